@@ -0,0 +1,259 @@
+import os
+import json
+import getpass
+import logging
+import argparse
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+import storage
+from dataset_progress import list_sequences, EDITED_DIR
+from utils import keyframe_number
+
+logger = logging.getLogger(__name__)
+
+NUM_KEYPOINTS = 17
+# 편집자 이름 (저장 시 edited JSON에 기록, 없으면 OS 사용자 이름)
+ANNOTATOR_ENV = "KEYPOINT_ANNOTATOR"
+UNKNOWN_ANNOTATOR = "unknown"
+DEFAULT_DIFF_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+TOP_CORRECTIONS = 50
+
+
+def current_annotator() -> str:
+    """현재 편집자 이름 (KEYPOINT_ANNOTATOR 환경 변수, 없으면 OS 사용자 이름)"""
+    name = os.environ.get(ANNOTATOR_ENV)
+    if name:
+        return name
+    try:
+        return getpass.getuser()
+    except Exception:
+        return UNKNOWN_ANNOTATOR
+
+
+class FileDiff(NamedTuple):
+    """
+    원본/수정본 JSON 한 쌍의 비교 결과.
+
+    프레임 축(K)은 (키프레임, 같은 키프레임 안의 순번) 단위이며, 두 파일 모두에
+    있는 항목만 비교합니다. 이동 거리는 양쪽 모두 표시된 포인트만 값이 있고
+    나머지는 NaN입니다.
+    """
+    sequence: str
+    name: str
+    annotator: str
+    keyframes: np.ndarray     # (K,) 키프레임 번호
+    displacement: np.ndarray  # (K, 17) 이동 거리(px), 비교 불가 시 NaN
+    added: np.ndarray         # (K, 17) 수정본에서 새로 표시된 포인트
+    removed: np.ndarray       # (K, 17) 수정본에서 지워진 포인트
+
+
+def keypoint_array(keypoints) -> np.ndarray:
+    """키포인트 목록을 (17, 2) 배열로 정규화 (부족하면 (0, 0)으로 채움, 3번째 값은 무시)"""
+    points = np.zeros((NUM_KEYPOINTS, 2), dtype=np.float64)
+    rows = [p[:2] for p in keypoints[:NUM_KEYPOINTS] if len(p) >= 2]
+    if rows:
+        points[:len(rows)] = rows
+    return points
+
+
+def load_segments(path):
+    """
+    JSON의 세그먼트를 {(키프레임, 순번): (17, 2) 배열}로 읽고 편집자 이름과 함께 반환.
+    keyframe을 정수로 읽을 수 없는 세그먼트는 건너뜀
+    """
+    data = json.loads(storage.read_bytes(path))
+    segments = {}
+    for segment in data.get('segmentation', []):
+        keyframe = keyframe_number(segment.get('keyframe'))
+        if keyframe is None:
+            continue
+        order = 0
+        while (keyframe, order) in segments:
+            order += 1
+        segments[(keyframe, order)] = keypoint_array(segment.get('keypoints', []))
+    return segments, data.get('annotator') or UNKNOWN_ANNOTATOR
+
+
+def diff_pair(job) -> FileDiff:
+    """워커 프로세스: (시퀀스, 원본 경로, 수정본 경로) 비교"""
+    sequence, original_path, edited_path = job
+    original, _ = load_segments(original_path)
+    edited, annotator = load_segments(edited_path)
+
+    keys = sorted(original.keys() & edited.keys())
+    if keys:
+        before = np.stack([original[k] for k in keys])
+        after = np.stack([edited[k] for k in keys])
+    else:
+        before = after = np.zeros((0, NUM_KEYPOINTS, 2))
+
+    # (0, 0)은 표시하지 않은 포인트
+    shown_before = np.any(before != 0, axis=2)
+    shown_after = np.any(after != 0, axis=2)
+    displacement = np.linalg.norm(after - before, axis=2)
+    displacement[~(shown_before & shown_after)] = np.nan
+
+    return FileDiff(
+        sequence, Path(original_path).name, annotator,
+        np.array([k[0] for k in keys], dtype=np.int64),
+        displacement.astype(np.float32),
+        shown_after & ~shown_before,
+        shown_before & ~shown_after,
+    )
+
+
+def pair_files(base_path):
+    """데이터셋 전체에서 (시퀀스, 원본, 수정본) 쌍 목록 생성"""
+    jobs = []
+    for folder in list_sequences(base_path):
+        edited_folder = folder / EDITED_DIR
+        for edited_path in storage.glob(edited_folder, "*.json"):
+            original_path = folder / edited_path.name
+            if storage.exists(original_path):
+                jobs.append((folder.name, str(original_path), str(edited_path)))
+    return jobs
+
+
+def diff_dataset(base_path, workers=DEFAULT_DIFF_WORKERS):
+    """
+    데이터셋의 모든 원본/수정본 쌍을 프로세스 풀에서 비교합니다.
+
+    :param workers: 워커 프로세스 수 (storage.process_pool 참고)
+    :return: FileDiff 목록 (읽을 수 없는 쌍은 경고 후 제외)
+    """
+    jobs = pair_files(base_path)
+    if not jobs:
+        return []
+    executor = storage.process_pool(base_path, workers, len(jobs))
+    if executor is None:
+        return [d for d in map(_safe_diff, jobs) if d is not None]
+
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with executor:
+        return [d for d in executor.map(_safe_diff, jobs, chunksize=chunksize) if d is not None]
+
+
+def _safe_diff(job):
+    try:
+        return diff_pair(job)
+    except Exception as e:
+        logger.warning(f"비교 실패: {job[2]}: {e}")
+        return None
+
+
+def summarize(diffs):
+    """
+    편집자별 집계와 키포인트별 평균 이동 거리 계산.
+
+    :return: {'annotators': {이름: {...}}, 'keypoint_mean_px': [17개], 'total': {...}}
+    """
+    def aggregate(group):
+        if group:
+            displacement = np.concatenate([d.displacement for d in group])
+            added = np.concatenate([d.added for d in group])
+            removed = np.concatenate([d.removed for d in group])
+        else:
+            displacement = np.zeros((0, NUM_KEYPOINTS), dtype=np.float32)
+            added = removed = np.zeros((0, NUM_KEYPOINTS), dtype=bool)
+        compared = displacement[~np.isnan(displacement)]
+        return {
+            'files': len(group),
+            'frames': int(displacement.shape[0]),
+            'points_compared': int(compared.size),
+            'points_moved': int(np.count_nonzero(compared > 0)),
+            'mean_px': round(float(compared.mean()), 2) if compared.size else 0.0,
+            'p95_px': round(float(np.percentile(compared, 95)), 2) if compared.size else 0.0,
+            'max_px': round(float(compared.max()), 2) if compared.size else 0.0,
+            'added': int(added.sum()),
+            'removed': int(removed.sum()),
+        }
+
+    by_annotator = {}
+    for d in diffs:
+        by_annotator.setdefault(d.annotator, []).append(d)
+
+    if diffs:
+        stacked = np.concatenate([d.displacement for d in diffs])
+        counts = np.sum(~np.isnan(stacked), axis=0)
+        sums = np.nansum(stacked, axis=0)
+        keypoint_mean = np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+    else:
+        keypoint_mean = np.zeros(NUM_KEYPOINTS)
+
+    return {
+        'total': aggregate(diffs),
+        'annotators': {name: aggregate(group) for name, group in sorted(by_annotator.items())},
+        'keypoint_mean_px': [round(float(v), 2) for v in keypoint_mean],
+    }
+
+
+class Correction(NamedTuple):
+    """수정 폭이 큰 프레임 한 개"""
+    sequence: str
+    name: str
+    keyframe: int
+    max_px: float
+    mean_px: float
+    added: int
+    removed: int
+    annotator: str
+
+
+def largest_corrections(diffs, limit=TOP_CORRECTIONS):
+    """최대 이동 거리 기준 상위 프레임 목록 (같으면 추가/삭제된 포인트 수 순)"""
+    corrections = []
+    for d in diffs:
+        if not len(d.keyframes):
+            continue
+        compared = ~np.isnan(d.displacement)
+        moved = np.where(compared, d.displacement, 0.0)
+        max_px = moved.max(axis=1)
+        counts = compared.sum(axis=1)
+        mean_px = moved.sum(axis=1) / np.maximum(counts, 1)
+        added = d.added.sum(axis=1)
+        removed = d.removed.sum(axis=1)
+        for i in np.flatnonzero((max_px > 0) | (added > 0) | (removed > 0)):
+            corrections.append(Correction(d.sequence, d.name, int(d.keyframes[i]),
+                                          round(float(max_px[i]), 2), round(float(mean_px[i]), 2),
+                                          int(added[i]), int(removed[i]), d.annotator))
+    corrections.sort(key=lambda c: (c.max_px, c.added + c.removed), reverse=True)
+    return corrections[:limit]
+
+
+def build_report(diffs, limit=TOP_CORRECTIONS):
+    """요약과 상위 수정 프레임을 담은 보고서 딕셔너리"""
+    report = summarize(diffs)
+    report['largest_corrections'] = [c._asdict() for c in largest_corrections(diffs, limit)]
+    return report
+
+
+def write_report(path, diffs, limit=TOP_CORRECTIONS):
+    path = Path(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(build_report(diffs, limit), f, indent=2, ensure_ascii=False)
+    logger.info(f"수정 비교 보고서 저장: {path}")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="원본 대비 수정된 키포인트 비교 보고서 생성")
+    parser.add_argument('base_path', help="최상위 데이터 폴더")
+    parser.add_argument('-o', '--output', default='diff_report.json', help="보고서 JSON 경로")
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_DIFF_WORKERS)
+    parser.add_argument('-n', '--top', type=int, default=TOP_CORRECTIONS)
+    args = parser.parse_args(argv)
+
+    diffs = diff_dataset(args.base_path, args.workers)
+    write_report(args.output, diffs, args.top)
+    total = summarize(diffs)['total']
+    print(f"{total['files']}개 파일, {total['frames']}개 프레임 비교: "
+          f"평균 이동 {total['mean_px']}px, 추가 {total['added']}, 삭제 {total['removed']}")
+
+
+if __name__ == '__main__':
+    from logging_setup import setup_logging
+    setup_logging()
+    main()
@@ -0,0 +1,256 @@
+import os
+import json
+import logging
+import argparse
+from pathlib import Path
+from typing import NamedTuple
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import cv2
+import numpy as np
+
+import storage
+from storage import IMAGE_DIR
+from utils import iter_label_files, labeled_segments
+from annotation_diff import keypoint_array, NUM_KEYPOINTS
+from decoder import decode_file
+from geometry import Affine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CROP_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# 워커 작업 하나가 처리하는 원본 이미지 수
+DEFAULT_CHUNK_IMAGES = 64
+# 워커당 동시에 대기시키는 작업 수 (대기 중인 작업만큼만 메모리를 사용)
+JOBS_PER_WORKER = 2
+# 박스 각 변에 더하는 여백 (박스 크기 대비)
+DEFAULT_PADDING = 0.15
+# 포인트가 한두 개뿐이어도 잘라낼 수 있도록 하는 박스 최소 크기(px)
+MIN_BOX_PX = 16
+# 박스를 만들 최소 표시 포인트 수
+MIN_VISIBLE_POINTS = 2
+DEFAULT_JPEG_QUALITY = 95
+MANIFEST_NAME = "crops.json"
+MANIFEST_VERSION = 1
+CROP_DIR = "images"
+# COCO 형식 가시성 값 (표시된 포인트)
+VISIBLE = 2
+
+
+class CropSource(NamedTuple):
+    """라벨링된 키프레임 이미지 한 장과 그 안의 사람들"""
+    sequence: str
+    name: str          # JSON 파일 이름 (확장자 제외)
+    keyframe: int
+    image_path: str
+    people: list       # 사람별 17개 [x, y] (원본 좌표, (0, 0)은 표시 안 함)
+
+
+def collect_sources(base_path) -> list:
+    """
+    데이터셋의 라벨링된 키프레임 이미지 목록. JSON은 edited 수정본을 우선 사용하며,
+    같은 키프레임의 세그먼트는 편집 도구와 같이 한 사람씩 모읍니다.
+    """
+    base_path = Path(base_path)
+    sources = []
+    for folder, json_path, data in iter_label_files(base_path):
+        image_folder = base_path / IMAGE_DIR / folder.name
+        people = {}
+        for keyframe, points in labeled_segments(data, json_path):
+            people.setdefault(keyframe, []).append(keypoint_array(points).tolist())
+        for keyframe in sorted(people):
+            image_path = image_folder / f"{json_path.stem}_{keyframe}.jpg"
+            if storage.exists(image_path):
+                sources.append(CropSource(folder.name, json_path.stem, keyframe,
+                                          str(image_path), people[keyframe]))
+    return sources
+
+
+def person_boxes(people, image_size, padding=DEFAULT_PADDING, aspect=None):
+    """
+    사람별 키포인트에서 여백을 더한 박스 계산.
+
+    render_skeleton과 같이 (0, 0)인 포인트는 표시하지 않는 포인트로 보고 제외합니다.
+    aspect(너비/높이)를 주면 짧은 변을 늘려 비율을 맞춥니다.
+
+    :param people: (P, 17, 2) 원본 좌표
+    :param image_size: 원본 이미지 (너비, 높이)
+    :return: ((P, 4) [x0, y0, x1, y1] float 박스 (이미지 밖으로 나갈 수 있음),
+              (P,) 박스를 만들 수 있는지 여부)
+    """
+    points = np.asarray(people, dtype=np.float64).reshape(-1, NUM_KEYPOINTS, 2)
+    visible = np.any(points != 0, axis=2)
+    valid = visible.sum(axis=1) >= MIN_VISIBLE_POINTS
+    lo = np.where(visible[..., None], points, np.inf).min(axis=1)
+    hi = np.where(visible[..., None], points, -np.inf).max(axis=1)
+    lo[~valid] = hi[~valid] = 0
+
+    center = (lo + hi) / 2
+    size = np.maximum((hi - lo) * (1 + 2 * padding), MIN_BOX_PX)
+    if aspect:
+        size = np.maximum(size, np.stack([size[:, 1] * aspect, size[:, 0] / aspect], axis=1))
+    boxes = np.concatenate([center - size / 2, center + size / 2], axis=1)
+
+    # 이미지와 겹치지 않는 박스는 제외
+    width, height = image_size
+    valid &= (boxes[:, 0] < width) & (boxes[:, 1] < height) & (boxes[:, 2] > 0) & (boxes[:, 3] > 0)
+    return boxes, valid
+
+
+def crop_transform(box, image_size, out_size=None):
+    """
+    원본 좌표 -> 잘라낸 이미지 좌표 변환과 잘라낼 정수 영역.
+
+    out_size가 없으면 박스를 이미지 안으로 자른 정수 영역을 그대로 잘라내고,
+    있으면 박스 전체(이미지 밖은 검은색)를 out_size로 늘립니다.
+
+    :return: (Affine, (x0, y0, x1, y1) 원본에서의 영역)
+    """
+    x0, y0, x1, y1 = box
+    if out_size is None:
+        width, height = image_size
+        x0, y0 = int(max(np.floor(x0), 0)), int(max(np.floor(y0), 0))
+        x1, y1 = int(min(np.ceil(x1), width)), int(min(np.ceil(y1), height))
+        return Affine.translation(-x0, -y0), (x0, y0, x1, y1)
+    affine = Affine.translation(-x0, -y0).then(Affine.between((x1 - x0, y1 - y0), out_size))
+    return affine, (x0, y0, x1, y1)
+
+
+def crop_images(job):
+    """
+    원본 이미지 묶음에서 사람별 이미지를 잘라 JPEG으로 저장 (워커 프로세스에서 실행).
+
+    이미지마다 한 번만 디코딩해 그 안의 모든 사람을 잘라내며, 디코딩한 이미지는
+    다음 이미지로 넘어가기 전에 버리므로 워커의 메모리는 이미지 한 장 분량입니다.
+    :return: 잘라낸 이미지별 기록 목록
+    """
+    out_dir, sources, padding, aspect, out_size, quality = job
+    out_dir = Path(out_dir)
+    params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+    records = []
+    for source in sources:
+        try:
+            image = decode_file(source.image_path, storage.read_array(source.image_path))
+        except Exception as e:
+            image = None
+            logger.warning(f"이미지 읽기 실패: {source.image_path}: {e}")
+        if image is None:
+            continue
+        height, width = image.shape[:2]
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        boxes, valid = person_boxes(source.people, (width, height), padding, aspect)
+        folder = out_dir / CROP_DIR / source.sequence
+        folder.mkdir(parents=True, exist_ok=True)
+
+        for person in np.flatnonzero(valid).tolist():
+            affine, (x0, y0, x1, y1) = crop_transform(boxes[person], (width, height), out_size)
+            if out_size is None:
+                crop = image[y0:y1, x0:x1]
+            else:
+                crop = cv2.warpAffine(image, affine.matrix[:2], tuple(out_size), flags=cv2.INTER_LINEAR,
+                                      borderMode=cv2.BORDER_CONSTANT)
+            ok, encoded = cv2.imencode('.jpg', crop, params)
+            if not ok:
+                logger.warning(f"인코딩 실패: {source.image_path} ({person})")
+                continue
+            file_name = f"{source.name}_{source.keyframe}_{person}.jpg"
+            (folder / file_name).write_bytes(encoded.tobytes())
+
+            points = np.asarray(source.people[person], dtype=np.float64)
+            shown = np.any(points != 0, axis=1)
+            mapped = affine.apply(points, keep_missing=True)
+            keypoints = np.concatenate([mapped, np.where(shown, VISIBLE, 0)[:, None]], axis=1)
+            records.append({
+                'file': f"{CROP_DIR}/{source.sequence}/{file_name}",
+                'sequence': source.sequence,
+                'name': source.name,
+                'keyframe': source.keyframe,
+                'person': person,
+                'source_size': [width, height],
+                'box': [round(float(v), 2) for v in (x0, y0, x1, y1)],
+                'size': [int(crop.shape[1]), int(crop.shape[0])],
+                'keypoints': np.round(keypoints, 2).tolist(),
+            })
+        del image
+    return records
+
+
+def export_crops(base_path, out_dir, padding=DEFAULT_PADDING, aspect=None, out_size=None,
+                 workers=DEFAULT_CROP_WORKERS, chunk_images=DEFAULT_CHUNK_IMAGES,
+                 quality=DEFAULT_JPEG_QUALITY):
+    """
+    라벨링된 키프레임에서 사람별 이미지를 잘라 내보내고 crops.json을 작성합니다.
+
+    박스는 표시된 키포인트에서 padding만큼 여백을 더해 만들고, 키포인트는 잘라낸
+    이미지 좌표로 변환해 기록합니다. 원본 이미지 묶음을 프로세스 풀에서 병렬로
+    처리하며, 워커당 JOBS_PER_WORKER개의 묶음만 대기시켜 메모리 사용을 제한합니다.
+
+    :param aspect: 박스 비율 (너비/높이). 생략하면 키포인트 범위 그대로
+    :param out_size: 잘라낸 이미지를 늘릴 (너비, 높이). 생략하면 원본 해상도
+    :param workers: 워커 프로세스 수 (storage.process_pool 참고)
+    :return: crops.json 경로
+    """
+    out_size = tuple(out_size) if out_size else None
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    sources = collect_sources(base_path)
+    jobs = [(str(out_dir), sources[i:i + chunk_images], padding, aspect, out_size, quality)
+            for i in range(0, len(sources), chunk_images)]
+    executor = storage.process_pool(base_path, workers, len(jobs))
+    if executor is None:
+        results = list(map(crop_images, jobs))
+    else:
+        results = [None] * len(jobs)
+        with executor:
+            pending, next_job = {}, 0
+            while next_job < len(jobs) or pending:
+                while next_job < len(jobs) and len(pending) < workers * JOBS_PER_WORKER:
+                    pending[executor.submit(crop_images, jobs[next_job])] = next_job
+                    next_job += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+
+    crops = [record for records in results for record in records]
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'keypoints': NUM_KEYPOINTS,
+        'padding': padding,
+        'aspect': aspect,
+        'size': list(out_size) if out_size else None,
+        'num_images': len(sources),
+        'num_crops': len(crops),
+        'crops': crops,
+    }
+    path = out_dir / MANIFEST_NAME
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    logger.info(f"사람 이미지 내보내기: {len(sources)}개 이미지에서 {len(crops)}개 -> {out_dir}")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="키포인트 박스로 사람별 이미지 잘라 내보내기")
+    parser.add_argument('base_path', help="최상위 데이터 폴더")
+    parser.add_argument('-o', '--output', default='crops', help="잘라낸 이미지를 저장할 폴더")
+    parser.add_argument('-p', '--padding', type=float, default=DEFAULT_PADDING,
+                        help="박스 각 변에 더할 여백 (박스 크기 대비)")
+    parser.add_argument('--aspect', type=float, help="박스 비율 (너비/높이, 예: 0.75)")
+    parser.add_argument('--size', type=int, nargs=2, metavar=('W', 'H'),
+                        help="잘라낸 이미지를 이 크기로 늘려 저장")
+    parser.add_argument('-q', '--quality', type=int, default=DEFAULT_JPEG_QUALITY)
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_CROP_WORKERS)
+    args = parser.parse_args(argv)
+
+    path = export_crops(args.base_path, args.output, args.padding, args.aspect, args.size,
+                        args.workers, quality=args.quality)
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    print(f"{manifest['num_images']}개 이미지에서 {manifest['num_crops']}개 사람 이미지 저장: {path}")
+
+
+if __name__ == '__main__':
+    from logging_setup import setup_logging
+    setup_logging()
+    main()
@@ -0,0 +1,76 @@
+import os
+import csv
+import logging
+from pathlib import Path
+from typing import NamedTuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import storage
+from storage import LABEL_DIR
+
+logger = logging.getLogger(__name__)
+
+EDITED_DIR = "edited"
+# 파일 목록 조회는 I/O 대기 위주라 CPU 수보다 많은 스레드를 사용
+DEFAULT_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+CSV_HEADER = ['시퀀스', '전체', '수정됨', '진행률(%)']
+
+
+class SequenceProgress(NamedTuple):
+    """시퀀스 한 개의 라벨링 진행 현황"""
+    name: str
+    total: int
+    edited: int
+
+    @property
+    def percent(self) -> float:
+        return 100.0 * self.edited / self.total if self.total else 0.0
+
+
+def _json_names(folder) -> set:
+    """폴더 바로 아래의 .json 파일명 집합 (폴더가 없으면 빈 집합)"""
+    if not storage.is_local(folder):
+        return {path.name for path in storage.glob(folder, "*.json")}
+    try:
+        with os.scandir(folder) as entries:
+            return {e.name for e in entries if e.name.endswith('.json') and e.is_file()}
+    except FileNotFoundError:
+        return set()
+
+
+def list_sequences(base_path) -> list:
+    """2.라벨링데이터 아래의 시퀀스 폴더 목록"""
+    label_root = Path(base_path) / LABEL_DIR
+    return [label_root / name for name in storage.subdirs(label_root)]
+
+
+def scan_sequence(json_folder) -> SequenceProgress:
+    """시퀀스 폴더의 JSON 수와 그중 edited 폴더에 저장된 수 집계"""
+    json_folder = Path(json_folder)
+    names = _json_names(json_folder)
+    edited = _json_names(json_folder / EDITED_DIR)
+    return SequenceProgress(json_folder.name, len(names), len(names & edited))
+
+
+def scan_progress(base_path, workers=DEFAULT_SCAN_WORKERS):
+    """모든 시퀀스를 스레드 풀에서 병렬로 스캔하고 완료되는 순서대로 반환"""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(scan_sequence, d) for d in list_sequences(base_path)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def write_progress_csv(path, results):
+    """진행 현황을 CSV로 저장 (엑셀에서 한글이 깨지지 않도록 BOM 포함)"""
+    results = sorted(results, key=lambda r: r.name)
+    total = sum(r.total for r in results)
+    edited = sum(r.edited for r in results)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for r in results:
+            writer.writerow([r.name, r.total, r.edited, f"{r.percent:.1f}"])
+        overall = SequenceProgress('합계', total, edited)
+        writer.writerow([overall.name, overall.total, overall.edited, f"{overall.percent:.1f}"])
+    logger.info(f"진행 현황 저장: {path}")
+    return Path(path)
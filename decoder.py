@@ -0,0 +1,310 @@
+import os
+import atexit
+import logging
+import threading
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context, shared_memory
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 디코딩 워커 프로세스 수 (0이면 GUI 프로세스에서 직접 디코딩)
+DECODE_WORKERS_ENV = "KEYPOINT_DECODE_WORKERS"
+DEFAULT_DECODE_WORKERS = 2
+DEFAULT_SLAB_BYTES = 2304 * 1296 * 3  # 원본 해상도 RGB 한 장
+
+# Qt Format_RGB888 채널 순서로 바로 디코딩 (지원하지 않는 OpenCV에서는 cvtColor로 변환)
+IMREAD_RGB = getattr(cv2, 'IMREAD_COLOR_RGB', None)
+
+
+def decode_rgb(data):
+    """인코딩된 이미지 바이트를 RGB ndarray로 디코딩 (실패 시 None)"""
+    if not isinstance(data, np.ndarray):
+        data = np.frombuffer(data, np.uint8)
+    if IMREAD_RGB is not None:
+        return cv2.imdecode(data, IMREAD_RGB)
+    image = cv2.imdecode(data, cv2.IMREAD_COLOR)
+    if image is not None:
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+    return image
+
+
+def decode_file(path, data=None):
+    """파일(또는 미리 읽은 바이트)을 RGB ndarray로 디코딩"""
+    if data is None:
+        data = np.fromfile(os.fspath(path), np.uint8)
+    image = decode_rgb(data)
+    if image is None:
+        raise ValueError("이미지를 읽을 수 없습니다.")
+    return image
+
+
+# 워커 프로세스에서 열어 둔 공유 메모리 슬랩 (이름 -> SharedMemory)
+_worker_slabs = {}
+
+
+def _decode_to_slab(path, data, slab_name, slab_size):
+    """워커 프로세스: 디코딩 결과를 공유 메모리 슬랩에 기록하고 shape만 반환"""
+    image = decode_file(path, data)
+    if slab_name is None or image.nbytes > slab_size:
+        # 슬랩이 없거나 슬랩보다 큰 이미지는 일반 전송으로 반환
+        return 'array', image
+
+    slab = _worker_slabs.get(slab_name)
+    if slab is None:
+        slab = _worker_slabs[slab_name] = shared_memory.SharedMemory(name=slab_name)
+    target = np.ndarray(image.shape, dtype=np.uint8, buffer=slab.buf)
+    target[...] = image
+    del target
+    return 'slab', image.shape
+
+
+class DecodeFuture(Future):
+    """취소 시 워커 작업도 함께 취소하는 Future"""
+
+    def __init__(self, inner=None):
+        super().__init__()
+        self._inner = inner
+
+    def cancel(self):
+        if self._inner is not None and not self._inner.cancel():
+            return False  # 이미 디코딩 중
+        return super().cancel()
+
+
+class _Lease:
+    """슬랩 기반 배열과 사용자 수"""
+    __slots__ = ('slab', 'array', 'refs')
+
+    def __init__(self, slab, array):
+        self.slab = slab
+        self.array = array
+        self.refs = 1
+
+
+class LeaseGroup:
+    """
+    작업 하나(추적 한 번 등)가 끝날 때까지 디코딩 결과를 붙잡아 두는 사용 표시 묶음.
+
+    아직 디코딩 중인 Future는 결과가 나오는 대로 붙잡고, close() 뒤에 나온 결과는
+    붙잡지 않습니다. close()는 어느 스레드에서 호출해도 됩니다.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.futures = []    # 결과를 기다리는 Future (취소하면 안 되는 요청)
+        self._arrays = []
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def hold(self, image):
+        """배열 또는 배열을 결과로 하는 Future를 붙잡고 그대로 반환"""
+        if isinstance(image, Future):
+            self.futures.append(image)
+            image.add_done_callback(self._on_done)
+        else:
+            self._retain(image)
+        return image
+
+    def _on_done(self, future):
+        if not future.cancelled() and future.exception() is None:
+            self._retain(future.result())
+
+    def _retain(self, array):
+        with self._lock:
+            if not self._closed and self.service.retain(array):
+                self._arrays.append(array)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            arrays, self._arrays = self._arrays, []
+        for array in arrays:
+            self.service.release(array)
+
+
+class DecodeService:
+    """
+    워커 프로세스 풀에서 JPEG을 디코딩해 공유 메모리 슬랩에 기록하는 서비스.
+
+    GUI 프로세스는 슬랩을 복사 없이 ndarray로 감싸 사용합니다. 디코딩 결과는 사용자
+    하나(결과를 받은 쪽, 보통 ImageCache)로 시작하며, 화면이나 추적처럼 캐시에서
+    빠진 뒤에도 읽는 쪽은 retain()으로 사용자를 늘립니다. 슬랩은 모든 사용자가
+    release()한 뒤에야 다음 디코딩에 재사용됩니다.
+
+    cached_frames를 지정하면 슬랩 수는 캐시 크기 + 워커 수로 제한되고, 그 이상의
+    요청은 일반 전송(pickle)으로 결과를 받습니다. 워커 프로세스가 비정상 종료되면
+    풀을 다시 만들고, 그 사이 요청은 GUI 프로세스에서 직접 디코딩합니다.
+    """
+
+    def __init__(self, workers=None, slab_bytes=DEFAULT_SLAB_BYTES, cached_frames=None):
+        if workers is None:
+            workers = int(os.environ.get(DECODE_WORKERS_ENV, DEFAULT_DECODE_WORKERS))
+        self.workers = max(0, workers)
+        self.slab_bytes = slab_bytes
+        self.max_slabs = None if cached_frames is None else cached_frames + max(1, self.workers)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._free = []      # 재사용 가능한 슬랩
+        self._slabs = []     # 생성한 모든 슬랩
+        self._leases = {}    # id(array) -> _Lease
+        atexit.register(self.shutdown)
+
+    def start(self):
+        """워커 프로세스를 미리 띄움 (첫 디코딩 지연 방지)"""
+        if self.workers and self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=get_context('spawn')
+            )
+            for _ in range(self.workers):
+                self._executor.submit(int)
+        return self
+
+    def submit(self, path, data=None):
+        """디코딩 요청. RGB ndarray를 결과로 하는 Future 반환"""
+        if not self.workers:
+            return self._decode_inline(path, data)
+
+        slab = self._acquire()
+        for _ in range(2):
+            executor = self.start()._executor
+            try:
+                inner = executor.submit(_decode_to_slab, os.fspath(path), data,
+                                        None if slab is None else slab.name,
+                                        0 if slab is None else slab.size)
+                break
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+            except Exception:
+                self._release_slab(slab)
+                raise
+        else:
+            # 풀을 다시 만들어도 실패하면 이번 요청은 직접 디코딩
+            self._release_slab(slab)
+            return self._decode_inline(path, data)
+
+        future = DecodeFuture(inner)
+        inner.add_done_callback(
+            lambda f: self._on_decoded(f, future, slab, executor, path, data)
+        )
+        return future
+
+    def _decode_inline(self, path, data, future=None):
+        """GUI 프로세스에서 직접 디코딩 (워커 0개 또는 워커 풀 장애 시)"""
+        future = future or DecodeFuture()
+        try:
+            future.set_result(decode_file(path, data))
+        except InvalidStateError:  # 그 사이 취소된 요청
+            pass
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _discard_executor(self, executor):
+        """비정상 종료된 워커 풀 폐기 (다음 요청 시 새로 생성)"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        logger.warning("디코딩 워커 풀이 비정상 종료되어 다시 생성합니다.")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def decode(self, path, data=None):
+        """동기 디코딩 (디코딩은 워커 프로세스에서 수행되어 GIL을 점유하지 않음)"""
+        return self.submit(path, data).result()
+
+    def _on_decoded(self, inner, future, slab, executor, path, data):
+        if inner.cancelled() or future.cancelled():
+            self._release_slab(slab)
+            return
+        try:
+            kind, payload = inner.result()
+        except BrokenProcessPool:
+            # 워커가 죽은 경우 풀을 폐기하고 이 요청은 직접 디코딩
+            self._release_slab(slab)
+            self._discard_executor(executor)
+            self._decode_inline(path, data, future)
+            return
+        except Exception as e:
+            self._release_slab(slab)
+            try:
+                future.set_exception(e)
+            except InvalidStateError:
+                pass
+            return
+
+        if kind == 'slab':
+            array = np.ndarray(payload, dtype=np.uint8, buffer=slab.buf)
+            with self._lock:
+                self._leases[id(array)] = _Lease(slab, array)
+        else:
+            self._release_slab(slab)
+            array = payload
+        try:
+            future.set_result(array)
+        except InvalidStateError:  # 그 사이 취소된 요청
+            self.release(array)
+
+    def retain(self, array):
+        """
+        슬랩 기반 배열의 사용자 추가 (사용이 끝나면 release). 아직 사용자가 있는 배열에만
+        호출해야 합니다. 슬랩 기반 배열이면 True
+        """
+        with self._lock:
+            lease = self._leases.get(id(array))
+            if lease is None or lease.array is not array:
+                return False
+            lease.refs += 1
+            return True
+
+    def release(self, array):
+        """디코딩 결과 사용 종료. 슬랩 기반 배열의 마지막 사용자이면 슬랩을 재사용 목록에 돌려놓음"""
+        with self._lock:
+            lease = self._leases.get(id(array))
+            if lease is None or lease.array is not array:
+                return
+            lease.refs -= 1
+            if lease.refs > 0:
+                return
+            del self._leases[id(array)]
+            self._free.append(lease.slab)
+
+    def _acquire(self):
+        """재사용 가능한 슬랩 반환. 상한에 도달했으면 None (일반 전송 사용)"""
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+            if self.max_slabs is not None and len(self._slabs) >= self.max_slabs:
+                return None
+            slab = shared_memory.SharedMemory(create=True, size=self.slab_bytes)
+            self._slabs.append(slab)
+        return slab
+
+    def _release_slab(self, slab):
+        if slab is None:
+            return
+        with self._lock:
+            self._free.append(slab)
+
+    def shutdown(self):
+        """워커 종료 및 슬랩 해제"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        with self._lock:
+            slabs, self._slabs = self._slabs, []
+            self._free.clear()
+            self._leases.clear()
+        for slab in slabs:
+            try:
+                slab.close()
+            except BufferError:
+                # 아직 화면 등에서 참조 중인 배열이 있으면 매핑은 프로세스 종료 시 해제됨
+                logger.debug("사용 중인 슬랩: %s", slab.name)
+            try:
+                slab.unlink()
+            except FileNotFoundError:
+                pass
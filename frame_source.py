@@ -0,0 +1,209 @@
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from utils import default_cache_dir, file_cache_key
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# 추출 이미지 대신 사용할 수 있는 원본 영상 확장자
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.MP4', '.AVI', '.MOV', '.MKV')
+VIDEO_CACHE_FRAMES = 8   # 최근 디코딩한 프레임 보관 수 (←/→ 이동용)
+# 키프레임 색인이 없을 때 seek 대신 앞으로 디코딩할 최대 프레임 수
+SEQUENTIAL_LIMIT = 30
+
+
+def find_video(image_folder, prefix):
+    """추출 이미지 폴더에서 JSON 이름과 같은 원본 영상 찾기 (없으면 None)"""
+    for ext in VIDEO_EXTENSIONS:
+        candidate = Path(image_folder) / f"{prefix}{ext}"
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def scan_keyframes(path):
+    """
+    영상을 디코딩하지 않고 패킷만 읽어 키프레임(I-프레임) 번호와 전체 프레임 수 반환.
+    FFmpeg 백엔드가 원시 패킷 모드를 지원하지 않으면 (None, 메타데이터 프레임 수).
+    """
+    cap = cv2.VideoCapture(str(path), cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
+    try:
+        if not cap.isOpened() or cap.get(cv2.CAP_PROP_FORMAT) != -1:
+            count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if cap.isOpened() else 0
+            return None, count
+        keyframes = []
+        count = 0
+        while cap.grab():
+            if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                keyframes.append(count)
+            count += 1
+        return np.asarray(keyframes or [0], dtype=np.int64), count
+    finally:
+        cap.release()
+
+
+class VideoFrameSource:
+    """
+    원본 영상에서 프레임 번호로 프레임을 읽는 소스.
+
+    처음 열 때 키프레임 색인을 만들어 디스크에 보관하고(다음 실행부터 재사용),
+    요청한 프레임보다 앞선 가장 가까운 키프레임으로 이동한 뒤 앞으로 디코딩합니다.
+    현재 디코딩 위치에서 앞으로 가는 편이 가까우면 이동 없이 이어서 디코딩하고,
+    최근 프레임은 메모리에 보관하므로 ←/→ 이동은 대부분 디코딩 없이 처리됩니다.
+    디코딩은 전용 스레드 하나에서 순서대로 수행됩니다.
+    """
+
+    def __init__(self, path, cache_frames=VIDEO_CACHE_FRAMES, index_dir=None):
+        self.path = Path(path)
+        self.cache_frames = cache_frames
+        self.index_dir = Path(index_dir) if index_dir else default_cache_dir() / "video_index"
+        self.keyframes, self.frame_count = self._load_index()
+        self._cap = None
+        self._position = None   # 다음 read()가 반환할 프레임 번호
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="video")
+        self._pending = set()   # 아직 끝나지 않은 디코딩 요청 (close()에서 취소)
+
+    def _load_index(self):
+        """디스크에 보관한 키프레임 색인 사용, 없으면 새로 만들어 저장"""
+        try:
+            entry = self.index_dir / f"{file_cache_key(self.path)}.npz"
+        except OSError:
+            entry = None
+        if entry is not None and entry.exists():
+            try:
+                with np.load(entry) as index:
+                    keyframes = index['keyframes']
+                    return (keyframes if keyframes.size else None), int(index['frame_count'])
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"영상 색인 읽기 실패: {entry}: {e}")
+
+        with span('video.index', path=self.path.name):
+            keyframes, count = scan_keyframes(self.path)
+        logger.info("영상 색인 생성: %s", self.path.name,
+                    extra={'frames': count, 'keyframes': 0 if keyframes is None else len(keyframes)})
+        if entry is not None:
+            try:
+                entry.parent.mkdir(parents=True, exist_ok=True)
+                tmp = entry.with_suffix('.tmp.npz')
+                np.savez(tmp, keyframes=keyframes if keyframes is not None else np.zeros(0, np.int64),
+                         frame_count=count)
+                tmp.replace(entry)
+            except OSError as e:
+                logger.warning(f"영상 색인 저장 실패: {e}")
+        return keyframes, count
+
+    def keyframe_before(self, n):
+        """n 이하의 가장 가까운 키프레임 번호 (색인이 없으면 None)"""
+        if self.keyframes is None:
+            return None
+        i = int(np.searchsorted(self.keyframes, n, side='right')) - 1
+        return int(self.keyframes[max(i, 0)])
+
+    def read(self, n):
+        """프레임 n을 RGB ndarray로 반환"""
+        if not 0 <= n < max(self.frame_count, 1):
+            raise IndexError(f"프레임 번호 범위 초과: {n}")
+        with self._lock:
+            frame = self._cache.get(n)
+            if frame is not None:
+                self._cache.move_to_end(n)
+                return frame
+            with span('video.decode', frame=n):
+                return self._decode(n)
+
+    def _decode(self, n):
+        if self._cap is None:
+            self._cap = cv2.VideoCapture(str(self.path), cv2.CAP_FFMPEG)
+            if not self._cap.isOpened():
+                self._cap = None
+                raise ValueError(f"영상을 열 수 없습니다: {self.path}")
+            self._position = 0
+
+        start = self.keyframe_before(n)
+        if start is None:
+            # 색인이 없으면 가까운 앞쪽 이동만 이어서 디코딩하고 나머지는 백엔드의 seek 사용
+            forward = self._position <= n <= self._position + SEQUENTIAL_LIMIT
+            start = self._position if forward else n
+        if not start <= self._position <= n:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            self._position = start
+
+        frame = None
+        while self._position <= n:
+            # 요청 프레임 직전 구간은 디코딩 결과를 보관 (← 이동 대비)
+            keep = n - self._position < self.cache_frames
+            if keep:
+                ok, bgr = self._cap.read()
+            else:
+                ok, bgr = self._cap.grab(), None
+            if not ok:
+                self._position = None
+                self._cap.release()
+                self._cap = None
+                raise ValueError(f"프레임을 읽을 수 없습니다: {self.path} #{n}")
+            if keep:
+                frame = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+                self._remember(self._position, frame)
+            self._position += 1
+        return frame
+
+    def _remember(self, n, frame):
+        self._cache[n] = frame
+        self._cache.move_to_end(n)
+        while len(self._cache) > self.cache_frames:
+            self._cache.popitem(last=False)
+
+    def submit(self, n):
+        """디코딩 스레드에서 프레임 n 읽기. RGB ndarray를 결과로 하는 Future 반환"""
+        future = self._executor.submit(self.read, n)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return future
+
+    def _release(self):
+        with self._lock:
+            if self._cap is not None:
+                self._cap.release()
+                self._cap = None
+            self._cache.clear()
+
+    def close(self):
+        """
+        대기 중인 디코딩을 취소하고 디코딩 스레드의 마지막 작업으로 영상을 닫음.
+        진행 중인 디코딩을 기다리지 않으므로 GUI 스레드에서 불러도 멈추지 않습니다.
+        """
+        # cancel_futures는 마지막에 넣은 닫기 작업까지 취소하므로 대기 중인 요청은 직접 취소
+        for future in list(self._pending):
+            future.cancel()
+        self._executor.submit(self._release)
+        self._executor.shutdown(wait=False)
+
+
+class VideoFrames:
+    """
+    영상 프레임을 추출 이미지와 같은 이름의 가상 경로({접두어}_{번호}.jpg)로 제공.
+    화면, 캐시, 키프레임 번호 처리는 추출 이미지와 동일하게 동작합니다.
+    """
+
+    def __init__(self, source, image_folder, prefix):
+        self.source = source
+        self.paths = [Path(image_folder) / f"{prefix}_{n}.jpg" for n in range(source.frame_count)]
+        self._numbers = {path: n for n, path in enumerate(self.paths)}
+
+    def __contains__(self, path):
+        return path in self._numbers
+
+    def submit(self, path):
+        return self.source.submit(self._numbers[path])
+
+    def close(self):
+        self.source.close()
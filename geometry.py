@@ -0,0 +1,213 @@
+import io
+import os
+import struct
+import logging
+from functools import lru_cache
+
+import numpy as np
+
+import storage
+
+logger = logging.getLogger(__name__)
+
+# JPEG 프레임 헤더(SOF) 마커 (DHT/JPG/DAC 제외)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# EXIF 방향 값 중 가로/세로가 바뀌는 경우 (OpenCV는 디코딩 시 방향을 적용함)
+_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+# 로컬이 아닌 저장소에서 크기 확인 시 읽는 앞부분 크기
+PROBE_BYTES = 64 * 1024
+
+
+class Affine:
+    """
+    2D 아핀 변환 (3x3 동차 행렬).
+
+    점 배열 (N, 2)에 한 번에 적용되며, 좌표계 사이의 변환(저장 좌표 ↔ 이미지
+    배열 ↔ 화면)을 합성해 하나의 행렬로 사용할 수 있습니다.
+    """
+    __slots__ = ('matrix',)
+
+    def __init__(self, matrix=None):
+        self.matrix = np.eye(3) if matrix is None else np.asarray(matrix, dtype=np.float64)
+
+    @classmethod
+    def scaling(cls, sx, sy=None):
+        sy = sx if sy is None else sy
+        return cls([[sx, 0, 0], [0, sy, 0], [0, 0, 1]])
+
+    @classmethod
+    def translation(cls, tx, ty):
+        return cls([[1, 0, tx], [0, 1, ty], [0, 0, 1]])
+
+    @classmethod
+    def between(cls, src_size, dst_size):
+        """(w, h) 크기의 좌표계를 다른 (w, h) 크기로 늘리는 변환"""
+        return cls.scaling(dst_size[0] / src_size[0], dst_size[1] / src_size[1])
+
+    def __matmul__(self, other):
+        """self @ other: other를 먼저 적용한 뒤 self를 적용"""
+        return Affine(self.matrix @ other.matrix)
+
+    def then(self, other):
+        """이 변환 다음에 other를 적용하는 변환"""
+        return other @ self
+
+    def inverse(self):
+        return Affine(np.linalg.inv(self.matrix))
+
+    def apply(self, points, keep_missing=False):
+        """
+        점 배열 (N, 2)에 변환 적용.
+
+        :param keep_missing: True이면 (0, 0)(표시하지 않는 키포인트)은 그대로 (0, 0)으로 유지
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        mapped = points @ self.matrix[:2, :2].T + self.matrix[:2, 2]
+        if keep_missing:
+            mapped[~np.any(points != 0, axis=1)] = 0
+        return mapped
+
+
+class PointGrid:
+    """
+    점 집합의 균일 격자 인덱스 (칸 크기 = 검색 반경).
+
+    반경 안의 점은 질의 위치 칸과 인접한 3x3 칸에만 있으므로, 칸 키를 정렬해 두고
+    이진 탐색으로 후보만 골라 거리를 계산합니다. 여러 사람의 키포인트처럼 점이
+    많을 때 클릭 위치의 점을 찾는 데 사용합니다.
+    """
+    _OFFSET = 1 << 30
+    _SPAN = 1 << 31
+
+    def __init__(self, points, radius, active=None):
+        """
+        :param points: (N, 2) 좌표
+        :param radius: 검색 반경 (칸 크기)
+        :param active: (N,) 검색 대상 여부. 생략하면 전체
+        """
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.radius = float(radius)
+        ids = np.arange(len(self.points)) if active is None else np.flatnonzero(active)
+        keys = self._keys(np.floor(self.points[ids] / self.radius))
+        order = np.argsort(keys, kind='stable')
+        self._keys_sorted = keys[order]
+        self._ids = ids[order]
+
+    @classmethod
+    def _keys(cls, cells):
+        cells = np.clip(cells, 1 - cls._OFFSET, cls._OFFSET - 2).astype(np.int64) + cls._OFFSET
+        return cells[..., 0] * cls._SPAN + cells[..., 1]
+
+    def query(self, x, y):
+        """반경 안의 점 번호를 가까운 순서로 반환 (거리가 같으면 번호 순)"""
+        cx, cy = np.floor(x / self.radius), np.floor(y / self.radius)
+        offsets = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)], dtype=np.float64)
+        keys = self._keys(offsets + (cx, cy))
+        lo = np.searchsorted(self._keys_sorted, keys, side='left')
+        hi = np.searchsorted(self._keys_sorted, keys, side='right')
+        if not (hi > lo).any():
+            return []
+        candidates = np.sort(np.concatenate([self._ids[a:b] for a, b in zip(lo, hi)]))
+        dist = np.sum((self.points[candidates] - (x, y)) ** 2, axis=1)
+        inside = dist <= self.radius * self.radius
+        order = np.argsort(dist[inside], kind='stable')
+        return candidates[inside][order].tolist()
+
+    def nearest(self, x, y):
+        """반경 안의 가장 가까운 점 번호 (없으면 None)"""
+        hits = self.query(x, y)
+        return hits[0] if hits else None
+
+
+def _exif_orientation(tiff):
+    """EXIF(TIFF) 블록의 IFD0에서 방향 태그(0x0112) 값 반환"""
+    try:
+        endian = '<' if tiff[:2] == b'II' else '>'
+        offset = struct.unpack(endian + 'I', tiff[4:8])[0]
+        count = struct.unpack(endian + 'H', tiff[offset:offset + 2])[0]
+        for i in range(count):
+            entry = offset + 2 + i * 12
+            if struct.unpack(endian + 'H', tiff[entry:entry + 2])[0] == 0x0112:
+                return struct.unpack(endian + 'H', tiff[entry + 8:entry + 10])[0]
+    except struct.error:
+        pass
+    return None
+
+
+def _jpeg_size(f):
+    """JPEG 마커를 따라가며 SOF 세그먼트의 크기 읽기 (압축 데이터는 읽지 않음)"""
+    orientation = 1
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            continue
+        marker = f.read(1)
+        while marker == b'\xff':  # 채움 바이트
+            marker = f.read(1)
+        if not marker:
+            return None
+        m = marker[0]
+        if m == 0x01 or m == 0xD8 or 0xD0 <= m <= 0xD7:  # 길이 없는 마커
+            continue
+        if m in (0xD9, 0xDA):  # SOF 없이 스캔/끝에 도달
+            return None
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if m in _SOF_MARKERS:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            h, w = struct.unpack('>HH', data[1:5])
+            if orientation in _TRANSPOSED_ORIENTATIONS:
+                w, h = h, w
+            return w, h
+        if m == 0xE1:
+            segment = f.read(length - 2)
+            if segment.startswith(b'Exif\x00\x00'):
+                orientation = _exif_orientation(segment[6:]) or 1
+        else:
+            f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_image_size(f):
+    """열린 이미지 파일의 헤더만 읽어 (너비, 높이) 반환. 알 수 없는 형식이면 None"""
+    head = f.read(24)
+    if head[:2] == b'\xff\xd8':
+        f.seek(2)
+        return _jpeg_size(f)
+    if head[:8] == _PNG_SIGNATURE and head[12:16] == b'IHDR':
+        return struct.unpack('>II', head[16:24])
+    return None
+
+
+@lru_cache(maxsize=8192)
+def _probe(path, mtime_ns, size):
+    with open(path, 'rb') as f:
+        return read_image_size(f)
+
+
+@lru_cache(maxsize=8192)
+def _probe_stored(path, key):
+    return read_image_size(io.BytesIO(storage.read_range(path, 0, PROBE_BYTES)))
+
+
+def probe_image_size(path):
+    """
+    디코딩 없이 이미지 헤더에서 (너비, 높이)를 읽습니다 (JPEG, PNG).
+    EXIF 방향이 적용된(디코딩 결과와 같은) 크기를 반환하며, 읽을 수 없으면 None.
+    """
+    try:
+        if not storage.is_local(path):
+            # 아카이브 등은 파일 앞부분만 읽어 확인
+            return _probe_stored(os.fspath(path), storage.cache_key(path))
+        stat = os.stat(path)
+        return _probe(os.fspath(path), stat.st_mtime_ns, stat.st_size)
+    except (OSError, ValueError, struct.error) as e:
+        logger.debug("이미지 크기 확인 실패: %s (%s)", path, e)
+        return None
@@ -0,0 +1,177 @@
+import logging
+from collections import deque
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 되돌리기 기록 전체 크기 상한 (넘으면 오래된 기록부터 버림)
+DEFAULT_HISTORY_BYTES = 4 * 1024 * 1024
+# 기록 하나의 고정 비용 추정치 (객체와 배열 헤더)
+EDIT_OVERHEAD_BYTES = 256
+# 변경 배열 열: 포인트 번호, 이전 x, y, 새 x, y
+_POINT, _OLD, _NEW = 0, slice(1, 3), slice(3, 5)
+
+
+class Edit:
+    """
+    한 번의 편집(드래그 한 번, 포인트 추가/삭제, 제안 확정)으로 바뀐 포인트들.
+
+    프레임과 사람 번호 하나에 대해 바뀐 포인트만 (N, 5) int32 배열로 보관하므로
+    크기는 바뀐 포인트 수에 비례합니다. created는 이 편집으로 키프레임이 새로
+    생겼는지 여부이며, 되돌리면 키프레임 자체를 지웁니다.
+    """
+    __slots__ = ('frame', 'person', 'created', 'changes', 'serial')
+
+    def __init__(self, frame, person, changes, created=False, serial=0):
+        self.frame = frame
+        self.person = person
+        self.created = created
+        self.changes = changes
+        self.serial = serial
+
+    @property
+    def nbytes(self):
+        return self.changes.nbytes + EDIT_OVERHEAD_BYTES
+
+    def points(self, undo=False):
+        """(포인트 번호, [x, y]) 목록. undo=True이면 편집 전 좌표"""
+        coords = self.changes[:, _OLD if undo else _NEW].tolist()
+        return list(zip(self.changes[:, _POINT].tolist(), coords))
+
+
+class EditHistory:
+    """
+    키포인트 편집의 되돌리기/다시 실행 기록.
+
+    record()로 들어오는 변경은 commit() 전까지 한 편집으로 합쳐지며 (포인트별로
+    처음 이전 좌표와 마지막 새 좌표만 유지), 드래그 중 마우스 이벤트마다 들어오는
+    변경도 기록 하나가 됩니다. 다른 프레임이나 사람의 변경이 들어오면 진행 중인
+    편집을 먼저 마칩니다. 전체 크기가 max_bytes를 넘으면 가장 오래된 기록부터 버립니다.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_HISTORY_BYTES):
+        self.max_bytes = max_bytes
+        self._undo = deque()
+        self._redo = []
+        self._bytes = 0
+        self._serial = 0
+        self._saved = 0        # 저장 시점의 마지막 기록 번호 (되돌릴 수 없게 되면 None)
+        self._open = None      # 진행 중인 편집 (프레임, 사람)
+        self._open_points = {}  # 포인트 번호 -> [이전 좌표, 새 좌표]
+        self._open_created = False
+
+    def __len__(self):
+        return len(self._undo)
+
+    @property
+    def nbytes(self):
+        """보관 중인 되돌리기/다시 실행 기록 크기"""
+        return self._bytes
+
+    @property
+    def can_undo(self):
+        return bool(self._undo) or bool(self._open_points)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo) and not self._open_points
+
+    def record(self, frame, person, point, old, new):
+        """포인트 하나의 변경을 진행 중인 편집에 추가"""
+        if self._open is not None and self._open != (frame, person):
+            self.commit()
+        self._open = (frame, person)
+        entry = self._open_points.get(point)
+        if entry is None:
+            self._open_points[point] = [list(old), list(new)]
+        else:
+            entry[1] = list(new)
+
+    def mark_created(self, frame, person=0):
+        """진행 중인 편집으로 키프레임이 새로 생겼음을 표시"""
+        if self._open is not None and self._open != (frame, person):
+            self.commit()
+        self._open = (frame, person)
+        self._open_created = True
+
+    def commit(self):
+        """
+        진행 중인 편집을 기록으로 확정. 좌표가 그대로인 포인트는 제외하며,
+        새 기록이 생기면 다시 실행 기록은 지웁니다.
+
+        :return: 확정한 Edit (바뀐 것이 없으면 None)
+        """
+        if self._open is None:
+            return None
+        frame, person = self._open
+        rows = [(point, *old, *new) for point, (old, new) in sorted(self._open_points.items())
+                if old != new]
+        created = self._open_created
+        self._open, self._open_points, self._open_created = None, {}, False
+        if not rows and not created:
+            return None
+
+        self._serial += 1
+        edit = Edit(frame, person, np.asarray(rows, dtype=np.int32).reshape(-1, 5), created, self._serial)
+        self._clear_redo()
+        self._undo.append(edit)
+        self._bytes += edit.nbytes
+        while self._bytes > self.max_bytes and len(self._undo) > 1:
+            self._bytes -= self._undo.popleft().nbytes
+        return edit
+
+    def _clear_redo(self):
+        for edit in self._redo:
+            self._bytes -= edit.nbytes
+            if edit.serial == self._saved:
+                # 저장한 상태로는 더 이상 돌아갈 수 없음
+                self._saved = None
+        self._redo.clear()
+
+    def undo(self):
+        """마지막 편집 반환 (적용은 호출 측에서 edit.points(undo=True)로). 없으면 None"""
+        self.commit()
+        if not self._undo:
+            return None
+        edit = self._undo.pop()
+        self._redo.append(edit)
+        return edit
+
+    def redo(self):
+        """되돌린 편집 반환 (적용은 edit.points()로). 없으면 None"""
+        self.commit()
+        if not self._redo:
+            return None
+        edit = self._redo.pop()
+        self._undo.append(edit)
+        return edit
+
+    def mark_saved(self):
+        """현재 상태를 저장한 상태로 표시"""
+        self.commit()
+        self._saved = self._undo[-1].serial if self._undo else self._base_serial()
+
+    def mark_unsaved(self):
+        """저장에 실패해 저장한 상태로 돌아갈 수 없음을 표시"""
+        self._saved = None
+
+    def _base_serial(self):
+        # 기록이 모두 되돌려졌거나 버려진 상태 (다시 실행 목록의 가장 오래된 기록 바로 앞)
+        return self._redo[-1].serial - 1 if self._redo else self._serial
+
+    @property
+    def is_saved(self):
+        """저장한 상태와 같은지 (진행 중인 편집이 있으면 False)"""
+        if self._open_points or self._open_created or self._saved is None:
+            return False
+        current = self._undo[-1].serial if self._undo else self._base_serial()
+        return current == self._saved
+
+    def clear(self):
+        """기록 전체 삭제 (다른 JSON을 열 때). 현재 상태를 저장한 상태로 봄"""
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+        self._open, self._open_points, self._open_created = None, {}, False
+        self._saved = self._serial
@@ -0,0 +1,117 @@
+import logging
+from typing import NamedTuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUM_KEYPOINTS = 17
+LINEAR = 'linear'
+SPLINE = 'spline'
+METHODS = (LINEAR, SPLINE)
+
+
+class Interpolation(NamedTuple):
+    """
+    키프레임 사이 프레임의 보간 결과.
+
+    points[i]는 frames[i]의 (17, 2) 좌표이며, interpolated가 False인 포인트는
+    (0, 0)입니다. 라벨링된 키프레임 자체는 항상 interpolated가 모두 False입니다.
+    """
+    frames: np.ndarray        # (F,) 프레임 번호
+    points: np.ndarray        # (F, 17, 2) 보간 좌표
+    interpolated: np.ndarray  # (F, 17) 보간으로 채워진 포인트
+
+    def proposal(self, frame):
+        """프레임의 (키포인트 목록, 포인트별 보간 여부) (보간된 포인트가 없으면 None)"""
+        i = np.searchsorted(self.frames, frame)
+        if i >= len(self.frames) or self.frames[i] != frame or not self.interpolated[i].any():
+            return None
+        return np.rint(self.points[i]).astype(int).tolist(), self.interpolated[i].tolist()
+
+
+def _tangents(keyframes, points, visible):
+    """
+    키프레임별 포인트 기울기 (M, 17, 2).
+
+    양쪽 이웃 키프레임에 모두 표시된 포인트는 중앙 차분, 한쪽만 표시되면 그쪽으로의
+    단측 차분, 둘 다 없으면 0을 사용합니다.
+    """
+    tangents = np.zeros_like(points)
+    if len(keyframes) < 2:
+        return tangents
+    gap = np.diff(keyframes).astype(np.float64)[:, None, None]
+    slope = np.diff(points, axis=0) / gap                       # (M-1, 17, 2)
+    slope_ok = visible[:-1] & visible[1:]                       # (M-1, 17)
+
+    forward = np.zeros_like(points)
+    forward_ok = np.zeros(visible.shape, dtype=bool)
+    forward[:-1], forward_ok[:-1] = slope, slope_ok
+    backward = np.zeros_like(points)
+    backward_ok = np.zeros(visible.shape, dtype=bool)
+    backward[1:], backward_ok[1:] = slope, slope_ok
+
+    central = np.zeros_like(points)
+    span = (keyframes[2:] - keyframes[:-2]).astype(np.float64)[:, None, None]
+    central[1:-1] = (points[2:] - points[:-2]) / span
+    central_ok = forward_ok & backward_ok & visible
+
+    tangents = np.where(backward_ok[..., None], backward, tangents)
+    tangents = np.where(forward_ok[..., None], forward, tangents)
+    return np.where(central_ok[..., None], central, tangents)
+
+
+def interpolate_keyframes(keyframes, frames, method=LINEAR) -> Interpolation:
+    """
+    라벨링된 키프레임 사이의 프레임을 한 번에 보간합니다.
+
+    각 프레임은 앞뒤로 가장 가까운 라벨링된 키프레임 사이에서 보간되며, 포인트는
+    두 키프레임 모두에 표시된((0, 0)이 아닌) 경우에만 채워집니다. 첫 키프레임 이전과
+    마지막 키프레임 이후의 프레임은 채우지 않습니다.
+
+    :param keyframes: {키프레임 번호: 17개 [x, y] 목록}
+    :param frames: 보간할 프레임 번호 목록
+    :param method: 'linear' 또는 'spline' (키프레임 기울기를 이용한 3차 Hermite 곡선)
+    """
+    if method not in METHODS:
+        raise ValueError(f"지원하지 않는 보간 방식입니다: {method}")
+    frames = np.unique(np.asarray(frames, dtype=np.int64))
+    points = np.zeros((len(frames), NUM_KEYPOINTS, 2))
+    interpolated = np.zeros((len(frames), NUM_KEYPOINTS), dtype=bool)
+
+    labelled = sorted(keyframes)
+    if len(labelled) < 2 or not len(frames):
+        return Interpolation(frames, points, interpolated)
+    key = np.asarray(labelled, dtype=np.int64)
+    key_points = np.zeros((len(key), NUM_KEYPOINTS, 2))
+    for i, frame in enumerate(labelled):
+        rows = [p[:2] for p in keyframes[frame][:NUM_KEYPOINTS]]
+        if rows:
+            key_points[i, :len(rows)] = rows
+    visible = np.any(key_points != 0, axis=2)
+
+    # 앞쪽 키프레임 인덱스; 키프레임 자체와 범위 밖 프레임은 제외
+    left = np.searchsorted(key, frames, side='right') - 1
+    inside = (left >= 0) & (left < len(key) - 1)
+    inside[inside] &= key[left[inside]] != frames[inside]
+    left = left[inside]
+    right = left + 1
+
+    gap = (key[right] - key[left]).astype(np.float64)
+    t = ((frames[inside] - key[left]) / gap)[:, None, None]
+    p0, p1 = key_points[left], key_points[right]
+    if method == LINEAR:
+        values = p0 + t * (p1 - p0)
+    else:
+        tangents = _tangents(key, key_points, visible)
+        m0, m1 = tangents[left] * gap[:, None, None], tangents[right] * gap[:, None, None]
+        t2, t3 = t * t, t * t * t
+        values = ((2 * t3 - 3 * t2 + 1) * p0 + (t3 - 2 * t2 + t) * m0
+                  + (-2 * t3 + 3 * t2) * p1 + (t3 - t2) * m1)
+
+    mask = visible[left] & visible[right]
+    points[inside] = np.where(mask[..., None], values, 0)
+    interpolated[inside] = mask
+    logger.debug("키프레임 보간: %d개 키프레임, %d개 프레임, %d개 포인트",
+                 len(key), int(inside.sum()), int(mask.sum()))
+    return Interpolation(frames, points, interpolated)
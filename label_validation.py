@@ -0,0 +1,277 @@
+import os
+import json
+import math
+import logging
+import argparse
+from pathlib import Path
+from typing import NamedTuple
+
+import storage
+from dataset_progress import list_sequences, EDITED_DIR
+from annotation_diff import NUM_KEYPOINTS
+from utils import keyframe_number
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# 파일 전체에 대한 문제의 세그먼트 번호
+WHOLE_FILE = -1
+
+
+class Problem(NamedTuple):
+    """
+    JSON 한 개에서 찾은 형식 문제.
+
+    fixable이면 정규화(normalize_label)로 고칠 수 있는 문제이고, 아니면 사람이
+    직접 확인해야 하는 문제입니다.
+    """
+    segment: int      # segmentation 안의 순번 (파일 전체 문제는 WHOLE_FILE)
+    field: str        # 'keyframe', 'keypoints', 'keypoints[3]' 등 (파일 전체 문제는 최상위 키)
+    message: str
+    fixable: bool
+
+    @property
+    def location(self):
+        if self.segment == WHOLE_FILE:
+            return self.field
+        return f"segmentation[{self.segment}].{self.field}"
+
+
+class FileReport(NamedTuple):
+    """JSON 한 개의 검사 결과"""
+    sequence: str
+    name: str
+    path: str         # 검사한 파일 (수정본이 있으면 수정본)
+    problems: list    # Problem 목록
+    written: str      # 정규화해 저장한 경로 (저장하지 않았으면 None)
+
+    @property
+    def ok(self):
+        return not self.problems
+
+    @property
+    def fixable(self):
+        """모든 문제를 정규화로 고칠 수 있는지"""
+        return all(p.fixable for p in self.problems)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _keyframe(value):
+    """
+    키프레임 값 -> (정수, 문제 메시지). 불러올 때(keyframe_number)와 같은 규칙으로 읽고,
+    정수로 바꿀 수 없으면 정수 자리에 None
+    """
+    number = keyframe_number(value)
+    if number is None:
+        return None, f"정수가 아닙니다: {value!r}"
+    if isinstance(value, float):
+        return number, f"실수입니다: {value!r}"
+    if isinstance(value, str):
+        return number, f"문자열입니다: {value!r}"
+    return number, None
+
+
+def check_keypoints(keypoints, segment=0):
+    """
+    키포인트 목록 검사. 불러올 때와 같이 좌표는 int()로 버림한 정수로 정규화하고,
+    부족한 포인트는 (0, 0)(표시 안 함)으로 채웁니다.
+
+    :return: (정규화한 17개 [x, y] (고칠 수 없으면 None), Problem 목록)
+    """
+    if not isinstance(keypoints, list):
+        return None, [Problem(segment, 'keypoints', f"목록이 아닙니다: {type(keypoints).__name__}", False)]
+    problems = []
+    if len(keypoints) > NUM_KEYPOINTS:
+        problems.append(Problem(segment, 'keypoints',
+                                f"포인트가 {len(keypoints)}개입니다 ({NUM_KEYPOINTS}개 초과)", False))
+    elif keypoints and len(keypoints) < NUM_KEYPOINTS:
+        problems.append(Problem(segment, 'keypoints',
+                                f"포인트가 {len(keypoints)}개입니다 ({NUM_KEYPOINTS}개로 채움)", True))
+
+    normalized = []
+    for index, coords in enumerate(keypoints[:NUM_KEYPOINTS]):
+        field = f'keypoints[{index}]'
+        if not isinstance(coords, (list, tuple)) or len(coords) < 2:
+            problems.append(Problem(segment, field, f"[x, y] 형식이 아닙니다: {coords!r}", False))
+            continue
+        xy = coords[:2]
+        if not all(_is_number(c) and math.isfinite(c) for c in xy):
+            problems.append(Problem(segment, field, f"좌표가 숫자가 아닙니다: {coords!r}", False))
+            continue
+        if len(coords) > 2:
+            problems.append(Problem(segment, field, f"값이 {len(coords)}개입니다 (x, y만 사용)", True))
+        if any(isinstance(c, float) for c in xy):
+            problems.append(Problem(segment, field, f"실수 좌표입니다: {list(xy)}", True))
+        normalized.append([int(xy[0]), int(xy[1])])
+
+    if any(not p.fixable for p in problems):
+        return None, problems
+    if normalized:
+        normalized += [[0, 0]] * (NUM_KEYPOINTS - len(normalized))
+    return normalized, problems
+
+
+def normalize_label(data):
+    """
+    라벨 JSON 검사와 정규화.
+
+    segmentation은 세그먼트 목록이어야 하며, 세그먼트마다 정수 keyframe과 비어 있거나
+    17개의 정수 [x, y]로 된 keypoints가 있어야 합니다. 실수 좌표, 정수로 읽을 수 있는
+    keyframe, 부족한 포인트, [x, y, v]의 세 번째 값은 고칠 수 있는 문제로 보고 정규화합니다.
+
+    :return: (정규화한 데이터 (고칠 수 없는 문제가 있으면 None), Problem 목록)
+    """
+    if not isinstance(data, dict):
+        return None, [Problem(WHOLE_FILE, '', "최상위 값이 객체가 아닙니다", False)]
+    segments = data.get('segmentation')
+    if segments is None:
+        return None, [Problem(WHOLE_FILE, 'segmentation', "segmentation이 없습니다", False)]
+    if not isinstance(segments, list):
+        return None, [Problem(WHOLE_FILE, 'segmentation', "segmentation이 목록이 아닙니다", False)]
+
+    problems, normalized = [], []
+    for i, segment in enumerate(segments):
+        if not isinstance(segment, dict):
+            problems.append(Problem(i, '', f"세그먼트가 객체가 아닙니다: {segment!r}", False))
+            continue
+        fixed = dict(segment)
+        if 'keyframe' not in segment:
+            problems.append(Problem(i, 'keyframe', "keyframe이 없습니다", False))
+        else:
+            keyframe, message = _keyframe(segment['keyframe'])
+            if message:
+                problems.append(Problem(i, 'keyframe', message, keyframe is not None))
+            fixed['keyframe'] = keyframe
+        if 'keypoints' in segment:
+            keypoints, point_problems = check_keypoints(segment['keypoints'], i)
+            problems += point_problems
+            fixed['keypoints'] = keypoints
+        normalized.append(fixed)
+
+    if any(not p.fixable for p in problems):
+        return None, problems
+    return {**data, 'segmentation': normalized}, problems
+
+
+def describe_problems(path, data, limit=5):
+    """편집 도구의 오류 메시지용 문제 위치 요약 (처음 limit개)"""
+    _, problems = normalize_label(data)
+    lines = [f"{p.location}: {p.message}" for p in problems[:limit]]
+    if len(problems) > limit:
+        lines.append(f"... 외 {len(problems) - limit}개")
+    if not lines:
+        lines.append("알 수 없는 형식 오류")
+    return f"형식이 잘못된 JSON입니다: {Path(path).name}\n" + "\n".join(lines)
+
+
+def label_files(base_path):
+    """데이터셋 전체의 (시퀀스, 원본 경로, 검사할 경로) 목록. 수정본이 있으면 수정본을 검사"""
+    jobs = []
+    for folder in list_sequences(base_path):
+        edited = {path.name for path in storage.glob(folder / EDITED_DIR, "*.json")}
+        for json_path in storage.glob(folder, "*.json"):
+            load_path = folder / EDITED_DIR / json_path.name if json_path.name in edited else json_path
+            jobs.append((folder.name, str(json_path), str(load_path)))
+    return jobs
+
+
+def check_file(job) -> FileReport:
+    """
+    워커 프로세스: JSON 한 개 검사. fix이면 고칠 수 있는 문제만 있는 파일을 정규화해
+    edited 폴더에 저장합니다 (편집 도구의 저장과 같은 위치와 형식).
+    """
+    sequence, json_path, load_path, fix = job
+    name = Path(json_path).name
+    try:
+        data = json.loads(storage.read_bytes(load_path))
+    except ValueError as e:
+        return FileReport(sequence, name, load_path, [Problem(WHOLE_FILE, '', f"JSON 파싱 실패: {e}", False)], None)
+    normalized, problems = normalize_label(data)
+    written = None
+    if fix and problems and normalized is not None:
+        save_path = Path(json_path).parent / EDITED_DIR / name
+        storage.write_bytes(save_path, json.dumps(normalized, indent=2, ensure_ascii=False).encode('utf-8'))
+        written = str(save_path)
+    return FileReport(sequence, name, load_path, problems, written)
+
+
+def _safe_check(job):
+    try:
+        return check_file(job)
+    except Exception as e:
+        logger.warning(f"검사 실패: {job[2]}: {e}")
+        return FileReport(job[0], Path(job[1]).name, job[2],
+                          [Problem(WHOLE_FILE, '', f"읽기 실패: {e}", False)], None)
+
+
+def validate_dataset(base_path, fix=False, workers=DEFAULT_CHECK_WORKERS):
+    """
+    데이터셋의 모든 라벨 JSON을 프로세스 풀에서 검사합니다.
+
+    :param fix: True이면 고칠 수 있는 문제만 있는 파일을 정규화해 edited 폴더에 저장
+    :param workers: 워커 프로세스 수 (storage.process_pool 참고)
+    :return: FileReport 목록 (파일 순서)
+    """
+    jobs = [(*job, fix) for job in label_files(base_path)]
+    if not jobs:
+        return []
+    executor = storage.process_pool(base_path, workers, len(jobs))
+    if executor is None:
+        return list(map(_safe_check, jobs))
+
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with executor:
+        return list(executor.map(_safe_check, jobs, chunksize=chunksize))
+
+
+def build_report(reports):
+    """문제가 있는 파일만 담은 보고서 딕셔너리"""
+    failed = [r for r in reports if not r.ok]
+    return {
+        'files': len(reports),
+        'failed': len(failed),
+        'fixable': sum(r.fixable for r in failed),
+        'written': sum(r.written is not None for r in failed),
+        'problems': [{
+            'sequence': r.sequence,
+            'name': r.name,
+            'path': r.path,
+            'written': r.written,
+            'problems': [{'location': p.location, 'message': p.message, 'fixable': p.fixable}
+                         for p in r.problems],
+        } for r in failed],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="라벨 JSON 형식 검사와 정규화")
+    parser.add_argument('base_path', help="최상위 데이터 폴더")
+    parser.add_argument('-o', '--output', help="검사 보고서 JSON 경로")
+    parser.add_argument('--fix', action='store_true',
+                        help="고칠 수 있는 파일을 정규화해 edited 폴더에 저장")
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_CHECK_WORKERS)
+    args = parser.parse_args(argv)
+
+    reports = validate_dataset(args.base_path, args.fix, args.workers)
+    for r in reports:
+        for p in r.problems:
+            mark = "" if p.fixable else " (직접 수정 필요)"
+            print(f"{r.sequence}/{r.name}: {p.location}: {p.message}{mark}")
+    report = build_report(reports)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"검사 보고서 저장: {args.output}")
+    print(f"{report['files']}개 파일 검사: 문제 {report['failed']}개 "
+          f"(정규화 가능 {report['fixable']}, 저장 {report['written']})")
+    # 남은 문제가 있으면 0이 아닌 종료 코드 (일괄 처리에서 확인용)
+    return int(report['failed'] > report['written'])
+
+
+if __name__ == '__main__':
+    from logging_setup import setup_logging
+    setup_logging()
+    raise SystemExit(main())
@@ -0,0 +1,161 @@
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# 환경 변수로 로깅 동작 설정
+LOG_LEVEL_ENV = "KEYPOINT_LOG_LEVEL"    # DEBUG, INFO, WARNING ...
+LOG_FORMAT_ENV = "KEYPOINT_LOG_FORMAT"  # text | json
+LOG_FILE_ENV = "KEYPOINT_LOG_FILE"      # 지정 시 파일로도 기록
+LOG_RATE_ENV = "KEYPOINT_LOG_RATE"      # 호출 위치별 초당 허용 메시지 수
+
+DEFAULT_LEVEL = "INFO"
+DEFAULT_FORMAT = "text"
+DEFAULT_RATE = 20.0
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 전달된 구조화 필드로 간주)
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {
+    'message', 'asctime', 'taskName'
+}
+
+_listener = None
+
+
+class LazyQueueHandler(QueueHandler):
+    """레코드를 포맷하지 않고 그대로 큐에 넣는 핸들러
+
+    기본 QueueHandler.prepare는 호출 스레드에서 메시지를 포맷하므로,
+    포맷팅을 리스너 스레드로 미뤄 GUI 스레드의 비용을 줄인다.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """호출 위치(파일, 줄)별 토큰 버킷 방식의 로그 빈도 제한
+
+    WARNING 이상은 제한하지 않으며, 버려진 메시지 수는 다음으로 통과하는
+    레코드의 suppressed 필드로 전달된다.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=None, min_level=logging.WARNING):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.min_level = min_level
+        self._buckets = {}  # (pathname, lineno) -> [tokens, last_time, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= self.min_level or self.rate <= 0:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+            bucket[0] = tokens - 1.0
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+        return True
+
+
+def structured_fields(record):
+    """extra로 전달된 구조화 필드 추출"""
+    return {k: v for k, v in record.__dict__.items() if k not in _RECORD_ATTRS}
+
+
+class StructuredFormatter(logging.Formatter):
+    """텍스트 포맷 뒤에 구조화 필드를 key=value로 덧붙이는 포매터"""
+
+    def format(self, record):
+        text = super().format(record)
+        fields = structured_fields(record)
+        if fields:
+            text += " | " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 하나의 JSON 객체로 기록하는 포매터"""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in structured_fields(record).items():
+            entry[key] = value if isinstance(value, (int, float, str, bool, type(None))) else str(value)
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logging(level=None, fmt=None, log_file=None, rate=None):
+    """
+    루트 로거를 큐 기반 비동기 파이프라인으로 구성합니다.
+
+    호출 스레드에서는 레벨 검사와 빈도 제한만 수행하고, 포맷팅과 출력은
+    QueueListener 스레드에서 처리됩니다. 인자가 없으면 환경 변수 값을 사용합니다.
+
+    :return: 실행 중인 QueueListener
+    """
+    global _listener
+
+    level = (level or os.environ.get(LOG_LEVEL_ENV) or DEFAULT_LEVEL).upper()
+    fmt = (fmt or os.environ.get(LOG_FORMAT_ENV) or DEFAULT_FORMAT).lower()
+    log_file = log_file or os.environ.get(LOG_FILE_ENV)
+    rate = float(rate if rate is not None else os.environ.get(LOG_RATE_ENV, DEFAULT_RATE))
+
+    shutdown_logging()
+
+    formatter = JsonFormatter() if fmt == "json" else StructuredFormatter(TEXT_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = LazyQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(rate))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """리스너를 중지하고 남은 레코드를 모두 출력"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -1,28 +1,89 @@
+import os
 import sys
+import time
+# 시작 시간 측정 기준 (무거운 모듈 임포트 전)
+_STARTED = time.perf_counter()
 from pathlib import Path
 import json
-import cv2
-import numpy as np
 import logging
-import json
 from datetime import datetime
+from typing import NamedTuple
+from concurrent.futures import CancelledError
+
+import numpy as np
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,QProgressDialog,
     QPushButton, QFileDialog, QLabel, QComboBox, QTableWidget,
-    QTableWidgetItem, QHeaderView, QMessageBox
+    QTableWidgetItem, QHeaderView, QMessageBox, QLineEdit, QInputDialog
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QByteArray, pyqtSignal
 from PyQt5.QtGui import QColor
 
-from widgets import KeypointEditorWidget
-from utils import ImageCache, get_json_path, KeypointRenderer
+from widgets import (KeypointEditorWidget, FilmstripWidget, TrajectoryTimeline,
+                     ProgressDashboard, CorrectionsDialog)
+from utils import ImageCache, FrameDiskCache, get_json_path, keyframe_number, KeypointRenderer
+from decoder import DecodeService, LeaseGroup
+import storage
+from geometry import probe_image_size
+from frame_source import VideoFrameSource, VideoFrames, find_video
+from file_index import FileIndex, STATUS_LABELS, STATUS_CODES, UNEDITED, EDITED
+from tracing import tracer, span, TRACE_ENV
+from interpolation import interpolate_keyframes, LINEAR, SPLINE
+from session import Session, load_session, save_session
+from trajectory import TrackArray
+from history import EditHistory
+from scheduler import (TaskScheduler, CancelToken, PRIORITY_FRAME, PRIORITY_SAVE,
+                       PRIORITY_PREFETCH, PRIORITY_SCAN)
+from logging_setup import setup_logging
 
-# 로거 설정
-logging.basicConfig(level=logging.INFO)
+# 로거 설정 (핸들러 구성은 실행 시 setup_logging에서 수행)
 logger = logging.getLogger(__name__)
 
+# 방향키를 누르고 있다가 멈춘 뒤 마지막 프레임을 디코딩하기까지의 대기 시간
+NAV_SETTLE_MS = 150
+# 원격 데이터셋에서 현재 프레임 다음으로 미리 받아 둘 프레임 수
+PREFETCH_FRAMES = 8
+
+
+class LoadedJson(NamedTuple):
+    """입출력 스레드에서 읽은 JSON과 이미지 목록"""
+    keypoints: dict        # {키프레임: 17개 [x, y]} (첫 번째 사람)
+    other_persons: dict    # {키프레임: [17개 목록, ...]} (두 번째 사람부터)
+    images: list
+    video_frames: object   # 원본 영상에서 읽는 경우 VideoFrames, 아니면 None
+    image_size: tuple      # 첫 이미지의 (너비, 높이) (알 수 없으면 None)
+
+
+def parse_segments(data):
+    """
+    segmentation 목록 -> (첫 번째 사람 키포인트, 두 번째 사람부터). 같은 키프레임의 세그먼트는 한 사람씩.
+    키프레임 번호는 정수로 변환하며 ("3", 3.0), 정수로 읽을 수 없는 세그먼트는 경고 후 건너뜁니다.
+    """
+    keypoints_data, other_persons = {}, {}
+    for i, segment in enumerate(data.get('segmentation', [])):
+        keypoints = segment.get('keypoints', [])
+        if not keypoints:
+            continue
+        frame_num = keyframe_number(segment.get('keyframe'))
+        if frame_num is None:
+            logger.warning("키프레임 번호가 잘못된 세그먼트 건너뜀: segmentation[%d].keyframe=%r",
+                           i, segment.get('keyframe'))
+            continue
+        processed_keypoints = [[int(x), int(y)] for x, y in keypoints]
+        if frame_num not in keypoints_data:
+            keypoints_data[frame_num] = processed_keypoints
+        else:
+            other_persons.setdefault(frame_num, []).append(processed_keypoints)
+    return keypoints_data, other_persons
+
+
 class KeypointLabeler(QMainWindow):
+    # 백그라운드 디코딩 완료 (이미지 경로, Future) - 워커 스레드에서 GUI 스레드로 전달
+    frame_decoded = pyqtSignal(object, object)
+    # 키포인트 추적 완료 (요청 세대, Future) - 추적 스레드에서 GUI 스레드로 전달
+    keypoints_propagated = pyqtSignal(int, object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle('키포인트 라벨링 도구')
@@ -30,12 +91,73 @@ class KeypointLabeler(QMainWindow):
         
         # 상태 변수 초기화
         self.base_path = None
+        self.dataset_source = None  # set_dataset에 넘긴 경로/URL (세션에 저장)
+        # 파일 입출력은 모두 스케줄러의 작업 스레드에서 수행 (GUI 스레드는 디스크를 기다리지 않음)
+        self.tasks = TaskScheduler(parent=self)
+        # 새 요청이 오면 이전 요청을 취소하는 종류별 토큰
+        self._dataset_token = None
+        self._folder_token = None
+        self._load_token = None
+        self._prefetch_token = None
+        self._preview_token = None
+        # {JSON 경로: 저장 Future}와 저장이 끝나면 이어서 읽을 요청 (GUI 스레드에서만 사용)
+        self._pending_saves = {}
+        self._deferred_load = None
         self.current_json = None
         self.current_images = []  # 현재 JSON에 속한 이미지들
         self.current_image_idx = -1
+        # 원본 이미지 크기 {이미지 경로: (너비, 높이)}와 JSON 첫 이미지의 크기.
+        # 헤더 확인과 디코딩은 작업 스레드에서 하고 GUI 스레드는 결과만 조회
+        self.image_sizes = {}
+        self.clip_image_size = None
         self.modified = False
+        # 디코딩은 워커 프로세스에서 수행, 캐시에서 빠진 프레임의 슬랩은 재사용
         self.image_cache = ImageCache()
-        self.keypoints_data = {}  # 키프레임별 키포인트 데이터 저장
+        self.decode_service = DecodeService(cached_frames=self.image_cache.max_size)
+        # 워커 프로세스는 창을 먼저 띄운 뒤 시작 (첫 디코딩 요청 시에도 시작됨)
+        QTimer.singleShot(0, self.decode_service.start)
+        self.image_cache.on_evict = self.decode_service.release
+        # 세션 간 유지되는 디스플레이 해상도 프레임 캐시
+        self.frame_cache = FrameDiskCache()
+        # 추출 이미지 대신 원본 영상에서 읽는 경우의 프레임 소스
+        self.video_frames = None
+        self.displayed_image_path = None
+        # 진행 중인 디코딩 {이미지 경로: Future} (이동과 추적이 같은 프레임을 요청하면 공유)
+        self._decoding = {}
+        self.frame_decoded.connect(self._on_frame_decoded)
+
+        # ←/→ 이동 요청 병합 상태 (대기 중인 목표 프레임과 그 디코딩 요청)
+        self.pending_nav_path = None
+        self.nav_future = None
+        self.nav_timer = QTimer(self)
+        self.nav_timer.setSingleShot(True)
+        self.nav_timer.setInterval(NAV_SETTLE_MS)
+        self.nav_timer.timeout.connect(self.flush_navigation)
+        self.keypoints_data = {}  # 키프레임별 키포인트 데이터 저장 (첫 번째 사람)
+        # 같은 키프레임의 두 번째 사람부터 {키프레임: [17개 목록, ...]} (보간/추적 대상 아님)
+        self.other_persons = {}
+        # 라벨링된 키프레임 사이 프레임의 보간 제안 (키프레임이 바뀌면 다시 계산)
+        self.interpolation = None
+        # 광학 흐름 추적 제안 {키프레임: Proposal}. 세대가 바뀌면 진행 중인 결과는 버림
+        # (추적기는 처음 추적할 때 생성)
+        self._tracker = None
+        self.flow_proposals = {}
+        self.propagation_generation = 0
+        # 진행 중인 추적의 프레임 사용 표시 {세대: LeaseGroup} (추적이 끝나면 해제)
+        self._tracking_leases = {}
+        self.edited_frames = set()  # 현재 JSON에서 편집한 키프레임 (떠날 때 추적 시작)
+        # 현재 JSON의 되돌리기 기록과, 표시 중인 프레임의 사람별 좌표 사본 (변경 전 좌표 확인용)
+        self.history = EditHistory()
+        self._shown_points = (None, [])
+        self.keypoints_propagated.connect(self._on_keypoints_propagated)
+
+        # 파일 목록 검색 인덱스와 표 행(정렬 반영) -> 인덱스 번호 대응
+        self.file_index = FileIndex()
+        self.file_list_folder = None
+        self.edited_names = set()  # 파일 목록 폴더의 edited 파일 이름 (스캔과 저장 결과로 유지)
+        self._file_rows = np.zeros(0, dtype=np.int64)
+        self._row_visible = np.zeros(0, dtype=bool)
+        self._file_rows_dirty = False
                 
         # UI 초기화
         self.init_ui()
@@ -68,9 +190,25 @@ class KeypointLabeler(QMainWindow):
         select_btn = QPushButton("폴더 선택")
         select_btn.clicked.connect(self.select_folder)
         folder_layout.addWidget(select_btn)
+
+        archive_btn = QPushButton("아카이브 열기")
+        archive_btn.clicked.connect(self.select_archive)
+        folder_layout.addWidget(archive_btn)
+
+        url_btn = QPushButton("URL 열기")
+        url_btn.clicked.connect(self.select_url)
+        folder_layout.addWidget(url_btn)
         
         self.path_label = QLabel()
         folder_layout.addWidget(self.path_label)
+
+        progress_btn = QPushButton("진행 현황")
+        progress_btn.clicked.connect(self.show_dashboard)
+        folder_layout.addWidget(progress_btn)
+
+        diff_btn = QPushButton("수정 비교")
+        diff_btn.clicked.connect(self.show_corrections)
+        folder_layout.addWidget(diff_btn)
         layout.addLayout(folder_layout)
         
         # 하위 폴더 선택
@@ -81,6 +219,25 @@ class KeypointLabeler(QMainWindow):
         folder_combo_layout.addWidget(self.folder_combo)
         layout.addLayout(folder_combo_layout)
         
+        # 파일 목록 필터 (파일명 검색 + 상태)
+        filter_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("파일명 검색 (*, ? 패턴 가능)")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.apply_file_filter)
+        filter_layout.addWidget(self.search_edit)
+
+        self.status_filter = QComboBox()
+        self.status_filter.addItem("전체 상태", None)
+        for code, label in STATUS_LABELS.items():
+            self.status_filter.addItem(label, (code,))
+        self.status_filter.currentIndexChanged.connect(self.apply_file_filter)
+        filter_layout.addWidget(self.status_filter)
+
+        self.filter_count_label = QLabel()
+        filter_layout.addWidget(self.filter_count_label)
+        layout.addLayout(filter_layout)
+
         # 파일 목록
         self.file_list = QTableWidget()
         self.file_list.setColumnCount(3)
@@ -89,8 +246,37 @@ class KeypointLabeler(QMainWindow):
         header.setSectionResizeMode(0, QHeaderView.Stretch)
         header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        # 정렬이 바뀌면 행 순서 대응을 다시 구성
+        header.sortIndicatorChanged.connect(self._invalidate_file_rows)
         layout.addWidget(self.file_list)
         
+        # 키프레임 보간 (라벨링된 키프레임 사이 프레임에 제안 포인트 표시)
+        interp_layout = QHBoxLayout()
+        interp_layout.addWidget(QLabel("보간:"))
+        self.interp_combo = QComboBox()
+        self.interp_combo.addItem("끔", None)
+        self.interp_combo.addItem("선형", LINEAR)
+        self.interp_combo.addItem("스플라인", SPLINE)
+        self.interp_combo.setCurrentIndex(1)
+        self.interp_combo.currentIndexChanged.connect(self.on_interpolation_changed)
+        interp_layout.addWidget(self.interp_combo)
+        accept_btn = QPushButton("제안 확정 (A)")
+        accept_btn.clicked.connect(self.accept_proposals)
+        interp_layout.addWidget(accept_btn)
+        track_btn = QPushButton("다음 프레임 추적 (T)")
+        track_btn.clicked.connect(lambda: self.propagate_from(self.current_image_idx))
+        interp_layout.addWidget(track_btn)
+        layout.addLayout(interp_layout)
+
+        # 여러 사람 라벨링 (클릭한 점의 사람이 편집 대상이 됨)
+        person_layout = QHBoxLayout()
+        self.person_label = QLabel()
+        person_layout.addWidget(self.person_label)
+        add_person_btn = QPushButton("사람 추가 (N)")
+        add_person_btn.clicked.connect(self.add_person)
+        person_layout.addWidget(add_person_btn)
+        layout.addLayout(person_layout)
+
         # 저장 버튼
         self.save_btn = QPushButton("저장")
         self.save_btn.clicked.connect(self.save_current)
@@ -104,7 +290,22 @@ class KeypointLabeler(QMainWindow):
         # 키포인트 에디터 위젯
         self.editor_widget = KeypointEditorWidget()
         self.editor_widget.keypoint_updated.connect(self.on_keypoint_update)
+        self.editor_widget.person_selected.connect(self.update_person_label)
+        self.editor_widget.edit_finished.connect(self.history.commit)
+        # 캐시에서 빠진 프레임이라도 표시 중이면 슬랩을 재사용하지 않음
+        self.editor_widget.retain_image = self.decode_service.retain
+        self.editor_widget.release_image = self.decode_service.release
         layout.addWidget(self.editor_widget)
+
+        # 현재 JSON의 프레임 썸네일 목록
+        self.filmstrip = FilmstripWidget()
+        self.filmstrip.frame_selected.connect(self.jump_to_image)
+        layout.addWidget(self.filmstrip)
+
+        # 키포인트 궤적 타임라인 (튐 표시를 클릭하면 해당 프레임으로 이동)
+        self.timeline = TrajectoryTimeline()
+        self.timeline.frame_selected.connect(self.jump_to_image)
+        layout.addWidget(self.timeline)
         
         return layout
 
@@ -115,42 +316,279 @@ class KeypointLabeler(QMainWindow):
     def keyPressEvent(self, event):
         """키보드 단축키 처리"""
         if event.key() == Qt.Key_Left:  # 이전 이미지
-            self.move_prev_image()
+            self.step_image(-1, event.isAutoRepeat())
         elif event.key() == Qt.Key_Right:  # 다음 이미지
-            self.move_next_image()
+            self.step_image(1, event.isAutoRepeat())
         elif event.key() == Qt.Key_Up:  # 이전 JSON
             self.move_prev_json()
         elif event.key() == Qt.Key_Down:  # 다음 JSON
             self.move_next_json()
         elif event.key() == Qt.Key_S and event.modifiers() & Qt.ControlModifier:  # 저장
             self.save_current()
+        elif event.key() == Qt.Key_Z and event.modifiers() & Qt.ControlModifier:  # 되돌리기 / 다시 실행
+            if event.modifiers() & Qt.ShiftModifier:
+                self.redo()
+            else:
+                self.undo()
+        elif event.key() == Qt.Key_Y and event.modifiers() & Qt.ControlModifier:  # 다시 실행
+            self.redo()
+        elif event.key() == Qt.Key_F and event.modifiers() & Qt.ControlModifier:  # 파일 검색
+            self.search_edit.setFocus()
+            self.search_edit.selectAll()
+        elif event.key() == Qt.Key_A and not event.modifiers():  # 제안 포인트 확정
+            self.accept_proposals()
+        elif event.key() == Qt.Key_N and not event.modifiers():  # 사람 추가
+            self.add_person()
+        elif event.key() == Qt.Key_T and not event.modifiers():  # 다음 프레임으로 추적
+            self.propagate_from(self.current_image_idx)
+        elif event.key() == Qt.Key_F12 and event.modifiers() & Qt.ShiftModifier:  # 추적 내보내기
+            self.export_trace()
+        elif event.key() == Qt.Key_F12:  # 계측 오버레이
+            self.editor_widget.toggle_trace_hud()
+
+    def keyReleaseEvent(self, event):
+        """방향키를 떼면 도착한 프레임을 디코딩"""
+        if event.key() in (Qt.Key_Left, Qt.Key_Right) and not event.isAutoRepeat():
+            self.flush_navigation()
+        super().keyReleaseEvent(event)
+
+    def export_trace(self):
+        """기록된 계측 스팬을 Chrome trace JSON으로 저장"""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "추적 결과 저장", "keypoint_trace.json", "JSON (*.json)"
+        )
+        if path:
+            try:
+                tracer.export_chrome_trace(path)
+            except Exception as e:
+                logger.error(f"추적 결과 저장 실패: {e}")
+                QMessageBox.critical(self, "오류", f"추적 결과 저장 실패: {e}")
             
     def select_folder(self):
         """상위 폴더 선택"""
         folder = QFileDialog.getExistingDirectory(self, "폴더 선택")
         if folder:
-            self.base_path = Path(folder)
-            self.path_label.setText(folder)
-            
-            # 하위 폴더 목록 업데이트
-            if (self.base_path / "1.추출 이미지 데이터").exists():
-                folders = [d.name for d in (self.base_path / "1.추출 이미지 데이터").iterdir() 
-                        if d.is_dir()]
-                self.folder_combo.clear()
-                self.folder_combo.addItems(sorted(folders))
+            self.set_dataset(folder)
+
+    def select_archive(self):
+        """압축 해제 없이 zip/tar 아카이브를 데이터셋으로 열기"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "아카이브 열기", "", "데이터셋 아카이브 (*.zip *.tar)"
+        )
+        if path:
+            self.set_dataset(path)
+
+    def select_url(self):
+        """HTTP 서버에 있는 데이터셋을 URL로 열기"""
+        url, ok = QInputDialog.getText(self, "URL 열기", "데이터셋 URL (http://...):")
+        if ok and url.strip():
+            self.set_dataset(url.strip())
+
+    def set_dataset(self, path):
+        """
+        데이터셋 루트(폴더, 아카이브 또는 URL) 설정 및 하위 폴더 목록 갱신.
+        열기와 하위 폴더 스캔은 작업 스레드에서 수행합니다 (완료 시 _on_dataset_opened).
+        """
+        if self._dataset_token is not None:
+            self._dataset_token.cancel()
+        self._dataset_token = CancelToken()
+        return self.tasks.submit(self._open_dataset, path, priority=PRIORITY_SCAN,
+                                 token=self._dataset_token,
+                                 on_done=lambda f: self._on_dataset_opened(path, f))
+
+    def _open_dataset(self, path):
+        """데이터셋을 열고 시퀀스 목록 스캔 (작업 스레드에서 실행)"""
+        with span('dataset.open'):
+            root = storage.open_dataset(path)
+            return root, self._list_sequences(root)
+
+    def _on_dataset_opened(self, path, future):
+        try:
+            root, sequences = future.result()
+        except Exception as e:
+            logger.error(f"데이터셋 열기 실패: {e}")
+            QMessageBox.critical(self, "오류", f"데이터셋 열기 실패: {e}")
+            return
+        if self.base_path is not None and self.base_path != root:
+            storage.unmount(self.base_path)
+        self._apply_dataset(root, path, sequences)
+
+    @staticmethod
+    def _list_sequences(root):
+        """데이터셋의 시퀀스(하위 폴더) 목록 (이미지 폴더가 없으면 None)"""
+        image_root = root / "1.추출 이미지 데이터"
+        if storage.is_dir(image_root):
+            return storage.subdirs(image_root)
+        return None
+
+    def _apply_dataset(self, root, source, sequences):
+        """열린 데이터셋 루트와 하위 폴더 목록을 화면에 반영"""
+        self.base_path = root
+        self.dataset_source = str(source)
+        self.path_label.setText(str(source))
+        if sequences is not None:
+            self.folder_combo.clear()
+            self.folder_combo.addItems(sequences)
                 
-    def load_folder_files(self):
-        """하위 폴더 내 JSON 파일 목록 로드"""
+    def show_dashboard(self):
+        """전체 시퀀스의 진행 현황 창 표시"""
+        if not self.base_path:
+            QMessageBox.information(self, "알림", "먼저 폴더를 선택하세요.")
+            return
+        dashboard = ProgressDashboard(self.base_path, self)
+        dashboard.setAttribute(Qt.WA_DeleteOnClose)
+        dashboard.sequence_activated.connect(self.open_sequence)
+        dashboard.show()
+        return dashboard
+
+    def show_corrections(self):
+        """원본 대비 수정 폭이 큰 프레임 목록 창 표시"""
+        if not self.base_path:
+            QMessageBox.information(self, "알림", "먼저 폴더를 선택하세요.")
+            return
+        dialog = CorrectionsDialog(self.base_path, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.frame_activated.connect(self.open_frame)
+        dialog.show()
+        return dialog
+
+    def open_frame(self, sequence: str, name: str, keyframe: int):
+        """시퀀스의 JSON을 열고 해당 키프레임 이미지로 이동"""
+        self.open_sequence(sequence)
+        json_file = self.base_path / "2.라벨링데이터" / sequence / name
+        if self.current_json != json_file:
+            # 읽기가 끝나면 키프레임 위치에서 바로 표시
+            self.load_json(json_file, keyframe=keyframe)
+            return
+        index = self._keyframe_index(keyframe)
+        if index >= 0:
+            self.jump_to_image(index)
+
+    def _keyframe_index(self, keyframe):
+        """현재 JSON에서 키프레임 번호의 이미지 순번 (없으면 -1)"""
+        for index, image_path in enumerate(self.current_images):
+            if int(image_path.stem.split('_')[-1]) == keyframe:
+                return index
+        return -1
+
+    def open_sequence(self, name: str):
+        """시퀀스 폴더 선택 (목록에 없으면 무시)"""
+        index = self.folder_combo.findText(name)
+        if index >= 0:
+            self.folder_combo.setCurrentIndex(index)
+
+    def restore_session(self, session=None):
+        """
+        마지막 세션 복원. 창 배치는 바로 적용하고, 데이터셋 열기와 폴더 스캔은
+        작업 스레드에서 수행한 뒤 _on_session_scanned에서 목록과 프레임을 엽니다.
+
+        :return: 스캔 Future (복원할 세션이 없으면 None)
+        """
+        session = session or load_session()
+        if session is None:
+            return None
+        if session.geometry:
+            self.restoreGeometry(QByteArray.fromBase64(session.geometry.encode('ascii')))
+        if session.window_state:
+            self.restoreState(QByteArray.fromBase64(session.window_state.encode('ascii')))
+        self.path_label.setText(f"{session.dataset} (여는 중...)")
+        return self.tasks.submit(self._scan_session, session, priority=PRIORITY_SCAN,
+                                 on_done=lambda f: self._on_session_scanned(session, f))
+
+    def _scan_session(self, session):
+        """세션의 데이터셋을 열고 시퀀스 목록과 JSON 목록 스캔 (작업 스레드에서 실행)"""
+        with span('session.scan'):
+            root = storage.open_dataset(session.dataset)
+            sequences = self._list_sequences(root)
+            files = None
+            if sequences and session.sequence in sequences:
+                files = self._scan_json_folder(root / "2.라벨링데이터" / session.sequence)
+        return root, sequences, files
+
+    def _on_session_scanned(self, session, future):
+        """스캔 결과로 데이터셋, 파일 목록, JSON과 프레임 위치 복원"""
         try:
-            if not self.base_path or not self.folder_combo.currentText():
+            root, sequences, files = future.result()
+        except Exception as e:
+            logger.warning(f"세션 복원 실패: {session.dataset}: {e}")
+            if self.base_path is None:
+                self.path_label.clear()
+            return
+        if self.base_path is not None:
+            # 스캔하는 동안 다른 데이터셋을 연 경우 복원하지 않음
+            if self.base_path != root:
+                storage.unmount(root)
+            return
+
+        with span('session.restore'):
+            self.folder_combo.blockSignals(True)
+            self._apply_dataset(root, session.dataset, sequences)
+            if files is not None:
+                self.folder_combo.setCurrentIndex(self.folder_combo.findText(session.sequence))
+            self.folder_combo.blockSignals(False)
+            if files is None:
+                self.load_folder_files()
                 return
-                
-            folder_name = self.folder_combo.currentText()
-            json_folder = self.base_path / "2.라벨링데이터" / folder_name
-            edited_folder = json_folder / "edited"
-            
-            # 파일 목록 가져오기
-            json_files = sorted(list(json_folder.glob("*.json")))
+
+            json_folder = root / "2.라벨링데이터" / session.sequence
+            self._populate_file_list(json_folder, *files)
+            if session.json_name and any(f.name == session.json_name for f in files[0]):
+                self.load_json(json_folder / session.json_name, frame=session.frame)
+        logger.info(f"세션 복원: {session.dataset} {session.sequence}/{session.json_name} #{session.frame}")
+
+    def current_session(self):
+        """현재 작업 위치 (데이터셋을 열지 않았으면 None)"""
+        if self.dataset_source is None:
+            return None
+        sequence = self.folder_combo.currentText()
+        json_name = ''
+        if self.current_json is not None:
+            sequence, json_name = self.current_json.parent.name, self.current_json.name
+        return Session(
+            self.dataset_source, sequence, json_name, max(self.current_image_idx, 0),
+            bytes(self.saveGeometry().toBase64()).decode('ascii'),
+            bytes(self.saveState().toBase64()).decode('ascii'),
+        )
+
+    def load_folder_files(self):
+        """하위 폴더 내 JSON 파일 목록을 작업 스레드에서 스캔한 뒤 표시 (_on_folder_scanned)"""
+        if not self.base_path or not self.folder_combo.currentText():
+            return None
+        json_folder = self.base_path / "2.라벨링데이터" / self.folder_combo.currentText()
+
+        # 다른 폴더를 고르면 진행 중인 스캔 결과는 버림
+        if self._folder_token is not None:
+            self._folder_token.cancel()
+        self._folder_token = CancelToken()
+        return self.tasks.submit(self._scan_json_folder, json_folder, priority=PRIORITY_SCAN,
+                                 token=self._folder_token,
+                                 on_done=lambda f: self._on_folder_scanned(json_folder, f))
+
+    def _on_folder_scanned(self, json_folder, future):
+        try:
+            json_files, edited_names = future.result()
+        except Exception as e:
+            logger.error(f"파일 목록 로드 실패: {e}")
+            QMessageBox.critical(self, "오류", f"파일 목록 로드 실패: {e}")
+            return
+        self._populate_file_list(json_folder, json_files, edited_names)
+
+    @staticmethod
+    def _scan_json_folder(json_folder):
+        """(JSON 파일 목록, edited 폴더의 파일 이름 집합) (작업 스레드에서 실행)"""
+        with span('file_list.scan'):
+            json_files = storage.glob(json_folder, "*.json")
+            edited_names = {p.name for p in storage.glob(json_folder / "edited", "*.json")}
+        return json_files, edited_names
+
+    def _populate_file_list(self, json_folder, json_files, edited_names):
+        """스캔한 JSON 목록으로 파일 표와 검색 인덱스 구성"""
+        try:
+            # 검색 인덱스 구성
+            statuses = [EDITED if f.name in edited_names else UNEDITED for f in json_files]
+            self.file_index = FileIndex([f.name for f in json_files], statuses)
+            self.file_list_folder = json_folder
+            self.edited_names = set(edited_names)
             
             # 프로그레스 다이얼로그 설정
             progress = QProgressDialog("파일 목록 로딩 중...", None, 0, len(json_files), self)
@@ -163,158 +601,700 @@ class KeypointLabeler(QMainWindow):
             self.file_list.setSortingEnabled(False)
             self.file_list.setRowCount(0)
             
-            # 전체 파일 로드
-            for i, json_file in enumerate(json_files):
-                row = self.file_list.rowCount()
-                self.file_list.insertRow(row)
-                
-                # 파일명
-                name_item = QTableWidgetItem(json_file.name)
-                self.file_list.setItem(row, 0, name_item)
-                
-                # 상태
-                status = "수정됨" if (edited_folder / json_file.name).exists() else "수정 사항 없음"
-                status_item = QTableWidgetItem(status)
-                self.file_list.setItem(row, 1, status_item)
-                
-                # 로드 버튼
-                load_btn = QPushButton("로드")
-                load_btn.clicked.connect(lambda checked, f=json_file: self.load_json(f))
-                self.file_list.setCellWidget(row, 2, load_btn)
-                
-                # 프로그레스 업데이트
-                progress.setValue(i + 1)
-                
-                # 50개 파일마다 이벤트 처리 (UI 반응성 유지)
-                if i % 50 == 0:
-                    QApplication.processEvents()
-            
+            # 전체 파일 로드 (50개 단위로 계측하고, 계측 구간 밖에서 이벤트 처리)
+            for start in range(0, len(json_files), 50):
+                chunk = json_files[start:start + 50]
+                with span('file_list.populate', rows=len(chunk)):
+                    for position, json_file in enumerate(chunk, start):
+                        row = self.file_list.rowCount()
+                        self.file_list.insertRow(row)
+
+                        # 파일명 (검색 인덱스 번호를 함께 보관)
+                        name_item = QTableWidgetItem(json_file.name)
+                        name_item.setData(Qt.UserRole, position)
+                        self.file_list.setItem(row, 0, name_item)
+
+                        # 상태
+                        status = STATUS_LABELS[statuses[position]]
+                        status_item = QTableWidgetItem(status)
+                        self.file_list.setItem(row, 1, status_item)
+
+                        # 로드 버튼
+                        load_btn = QPushButton("로드")
+                        load_btn.clicked.connect(lambda checked, f=json_file: self.load_json(f))
+                        self.file_list.setCellWidget(row, 2, load_btn)
+
+                # 프로그레스 업데이트 및 이벤트 처리 (UI 반응성 유지)
+                progress.setValue(start + len(chunk))
+                QApplication.processEvents()
+
             # UI 업데이트 재개
             self.file_list.setUpdatesEnabled(True)
             self.file_list.setSortingEnabled(True)
             progress.close()
+
+            # 새 목록에 현재 검색 조건 적용
+            self._file_rows_dirty = True
+            self.apply_file_filter()
                 
         except Exception as e:
             logger.error(f"파일 목록 로드 실패: {e}")
             QMessageBox.critical(self, "오류", f"파일 목록 로드 실패: {e}")
 
-    def load_json(self, json_file: Path):
-        try:
-            if self.modified:
-                self.save_check()
+    def _invalidate_file_rows(self, *args):
+        self._file_rows_dirty = True
 
-            # edited 폴더의 파일 경로 확인
-            edited_folder = json_file.parent / "edited"
-            edited_json = edited_folder / json_file.name
+    def _sync_file_rows(self):
+        """표 행 순서(정렬 반영) -> 인덱스 번호 대응과 표시 상태를 다시 구성"""
+        count = self.file_list.rowCount()
+        rows = np.full(count, -1, dtype=np.int64)
+        visible = np.ones(count, dtype=bool)
+        for row in range(count):
+            item = self.file_list.item(row, 0)
+            position = item.data(Qt.UserRole) if item is not None else None
+            if position is not None:
+                rows[row] = position
+            visible[row] = not self.file_list.isRowHidden(row)
+        self._file_rows = rows
+        self._row_visible = visible
+        self._file_rows_dirty = False
 
-            # 파일 존재 여부 및 선택된 경로 로깅
-            logger.info(f"원본 파일 경로: {json_file}")
-            logger.info(f"수정본 파일 경로: {edited_json}")
-            logger.info(f"수정본 존재 여부: {edited_json.exists()}")
+    def apply_file_filter(self):
+        """검색어/상태 필터를 파일 목록에 적용 (표시 여부가 바뀐 행만 갱신)"""
+        if self._file_rows_dirty or len(self._file_rows) != self.file_list.rowCount():
+            self._sync_file_rows()
+        rows = self._file_rows
 
-            # 로드할 파일 경로 결정 (edited 파일 우선)
-            load_path = edited_json if edited_json.exists() else json_file
-            logger.info(f"최종 선택된 로드 경로: {load_path}")
+        with span('file_list.filter', rows=len(rows)):
+            mask = self.file_index.search(self.search_edit.text(), self.status_filter.currentData())
+            # 작업 중인 파일은 조건과 관계없이 표시
+            if self.current_json is not None and self.current_json.parent == self.file_list_folder:
+                position = self.file_index.position(self.current_json.name)
+                if position >= 0:
+                    mask[position] = True
 
-            with open(load_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            indexed = rows >= 0
+            visible = np.ones(len(rows), dtype=bool)
+            visible[indexed] = mask[rows[indexed]]
+            changed = np.flatnonzero(visible != self._row_visible)
+            self.file_list.setUpdatesEnabled(False)
+            for row in changed.tolist():
+                self.file_list.setRowHidden(row, not visible[row])
+            self.file_list.setUpdatesEnabled(True)
+            self._row_visible = visible
 
-            # 로드된 데이터 확인 로깅
-            logger.info(f"로드된 데이터: {data}")
+        self.filter_count_label.setText(f"{int(visible.sum())} / {len(rows)}")
 
-            self.keypoints_data.clear()  # 기존 데이터 초기화
+    def load_json(self, json_file: Path, frame: int = 0, keyframe=None):
+        """
+        JSON과 이미지 목록을 작업 스레드에서 읽은 뒤 화면에 반영합니다 (_on_json_loaded).
+        다른 JSON을 요청하면 읽는 중인 이전 요청은 취소됩니다. 같은 파일을 저장하는
+        중이면 저장이 끝난 뒤(_on_saved) 읽기를 요청하며, 이때는 None을 반환합니다.
 
-            # segmentation 데이터 처리
-            if 'segmentation' in data:
-                # 첫 번째 세그먼트만 사용
-                segment = data['segmentation'][0]  # 항상 첫 번째 세그먼트 사용
-                frame_num = segment.get('keyframe')
-                keypoints = segment.get('keypoints', [])
-                if keypoints:
-                    processed_keypoints = [[int(x), int(y)] for x, y in keypoints]
-                    self.keypoints_data[frame_num] = processed_keypoints
-                    logger.info(f"프레임 {frame_num}의 키포인트 데이터 로드됨: {processed_keypoints}")
-
-            # 관련 이미지 파일 찾기
-            image_folder = self.base_path / "1.추출 이미지 데이터" / json_file.parent.name
-            prefix = json_file.stem
-            self.current_images = sorted(image_folder.glob(f"{prefix}_*.jpg"))
+        :param frame: 처음 표시할 이미지 순번 (음수이면 끝에서부터)
+        :param keyframe: 처음 표시할 키프레임 번호 (목록에 있으면 frame보다 우선)
+        """
+        if self.modified:
+            self.save_check()
+        if self._load_token is not None:
+            self._load_token.cancel()
+        self._load_token = token = CancelToken()
+        self._deferred_load = None
+        saving = self._pending_saves.get(json_file)
+        if saving is not None and not saving.done():
+            # 작업 스레드에서 저장을 기다리지 않음 (저장 완료 알림에서 이어서 요청)
+            self._deferred_load = (json_file, frame, keyframe, token)
+            return None
+        return self._submit_load(json_file, frame, keyframe, token)
 
-            if not self.current_images:
+    def _submit_load(self, json_file: Path, frame, keyframe, token):
+        return self.tasks.submit(self._read_json, json_file, self.base_path, token,
+                                 priority=PRIORITY_FRAME, token=token,
+                                 on_done=lambda f: self._on_json_loaded(json_file, frame, keyframe, f))
+
+    def _read_json(self, json_file: Path, base_path, token):
+        """JSON 파싱과 이미지 목록 확인 (작업 스레드에서 실행)"""
+        # edited 폴더의 파일 경로 확인
+        edited_folder = json_file.parent / "edited"
+        edited_json = edited_folder / json_file.name
+
+        # 로드할 파일 경로 결정 (edited 파일 우선)
+        edited_exists = storage.exists(edited_json)
+        load_path = edited_json if edited_exists else json_file
+        logger.info("JSON 로드: %s", load_path.name,
+                    extra={'json': str(json_file), 'edited': edited_exists})
+
+        with span('json.parse'):
+            data = json.loads(storage.read_bytes(load_path))
+        logger.debug("로드된 세그먼트 수: %d", len(data.get('segmentation', [])))
+        try:
+            keypoints_data, other_persons = parse_segments(data)
+        except (TypeError, ValueError, AttributeError):
+            # 형식이 잘못된 파일은 문제 위치를 알려 줌 (label_validation.py --fix로 일괄 정규화)
+            from label_validation import describe_problems
+            raise ValueError(describe_problems(load_path, data)) from None
+
+        # 관련 이미지 파일 찾기
+        image_folder = base_path / "1.추출 이미지 데이터" / json_file.parent.name
+        prefix = json_file.stem
+        images = storage.glob(image_folder, f"{prefix}_*.jpg")
+        video_frames = None
+        if not images:
+            if token.cancelled:
+                raise CancelledError()  # 영상 색인은 만들지 않음
+            # 추출 이미지가 없으면 같은 이름의 원본 영상에서 직접 읽음
+            video_path = find_video(image_folder, prefix)
+            if video_path is None:
                 raise FileNotFoundError(f"이미지 파일이 없습니다: {image_folder}")
+            video_frames = VideoFrames(VideoFrameSource(video_path), image_folder, prefix)
+            images = video_frames.paths
+            if not images:
+                video_frames.close()
+                raise FileNotFoundError(f"영상에서 프레임을 읽을 수 없습니다: {video_path}")
+        return LoadedJson(keypoints_data, other_persons, images, video_frames,
+                          probe_image_size(images[0]))
 
+    def _on_json_loaded(self, json_file: Path, frame: int, keyframe, future):
+        """읽은 JSON으로 상태를 교체하고 첫 프레임 표시"""
+        try:
+            loaded = future.result()
+        except Exception as e:
+            logger.error(f"JSON 로드 실패: {str(e)}")
+            QMessageBox.critical(self, "오류", f"JSON 로드 실패: {str(e)}")
+            return
+
+        try:
+            # 읽는 동안 이전 JSON을 수정했으면 교체 전에 저장 확인
+            if self.modified:
+                self.save_check()
+
+            self.keypoints_data.clear()  # 기존 데이터 초기화
+            self.keypoints_data.update(loaded.keypoints)
+            self.other_persons.clear()
+            self.other_persons.update(loaded.other_persons)
+
+            self.close_video()
+            self.video_frames = loaded.video_frames
+            self.current_images = images = loaded.images
+            self.image_sizes.clear()
+            self.clip_image_size = loaded.image_size
             self.current_json = json_file
-            self.current_image_idx = 0
+            self.current_image_idx = frame % len(images) if frame < 0 else min(frame, len(images) - 1)
+            if keyframe is not None and self._keyframe_index(keyframe) >= 0:
+                self.current_image_idx = self._keyframe_index(keyframe)
             self.modified = False
+            self.interpolation = None
+            self.reset_propagation()
+            if self._tracker is not None:
+                self._tracker.clear()
+            self.edited_frames.clear()
+            self.history.clear()
 
-            self.load_image(self.current_images[0])
+            # 영상 프레임은 썸네일을 만들려면 전체를 디코딩해야 하므로 번호만 표시
+            self.filmstrip.set_frames(images, self.current_image_idx,
+                                      thumbnails=loaded.video_frames is None)
+            frames = [int(p.stem.split('_')[-1]) for p in images]
+            self.timeline.set_tracks(TrackArray.from_keyframes(frames, self.keypoints_data),
+                                     loaded.image_size)
+            self.load_image(images[self.current_image_idx])
             self.update_file_list()
 
         except Exception as e:
             logger.error(f"JSON 로드 실패: {str(e)}")
             QMessageBox.critical(self, "오류", f"JSON 로드 실패: {str(e)}")
 
-    # 키포인트 필터링 함수
-    def filter_keypoints(self, raw_keypoints):
+    def load_image(self, image_path: Path):
         """
-        키포인트 데이터를 필터링하여 유효한 좌표만 반환.
-        :param raw_keypoints: [[x, y], ...] 형식의 데이터
-        :return: [(index, (x, y)), ...] 형식의 필터링된 데이터
+        이미지 및 해당 키포인트 데이터 로드
+
+        캐시에 없는 프레임은 GUI 스레드에서 디코딩을 기다리지 않고, 미리보기(또는
+        빈 화면)를 표시한 뒤 백그라운드 디코딩이 끝나면 원본으로 교체합니다.
         """
-        filtered = []
+        # 다른 프레임을 직접 로드하면 대기 중인 방향키 이동은 무효
+        if image_path != self.pending_nav_path:
+            self.cancel_navigation()
+        self.prefetch_neighbors()
         try:
-            for index, coords in enumerate(raw_keypoints):
-                if len(coords) == 2 and all(isinstance(c, (int, float)) for c in coords):
-                    x, y = map(int, coords)
-                    if (x, y) != (0, 0):
-                        filtered.append((index, (x, y)))
-                    else:
-                        logger.warning(f"키포인트 {index}가 (0, 0) 상태입니다: {coords}")
+            # 이미지 캐시 체크 및 읽기
+            image = self.image_cache.get(str(image_path))
+            if image is None:
+                with span('disk_cache.lookup'):
+                    image = self.frame_cache.get(image_path)
+                if image is not None:
+                    # 디스크 캐시의 디스플레이 해상도 프레임을 먼저 표시하고 원본은 백그라운드 디코딩
+                    self.decode_in_background(image_path)
                 else:
-                    logger.warning(f"키포인트 {index}의 형식이 잘못되었습니다: {coords}")
+                    # 디코딩이 끝나면 _on_frame_decoded에서 다시 로드
+                    self.pending_nav_path = image_path
+                    self.show_preview(image_path)
+                    self.flush_navigation()
+                    return
+
+            self.display_frame(image_path, image)
+
+        except Exception as e:
+            logger.error(f"이미지 로드 실패: {str(e)}")
+            QMessageBox.critical(self, "오류", f"이미지 로드 실패: {str(e)}")
+
+    def prefetch_neighbors(self):
+        """
+        현재 프레임 주변 파일을 작업 스레드에서 미리 준비 (이동하면 이전 요청은 취소).
+        원격 데이터셋은 파일을 받아 두고, 로컬 파일은 표시할 때 읽는 헤더의 이미지 크기를 읽어 둡니다.
+        """
+        if not self.current_images or self.video_frames is not None:
+            return
+        idx = self.current_image_idx
+        paths = self.current_images[idx:idx + PREFETCH_FRAMES + 1]
+        if idx > 0:
+            paths.append(self.current_images[idx - 1])
+        if self._prefetch_token is not None:
+            self._prefetch_token.cancel()
+        self._prefetch_token = token = CancelToken()
+        self.tasks.submit(self._prefetch, paths, token, priority=PRIORITY_PREFETCH, token=token,
+                          on_done=self._on_prefetched)
+
+    @staticmethod
+    def _prefetch(paths, token):
+        """
+        (작업 스레드) 원격 파일은 동시에 받기 시작하고, 모든 파일의 헤더에서 이미지 크기 확인.
+        :return: {이미지 경로: (너비, 높이)}
+        """
+        if not storage.is_local(paths[0]):
+            storage.prefetch(paths)
+        sizes = {}
+        for path in paths:
+            if token.cancelled:
+                break
+            # 원격 파일은 미리 받는 중인 내용이 도착하면 그 앞부분으로 확인
+            sizes[path] = probe_image_size(path)
+        return sizes
+
+    def _on_prefetched(self, future):
+        try:
+            sizes = future.result()
         except Exception as e:
-            logger.error(f"키포인트 필터링 중 오류 발생: {e}")
-        return filtered
+            logger.debug("미리 준비 실패: %s", e)
+            return
+        self.image_sizes.update((path, size) for path, size in sizes.items() if size is not None)
 
+    def image_size(self, image_path: Path):
+        """
+        프레임의 원본 (너비, 높이). 작업 스레드에서 확인했거나 디코딩한 크기를 쓰고,
+        아직 모르면 JSON 첫 이미지의 크기 (그것도 없으면 None: 표시 배열 크기 사용)
+        """
+        return self.image_sizes.get(image_path, self.clip_image_size)
 
-    def load_image(self, image_path: Path):
-        """이미지 및 해당 키포인트 데이터 로드"""
+    def display_frame(self, image_path: Path, image):
+        """이미지(원본 또는 미리보기)와 해당 프레임의 키포인트를 에디터에 표시"""
+        # 키프레임 번호 추출 - int로 변환
+        keyframe_num = int(image_path.stem.split('_')[-1])
+
+        # 키포인트 데이터 로드
+        proposed = [False] * 17
+        proposal = None if keyframe_num in self.keypoints_data else self.interpolated_keypoints(keyframe_num)
+        if keyframe_num in self.keypoints_data:
+            keypoints = self.keypoints_data[keyframe_num]
+            logger.debug("키포인트 데이터 찾음", extra={'frame': keyframe_num})
+        elif keyframe_num in self.flow_proposals:
+            # 앞 프레임에서 추적한 제안 (보간보다 우선)
+            flow = self.flow_proposals[keyframe_num]
+            keypoints, proposed = flow.keypoints, flow.proposed
+            logger.debug("추적 제안 표시", extra={'frame': keyframe_num})
+        elif proposal is not None:
+            # 라벨링되지 않은 프레임은 앞뒤 키프레임의 보간 제안을 표시 (확정 전까지 저장되지 않음)
+            keypoints, proposed = proposal
+            logger.debug("보간 제안 표시", extra={'frame': keyframe_num})
+        else:
+            # 17개 포인트 초기화 (1개는 코, 4개는 눈/귀, 12개는 신체 포인트)
+            keypoints = [[0,0] for _ in range(17)]
+            logger.debug("키포인트 데이터 없음, 기본값 사용", extra={'frame': keyframe_num})
+
+        # 에디터 위젯 업데이트 (미리보기도 원본 좌표계에 맞도록 헤더의 원본 크기 사용)
+        self.displayed_image_path = image_path
+        self.editor_widget.set_image(image, self.image_size(image_path))
+        # 편집 중이던 사람 번호는 프레임을 옮겨도 유지 (사람 수보다 크면 마지막 사람)
+        persons = [keypoints] + self.other_persons.get(keyframe_num, [])
+        self.history.commit()
+        self._shown_points = (keyframe_num, [[list(p) for p in person] for person in persons])
+        self.editor_widget.set_persons(persons, self.editor_widget.active_person)
+        self.editor_widget.proposed = proposed
+        self.editor_widget.update_view()
+        self.update_person_label()
+        self.editor_widget.filename_label.setText(image_path.name)
+        self.filmstrip.set_current(self.current_image_idx)
+        self.timeline.set_current(self.current_image_idx)
+
+    def interpolated_keypoints(self, keyframe_num):
+        """프레임의 보간 제안 (키포인트 목록, 포인트별 제안 여부). 없으면 None"""
+        method = self.interp_combo.currentData()
+        if method is None or len(self.keypoints_data) < 2:
+            return None
+        if self.interpolation is None:
+            frames = [int(p.stem.split('_')[-1]) for p in self.current_images]
+            with span('interpolate'):
+                self.interpolation = interpolate_keyframes(self.keypoints_data, frames, method)
+        return self.interpolation.proposal(keyframe_num)
+
+    def on_interpolation_changed(self):
+        """보간 방식 변경 시 제안을 다시 계산해 현재 프레임에 반영"""
+        self.interpolation = None
+        if self.displayed_image_path is not None and self.editor_widget.current_image is not None:
+            self.display_frame(self.displayed_image_path, self.editor_widget.current_image)
+
+    def accept_proposals(self):
+        """현재 프레임에 표시된 제안 포인트를 그대로 키프레임 데이터로 확정"""
+        if not any(self.editor_widget.proposed) or self.displayed_image_path is None:
+            return
+        keyframe_num = int(self.displayed_image_path.stem.split('_')[-1])
+        self.keypoints_data[keyframe_num] = [list(p) for p in self.editor_widget.persons[0]]
+        self.editor_widget.persons[0] = self.keypoints_data[keyframe_num]
+        self.editor_widget.proposed = [False] * 17
+        self.editor_widget.update_view()
+        self._record_created(keyframe_num)
+        self.history.commit()
+        self.timeline.set_frame(keyframe_num, self.keypoints_data[keyframe_num])
+        self.interpolation = None
+        self.flow_proposals.pop(keyframe_num, None)
+        self.edited_frames.add(keyframe_num)
+        self.modified = True
+        self.update_file_list()
+
+    def _record_created(self, keyframe_num):
+        """키프레임이 새로 생긴 편집으로 기록 (다시 실행할 때 복원할 포인트 포함)"""
+        self.history.mark_created(keyframe_num)
+        # 표시 중이던 제안 좌표가 아니라 빈 상태에서 생긴 것으로 기록
+        shown = self._shown_points[1] if self._shown_points[0] == keyframe_num else []
+        self._shown_points = (keyframe_num, [[[0, 0] for _ in range(17)]] + shown[1:])
+        for point_id, xy in enumerate(self.keypoints_data[keyframe_num]):
+            if xy[0] or xy[1]:
+                self._record_point(keyframe_num, 0, point_id, xy)
+
+    def _record_point(self, keyframe_num, person, point_id, xy):
+        """포인트 변경을 되돌리기 기록에 추가 (변경 전 좌표는 표시 중인 프레임의 사본에서 확인)"""
+        shown_frame, shown = self._shown_points
+        if shown_frame != keyframe_num:
+            shown_frame, shown = self._shown_points = (keyframe_num, [])
+        while len(shown) <= person:
+            shown.append([[0, 0] for _ in range(17)])
+        self.history.record(keyframe_num, person, point_id, shown[person][point_id], xy)
+        shown[person][point_id] = list(xy)
+
+    def undo(self):
+        """마지막 편집 되돌리기 (Ctrl+Z)"""
+        edit = self.history.undo()
+        if edit is not None:
+            self._apply_edit(edit, undo=True)
+        return edit
+
+    def redo(self):
+        """되돌린 편집 다시 실행 (Ctrl+Shift+Z, Ctrl+Y)"""
+        edit = self.history.redo()
+        if edit is not None:
+            self._apply_edit(edit, undo=False)
+        return edit
+
+    def _apply_edit(self, edit, undo):
+        """
+        기록된 편집의 포인트만 키포인트 데이터에 반영하고 (바뀐 포인트 수에 비례),
+        편집한 프레임과 사람을 화면에 표시합니다.
+        """
+        frame, person = edit.frame, edit.person
+        if person == 0 and edit.created and undo:
+            # 이 편집으로 생긴 키프레임은 지움 (다시 보간/추적 제안 대상)
+            self.keypoints_data.pop(frame, None)
+        else:
+            if person == 0:
+                if frame not in self.keypoints_data:
+                    self.keypoints_data[frame] = [[0, 0] for _ in range(17)]
+                keypoints = self.keypoints_data[frame]
+            else:
+                persons = self.other_persons.setdefault(frame, [])
+                while len(persons) < person:
+                    persons.append([[0, 0] for _ in range(17)])
+                keypoints = persons[person - 1]
+            for point_id, xy in edit.points(undo=undo):
+                keypoints[point_id] = xy
+        if person == 0:
+            self.timeline.set_frame(frame, self.keypoints_data.get(frame, []))
+        self.interpolation = None
+        self.flow_proposals.pop(frame, None)
+        self.modified = not self.history.is_saved
+        self.update_file_list()
+
+        index = self._keyframe_index(frame)
+        self.editor_widget.active_person = person
+        if index >= 0 and index != self.current_image_idx:
+            self.jump_to_image(index)
+        elif self.displayed_image_path is not None and self.editor_widget.current_image is not None:
+            self.display_frame(self.displayed_image_path, self.editor_widget.current_image)
+
+    def add_person(self):
+        """현재 프레임에 사람을 추가하고 편집 대상으로 선택 (더블클릭으로 포인트 추가)"""
+        if self.displayed_image_path is None or self.editor_widget.current_image is None:
+            return
+        self.editor_widget.add_person()
+        self.update_person_label()
+
+    def update_person_label(self, *args):
+        """편집 중인 사람 번호 / 프레임의 사람 수 표시"""
+        count = len(self.editor_widget.persons)
+        self.person_label.setText(f"사람 {self.editor_widget.active_person + 1} / {count}" if count else "")
+
+    def propagate_from(self, index):
+        """
+        라벨링된 프레임의 키포인트를 다음 프레임들로 백그라운드에서 추적합니다.
+
+        이미 디코딩된 프레임은 캐시의 배열을 그대로 쓰고, 없는 프레임은 디코딩을
+        요청해 (디코딩 결과는 이동 시에도 재사용됨) 추적 스레드에서 기다립니다.
+        다음 라벨링된 프레임에서 멈추며, 완료되면 _on_keypoints_propagated에서 반영합니다.
+        추적에 쓰는 프레임은 추적이 끝날 때까지 붙잡아 두어 캐시에서 빠져도 재사용되지 않습니다.
+        """
+        if not 0 <= index < len(self.current_images):
+            return None
+        start_path = self.current_images[index]
+        keyframe_num = int(start_path.stem.split('_')[-1])
+        keypoints = self.keypoints_data.get(keyframe_num)
+        if keypoints is None or not any(x or y for x, y in keypoints):
+            return None
+
+        from propagation import PROPAGATE_FRAMES
+        paths = []
+        for path in self.current_images[index + 1:index + 1 + PROPAGATE_FRAMES]:
+            frame = int(path.stem.split('_')[-1])
+            if frame in self.keypoints_data:
+                break
+            paths.append((frame, path))
+        if not paths:
+            return None
+
+        lease = LeaseGroup(self.decode_service)
+        targets = [(frame, str(path), lease.hold(self._frame_for_tracking(path))) for frame, path in paths]
+        self.propagation_generation += 1
+        self._tracking_leases[self.propagation_generation] = lease
+        future = self.tracker.submit(
+            (str(start_path), lease.hold(self._frame_for_tracking(start_path))),
+            [list(p) for p in keypoints], targets, self.image_size(start_path)
+        )
+        future.add_done_callback(lambda f: lease.close())
+        future.add_done_callback(
+            lambda f, g=self.propagation_generation: self.keypoints_propagated.emit(g, f)
+        )
+        return future
+
+    @property
+    def tracker(self):
+        """광학 흐름 추적기 (첫 사용 시 생성)"""
+        if self._tracker is None:
+            from propagation import KeypointTracker
+            self._tracker = KeypointTracker()
+        return self._tracker
+
+    def _frame_for_tracking(self, image_path: Path):
+        """추적용 원본 프레임 (캐시에 있으면 배열, 없으면 디코딩 Future)"""
+        image = self.image_cache.get(str(image_path))
+        return image if image is not None else self.decode_in_background(image_path)
+
+    def _on_keypoints_propagated(self, generation, future):
+        """추적 결과를 제안으로 보관하고, 표시 중인 프레임이면 바로 반영"""
+        self._tracking_leases.pop(generation, None)
+        if generation != self.propagation_generation or future.cancelled():
+            return
         try:
-            # 이미지 캐시 체크 및 읽기
-            image = self.image_cache.get(str(image_path))
-            if image is None:
-                image = cv2.imdecode(
-                    np.fromfile(image_path.as_posix(), np.uint8),
-                    cv2.IMREAD_COLOR
-                )
-                if image is None:
-                    raise Exception("이미지를 읽을 수 없습니다.")
-                image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                self.image_cache.put(str(image_path), image)
-
-            # 키프레임 번호 추출 - int로 변환
-            keyframe_num = int(image_path.stem.split('_')[-1])
-            logger.info(f"키프레임 번호: {keyframe_num}")
+            proposals = future.result()
+        except Exception as e:
+            logger.warning(f"키포인트 추적 실패: {e}")
+            return
+        for proposal in proposals:
+            if proposal.frame not in self.keypoints_data:
+                self.flow_proposals[proposal.frame] = proposal
+        shown = self.displayed_image_path
+        if (shown is not None and self.editor_widget.current_image is not None
+                and int(shown.stem.split('_')[-1]) in self.flow_proposals):
+            self.display_frame(shown, self.editor_widget.current_image)
+
+    def reset_propagation(self):
+        """추적 제안 제거 (진행 중인 추적 결과도 무시)"""
+        self.propagation_generation += 1
+        self.flow_proposals.clear()
 
-            # 키포인트 데이터 로드
-            if keyframe_num in self.keypoints_data:
-                keypoints = self.keypoints_data[keyframe_num]
-                logger.info(f"키포인트 데이터 찾음: {keypoints}")
+    def close_video(self):
+        """현재 JSON의 영상 프레임 소스 닫기"""
+        if self.video_frames is not None:
+            self.video_frames.close()
+            self.video_frames = None
+
+    def decode_in_background(self, image_path: Path):
+        """
+        원본 해상도 디코딩을 워커에 요청 (완료 시 frame_decoded 발생).
+        같은 프레임을 디코딩 중이면 새로 요청하지 않고 그 Future를 반환합니다.
+        """
+        future = self._decoding.get(image_path)
+        if future is not None and not future.cancelled():
+            return future
+        if self.video_frames is not None and image_path in self.video_frames:
+            future = self.video_frames.submit(image_path)
+        elif storage.is_local(image_path):
+            future = self.decode_service.submit(image_path)
+        else:
+            # 아카이브/원격 파일은 작업 스레드에서 읽은 바이트를 넘겨 디코딩 (워커 프로세스에는 저장소가 열려 있지 않음)
+            future = self.tasks.submit(
+                lambda: self.decode_service.decode(image_path, storage.read_array(image_path)),
+                priority=PRIORITY_FRAME, name='decode_stored'
+            )
+        # 동기 디코딩이면 아래 콜백에서 바로 제거됨
+        self._decoding[image_path] = future
+        future.add_done_callback(lambda f, p=image_path: self.frame_decoded.emit(p, f))
+        return future
+
+    def _on_frame_decoded(self, image_path: Path, future):
+        """백그라운드 디코딩 결과를 캐시에 넣고, 표시 중인 프레임이면 원본 해상도로 교체"""
+        if self._decoding.get(image_path) is future:
+            del self._decoding[image_path]
+        if future.cancelled():
+            return
+        try:
+            image = future.result()
+        except Exception as e:
+            if image_path == self.pending_nav_path:
+                # 기다리던 프레임이면 오류를 사용자에게 표시
+                self.pending_nav_path = None
+                self.nav_future = None
+                logger.error(f"이미지 로드 실패: {str(e)}")
+                QMessageBox.critical(self, "오류", f"이미지 로드 실패: {str(e)}")
             else:
-                # 17개 포인트 초기화 (1개는 코, 4개는 눈/귀, 12개는 신체 포인트)
-                keypoints = [[0,0] for _ in range(17)]
-                logger.info("키포인트 데이터 없음, 기본값 사용")
-
-            # 에디터 위젯 업데이트
-            self.editor_widget.current_image = image
-            self.editor_widget.keypoints = keypoints
-            self.editor_widget.selected_point = None  # 선택 초기화
+                logger.warning(f"백그라운드 디코딩 실패: {image_path}: {e}")
+            return
+
+        # 디코딩 결과가 원본 크기 (헤더의 EXIF 방향 적용 크기와 같음)
+        self.image_sizes[image_path] = (image.shape[1], image.shape[0])
+        self.image_cache.put(str(image_path), image)
+        self.store_frame(image_path, image)
+        if image_path == self.pending_nav_path:
+            # 방향키 이동으로 도착한 프레임은 캐시에서 정식 로드
+            self.load_image(image_path)
+            self.pending_nav_path = None
+            self.nav_future = None
+        elif image_path == self.displayed_image_path:
+            self.editor_widget.set_image(image, self.image_sizes[image_path])
             self.editor_widget.update_view()
-            self.editor_widget.filename_label.setText(image_path.name)
 
+    def store_frame(self, image_path: Path, image):
+        """디코딩한 프레임을 작업 스레드에서 디스크 프레임 캐시에 저장 (저장할 때까지 슬랩 사용 표시)"""
+        if not self.frame_cache.enabled:
+            return
+        retained = self.decode_service.retain(image)
+
+        def store():
+            try:
+                self.frame_cache.put(image_path, image)
+            finally:
+                if retained:
+                    self.decode_service.release(image)
+
+        try:
+            self.tasks.submit(store, priority=PRIORITY_PREFETCH, name='frame_cache.put')
+        except RuntimeError:  # 종료 중
+            if retained:
+                self.decode_service.release(image)
+
+    def step_image(self, step: int, auto_repeat: bool = False):
+        """
+        ←/→ 이동 요청을 목표 프레임 요청으로 처리합니다.
+
+        디코딩된 프레임은 바로 표시하고, 그렇지 않으면 디스크 캐시나 썸네일의
+        저해상도 미리보기만 표시합니다. 키를 누르고 있는 동안(자동 반복)에는
+        디코딩하지 않고, 키를 떼거나 잠시 멈추면 도착한 프레임만 디코딩합니다.
+        """
+        if not self.current_images:
+            return
+
+        target = self.current_image_idx + step
+        if not 0 <= target < len(self.current_images):
+            # 키를 누르고 있는 동안에는 JSON 경계를 넘지 않음
+            if not auto_repeat:
+                self.cancel_navigation()
+                if step > 0:
+                    self.move_next_image()
+                else:
+                    self.move_prev_image()
+            return
+
+        # 편집을 마친 프레임에서 다음으로 넘어가면 이어지는 프레임으로 추적
+        leaving = int(self.current_images[self.current_image_idx].stem.split('_')[-1])
+        if step > 0 and not auto_repeat and leaving in self.edited_frames:
+            self.propagate_from(self.current_image_idx)
+
+        # 이전 목표 프레임의 디코딩 요청은 취소 (이미 시작된 것은 캐시로 들어감)
+        self.cancel_navigation()
+        self.current_image_idx = target
+        self.prefetch_neighbors()
+        path = self.current_images[target]
+        if self.image_cache.get(str(path)) is not None:
+            self.load_image(path)
+            return
+
+        self.pending_nav_path = path
+        self.show_preview(path)
+        if auto_repeat:
+            self.nav_timer.start()
+        else:
+            self.flush_navigation()
+
+    def show_preview(self, image_path: Path):
+        """
+        빈 화면을 표시하고, 디스크 캐시나 썸네일의 저해상도 미리보기는 작업 스레드에서
+        읽어 도착하면 표시합니다 (그사이 원본이 도착했거나 다른 프레임으로 이동했으면 버림).
+        """
+        # 이전 프레임에 편집이 들어가지 않도록 에디터를 비움
+        self.displayed_image_path = None
+        self.editor_widget.show_placeholder(image_path.name)
+        self.filmstrip.set_current(self.current_image_idx)
+        self.timeline.set_current(self.current_image_idx)
+        if self._preview_token is not None:
+            self._preview_token.cancel()
+        self._preview_token = token = CancelToken()
+        self.tasks.submit(self._read_preview, image_path, priority=PRIORITY_FRAME, token=token,
+                          on_done=lambda f, p=image_path: self._on_preview(p, f))
+
+    def _read_preview(self, image_path: Path):
+        """(작업 스레드) 디스크 프레임 캐시, 없으면 썸네일 캐시에서 미리보기 읽기. 없으면 None"""
+        with span('nav.preview'):
+            preview = self.frame_cache.get(image_path)
+            if preview is not None:
+                # 캐시 슬롯은 다른 프레임 저장에 재사용될 수 있으므로 복사
+                return np.array(preview)
+            return self.filmstrip.cache.get(image_path)
+
+    def _on_preview(self, image_path: Path, future):
+        """기다리는 프레임의 빈 화면을 미리보기로 교체"""
+        if image_path != self.pending_nav_path or self.displayed_image_path is not None:
+            return
+        try:
+            preview = future.result()
         except Exception as e:
-            logger.error(f"이미지 로드 실패: {str(e)}")
-            QMessageBox.critical(self, "오류", f"이미지 로드 실패: {str(e)}")
+            logger.warning(f"미리보기 표시 실패: {e}")
+            return
+        if preview is not None:
+            self.display_frame(image_path, preview)
+
+    def flush_navigation(self):
+        """대기 중인 목표 프레임의 원본 디코딩 요청"""
+        self.nav_timer.stop()
+        path = self.pending_nav_path
+        if path is not None and self.nav_future is None:
+            future = self.decode_in_background(path)
+            # 동기 디코딩 모드에서는 위 호출 중에 이미 로드가 끝났을 수 있음
+            if self.pending_nav_path == path:
+                self.nav_future = future
+
+    def cancel_navigation(self):
+        """대기 중인 방향키 이동 취소 (추적이 기다리는 디코딩은 취소하지 않음)"""
+        self.nav_timer.stop()
+        if self.nav_future is not None:
+            if not any(self.nav_future in lease.futures for lease in self._tracking_leases.values()):
+                self.nav_future.cancel()
+            self.nav_future = None
+        self.pending_nav_path = None
 
     def on_keypoint_update(self, point_id: int, coords: list):
         """
@@ -327,15 +1307,42 @@ class KeypointLabeler(QMainWindow):
         try:
             current_image = self.current_images[self.current_image_idx]
             keyframe_num = int(current_image.stem.split('_')[-1])
+            person = self.editor_widget.active_person
             
-            # keyframe_num을 int로 유지하고 17개 포인트로 초기화
-            if keyframe_num not in self.keypoints_data:
-                self.keypoints_data[keyframe_num] = [[0,0]] * 17
+            # keyframe_num을 int로 유지하고 17개 포인트로 초기화 (첫 번째 사람을 편집할 때만 키프레임 생성,
+            # 다른 사람의 편집은 첫 번째 사람의 제안을 확정하지 않음)
+            created = person == 0 and keyframe_num not in self.keypoints_data
+            if created:
+                if any(self.editor_widget.proposed) and self.displayed_image_path == current_image:
+                    # 제안 포인트를 수정하면 나머지 제안도 함께 확정
+                    self.keypoints_data[keyframe_num] = [list(p) for p in self.editor_widget.persons[0]]
+                    self.editor_widget.persons[0] = self.keypoints_data[keyframe_num]
+                    self.editor_widget.proposed = [False] * 17
+                else:
+                    self.keypoints_data[keyframe_num] = [[0,0]] * 17
+            if person == 0:
+                self.interpolation = None
+                self.flow_proposals.pop(keyframe_num, None)
+            self.edited_frames.add(keyframe_num)
             
             # 좌표를 정수형으로 변환하여 저장
             x, y = coords
-            self.keypoints_data[keyframe_num][point_id] = [int(x), int(y)]
-            logger.info(f"키포인트 업데이트: 프레임 {keyframe_num}, 포인트 {point_id}, 좌표 {[int(x), int(y)]}")
+            if created:
+                self._record_created(keyframe_num)
+            self._record_point(keyframe_num, person, point_id, [int(x), int(y)])
+            if person == 0:
+                self.keypoints_data[keyframe_num][point_id] = [int(x), int(y)]
+                if created:
+                    # 제안을 함께 확정했을 수 있으므로 프레임 전체 반영
+                    self.timeline.set_frame(keyframe_num, self.keypoints_data[keyframe_num])
+                else:
+                    self.timeline.set_point(keyframe_num, point_id, [int(x), int(y)])
+            else:
+                # 두 번째 사람부터는 에디터의 목록을 그대로 보관
+                self.other_persons[keyframe_num] = self.editor_widget.persons[1:]
+                self.other_persons[keyframe_num][person - 1][point_id] = [int(x), int(y)]
+            logger.debug("키포인트 업데이트: 프레임 %s, 사람 %d, 포인트 %d, 좌표 (%d, %d)",
+                         keyframe_num, person, point_id, int(x), int(y))
             
             self.modified = True
             self.update_file_list()
@@ -344,45 +1351,99 @@ class KeypointLabeler(QMainWindow):
             logger.error(f"키포인트 업데이트 실패: {str(e)}")
 
     def save_current(self):
+        """
+        현재 JSON의 수정 사항을 edited 폴더에 저장합니다. 키포인트는 바로 복사해 두고
+        원본 읽기와 쓰기는 작업 스레드에서 수행합니다 (완료 시 _on_saved).
+
+        :return: 저장 Future (저장할 내용이 없으면 None)
+        """
+        if not self.current_json or not self.modified:
+            return None
+        json_file = self.current_json
+        persons = {}
+        for keyframe_num in self.keypoints_data.keys() | self.other_persons.keys():
+            # 첫 번째 사람이 라벨링되지 않은 프레임은 None (다른 사람만 편집한 프레임)
+            first = self.keypoints_data.get(keyframe_num)
+            persons[keyframe_num] = [None if first is None else [list(p) for p in first]] + [
+                [list(p) for p in keypoints] for keypoints in self.other_persons.get(keyframe_num, [])]
+        listed = json_file.parent == self.file_list_folder
+        was_edited = listed and json_file.name in self.edited_names
+        # 저장 결과가 바로 전달되는 경우(동기 모드)에도 실패 처리가 덮어쓰이지 않도록 먼저 갱신
+        self.history.mark_saved()
+        self.modified = False
+        if listed:
+            self.edited_names.add(json_file.name)
+        self.update_file_list()
+        future = self.tasks.submit(self._write_json, json_file, persons, priority=PRIORITY_SAVE,
+                                   on_done=lambda f: self._on_saved(json_file, was_edited, f))
+        if not future.done():
+            self._pending_saves[json_file] = future
+        return future
+
+    @staticmethod
+    def _write_json(json_file: Path, persons: dict):
+        """
+        원본 JSON에 키프레임별 키포인트를 반영해 edited 폴더에 저장 (작업 스레드에서 실행).
+        :param persons: {키프레임: [사람별 17개 [x, y]]}. 첫 번째 사람이 None이면 그 세그먼트는 그대로 둠
+        """
+        save_path = json_file.parent / "edited" / json_file.name
+
+        # 현재 JSON 데이터 로드
+        with span('json.parse'):
+            data = json.loads(storage.read_bytes(json_file))
+
+        # segmentation 배열에서 각 키프레임 데이터 업데이트 (확정된 보간 프레임과 추가한 사람은 세그먼트 추가)
+        segments = data.setdefault('segmentation', [])
+        for keyframe_num in sorted(persons):
+            # 불러올 때와 같은 순서: 키포인트가 있던 세그먼트부터 한 사람씩 대응
+            existing = sorted((s for s in segments if keyframe_number(s.get('keyframe')) == keyframe_num),
+                              key=lambda s: not s.get('keypoints'))
+            for i, keypoints in enumerate(persons[keyframe_num]):
+                if keypoints is None:
+                    continue
+                if i < len(existing):
+                    existing[i]['keypoints'] = keypoints  # editor_widget 대신 저장된 데이터 사용
+                elif i == 0 or any(x or y for x, y in keypoints):
+                    segments.append({'keyframe': keyframe_num, 'keypoints': keypoints})
+
+        # 수정 비교 보고서의 편집자별 집계용
+        from annotation_diff import current_annotator
+        data['annotator'] = current_annotator()
+
+        # 저장 (아카이브 데이터셋은 옆 폴더에 저장)
+        with span('json.write'):
+            storage.write_bytes(save_path, json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+        return save_path
+
+    def _on_saved(self, json_file: Path, was_edited: bool, future):
+        """저장 결과 표시. 실패하면 다시 수정 중 상태로 되돌림"""
+        if self._pending_saves.get(json_file) is future:
+            del self._pending_saves[json_file]
+        deferred = self._deferred_load
+        if deferred is not None and deferred[0] == json_file:
+            # 저장을 기다리던 같은 파일 읽기 요청
+            self._deferred_load = None
+            if not deferred[3].cancelled:
+                self._submit_load(*deferred)
         try:
-            if not self.current_json or not self.modified:
-                return
-                
-            edited_folder = self.current_json.parent / "edited"
-            edited_folder.mkdir(exist_ok=True)
-            save_path = edited_folder / self.current_json.name
-            
-            # 현재 JSON 데이터 로드
-            with open(self.current_json, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # 현재 이미지의 키프레임 번호 추출
-            current_image = self.current_images[self.current_image_idx]
-            keyframe_num = int(current_image.stem.split('_')[-1])
-            
-            # segmentation 배열에서 해당 키프레임 데이터 업데이트
-            for segment in data.get('segmentation', []):
-                if segment.get('keyframe') == keyframe_num:  # 'keyframe'으로 수정
-                    segment['keypoints'] = self.keypoints_data[keyframe_num]  # editor_widget 대신 저장된 데이터 사용
-                    break
-            
-            # 저장
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            self.modified = False
-            self.update_file_list()
-            
-            # 저장 완료 메시지
-            msg = QMessageBox(self)
-            msg.setText("수정사항이 저장되었습니다.")
-            msg.setWindowTitle("알림")
-            QTimer.singleShot(1000, msg.close)
-            msg.show()
-            
+            future.result()
         except Exception as e:
             logger.error(f"저장 실패: {e}")
+            if json_file == self.current_json:
+                self.modified = True
+                self.history.mark_unsaved()
+            if not was_edited and json_file.parent == self.file_list_folder:
+                self.edited_names.discard(json_file.name)
+            self.update_file_list()
             QMessageBox.critical(self, "오류", f"저장 실패: {e}")
+            return
+
+        # 저장 완료 메시지
+        msg = QMessageBox(self)
+        msg.setText("수정사항이 저장되었습니다.")
+        msg.setWindowTitle("알림")
+        QTimer.singleShot(1000, msg.close)
+        msg.show()
 
     def save_check(self):
         """수정사항 있을 경우 저장 확인"""
@@ -398,6 +1459,17 @@ class KeypointLabeler(QMainWindow):
 
     def update_file_list(self):
         """파일 목록 상태 업데이트"""
+        with span('file_list.refresh', rows=self.file_list.rowCount()):
+            self._update_file_list_rows()
+
+        # 상태 열로 정렬 중이면 행 순서가 바뀌었을 수 있음
+        header = self.file_list.horizontalHeader()
+        if self.file_list.isSortingEnabled() and header.sortIndicatorSection() == 1:
+            self._file_rows_dirty = True
+        if self._file_rows_dirty or self.status_filter.currentData() is not None:
+            self.apply_file_filter()
+
+    def _update_file_list_rows(self):
         for row in range(self.file_list.rowCount()):
             item = self.file_list.item(row, 0)
             # 모든 행의 배경색을 먼저 흰색으로 초기화
@@ -406,9 +1478,9 @@ class KeypointLabeler(QMainWindow):
                     self.file_list.item(row, col).setBackground(QColor("white"))
             
             if item:
-                file_path = self.current_json.parent / item.text()
-                edited_path = file_path.parent / "edited" / item.text()
-                
+                # edited 파일 여부는 목록 스캔과 저장 결과로 알고 있으므로 디스크를 확인하지 않음
+                edited = item.text() in self.edited_names
+
                 # 현재 선택된 파일 하이라이트
                 if self.current_json and item.text() == self.current_json.name:
                     for col in range(3):
@@ -418,12 +1490,13 @@ class KeypointLabeler(QMainWindow):
                     if self.modified:
                         status = "수정 중"
                     else:
-                        status = "수정됨" if edited_path.exists() else "수정 사항 없음"
+                        status = "수정됨" if edited else "수정 사항 없음"
                 else:
                     # 다른 파일들은 edited 폴더 존재 여부만 확인
-                    status = "수정됨" if edited_path.exists() else "수정 사항 없음"
+                    status = "수정됨" if edited else "수정 사항 없음"
                 
                 self.file_list.item(row, 1).setText(status)
+                self.file_index.set_status(item.text(), STATUS_CODES[status])
 
     def closeEvent(self, event):
         """프로그램 종료"""
@@ -439,6 +1512,35 @@ class KeypointLabeler(QMainWindow):
                 return
             if reply == QMessageBox.Yes:
                 self.save_current()
+
+        # 다음 실행에서 복원할 작업 위치 저장
+        session = self.current_session()
+        if session is not None:
+            try:
+                save_session(session)
+            except OSError as e:
+                logger.warning(f"세션 저장 실패: {e}")
+        # 대기 중인 스캔/미리 받기는 취소하고 저장이 끝날 때까지 대기
+        self.tasks.shutdown()
+
+        # 디코딩 워커 종료 및 공유 메모리 해제
+        self.editor_widget.current_image = None
+        if self._tracker is not None:
+            self._tracker.shutdown()
+        self.image_cache.clear()
+        self.decode_service.shutdown()
+        self.close_video()
+        self.frame_cache.close()
+        if self.base_path is not None:
+            storage.unmount(self.base_path)
+
+        # 환경 변수로 추적을 켠 경우 종료 시 결과 저장
+        trace_path = os.environ.get(TRACE_ENV)
+        if trace_path and trace_path != "1":
+            try:
+                tracer.export_chrome_trace(trace_path)
+            except Exception as e:
+                logger.error(f"추적 결과 저장 실패: {e}")
         event.accept()
         
     def move_next_image(self):
@@ -460,6 +1562,12 @@ class KeypointLabeler(QMainWindow):
             logger.error(f"다음 이미지 이동 실패: {e}")
             QMessageBox.critical(self, "오류", f"다음 이미지 이동 실패: {e}")
 
+    def jump_to_image(self, index: int):
+        """썸네일 클릭 시 해당 프레임으로 바로 이동"""
+        if 0 <= index < len(self.current_images) and index != self.current_image_idx:
+            self.current_image_idx = index
+            self.load_image(self.current_images[index])
+
     def move_prev_image(self):
         """이전 이미지로 이동"""
         try:
@@ -473,9 +1581,7 @@ class KeypointLabeler(QMainWindow):
                 # 첫 이미지에서 이전 JSON의 마지막 이미지로
                 prev_json = self.get_prev_json()
                 if prev_json:
-                    self.load_json(prev_json)
-                    self.current_image_idx = len(self.current_images) - 1
-                    self.load_image(self.current_images[self.current_image_idx])
+                    self.load_json(prev_json, frame=-1)
                     
         except Exception as e:
             logger.error(f"이전 이미지 이동 실패: {e}")
@@ -494,57 +1600,70 @@ class KeypointLabeler(QMainWindow):
             self.load_json(prev_json)
 
     def get_next_json(self) -> Path:
-        """다음 JSON 파일 경로 반환"""
+        """다음 JSON 파일 경로 반환 (필터로 숨겨진 파일은 건너뜀)"""
         try:
-            current_row = -1
-            for row in range(self.file_list.rowCount()):
-                if self.file_list.item(row, 0).text() == self.current_json.name:
-                    current_row = row
-                    break
-                    
-            if current_row != -1 and current_row < self.file_list.rowCount() - 1:
-                next_name = self.file_list.item(current_row + 1, 0).text()
-                return self.current_json.parent / next_name
-                
+            return self._adjacent_json(1)
         except Exception as e:
             logger.error(f"다음 JSON 파일 찾기 실패: {e}")
         return None
 
     def get_prev_json(self) -> Path:
-        """이전 JSON 파일 경로 반환"""
+        """이전 JSON 파일 경로 반환 (필터로 숨겨진 파일은 건너뜀)"""
         try:
-            current_row = -1
-            for row in range(self.file_list.rowCount()):
-                if self.file_list.item(row, 0).text() == self.current_json.name:
-                    current_row = row
-                    break
-                    
-            if current_row > 0:
-                prev_name = self.file_list.item(current_row - 1, 0).text()
-                return self.current_json.parent / prev_name
-                
+            return self._adjacent_json(-1)
         except Exception as e:
             logger.error(f"이전 JSON 파일 찾기 실패: {e}")
         return None
 
+    def _adjacent_json(self, step: int) -> Path:
+        """표시 중인 행 순서 기준으로 현재 JSON의 앞/뒤 파일 반환"""
+        if self.current_json is None:
+            return None
+        if self._file_rows_dirty or len(self._file_rows) != self.file_list.rowCount():
+            self._sync_file_rows()
+
+        position = self.file_index.position(self.current_json.name)
+        current = np.flatnonzero(self._file_rows == position) if position >= 0 else []
+        if len(current) == 0:
+            return None
+        visible = np.flatnonzero(self._row_visible)
+        if step > 0:
+            rows = visible[visible > current[0]]
+        else:
+            rows = visible[visible < current[0]][::-1]
+        if len(rows) == 0:
+            return None
+        return self.current_json.parent / self.file_list.item(int(rows[0]), 0).text()
+
     def get_keypoints_for_image(self, image_path: Path) -> list:
         """특정 이미지의 키포인트 데이터 반환"""
         try:
             keyframe_num = int(image_path.stem.split('_')[-1])
             json_path = self.current_json
-            if (self.current_json.parent / "edited" / self.current_json.name).exists():
+            if storage.exists(self.current_json.parent / "edited" / self.current_json.name):
                 json_path = self.current_json.parent / "edited" / self.current_json.name
                 
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('keypoints', {}).get(str(keyframe_num), [[0,0]]*13)
+            data = json.loads(storage.read_bytes(json_path))
+            return data.get('keypoints', {}).get(str(keyframe_num), [[0,0]]*13)
                 
         except Exception as e:
             logger.error(f"키포인트 데이터 로드 실패: {e}")
             return [[0,0]] * 13
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    import argparse
+    setup_logging()
+    parser = argparse.ArgumentParser(description="키포인트 라벨링 도구")
+    parser.add_argument('--no-restore', action='store_true', help="마지막 세션을 복원하지 않고 시작")
+    args, qt_args = parser.parse_known_args()
+
+    imported = time.perf_counter()
+    app = QApplication(sys.argv[:1] + qt_args)
     window = KeypointLabeler()
     window.show()
+    logger.info(f"시작 시간: 임포트 {(imported - _STARTED) * 1000:.0f}ms, "
+                f"창 표시까지 {(time.perf_counter() - _STARTED) * 1000:.0f}ms")
+    if not args.no_restore:
+        # 첫 화면을 그린 뒤 복원 시작
+        QTimer.singleShot(0, window.restore_session)
     sys.exit(app.exec_())
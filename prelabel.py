@@ -0,0 +1,327 @@
+import os
+import json
+import logging
+import argparse
+import importlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import NamedTuple
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import cv2
+import numpy as np
+
+import storage
+from storage import IMAGE_DIR, LABEL_DIR
+from decoder import decode_file
+from dataset_progress import EDITED_DIR
+from utils import edited_json_path, keyframe_number
+
+logger = logging.getLogger(__name__)
+
+NUM_KEYPOINTS = 17
+DEFAULT_PRELABEL_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+DEFAULT_BATCH_SIZE = 8
+# 이보다 점수가 낮은 포인트는 표시하지 않음 ((0, 0)으로 저장)
+MIN_SCORE = 0.3
+# 완료한 JSON 목록 (데이터셋 루트에 한 줄씩 추가, 다시 실행하면 건너뜀)
+PROGRESS_FILE = ".prelabel_progress"
+
+
+class PosePredictor(ABC):
+    """
+    포즈 예측기 플러그인 인터페이스.
+
+    predict()는 RGB 이미지 목록을 받아 (B, 17, 3) 배열 (이미지 픽셀 좌표 x, y와
+    점수 0~1)을 반환합니다. 예측기는 워커 프로세스마다 create_predictor()로
+    생성되므로 생성자 인자는 pickle 가능한 값이어야 합니다.
+    """
+    name = None
+
+    @abstractmethod
+    def predict(self, images) -> np.ndarray:
+        ...
+
+
+class StubPredictor(PosePredictor):
+    """이미지 크기에 비례한 고정 자세를 반환하는 테스트용 예측기 (눈/귀는 점수 0)"""
+    name = 'stub'
+
+    # 이미지 크기 대비 (x, y, 점수)
+    TEMPLATE = np.array([
+        [0.50, 0.15, 1.0],                                          # 코
+        [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0],  # 눈, 귀
+        [0.40, 0.30, 1.0], [0.60, 0.30, 1.0],                       # 어깨
+        [0.35, 0.45, 1.0], [0.65, 0.45, 1.0],                       # 팔꿈치
+        [0.33, 0.60, 1.0], [0.67, 0.60, 1.0],                       # 손목
+        [0.44, 0.60, 1.0], [0.56, 0.60, 1.0],                       # 골반
+        [0.43, 0.75, 1.0], [0.57, 0.75, 1.0],                       # 무릎
+        [0.42, 0.90, 1.0], [0.58, 0.90, 1.0],                       # 발목
+    ])
+
+    def predict(self, images):
+        sizes = np.array([[image.shape[1], image.shape[0], 1] for image in images], dtype=np.float64)
+        return self.TEMPLATE[None, :, :] * sizes[:, None, :]
+
+
+def decode_heatmaps(heatmaps, image_sizes):
+    """
+    (B, 17, h, w) 히트맵의 최대값 위치를 이미지 좌표 (B, 17, 3)로 변환.
+
+    최대값 위치는 이웃 값 기울기 방향으로 1/4 픽셀 보정합니다 (가장자리는 보정하지 않음).
+    """
+    heatmaps = np.asarray(heatmaps, dtype=np.float32)
+    batch, joints, h, w = heatmaps.shape
+    flat = heatmaps.reshape(batch, joints, -1)
+    index = flat.argmax(axis=2)
+    scores = np.take_along_axis(flat, index[..., None], axis=2)[..., 0]
+    x = (index % w).astype(np.float64)
+    y = (index // w).astype(np.float64)
+
+    b, j = np.meshgrid(np.arange(batch), np.arange(joints), indexing='ij')
+    xi, yi = x.astype(int), y.astype(int)
+    right = heatmaps[b, j, yi, np.minimum(xi + 1, w - 1)]
+    left = heatmaps[b, j, yi, np.maximum(xi - 1, 0)]
+    down = heatmaps[b, j, np.minimum(yi + 1, h - 1), xi]
+    up = heatmaps[b, j, np.maximum(yi - 1, 0), xi]
+    x += np.where((xi > 0) & (xi < w - 1), 0.25 * np.sign(right - left), 0.0)
+    y += np.where((yi > 0) & (yi < h - 1), 0.25 * np.sign(down - up), 0.0)
+
+    sizes = np.asarray(image_sizes, dtype=np.float64)  # (B, 2) 너비, 높이
+    x = (x + 0.5) * sizes[:, None, 0] / w - 0.5
+    y = (y + 0.5) * sizes[:, None, 1] / h - 0.5
+    return np.stack([x, y, np.clip(scores, 0.0, 1.0)], axis=2)
+
+
+class OpenCVDnnPredictor(PosePredictor):
+    """
+    OpenCV DNN으로 히트맵 방식(SimpleBaseline, HRNet 등) 포즈 모델을 실행하는 예측기.
+
+    사람 영역 검출 없이 이미지 전체를 모델 입력 크기로 늘려 배치로 추론하므로
+    한 사람이 화면 대부분을 차지하는 시퀀스에 적합합니다. 모델은 (B, 17, h, w)
+    히트맵을 출력해야 합니다 (ONNX, Caffe 등 cv2.dnn.readNet이 읽을 수 있는 형식).
+    """
+    name = 'opencv-dnn'
+
+    def __init__(self, model, input_size=(192, 256), mean=(0.485, 0.456, 0.406),
+                 std=(0.229, 0.224, 0.225)):
+        self.net = cv2.dnn.readNet(os.fspath(model))
+        self.input_size = tuple(input_size)  # (너비, 높이)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.std = np.asarray(std, dtype=np.float32)
+
+    def predict(self, images):
+        w, h = self.input_size
+        batch = np.stack([cv2.resize(image, (w, h), interpolation=cv2.INTER_LINEAR)
+                          for image in images]).astype(np.float32)
+        batch = (batch / 255.0 - self.mean) / self.std
+        self.net.setInput(np.ascontiguousarray(batch.transpose(0, 3, 1, 2)))
+        heatmaps = self.net.forward()
+        return decode_heatmaps(heatmaps, [(image.shape[1], image.shape[0]) for image in images])
+
+
+PREDICTORS = {cls.name: cls for cls in (StubPredictor, OpenCVDnnPredictor)}
+
+
+def create_predictor(name, options=None) -> PosePredictor:
+    """
+    이름으로 예측기 생성. 등록된 이름('stub', 'opencv-dnn') 또는 '모듈:클래스' 경로.
+    """
+    if name in PREDICTORS:
+        cls = PREDICTORS[name]
+    elif ':' in name:
+        module, _, attr = name.partition(':')
+        cls = getattr(importlib.import_module(module), attr)
+    else:
+        raise ValueError(f"알 수 없는 예측기입니다: {name}")
+    return cls(**(options or {}))
+
+
+class PrelabelResult(NamedTuple):
+    """JSON 한 개의 자동 라벨링 결과"""
+    json_path: str
+    frames: int   # 예측으로 채운 키프레임 수
+    points: int   # 표시된 포인트 수
+
+
+def find_jobs(base_path) -> list:
+    """
+    추출 이미지를 <이름>_<번호>.jpg 단위로 묶어 (JSON 경로, [(키프레임, 이미지 경로), ...]) 목록 생성
+    """
+    base_path = Path(base_path)
+    jobs = []
+    for sequence in storage.subdirs(base_path / IMAGE_DIR):
+        groups = {}
+        for path in storage.glob(base_path / IMAGE_DIR / sequence, "*_*.jpg"):
+            prefix, _, number = path.stem.rpartition('_')
+            if number.isdigit():
+                groups.setdefault(prefix, []).append((int(number), str(path)))
+        for prefix, frames in sorted(groups.items()):
+            json_path = base_path / LABEL_DIR / sequence / f"{prefix}.json"
+            jobs.append((str(json_path), sorted(frames)))
+    return jobs
+
+
+def _has_keypoints(segment):
+    return any(len(p) >= 2 and (p[0] or p[1]) for p in segment.get('keypoints') or [])
+
+
+def prelabel_file(predictor, job, batch_size=DEFAULT_BATCH_SIZE) -> PrelabelResult:
+    """
+    JSON 한 개의 빈 키프레임을 예측으로 채워 저장합니다.
+
+    편집 도구와 같이 edited 수정본을 우선 읽어 키포인트가 비어 있는 세그먼트만
+    채우고 (사람이 찍은 포인트는 덮어쓰지 않음), 결과는 edited 폴더에만 저장합니다.
+    JSON이 없으면 모든 프레임의 빈 세그먼트로 원본을 만든 뒤 같은 방식으로 채웁니다.
+    """
+    json_path, frames = job
+    json_path = Path(json_path)
+    images = dict(frames)
+    load_path = edited_json_path(json_path)
+    if storage.exists(load_path):
+        data = json.loads(storage.read_bytes(load_path))
+    else:
+        data = {'segmentation': [{'keyframe': frame, 'keypoints': []} for frame, _ in frames]}
+        storage.write_bytes(json_path, json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+    segments = [s for s in data.get('segmentation', [])
+                if not _has_keypoints(s) and keyframe_number(s.get('keyframe')) in images]
+    if not segments:
+        return PrelabelResult(str(json_path), 0, 0)
+
+    points = 0
+    for start in range(0, len(segments), batch_size):
+        batch = segments[start:start + batch_size]
+        paths = [images[keyframe_number(s['keyframe'])] for s in batch]
+        decoded = [decode_file(path, storage.read_array(path)) for path in paths]
+        predictions = np.asarray(predictor.predict(decoded), dtype=np.float64)
+        shown = predictions[:, :NUM_KEYPOINTS, 2] >= MIN_SCORE
+        coords = np.where(shown[..., None], np.rint(predictions[:, :NUM_KEYPOINTS, :2]), 0)
+        for segment, keypoints in zip(batch, coords.astype(int).tolist()):
+            segment['keypoints'] = keypoints
+        points += int(shown.sum())
+
+    data['prelabel'] = {'model': predictor.name or type(predictor).__name__}
+    save_path = json_path.parent / EDITED_DIR / json_path.name
+    storage.write_bytes(save_path, json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+    return PrelabelResult(str(json_path), len(segments), points)
+
+
+# 워커 프로세스마다 한 번 생성한 예측기
+_worker_predictor = None
+
+
+def _init_worker(name, options):
+    global _worker_predictor
+    _worker_predictor = create_predictor(name, options)
+
+
+def _prelabel_job(job, batch_size):
+    return prelabel_file(_worker_predictor, job, batch_size)
+
+
+def _read_progress(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return {line.rstrip('\n') for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def prelabel_dataset(base_path, name, options=None, workers=DEFAULT_PRELABEL_WORKERS,
+                     batch_size=DEFAULT_BATCH_SIZE, resume=True, on_result=None):
+    """
+    데이터셋 전체를 프로세스 풀에서 자동 라벨링합니다.
+
+    워커마다 예측기를 한 번 만들고 JSON 단위 작업을 배치 추론합니다. 대기 중인
+    작업은 워커 수의 2배로 제한되어 큰 데이터셋에서도 메모리가 일정하며, 끝난
+    JSON은 데이터셋 루트의 진행 파일에 기록되어 중단 후 다시 실행하면 건너뜁니다.
+
+    :param name: 예측기 이름 (create_predictor 참고)
+    :param workers: 워커 프로세스 수 (storage.process_pool 참고)
+    :param resume: False이면 진행 파일을 무시하고 처음부터 실행
+    :param on_result: 작업이 끝날 때마다 (PrelabelResult, 완료 수, 전체 수)로 호출
+    :return: PrelabelResult 목록 (실패한 작업은 경고 후 제외)
+    """
+    progress_path = Path(base_path) / PROGRESS_FILE if storage.is_local(base_path) else None
+    done = _read_progress(progress_path) if progress_path and resume else set()
+    jobs = [job for job in find_jobs(base_path) if job[0] not in done]
+    results = []
+    if not jobs:
+        return results
+
+    progress = open(progress_path, 'a', encoding='utf-8') if progress_path else None
+
+    def finished(job, result):
+        results.append(result)
+        if progress is not None:
+            progress.write(job[0] + '\n')
+            progress.flush()
+        if on_result is not None:
+            on_result(result, len(results), len(jobs))
+
+    try:
+        executor = storage.process_pool(base_path, workers, len(jobs),
+                                        initializer=_init_worker, initargs=(name, options))
+        if executor is None:
+            predictor = create_predictor(name, options)
+            for job in jobs:
+                try:
+                    finished(job, prelabel_file(predictor, job, batch_size))
+                except Exception as e:
+                    logger.warning(f"자동 라벨링 실패: {job[0]}: {e}")
+            return results
+
+        with executor:
+            pending = {}
+            queue = iter(jobs)
+            while True:
+                for job in queue:
+                    pending[executor.submit(_prelabel_job, job, batch_size)] = job
+                    if len(pending) >= workers * 2:
+                        break
+                if not pending:
+                    break
+                completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    job = pending.pop(future)
+                    try:
+                        finished(job, future.result())
+                    except Exception as e:
+                        logger.warning(f"자동 라벨링 실패: {job[0]}: {e}")
+        return results
+    finally:
+        if progress is not None:
+            progress.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="포즈 예측 모델로 빈 키포인트 자동 라벨링")
+    parser.add_argument('base_path', help="최상위 데이터 폴더")
+    parser.add_argument('-m', '--model', default=OpenCVDnnPredictor.name,
+                        help="예측기 이름 (stub, opencv-dnn) 또는 '모듈:클래스'")
+    parser.add_argument('-w', '--weights', help="opencv-dnn 모델 파일 (.onnx 등)")
+    parser.add_argument('--input-size', type=int, nargs=2, metavar=('W', 'H'))
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_PRELABEL_WORKERS)
+    parser.add_argument('-b', '--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--restart', action='store_true', help="진행 기록을 무시하고 처음부터")
+    args = parser.parse_args(argv)
+
+    options = {}
+    if args.weights:
+        options['model'] = args.weights
+    if args.input_size:
+        options['input_size'] = tuple(args.input_size)
+
+    def report(result, count, total):
+        print(f"[{count}/{total}] {Path(result.json_path).name}: "
+              f"{result.frames}개 프레임, {result.points}개 포인트")
+
+    results = prelabel_dataset(args.base_path, args.model, options, args.workers,
+                               args.batch_size, resume=not args.restart, on_result=report)
+    print(f"{len(results)}개 JSON 처리, {sum(r.frames for r in results)}개 프레임 자동 라벨링")
+
+
+if __name__ == '__main__':
+    from logging_setup import setup_logging
+    setup_logging()
+    main()
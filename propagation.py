@@ -0,0 +1,153 @@
+import logging
+import threading
+from typing import NamedTuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from geometry import Affine
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# 현재 프레임에서 이어서 추적할 프레임 수
+PROPAGATE_FRAMES = 5
+# 이보다 신뢰도가 낮은 포인트는 제안하지 않음
+MIN_CONFIDENCE = 0.5
+LK_WINDOW = (21, 21)
+LK_LEVELS = 3
+LK_CRITERIA = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 30, 0.01)
+# 순방향-역방향 추적 오차(px)가 이 값일 때 신뢰도가 1/e로 떨어짐
+FB_ERROR_SCALE = 2.0
+PYRAMID_CACHE_SIZE = 2 * PROPAGATE_FRAMES
+
+
+class Proposal(NamedTuple):
+    """한 프레임에 대한 추적 결과 (신뢰도가 낮은 포인트는 (0, 0), 신뢰도 0)"""
+    frame: int
+    keypoints: list         # 17개 [x, y] (저장 좌표계)
+    confidence: np.ndarray  # (17,) 0~1, 앞 프레임들의 신뢰도가 곱해진 누적 값
+
+    @property
+    def proposed(self):
+        return (self.confidence >= MIN_CONFIDENCE).tolist()
+
+
+def _gray(image):
+    if image.ndim == 2:
+        return image
+    return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+
+
+class KeypointTracker:
+    """
+    피라미드 Lucas-Kanade 광학 흐름으로 키포인트를 다음 프레임들로 추적하는 워커.
+
+    추적은 전용 스레드 하나에서 수행되며 (OpenCV가 GIL을 놓으므로 GUI는 막히지
+    않음), 프레임별 회색조 영상과 피라미드는 경로 단위로 보관해 이어지는 추적
+    요청에서 다시 만들지 않습니다. 포인트별 신뢰도는 순방향-역방향 추적 오차로
+    계산합니다.
+    """
+
+    def __init__(self, pyramid_cache=PYRAMID_CACHE_SIZE):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tracker")
+        self._pyramids = OrderedDict()  # 프레임 키 -> (배열 크기, 회색조 영상, 피라미드)
+        self._cache_size = pyramid_cache
+        self._lock = threading.Lock()
+        # 피라미드 입력을 받지 않는 OpenCV 바인딩이면 False (회색조 영상만 재사용)
+        self._use_pyramids = True
+
+    def submit(self, start, keypoints, targets, image_size=None):
+        """
+        추적 요청. Proposal 목록을 결과로 하는 Future 반환.
+
+        :param start: 시작 프레임 (키, RGB 이미지 또는 이미지를 결과로 하는 Future)
+        :param keypoints: 시작 프레임의 17개 [x, y] ((0, 0)은 추적하지 않음)
+        :param targets: [(프레임 번호, 키, 이미지 또는 Future), ...] 추적할 순서대로
+        :param image_size: 키포인트 좌표계의 (너비, 높이). 생략하면 이미지 자체 크기
+        """
+        return self._executor.submit(self.track, start, keypoints, targets, image_size)
+
+    def _pyramid(self, key, image):
+        """프레임의 LK 피라미드 (보관된 것이 있으면 재사용)"""
+        with self._lock:
+            cached = self._pyramids.get(key)
+            if cached is not None:
+                self._pyramids.move_to_end(key)
+                return cached
+        if isinstance(image, Future):
+            image = image.result()
+        gray = _gray(image)
+        pyramid = None
+        if self._use_pyramids:
+            _, pyramid = cv2.buildOpticalFlowPyramid(gray, LK_WINDOW, LK_LEVELS)
+        entry = ((gray.shape[1], gray.shape[0]), gray, pyramid)
+        with self._lock:
+            self._pyramids[key] = entry
+            while len(self._pyramids) > self._cache_size:
+                self._pyramids.popitem(last=False)
+        return entry
+
+    def track(self, start, keypoints, targets, image_size=None):
+        """동기 추적 (submit의 작업 함수)"""
+        start_key, start_image = start
+        size, *prev = self._pyramid(start_key, start_image)
+        to_array = Affine.between(image_size or size, size)
+        to_stored = to_array.inverse()
+
+        stored = np.asarray(keypoints, dtype=np.float64).reshape(-1, 2)
+        points = to_array.apply(stored).astype(np.float32)
+        confidence = np.any(stored != 0, axis=1).astype(np.float64)
+
+        proposals = []
+        for frame, key, image in targets:
+            alive = confidence >= MIN_CONFIDENCE
+            if not alive.any():
+                break
+            with span('propagate.step'):
+                _, *nxt = self._pyramid(key, image)
+                moved, step_confidence = self._step(prev, nxt, points[alive])
+            points[alive] = moved
+            confidence[alive] *= step_confidence
+            confidence[~alive] = 0
+
+            keep = confidence >= MIN_CONFIDENCE
+            out = np.rint(to_stored.apply(points)).astype(int)
+            out[~keep] = 0
+            proposals.append(Proposal(frame, out.tolist(), confidence.copy()))
+            prev = nxt
+        logger.debug("키포인트 추적: %d개 프레임", len(proposals))
+        return proposals
+
+    def _step(self, prev, nxt, points):
+        """한 프레임 추적. prev/nxt는 (회색조 영상, 피라미드)"""
+        if self._use_pyramids and prev[1] is not None and nxt[1] is not None:
+            try:
+                return self._flow(list(prev[1]), list(nxt[1]), points)
+            except cv2.error:
+                logger.debug("피라미드 입력을 지원하지 않는 OpenCV: 회색조 영상으로 추적")
+                self._use_pyramids = False
+        return self._flow(prev[0], nxt[0], points)
+
+    @staticmethod
+    def _flow(prev, nxt, points):
+        """순방향/역방향 LK 추적. (이동한 점 (N, 2), 점별 신뢰도 (N,))"""
+        params = dict(winSize=LK_WINDOW, maxLevel=LK_LEVELS, criteria=LK_CRITERIA)
+        start = points.reshape(-1, 1, 2)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(prev, nxt, start, None, **params)
+        back, back_status, _ = cv2.calcOpticalFlowPyrLK(nxt, prev, moved, None, **params)
+        fb_error = np.linalg.norm((back - start).reshape(-1, 2), axis=1)
+        ok = (status.ravel() == 1) & (back_status.ravel() == 1) & np.isfinite(fb_error)
+        confidence = np.where(ok, np.exp(-fb_error / FB_ERROR_SCALE), 0.0)
+        return moved.reshape(-1, 2), confidence
+
+    def clear(self):
+        """보관한 피라미드 제거 (다른 JSON으로 이동 시)"""
+        with self._lock:
+            self._pyramids.clear()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.clear()
@@ -0,0 +1,214 @@
+import os
+import heapq
+import logging
+import itertools
+import threading
+from concurrent.futures import Future, CancelledError
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# 파일 입출력 스레드 수 (0이면 요청한 스레드에서 바로 실행하고 결과도 바로 전달)
+IO_THREADS_ENV = "KEYPOINT_IO_THREADS"
+DEFAULT_IO_THREADS = 3
+
+# 작업 우선순위 (클수록 먼저 실행). 표시할 프레임 > 저장 > 미리 받기 > 스캔
+PRIORITY_SCAN = 0
+PRIORITY_PREFETCH = 1
+PRIORITY_SAVE = 2
+PRIORITY_FRAME = 3
+
+
+class CancelToken:
+    """
+    작업 취소 표시. 여러 작업이 공유할 수 있으며, 대기 중인 작업은 실행하지 않고
+    실행 중인 작업은 cancelled를 확인해 스스로 중단합니다.
+    """
+    __slots__ = ('_event',)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+class TaskFuture(Future):
+    """취소 시 토큰도 함께 취소하는 Future (실행 중인 작업은 토큰으로만 중단)"""
+
+    def __init__(self, token):
+        super().__init__()
+        self.token = token
+
+    def cancel(self):
+        self.token.cancel()
+        return super().cancel()
+
+
+class _Task:
+    __slots__ = ('fn', 'args', 'priority', 'future', 'on_done', 'name')
+
+    def __init__(self, fn, args, priority, future, on_done, name):
+        self.fn = fn
+        self.args = args
+        self.priority = priority
+        self.future = future
+        self.on_done = on_done
+        self.name = name
+
+    @property
+    def background(self):
+        return self.priority < PRIORITY_SAVE
+
+
+class _Runner(QRunnable):
+    def __init__(self, scheduler, task):
+        super().__init__()
+        self.scheduler = scheduler
+        self.task = task
+
+    def run(self):
+        self.scheduler._run(self.task)
+
+
+class TaskScheduler(QObject):
+    """
+    파일 입출력 작업을 우선순위 순서로 QThreadPool에서 실행하는 스케줄러.
+
+    대기열은 우선순위 힙으로 직접 관리하고 빈 스레드가 생길 때마다 가장 급한
+    작업을 풀에 넘깁니다. 미리 받기/스캔 작업은 스레드 하나를 남겨 두고만 실행하므로
+    오래 걸리는 폴더 스캔 중에도 표시할 프레임과 저장은 바로 시작됩니다.
+
+    결과는 on_done(future)으로 GUI 스레드에 전달되며, 토큰이 취소된 작업의 결과는
+    전달하지 않습니다.
+    """
+    _finished = pyqtSignal(object, object)  # on_done, Future (작업 스레드 -> GUI 스레드)
+
+    def __init__(self, threads=None, parent=None):
+        super().__init__(parent)
+        if threads is None:
+            threads = int(os.environ.get(IO_THREADS_ENV, DEFAULT_IO_THREADS))
+        # 같은 파일을 읽는 작업이 저장 완료를 기다릴 수 있으므로 스레드는 최소 2개
+        self.threads = 0 if threads <= 0 else max(2, threads)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, self.threads))
+        self._lock = threading.Lock()
+        self._queue = []   # (-우선순위, 순번, 작업) 힙
+        self._order = itertools.count()
+        self._active = set()   # 실행 중인 작업
+        self._running_background = 0
+        self._closed = False
+        self._finished.connect(self._deliver)
+
+    def submit(self, fn, *args, priority=PRIORITY_SCAN, token=None, on_done=None, name=None):
+        """
+        작업 등록. 작업 결과를 담는 TaskFuture 반환.
+
+        :param token: 공유할 CancelToken (생략하면 작업마다 새로 생성)
+        :param on_done: 완료 시 GUI 스레드에서 호출할 함수 (인자: Future)
+        :param name: 계측 구간 이름 (생략하면 함수 이름)
+        """
+        future = TaskFuture(token or CancelToken())
+        task = _Task(fn, args, priority, future, on_done, name or getattr(fn, '__name__', 'task'))
+        if not self.threads:
+            self._execute(task)
+            self._deliver(on_done, future)
+            return future
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("종료된 스케줄러에는 작업을 등록할 수 없습니다.")
+            heapq.heappush(self._queue, (-priority, next(self._order), task))
+        self._dispatch()
+        return future
+
+    def _dispatch(self):
+        """빈 스레드 수만큼 대기열에서 꺼내 실행 (미리 받기/스캔은 스레드 하나를 남겨 둠)"""
+        started, skipped = [], []
+        with self._lock:
+            while self._queue and len(self._active) < self.threads:
+                task = self._queue[0][2]
+                if task.future.token.cancelled:
+                    heapq.heappop(self._queue)
+                    skipped.append(task)
+                    continue
+                if task.background and self._running_background >= self.threads - 1:
+                    break  # 힙의 나머지도 모두 우선순위가 같거나 낮음
+                heapq.heappop(self._queue)
+                self._active.add(task)
+                self._running_background += task.background
+                started.append(task)
+        for task in skipped:
+            task.future.cancel()
+        for task in started:
+            self._pool.start(_Runner(self, task))
+
+    def _run(self, task):
+        """작업 스레드: 실행 후 다음 작업을 넘기고 결과 전달"""
+        try:
+            self._execute(task)
+        finally:
+            with self._lock:
+                self._active.discard(task)
+                self._running_background -= task.background
+            self._dispatch()
+        if task.on_done is not None:
+            self._finished.emit(task.on_done, task.future)
+
+    def _execute(self, task):
+        future = task.future
+        if future.token.cancelled:
+            future.cancel()
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            with span(f'task.{task.name}', priority=task.priority):
+                result = task.fn(*task.args)
+        except CancelledError as e:
+            # 실행 중 토큰을 확인하고 중단한 작업
+            future.set_exception(e)
+        except BaseException as e:
+            logger.debug("작업 실패: %s: %s", task.name, e)
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def _deliver(self, on_done, future):
+        """GUI 스레드: 취소되지 않은 작업의 결과 전달"""
+        if on_done is None or self._closed or future.cancelled() or future.token.cancelled:
+            return
+        on_done(future)
+
+    def pending(self):
+        """대기 중이거나 실행 중인 작업 수"""
+        with self._lock:
+            return len(self._queue) + len(self._active)
+
+    def wait_for_done(self, msecs=-1):
+        """대기 중인 작업 완료 대기 (테스트/종료용)"""
+        return self._pool.waitForDone(msecs)
+
+    def shutdown(self):
+        """
+        종료. 대기 중인 미리 받기/스캔은 취소하고 (실행 중이면 토큰으로 중단 요청)
+        저장과 프레임 읽기는 끝날 때까지 기다립니다. 이후 결과는 전달하지 않습니다.
+        """
+        with self._lock:
+            self._closed = True
+            cancelled = [task for _, _, task in self._queue if task.background]
+            running = [task for task in self._active if task.background]
+            self._queue = [entry for entry in self._queue if not entry[2].background]
+            heapq.heapify(self._queue)
+        for task in cancelled:
+            task.future.cancel()
+        for task in running:
+            task.future.token.cancel()
+        while self.pending():
+            self._pool.waitForDone(100)
+        self._pool.waitForDone()
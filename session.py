@@ -0,0 +1,58 @@
+import os
+import json
+import logging
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 KEYPOINT_SESSION으로 세션 파일 위치 변경 가능
+SESSION_ENV = "KEYPOINT_SESSION"
+SESSION_VERSION = 1
+
+
+class Session(NamedTuple):
+    """프로그램 종료 시 저장하고 다음 실행 때 복원하는 작업 위치"""
+    dataset: str             # set_dataset에 넘긴 폴더, 아카이브 경로 또는 URL
+    sequence: str = ''       # 하위 폴더(시퀀스) 이름
+    json_name: str = ''      # 작업 중이던 JSON 파일 이름
+    frame: int = 0           # 현재 JSON에서의 이미지 순번
+    geometry: str = ''       # QMainWindow.saveGeometry (base64)
+    window_state: str = ''   # QMainWindow.saveState (base64)
+
+
+def default_session_path() -> Path:
+    """세션 파일 기본 위치"""
+    return Path(os.environ.get(SESSION_ENV) or Path.home() / ".config" / "keypoint_labeler" / "session.json")
+
+
+def load_session(path=None) -> Optional[Session]:
+    """저장된 세션 반환 (없거나 읽을 수 없으면 None)"""
+    path = Path(path) if path else default_session_path()
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"세션 파일을 읽을 수 없습니다: {path}: {e}")
+        return None
+    if data.get('version') != SESSION_VERSION or not data.get('dataset'):
+        return None
+    fields = {name: data[name] for name in Session._fields if name in data}
+    try:
+        return Session(**fields)._replace(frame=int(fields.get('frame', 0)))
+    except (TypeError, ValueError) as e:
+        logger.warning(f"세션 파일 형식 오류: {path}: {e}")
+        return None
+
+
+def save_session(session: Session, path=None) -> Path:
+    """세션 저장 (임시 파일에 쓴 뒤 교체하므로 중간에 끊겨도 이전 세션이 남음)"""
+    path = Path(path) if path else default_session_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': SESSION_VERSION, **session._asdict()}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,257 @@
+import io
+import os
+import json
+import mmap
+import logging
+import argparse
+from pathlib import Path
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+import storage
+from storage import IMAGE_DIR
+from utils import iter_label_files, labeled_segments
+from annotation_diff import keypoint_array, NUM_KEYPOINTS
+from decoder import decode_file
+from geometry import read_image_size, PROBE_BYTES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD_SIZE = 1024
+DEFAULT_EXPORT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+JPEG = 'jpeg'
+RAW = 'raw'
+# COCO 형식 가시성 값 (표시된 포인트)
+VISIBLE = 2
+# 인덱스 열: 데이터 파일 내 오프셋, 길이, 원본 너비, 원본 높이
+INDEX_COLUMNS = ('offset', 'length', 'width', 'height')
+
+
+class Sample(NamedTuple):
+    """학습 샘플 한 개 (라벨링된 키프레임과 그 이미지)"""
+    sequence: str
+    name: str          # JSON 파일 이름 (확장자 제외)
+    keyframe: int
+    image_path: str
+    keypoints: list    # 17개 [x, y] (원본 좌표, (0, 0)은 표시 안 함)
+
+    @property
+    def key(self):
+        return f"{self.sequence}/{self.name}/{self.keyframe}"
+
+
+def collect_samples(base_path) -> list:
+    """
+    데이터셋의 라벨링된 키프레임 목록. JSON은 edited 수정본을 우선 사용하며,
+    키포인트가 없거나 추출 이미지가 없는 키프레임은 제외합니다.
+    """
+    base_path = Path(base_path)
+    samples = []
+    for folder, json_path, data in iter_label_files(base_path):
+        image_folder = base_path / IMAGE_DIR / folder.name
+        seen = set()
+        for keyframe, points in labeled_segments(data, json_path):
+            if keyframe in seen:
+                continue
+            seen.add(keyframe)
+            image_path = image_folder / f"{json_path.stem}_{keyframe}.jpg"
+            if not storage.exists(image_path):
+                continue
+            samples.append(Sample(folder.name, json_path.stem, keyframe,
+                                  str(image_path), [list(p[:2]) for p in points]))
+    return samples
+
+
+def _shard_files(out_dir, shard):
+    stem = Path(out_dir) / f"shard_{shard:05d}"
+    return {
+        'keypoints': stem.with_suffix('.keypoints.npy'),
+        'index': stem.with_suffix('.index.npy'),
+        'data': stem.with_suffix('.data'),
+    }
+
+
+def write_shard(job):
+    """
+    샘플 묶음을 샤드 하나로 기록 (워커 프로세스에서 실행).
+
+    - keypoints: (N, 17, 3) float32 (x, y, 가시성) 메모리 맵 배열
+    - index: (N, 4) int64 (데이터 오프셋, 길이, 원본 너비, 원본 높이)
+    - data: JPEG 원본 바이트를 이어 붙인 파일, 또는 (N, h, w, 3) RGB 픽셀
+
+    raw 모드의 키포인트는 축소된 이미지 좌표로 저장됩니다.
+    :return: (샤드 번호, 기록한 샘플 수)
+    """
+    out_dir, shard, samples, mode, raw_size = job
+    files = _shard_files(out_dir, shard)
+    count = len(samples)
+    keypoints = np.lib.format.open_memmap(files['keypoints'], mode='w+', dtype=np.float32,
+                                          shape=(count, NUM_KEYPOINTS, 3))
+    index = np.lib.format.open_memmap(files['index'], mode='w+', dtype=np.int64,
+                                      shape=(count, len(INDEX_COLUMNS)))
+    offset = 0
+    with open(files['data'], 'wb') as data:
+        for i, sample in enumerate(samples):
+            encoded = storage.read_array(sample.image_path)
+            points = keypoint_array(sample.keypoints)
+            shown = np.any(points != 0, axis=1)
+            if mode == RAW:
+                image = decode_file(sample.image_path, encoded)
+                height, width = image.shape[:2]
+                payload = cv2.resize(image, raw_size, interpolation=cv2.INTER_AREA)
+                points = points * (raw_size[0] / width, raw_size[1] / height)
+            else:
+                size = read_image_size(io.BytesIO(encoded[:PROBE_BYTES].tobytes()))
+                width, height = size if size else (0, 0)
+                payload = encoded
+            data.write(payload.tobytes())
+            keypoints[i, :, :2] = np.where(shown[:, None], points, 0)
+            keypoints[i, :, 2] = np.where(shown, VISIBLE, 0)
+            index[i] = (offset, payload.nbytes, width, height)
+            offset += payload.nbytes
+    keypoints.flush()
+    index.flush()
+    del keypoints, index
+    return shard, count
+
+
+def export_shards(base_path, out_dir, shard_size=DEFAULT_SHARD_SIZE, mode=JPEG,
+                  raw_size=None, workers=DEFAULT_EXPORT_WORKERS):
+    """
+    데이터셋의 라벨링된 프레임을 고정 크기 샤드로 내보내고 manifest.json을 작성합니다.
+
+    샤드는 프로세스 풀에서 병렬로 기록되며, 읽을 때는 ShardReader로 파싱 없이
+    임의 접근할 수 있습니다.
+
+    :param mode: 'jpeg'(원본 바이트) 또는 'raw'(raw_size로 축소한 RGB 픽셀)
+    :param raw_size: raw 모드의 (너비, 높이)
+    :param workers: 워커 프로세스 수 (storage.process_pool 참고)
+    :return: manifest.json 경로
+    """
+    if mode not in (JPEG, RAW):
+        raise ValueError(f"지원하지 않는 형식입니다: {mode}")
+    if mode == RAW and not raw_size:
+        raise ValueError("raw 형식은 raw_size (너비, 높이)가 필요합니다.")
+    raw_size = tuple(raw_size) if raw_size else None
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    samples = collect_samples(base_path)
+    chunks = [samples[i:i + shard_size] for i in range(0, len(samples), shard_size)]
+    jobs = [(str(out_dir), shard, chunk, mode, raw_size) for shard, chunk in enumerate(chunks)]
+    executor = storage.process_pool(base_path, workers, len(jobs))
+    if executor is None:
+        written = list(map(write_shard, jobs))
+    else:
+        with executor:
+            written = list(executor.map(write_shard, jobs))
+
+    shards = []
+    for (shard, count), chunk in zip(written, chunks):
+        files = _shard_files(out_dir, shard)
+        shards.append({
+            'count': count,
+            'files': {kind: path.name for kind, path in files.items()},
+            'samples': [sample.key for sample in chunk],
+        })
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'mode': mode,
+        'raw_size': list(raw_size) if raw_size else None,
+        'keypoints': NUM_KEYPOINTS,
+        'index_columns': list(INDEX_COLUMNS),
+        'num_samples': len(samples),
+        'shards': shards,
+    }
+    path = out_dir / MANIFEST_NAME
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    logger.info(f"샤드 내보내기: {len(samples)}개 샘플, {len(shards)}개 샤드 -> {out_dir}")
+    return path
+
+
+class ShardReader:
+    """
+    export_shards로 만든 샤드를 메모리 맵으로 열어 샘플 단위로 임의 접근하는 리더.
+
+    reader[i]는 (이미지, (17, 3) 키포인트)를 반환합니다. 이미지는 jpeg 모드에서는
+    인코딩된 바이트 배열(uint8, 복사 없음), raw 모드에서는 (h, w, 3) RGB 배열입니다.
+    """
+
+    def __init__(self, manifest_path):
+        manifest_path = Path(manifest_path)
+        if manifest_path.is_dir():
+            manifest_path = manifest_path / MANIFEST_NAME
+        with open(manifest_path, encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.mode = self.manifest['mode']
+        self.raw_size = self.manifest['raw_size']
+        root = manifest_path.parent
+        self._keypoints, self._index, self._data, self._files = [], [], [], []
+        for shard in self.manifest['shards']:
+            files = shard['files']
+            self._keypoints.append(np.load(root / files['keypoints'], mmap_mode='r'))
+            self._index.append(np.load(root / files['index'], mmap_mode='r'))
+            f = open(root / files['data'], 'rb')
+            self._files.append(f)
+            self._data.append(np.frombuffer(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), np.uint8)
+                              if os.fstat(f.fileno()).st_size else np.zeros(0, np.uint8))
+        self._starts = np.cumsum([0] + [s['count'] for s in self.manifest['shards']])
+
+    def __len__(self):
+        return int(self._starts[-1])
+
+    def locate(self, i):
+        """전체 샘플 번호 -> (샤드 번호, 샤드 내 번호)"""
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        shard = int(np.searchsorted(self._starts, i, side='right')) - 1
+        return shard, i - int(self._starts[shard])
+
+    def keypoints(self, i):
+        shard, j = self.locate(i)
+        return self._keypoints[shard][j]
+
+    def __getitem__(self, i):
+        shard, j = self.locate(i)
+        offset, length = self._index[shard][j, :2]
+        image = self._data[shard][offset:offset + length]
+        if self.mode == RAW:
+            w, h = self.raw_size
+            image = image.reshape(h, w, 3)
+        return image, self._keypoints[shard][j]
+
+    def close(self):
+        self._keypoints.clear()
+        self._index.clear()
+        self._data.clear()
+        for f in self._files:
+            f.close()
+        self._files.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="라벨링된 프레임을 학습용 샤드로 내보내기")
+    parser.add_argument('base_path', help="최상위 데이터 폴더")
+    parser.add_argument('-o', '--output', default='shards', help="샤드를 저장할 폴더")
+    parser.add_argument('-n', '--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument('--raw', type=int, nargs=2, metavar=('W', 'H'),
+                        help="JPEG 대신 이 크기로 축소한 RGB 픽셀로 저장")
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_EXPORT_WORKERS)
+    args = parser.parse_args(argv)
+
+    path = export_shards(args.base_path, args.output, args.shard_size,
+                         RAW if args.raw else JPEG, args.raw, args.workers)
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    print(f"{manifest['num_samples']}개 샘플을 {len(manifest['shards'])}개 샤드로 저장: {path}")
+
+
+if __name__ == '__main__':
+    from logging_setup import setup_logging
+    setup_logging()
+    main()
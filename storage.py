@@ -0,0 +1,660 @@
+import os
+import json
+import mmap
+import time
+import zlib
+import queue
+import fnmatch
+import hashlib
+import logging
+import tarfile
+import threading
+import zipfile
+from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import get_context
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+IMAGE_DIR = "1.추출 이미지 데이터"
+LABEL_DIR = "2.라벨링데이터"
+ARCHIVE_SUFFIXES = ('.zip', '.tar')
+# 아카이브 데이터셋의 수정본을 저장하는 옆 폴더 (<아카이브 이름>_edited)
+SIDE_DIR_SUFFIX = "_edited"
+URL_SCHEMES = ('http://', 'https://')
+DEFAULT_HTTP_CONNECTIONS = 8
+DEFAULT_HTTP_CACHE_MB = 256   # 원격 파일 내용 메모리 보관 상한
+HTTP_TIMEOUT = 30
+
+_ZIP_LOCAL_HEADER = b'PK\x03\x04'
+_ZIP_UTF8_FLAG = 0x800
+
+
+class LocalStorage:
+    """로컬 파일 시스템 (경로를 그대로 사용)"""
+    is_local = True
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    def is_dir(self, path):
+        return os.path.isdir(path)
+
+    def list_dir(self, path):
+        """폴더 바로 아래의 이름 목록 (폴더가 없으면 빈 목록)"""
+        try:
+            return os.listdir(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+    def glob(self, folder, pattern):
+        return Path(folder).glob(pattern)
+
+    def read_bytes(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def read_array(self, path):
+        """파일 내용을 uint8 배열로 읽기"""
+        return np.fromfile(os.fspath(path), np.uint8)
+
+    def read_range(self, path, offset, length):
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def write_bytes(self, path, data):
+        """상위 폴더를 만들고 임시 파일에 쓴 뒤 교체 (중간에 종료되어도 기존 파일 유지)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def read_async(self, path):
+        return _completed(self.read_array, path)
+
+    def prefetch(self, paths):
+        pass
+
+    def cache_key(self, path):
+        """경로 + 수정 시각 + 크기 기반 캐시 키 (파일이 바뀌면 키도 바뀜)"""
+        stat = os.stat(path)
+        raw = f"{Path(path).resolve()}|{stat.st_mtime_ns}|{stat.st_size}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def close(self):
+        pass
+
+
+LOCAL = LocalStorage()
+
+
+class _Member:
+    """아카이브 멤버 위치 정보 (zip은 데이터 시작 위치를 처음 읽을 때 확인)"""
+    __slots__ = ('header_offset', 'offset', 'size', 'compressed_size', 'method', 'crc')
+
+    def __init__(self, header_offset, offset, size, compressed_size, method, crc):
+        self.header_offset = header_offset
+        self.offset = offset
+        self.size = size
+        self.compressed_size = compressed_size
+        self.method = method
+        self.crc = crc
+
+
+class _IndexedStorage:
+    """멤버 목록으로 만든 폴더 색인을 조회하는 저장소 (아카이브, HTTP 공통)"""
+    is_local = False
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._members = {}        # 멤버 경로 -> 위치 정보
+        self._dirs = {'': set()}  # 폴더 경로 -> 하위 이름
+        self._prefix = ''         # 데이터셋 루트에 해당하는 멤버 경로 접두어
+
+    def _add(self, name, member=None):
+        """멤버와 모든 상위 폴더를 색인에 등록 (member가 None이면 폴더)"""
+        parts = name.strip('/').split('/')
+        for depth in range(len(parts)):
+            parent = '/'.join(parts[:depth])
+            self._dirs.setdefault(parent, set()).add(parts[depth])
+        if member is None:
+            self._dirs.setdefault('/'.join(parts), set())
+        else:
+            self._members['/'.join(parts)] = member
+
+    def _name(self, path):
+        """루트 기준 경로를 멤버 경로로 변환"""
+        rel = Path(path).relative_to(self.root).as_posix()
+        return self._prefix.rstrip('/') if rel == '.' else self._prefix + rel
+
+    def glob(self, folder, pattern):
+        folder = Path(folder)
+        return [folder / name for name in self.list_dir(folder)
+                if fnmatch.fnmatchcase(name, pattern) and not self.is_dir(folder / name)]
+
+    def read_bytes(self, path):
+        return self.read_array(path).tobytes()
+
+    def read_async(self, path):
+        return _completed(self.read_array, path)
+
+    def prefetch(self, paths):
+        pass
+
+
+def _zip_member_name(info):
+    """UTF-8 플래그가 없는 zip 파일명은 한국어 Windows(cp949)에서 만든 것으로 간주"""
+    if info.flag_bits & _ZIP_UTF8_FLAG:
+        return info.filename
+    try:
+        return info.filename.encode('cp437').decode('cp949')
+    except UnicodeError:
+        return info.filename
+
+
+class ArchiveStorage(_IndexedStorage):
+    """
+    zip/tar 아카이브를 압축 해제 없이 데이터셋 폴더처럼 사용하는 저장소.
+
+    아카이브 경로 자체를 데이터셋 루트로 사용하며 (예: ds.zip/2.라벨링데이터/...),
+    열 때 멤버 목록만 한 번 읽어 폴더 구조를 색인합니다. 파일 내용은 아카이브를
+    메모리 맵으로 열어 해당 구간을 그대로 반환하므로 (무압축 멤버는 복사 없음)
+    JPEG 바이트가 바로 cv2.imdecode로 전달됩니다.
+
+    아카이브는 읽기 전용이며, 쓰기는 옆 폴더(<아카이브 이름>_edited)의 같은 상대
+    경로로 저장됩니다. 조회 시 옆 폴더의 파일이 아카이브 멤버보다 우선합니다.
+    """
+    def __init__(self, archive_path, side_dir=None):
+        super().__init__(archive_path)
+        self.side_dir = (Path(side_dir) if side_dir else
+                         self.root.with_name(self.root.stem + SIDE_DIR_SUFFIX))
+        stat = os.stat(self.root)
+        self._stamp = f"{self.root.resolve()}|{stat.st_mtime_ns}|{stat.st_size}"
+        self._zip = None
+        self._zip_lock = threading.Lock()
+
+        self._file = open(self.root, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if zipfile.is_zipfile(self._file):
+                self._index_zip()
+            else:
+                self._index_tar()
+        except Exception:
+            self.close()
+            raise
+        self._prefix = self._find_prefix()
+        logger.info("아카이브 색인: %s (%d개 파일)", self.root.name, len(self._members))
+
+    def _index_zip(self):
+        self._zip = zipfile.ZipFile(self._file)
+        for info in self._zip.infolist():
+            name = _zip_member_name(info)
+            if info.is_dir():
+                self._add(name)
+            else:
+                self._add(name, _Member(info.header_offset, None, info.file_size,
+                                        info.compress_size, info.compress_type, info.CRC))
+
+    def _index_tar(self):
+        try:
+            self._file.seek(0)
+            # 'r:'은 무압축 tar만 허용 (압축된 tar는 임의 위치 읽기가 불가능)
+            with tarfile.open(fileobj=self._file, mode='r:') as tar:
+                for info in tar:
+                    if info.isdir():
+                        self._add(info.name)
+                    elif info.isfile():
+                        self._add(info.name, _Member(None, info.offset_data, info.size, info.size,
+                                                     zipfile.ZIP_STORED, info.chksum))
+        except tarfile.ReadError as e:
+            raise ValueError(f"지원하지 않는 아카이브입니다 (zip 또는 무압축 tar만 가능): {self.root.name}") from e
+
+    def _find_prefix(self):
+        """데이터 폴더가 최상위 폴더 하나로 감싸져 있으면 그 폴더를 루트로 사용"""
+        top = self._dirs['']
+        if IMAGE_DIR not in top and LABEL_DIR not in top and len(top) == 1:
+            (only,) = top
+            children = self._dirs.get(only, ())
+            if IMAGE_DIR in children or LABEL_DIR in children:
+                return only + '/'
+        return ''
+
+    def _side(self, path):
+        return self.side_dir / Path(path).relative_to(self.root)
+
+    def exists(self, path):
+        name = self._name(path)
+        return name in self._members or name in self._dirs or self._side(path).exists()
+
+    def is_dir(self, path):
+        return self._name(path) in self._dirs or self._side(path).is_dir()
+
+    def list_dir(self, path):
+        names = set(self._dirs.get(self._name(path), ()))
+        names.update(LOCAL.list_dir(self._side(path)))
+        return sorted(names)
+
+    def _member(self, path):
+        member = self._members.get(self._name(path))
+        if member is None:
+            raise FileNotFoundError(f"아카이브에 없는 파일입니다: {path}")
+        if member.offset is None:
+            # zip 로컬 헤더의 파일명/추가 필드 길이 뒤가 데이터 시작 위치
+            header = self._map[member.header_offset:member.header_offset + 30]
+            if header[:4] != _ZIP_LOCAL_HEADER:
+                raise ValueError(f"손상된 zip 멤버입니다: {path}")
+            name_len = int.from_bytes(header[26:28], 'little')
+            extra_len = int.from_bytes(header[28:30], 'little')
+            member.offset = member.header_offset + 30 + name_len + extra_len
+        return member
+
+    def _read_member(self, path, member):
+        if member.method == zipfile.ZIP_STORED:
+            return np.frombuffer(self._map, np.uint8, count=member.size, offset=member.offset)
+        data = self._map[member.offset:member.offset + member.compressed_size]
+        if member.method == zipfile.ZIP_DEFLATED:
+            return np.frombuffer(zlib.decompress(data, -zlib.MAX_WBITS), np.uint8)
+        # 그 밖의 압축 방식은 zipfile로 읽음 (ZipFile은 파일 위치를 공유하므로 잠금)
+        with self._zip_lock:
+            return np.frombuffer(self._zip.read(self._zip_info(path)), np.uint8)
+
+    def _zip_info(self, path):
+        name = self._name(path)
+        for info in self._zip.infolist():
+            if _zip_member_name(info) == name:
+                return info
+        raise FileNotFoundError(path)
+
+    def read_array(self, path):
+        """파일 내용을 uint8 배열로 반환 (무압축 멤버는 메모리 맵의 읽기 전용 뷰)"""
+        side = self._side(path)
+        if side.exists():
+            return LOCAL.read_array(side)
+        return self._read_member(path, self._member(path))
+
+    def read_range(self, path, offset, length):
+        side = self._side(path)
+        if side.exists():
+            return LOCAL.read_range(side, offset, length)
+        member = self._member(path)
+        if member.method == zipfile.ZIP_STORED:
+            start = member.offset + min(offset, member.size)
+            end = member.offset + min(offset + length, member.size)
+            return self._map[start:end]
+        if member.method == zipfile.ZIP_DEFLATED:
+            # 필요한 앞부분까지만 압축 해제
+            data = self._map[member.offset:member.offset + member.compressed_size]
+            head = zlib.decompressobj(-zlib.MAX_WBITS).decompress(data, offset + length)
+            return head[offset:offset + length]
+        return self.read_bytes(path)[offset:offset + length]
+
+    def write_bytes(self, path, data):
+        LOCAL.write_bytes(self._side(path), data)
+
+    def cache_key(self, path):
+        side = self._side(path)
+        if side.exists():
+            return LOCAL.cache_key(side)
+        member = self._member(path)
+        raw = f"{self._stamp}|{self._name(path)}|{member.crc}|{member.size}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if getattr(self, '_map', None) is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # 화면/캐시에서 아직 참조 중인 뷰가 있으면 매핑은 참조가 사라질 때 해제됨
+                logger.debug("사용 중인 아카이브 매핑: %s", self.root.name)
+            self._map = None
+        self._file.close()
+
+
+class _ConnectionPool:
+    """
+    한 서버에 대한 keep-alive HTTP 연결 풀.
+
+    동시에 최대 size개의 요청을 보내며, 응답 후 연결은 닫지 않고 다음 요청에
+    재사용합니다. 재사용한 연결이 서버 쪽에서 끊겨 있으면 새 연결로 한 번 재시도합니다.
+    """
+
+    def __init__(self, scheme, netloc, size, timeout):
+        import http.client  # HTTP 데이터셋을 열 때만 필요 (시작 시간 단축)
+        self._errors = (http.client.HTTPException, ConnectionError)
+        self._factory = (http.client.HTTPSConnection if scheme == 'https'
+                         else http.client.HTTPConnection)
+        self._netloc = netloc
+        self._timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.connections_created = 0
+
+    def _connect(self):
+        self.connections_created += 1
+        return self._factory(self._netloc, timeout=self._timeout)
+
+    def request(self, method, target, body=None, headers=None):
+        """요청을 보내고 (상태 코드, 응답 본문) 반환"""
+        with self._slots:
+            try:
+                conn, reused = self._idle.get_nowait(), True
+            except queue.Empty:
+                conn, reused = self._connect(), False
+            while True:
+                try:
+                    conn.request(method, target, body=body, headers=headers or {})
+                    response = conn.getresponse()
+                    data = response.read()
+                    break
+                except self._errors as e:
+                    conn.close()
+                    if not reused:
+                        raise OSError(f"HTTP 요청 실패: {target}: {e}") from e
+                    conn, reused = self._connect(), False
+                except OSError:
+                    conn.close()
+                    raise
+            if response.will_close:
+                conn.close()
+            else:
+                self._idle.put(conn)
+            return response.status, data
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class HttpStorage(_IndexedStorage):
+    """
+    HTTP 서버(또는 같은 규칙의 오브젝트 스토리지 게이트웨이)에 있는 데이터셋 저장소.
+
+    URL 자체를 데이터셋 루트로 사용하며 (예: http://nas:8080/ds/2.라벨링데이터/...),
+    열 때 ?list 요청 한 번으로 전체 파일 목록을 받아 폴더 조회는 네트워크 없이
+    처리합니다. 파일은 keep-alive 연결 풀에서 GET(Range 지원)으로 읽고, PUT으로
+    씁니다. prefetch()로 요청한 파일은 연결 수만큼 동시에 받아 메모리에 보관하므로
+    이동할 프레임은 대개 미리 도착해 있습니다. 서버 규칙은 storage_server.py 참고.
+    """
+
+    def __init__(self, url, connections=DEFAULT_HTTP_CONNECTIONS,
+                 cache_bytes=DEFAULT_HTTP_CACHE_MB * 1024 * 1024, timeout=HTTP_TIMEOUT):
+        super().__init__(url)
+        parts = urlsplit(url)
+        self.url = url.rstrip('/')
+        self._base = parts.path.rstrip('/')
+        self._pool = _ConnectionPool(parts.scheme, parts.netloc, connections, timeout)
+        self._executor = ThreadPoolExecutor(max_workers=connections, thread_name_prefix="http")
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # 멤버 경로 -> 내용 (LRU)
+        self._cache_bytes = 0
+        self.cache_limit = cache_bytes
+        self._inflight = {}  # 멤버 경로 -> 받는 중인 Future
+        try:
+            self._list()
+        except Exception:
+            self.close()
+            raise
+
+    def _target(self, name):
+        return quote(f"{self._base}/{name}" if name else f"{self._base}/")
+
+    def _request(self, method, name, body=None, headers=None, query=''):
+        status, data = self._pool.request(method, self._target(name) + query, body, headers)
+        if status == 404:
+            raise FileNotFoundError(f"서버에 없는 파일입니다: {self.url}/{name}")
+        if status >= 300:
+            raise OSError(f"HTTP {status}: {self.url}/{name}")
+        return data
+
+    def _list(self):
+        """전체 파일 목록을 한 번에 받아 색인"""
+        listing = json.loads(self._request('GET', '', query='?list'))
+        for entry in listing['entries']:
+            if entry.get('type') == 'dir':
+                self._add(entry['name'])
+            else:
+                self._add(entry['name'], (entry['size'], entry['mtime']))
+        logger.info("원격 데이터셋 색인: %s (%d개 파일)", self.url, len(self._members))
+
+    def exists(self, path):
+        name = self._name(path)
+        return name in self._members or name in self._dirs
+
+    def is_dir(self, path):
+        return self._name(path) in self._dirs
+
+    def list_dir(self, path):
+        return sorted(self._dirs.get(self._name(path), ()))
+
+    def _fetch(self, name):
+        data = np.frombuffer(self._request('GET', name), np.uint8)
+        with self._lock:
+            self._inflight.pop(name, None)
+            if name not in self._cache:
+                self._cache[name] = data
+                self._cache_bytes += data.nbytes
+            while self._cache_bytes > self.cache_limit and len(self._cache) > 1:
+                _, old = self._cache.popitem(last=False)
+                self._cache_bytes -= old.nbytes
+        return data
+
+    def _fetch_safe(self, name):
+        try:
+            return self._fetch(name)
+        except Exception:
+            with self._lock:
+                self._inflight.pop(name, None)
+            raise
+
+    def read_async(self, path):
+        """파일을 연결 풀 스레드에서 받는 Future 반환 (이미 받았거나 받는 중이면 그것을 사용)"""
+        name = self._name(path)
+        with self._lock:
+            data = self._cache.get(name)
+            if data is not None:
+                self._cache.move_to_end(name)
+                future = Future()
+                future.set_result(data)
+                return future
+            future = self._inflight.get(name)
+            if future is None:
+                if name not in self._members:
+                    future = Future()
+                    future.set_exception(FileNotFoundError(f"서버에 없는 파일입니다: {self.url}/{name}"))
+                    return future
+                future = self._inflight[name] = self._executor.submit(self._fetch_safe, name)
+        return future
+
+    def read_array(self, path):
+        return self.read_async(path).result()
+
+    def prefetch(self, paths):
+        """파일들을 미리 동시에 받아 보관 (이미 받았거나 받는 중인 파일은 건너뜀)"""
+        for path in paths:
+            self.read_async(path)
+
+    def read_range(self, path, offset, length):
+        name = self._name(path)
+        with self._lock:
+            data = self._cache.get(name)
+            inflight = self._inflight.get(name) if data is None else None
+        if inflight is not None:
+            # 미리 받는 중인 파일은 같은 내용을 다시 요청하지 않고 도착을 기다림
+            data = inflight.result()
+        if data is not None:
+            return data[offset:offset + length].tobytes()
+        data = self._request('GET', name, headers={'Range': f"bytes={offset}-{offset + length - 1}"})
+        # Range를 지원하지 않는 서버는 전체 내용을 반환
+        return data[offset:offset + length] if len(data) > length else data
+
+    def write_bytes(self, path, data):
+        name = self._name(path)
+        self._request('PUT', name, body=data, headers={'Content-Type': 'application/octet-stream'})
+        with self._lock:
+            old = self._cache.pop(name, None)
+            if old is not None:
+                self._cache_bytes -= old.nbytes
+        self._add(name, (len(data), time.time_ns()))
+
+    def cache_key(self, path):
+        name = self._name(path)
+        member = self._members.get(name)
+        if member is None:
+            raise FileNotFoundError(f"서버에 없는 파일입니다: {self.url}/{name}")
+        raw = f"{self.url}|{name}|{member[1]}|{member[0]}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pool.close()
+
+
+def _completed(function, *args):
+    """함수를 바로 실행하고 결과(또는 예외)를 담은 완료된 Future 반환"""
+    future = Future()
+    try:
+        future.set_result(function(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def is_url(path):
+    return str(path).startswith(URL_SCHEMES)
+
+
+def is_archive(path):
+    return Path(path).suffix.lower() in ARCHIVE_SUFFIXES and os.path.isfile(path)
+
+
+# 데이터셋 루트 -> 저장소. 등록되지 않은 경로는 로컬 파일 시스템으로 처리
+_mounts = {}
+_mounts_lock = threading.Lock()
+
+
+def mount(root, backend):
+    with _mounts_lock:
+        _mounts[Path(root)] = backend
+    return backend
+
+
+def unmount(root):
+    with _mounts_lock:
+        backend = _mounts.pop(Path(root), None)
+    if backend is not None:
+        backend.close()
+
+
+def open_dataset(path):
+    """
+    데이터셋 루트 열기. 폴더는 그대로, zip/tar 파일은 아카이브 저장소로,
+    http(s) URL은 HTTP 저장소로 등록합니다.
+
+    :return: 이후 경로 조합에 사용할 데이터셋 루트 Path
+    """
+    if is_url(path):
+        url = str(path).rstrip('/')
+        backend = HttpStorage(url)
+        unmount(backend.root)
+        return mount(backend.root, backend).root
+    path = Path(path)
+    if is_archive(path):
+        unmount(path)
+        mount(path, ArchiveStorage(path))
+    return path
+
+
+def backend_for(path):
+    """경로를 담당하는 저장소 (등록된 루트 아래가 아니면 LOCAL)"""
+    if _mounts:
+        path = Path(path)
+        for root, backend in list(_mounts.items()):
+            if path == root or root in path.parents:
+                return backend
+    return LOCAL
+
+
+def is_local(path):
+    return backend_for(path).is_local
+
+
+def process_pool(base_path, workers, jobs=None, **kwargs):
+    """
+    데이터셋 일괄 작업용 프로세스 풀 (spawn). 현재 프로세스에서 처리해야 하면 None.
+
+    워커 수가 0이거나, 작업이 한 개뿐이거나, 데이터셋이 로컬 폴더가 아니면 None을
+    반환합니다. 아카이브 등 등록된 저장소는 현재 프로세스에서만 열려 있어 워커
+    프로세스에서는 읽을 수 없기 때문입니다.
+
+    :param jobs: 작업 수 (2개 미만이면 풀을 만들지 않음)
+    :param kwargs: ProcessPoolExecutor 추가 인자 (initializer 등)
+    """
+    if not workers or not is_local(base_path) or (jobs is not None and jobs < 2):
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'), **kwargs)
+
+
+def exists(path):
+    return backend_for(path).exists(path)
+
+
+def is_dir(path):
+    return backend_for(path).is_dir(path)
+
+
+def subdirs(folder):
+    """폴더 바로 아래의 하위 폴더 이름 목록 (정렬)"""
+    backend = backend_for(folder)
+    return sorted(name for name in backend.list_dir(folder) if backend.is_dir(Path(folder) / name))
+
+
+def glob(folder, pattern):
+    """폴더 바로 아래에서 패턴과 일치하는 파일 경로 목록 (정렬)"""
+    return sorted(backend_for(folder).glob(folder, pattern))
+
+
+def read_bytes(path):
+    return backend_for(path).read_bytes(path)
+
+
+def read_array(path):
+    return backend_for(path).read_array(path)
+
+
+def read_async(path):
+    """파일 내용(uint8 배열)을 결과로 하는 Future (원격 저장소는 백그라운드에서 받음)"""
+    return backend_for(path).read_async(path)
+
+
+def prefetch(paths):
+    """곧 읽을 파일들을 미리 받아 둠 (원격 저장소에서만 동작)"""
+    paths = list(paths)
+    if paths:
+        backend_for(paths[0]).prefetch(paths)
+
+
+def read_range(path, offset, length):
+    return backend_for(path).read_range(path, offset, length)
+
+
+def write_bytes(path, data):
+    backend_for(path).write_bytes(path, data)
+
+
+def cache_key(path):
+    """디스크 캐시용 키 (내용이 바뀌면 키도 바뀜)"""
+    return backend_for(path).cache_key(path)
@@ -0,0 +1,131 @@
+import os
+import json
+import logging
+import argparse
+import threading
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import unquote, urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8080
+
+
+class _DatasetHandler(BaseHTTPRequestHandler):
+    """
+    HttpStorage가 사용하는 규칙을 구현한 요청 처리기.
+
+    - GET <폴더>/?list : 폴더 아래 전체 파일/폴더 목록 (JSON, 재귀)
+    - GET <파일>       : 파일 내용 (Range: bytes=a-b 지원)
+    - PUT <파일>       : 파일 쓰기 (상위 폴더 자동 생성)
+    """
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _path(self):
+        """요청 경로를 서버 루트 아래의 로컬 경로로 변환 (루트 밖은 None)"""
+        root = self.server.root
+        rel = unquote(urlsplit(self.path).path).lstrip('/')
+        path = (root / rel).resolve()
+        if path != root and root not in path.parents:
+            return None
+        return path
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _listing(self, folder):
+        entries = []
+        for current, dirs, files in os.walk(folder):
+            rel = Path(current).relative_to(folder).as_posix()
+            prefix = '' if rel == '.' else rel + '/'
+            for name in dirs:
+                entries.append({'name': prefix + name, 'type': 'dir'})
+            for name in files:
+                stat = os.stat(os.path.join(current, name))
+                entries.append({'name': prefix + name, 'size': stat.st_size,
+                                'mtime': stat.st_mtime_ns})
+        return json.dumps({'entries': entries}, ensure_ascii=False).encode('utf-8')
+
+    def do_GET(self):
+        path = self._path()
+        if path is None or not path.exists():
+            self._send(404)
+            return
+        if path.is_dir():
+            if urlsplit(self.path).query != 'list':
+                self._send(404)
+                return
+            self._send(200, self._listing(path), {'Content-Type': 'application/json'})
+            return
+
+        data = path.read_bytes()
+        ranged = self.headers.get('Range', '')
+        if ranged.startswith('bytes='):
+            start, _, end = ranged[len('bytes='):].partition('-')
+            start = int(start)
+            end = min(int(end) if end else len(data) - 1, len(data) - 1)
+            self._send(206, data[start:end + 1], {
+                'Content-Range': f"bytes {start}-{end}/{len(data)}",
+                'Content-Type': 'application/octet-stream',
+            })
+            return
+        self._send(200, data, {'Content-Type': 'application/octet-stream'})
+
+    def do_PUT(self):
+        path = self._path()
+        if path is None:
+            self._send(403)
+            return
+        data = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self._send(201)
+
+
+def make_server(root, host='127.0.0.1', port=DEFAULT_PORT):
+    """
+    로컬 폴더를 HttpStorage 규칙으로 제공하는 서버 생성 (port=0이면 빈 포트 사용).
+
+    테스트와 NAS 없이 원격 데이터셋 동작을 확인하는 용도입니다.
+    serve_forever()로 실행하고 shutdown()으로 종료합니다.
+    """
+    server = ThreadingHTTPServer((host, port), _DatasetHandler)
+    server.daemon_threads = True
+    server.root = Path(root).resolve()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="데이터셋 폴더를 HTTP 저장소로 제공")
+    parser.add_argument('root', help="제공할 폴더 (URL 경로는 이 폴더 기준)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    server = make_server(args.root, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"http://{host}:{port}/ 에서 {server.root} 제공 중 (Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    from logging_setup import setup_logging
+    setup_logging()
+    main()
@@ -1,22 +1,57 @@
 # test_keypoint_labeler.py
 
 import pytest
-from PyQt5.QtCore import Qt, QPoint
+from PyQt5.QtCore import Qt, QPoint, QEvent
+from PyQt5.QtGui import QMouseEvent
 from PyQt5.QtTest import QTest
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
 from pathlib import Path
 import numpy as np
 import cv2
+import os
 import json
+import sys
+import logging
+import threading
+import subprocess
 from unittest.mock import MagicMock, patch
 
 from main import KeypointLabeler
-from widgets import KeypointEditorWidget, KeypointDialog
-from utils import KeypointRenderer, ImageCache
+from widgets import (KeypointEditorWidget, KeypointDialog, FilmstripWidget, ProgressDashboard,
+                     CorrectionsDialog, TrajectoryTimeline)
+from utils import (KeypointRenderer, ImageCache, ViewTransform, ImagePyramid,
+                   ThumbnailCache, FrameDiskCache, CACHE_DIR_ENV, scale_keypoints_to_image)
+from tracing import Tracer
+from logging_setup import RateLimitFilter, JsonFormatter
+from decoder import DecodeService, DecodeFuture, LeaseGroup, decode_file, DECODE_WORKERS_ENV
+from file_index import FileIndex, UNEDITED, EDITED
+from geometry import Affine, PointGrid, probe_image_size
+from annotation_diff import diff_dataset, summarize, largest_corrections, build_report, load_segments
+from dataset_progress import scan_progress, write_progress_csv, SequenceProgress
+from frame_source import VideoFrameSource, scan_keyframes
+import storage
+from storage_server import make_server
+from interpolation import interpolate_keyframes, LINEAR, SPLINE
+from propagation import KeypointTracker, MIN_CONFIDENCE
+from shard_export import export_shards, ShardReader, collect_samples
+from prelabel import prelabel_dataset, decode_heatmaps, create_predictor, PosePredictor, PROGRESS_FILE
+from session import Session, load_session, save_session, SESSION_ENV
+from trajectory import TrackArray, SPIKE_THRESHOLD_PX
+from history import EditHistory, EDIT_OVERHEAD_BYTES
+from crop_export import export_crops, collect_sources, person_boxes
+from label_validation import normalize_label, validate_dataset, build_report as build_check_report
+from scheduler import (TaskScheduler, CancelToken, IO_THREADS_ENV, PRIORITY_FRAME, PRIORITY_SAVE,
+                       PRIORITY_PREFETCH, PRIORITY_SCAN)
 
 # Fixtures
 @pytest.fixture
-def app(qtbot):
+def app(qtbot, monkeypatch, tmp_path):
+    # 테스트에서는 cv2 모킹이 적용되도록 GUI 프로세스에서 직접 디코딩
+    monkeypatch.setenv(DECODE_WORKERS_ENV, '0')
+    # 파일 입출력 작업도 요청한 자리에서 바로 실행 (비동기 동작은 TestTaskScheduler에서 확인)
+    monkeypatch.setenv(IO_THREADS_ENV, '0')
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+    monkeypatch.setenv(SESSION_ENV, str(tmp_path / "session.json"))
     app = KeypointLabeler()
     qtbot.addWidget(app)
     return app
@@ -75,6 +110,84 @@ class TestKeypointEditorWidget:
         # 더블클릭으로 키포인트 추가
         qtbot.mouseDClick(editor, Qt.LeftButton, pos=QPoint(100, 100))
 
+    def test_zoom_keeps_hit_testing_in_image_coords(self, editor, sample_image):
+        """확대 후에도 화면 좌표 <-> 원본 좌표 변환으로 선택되는지 테스트"""
+        editor.current_image = sample_image
+        editor.keypoints[6] = [1000, 600]
+        editor.view.zoom_at(4.0, 500, 300)
+        assert abs(editor.scale_factor - 2.0) < 1e-6
+
+        view_x, view_y = editor.view.map_to_view([1000, 600])[0]
+        assert editor._hit_test(view_x + 3, view_y - 3) == 6
+        assert editor._hit_test(view_x + 20, view_y) is None
+
+        editor.reset_view()
+        assert abs(editor.scale_factor - 0.5) < 1e-6
+
+# 단위 테스트: 여러 사람 렌더링 / 선택
+class TestMultiPerson:
+    def test_point_grid_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        points = rng.uniform(-20, 700, (400, 2))
+        active = rng.random(400) > 0.2
+        grid = PointGrid(points, 10, active)
+        for x, y in rng.uniform(-30, 710, (50, 2)):
+            dist = np.sum((points - (x, y)) ** 2, axis=1)
+            dist[~active] = np.inf
+            expected = [i for i in np.argsort(dist, kind='stable') if dist[i] <= 100]
+            assert grid.query(x, y) == expected
+
+    def test_hit_test_switches_person(self, editor, sample_image):
+        editor.current_image = sample_image
+        first = [[0, 0] for _ in range(17)]
+        second = [[0, 0] for _ in range(17)]
+        first[6], second[6], second[7] = [1000, 600], [1500, 900], [1004, 600]
+        editor.set_persons([first, second])
+
+        view_x, view_y = editor.view.map_to_view([1500, 900])[0]
+        with patch.object(editor, 'person_selected') as selected:
+            assert editor._hit_test(view_x, view_y) == 6
+            selected.emit.assert_called_once_with(1)
+        assert editor.active_person == 1 and editor.keypoints is second
+
+        # 겹친 점은 편집 중인 사람의 점을 우선 (더 가까운 다른 사람 점보다)
+        view_x, view_y = editor.view.map_to_view([1001, 600])[0]
+        assert editor._hit_test(view_x, view_y) == 7 and editor.active_person == 1
+
+    def test_hit_grid_is_rebuilt_only_after_changes(self, editor, sample_image):
+        editor.current_image = sample_image
+        editor.keypoints[6] = [1000, 600]
+        view_x, view_y = editor.view.map_to_view([1000, 600])[0]
+        with patch('widgets.PointGrid', wraps=PointGrid) as grid:
+            assert editor._hit_test(view_x, view_y) == 6
+            assert editor._hit_test(view_x + 3, view_y) == 6
+            assert grid.call_count == 1
+
+            # 편집, 화면 변환이 바뀌면 새로 만듦
+            editor.keypoints[6] = [1200, 600]
+            assert editor._hit_test(view_x, view_y) is None
+            assert grid.call_count == 2
+            editor.view.zoom_at(2.0, 500, 300)
+            view_x, view_y = editor.view.map_to_view([1200, 600])[0]
+            assert editor._hit_test(view_x, view_y) == 6
+            assert grid.call_count == 3
+
+    def test_draws_all_people_in_one_pass(self):
+        canvas = np.zeros((200, 300, 3), dtype=np.uint8)
+        points = np.zeros((3, 17, 2), dtype=int)
+        visible = np.zeros((3, 17), dtype=bool)
+        for person, x in enumerate((40, 140, 240)):
+            points[person, 5], points[person, 6] = (x, 50), (x, 150)  # 어깨 두 점
+            visible[person, 5:7] = True
+        with patch('utils.cv2.polylines', wraps=cv2.polylines) as polylines, \
+                patch('utils.cv2.putText', wraps=cv2.putText) as put_text:
+            KeypointRenderer.draw_people(canvas, points, visible, active=1)
+        # 연결선 2색(회색/파랑) + 점 2색(빨강/초록), 번호는 편집 중인 사람만
+        assert polylines.call_count == 4 and put_text.call_count == 2
+        assert tuple(canvas[100, 140]) == (0, 0, 255)     # 편집 중인 사람 연결선
+        assert tuple(canvas[100, 40]) == (128, 128, 128)  # 다른 사람 연결선
+        assert tuple(canvas[50, 240]) == (255, 0, 0) and tuple(canvas[150, 240]) == (0, 255, 0)
+
 # 단위 테스트: KeypointRenderer
 def test_renderer(sample_image, sample_keypoints):
     """KeypointRenderer 테스트"""
@@ -82,6 +195,87 @@ def test_renderer(sample_image, sample_keypoints):
     assert rendered.shape == sample_image.shape
     assert isinstance(rendered, np.ndarray)
 
+# 단위 테스트: ViewTransform / ImagePyramid
+class TestViewport:
+    def test_zoom_at_keeps_anchor(self):
+        view = ViewTransform((2304, 1296), (1152, 648))
+        anchor = view.map_to_image((300, 200))[0]
+        view.zoom_at(3.0, 300, 200)
+        assert np.allclose(view.map_to_view(anchor)[0], (300, 200))
+        assert np.allclose(view.map_to_image(view.map_to_view([[10, 20]])), [[10, 20]])
+
+    def test_zoom_and_pan_are_clamped(self):
+        view = ViewTransform((2304, 1296), (1152, 648))
+        view.zoom_at(0.1, 0, 0)
+        assert view.zoom == 1.0
+        view.zoom_at(2.0, 0, 0)
+        view.pan(500, 500)  # 이미지 밖 여백이 생기지 않아야 함
+        assert (view.offset_x, view.offset_y) == (0.0, 0.0)
+
+    def test_pyramid_renders_visible_region(self):
+        image = np.zeros((1296, 2304, 3), dtype=np.uint8)
+        image[:, 1152:] = 200  # 오른쪽 절반만 밝게
+        pyramid = ImagePyramid(image)
+        view = ViewTransform((2304, 1296), (1152, 648))
+
+        canvas = pyramid.render(view)
+        assert canvas.shape == (648, 1152, 3)
+        assert canvas[300, 100].max() == 0 and canvas[300, 1000].min() == 200
+
+        # 오른쪽 끝으로 확대하면 전체가 밝은 영역
+        view.zoom_at(8.0, 1152, 324)
+        canvas = pyramid.render(view)
+        assert canvas.min() == 200
+        assert len(pyramid.levels) == 2  # 필요한 레벨만 생성됨
+
+# 단위 테스트: 좌표 변환 / 이미지 헤더 크기 확인
+class TestGeometry:
+    def test_affine_compose_inverse_and_missing_points(self):
+        to_view = Affine.scaling(0.5).then(Affine.translation(10, 20))
+        points = np.array([[100, 40], [0, 0]])
+        assert np.allclose(to_view.apply(points), [[60, 40], [10, 20]])
+        assert np.allclose(to_view.apply(points, keep_missing=True), [[60, 40], [0, 0]])
+        assert np.allclose(to_view.inverse().apply(to_view.apply(points)), points)
+        # 기존 스케일링 함수도 같은 변환 사용
+        assert scale_keypoints_to_image([[2304, 1296], [0, 0]], 1152, 648) == [[1152, 648], [0, 0]]
+
+    def test_probe_reads_header_only(self, tmp_path):
+        image = np.zeros((30, 40, 3), dtype=np.uint8)
+        cv2.imwrite(str(tmp_path / "a.jpg"), image, [cv2.IMWRITE_JPEG_PROGRESSIVE, 1])
+        cv2.imwrite(str(tmp_path / "a.png"), image)
+        assert probe_image_size(tmp_path / "a.jpg") == (40, 30)
+        assert probe_image_size(tmp_path / "a.png") == (40, 30)
+        assert probe_image_size(tmp_path / "missing.jpg") is None
+
+        # 압축 데이터가 잘려 있어도 헤더만으로 크기 확인
+        data = (tmp_path / "a.jpg").read_bytes()
+        (tmp_path / "cut.jpg").write_bytes(data[:len(data) // 2])
+        assert probe_image_size(tmp_path / "cut.jpg") == (40, 30)
+
+        # EXIF 방향(90도 회전)은 디코딩 결과와 같이 가로/세로를 바꿔서 반환
+        tiff = (b'MM\x00\x2a' + (8).to_bytes(4, 'big') + (1).to_bytes(2, 'big')
+                + bytes.fromhex('0112 0003 00000001 0006 0000') + bytes(4))
+        app1 = b'Exif\x00\x00' + tiff
+        segment = b'\xff\xe1' + (len(app1) + 2).to_bytes(2, 'big') + app1
+        (tmp_path / "rotated.jpg").write_bytes(data[:2] + segment + data[2:])
+        decoded = cv2.imread(str(tmp_path / "rotated.jpg"))
+        assert probe_image_size(tmp_path / "rotated.jpg") == (decoded.shape[1], decoded.shape[0])
+
+    def test_preview_of_other_resolution_maps_to_source_coords(self, editor):
+        # 4:3 카메라 원본(1600x1200)의 1/4 미리보기를 표시해도 키포인트는 원본 좌표 기준
+        editor.set_image(np.zeros((300, 400, 3), dtype=np.uint8), (1600, 1200))
+        assert editor.view.image_size == (1600, 1200)
+        assert editor.pyramid.image_size == (1600, 1200)
+        editor.keypoints = [[800, 600]] + [[0, 0]] * 16
+        view_x, view_y = editor.view.map_to_view([800, 600])[0]
+        assert (view_x, view_y) == (576.0, 324.0)  # 가로 가운데 정렬된 화면 중앙
+        assert editor._hit_test(view_x, view_y) == 0
+
+        rendered = KeypointRenderer.render_skeleton(
+            np.zeros((300, 400, 3), dtype=np.uint8), editor.keypoints, image_size=(1600, 1200)
+        )
+        assert rendered[150, 200].any()  # 미리보기 배열 좌표 (200, 150)에 표시
+
 # 단위 테스트: ImageCache
 class TestImageCache:
     def test_cache_operations(self, sample_image):
@@ -96,6 +290,1213 @@ class TestImageCache:
             cache.put(f"test_{i}.jpg", sample_image)
         assert len(cache.cache) <= 30
 
+# 단위 테스트: Tracer
+class TestTracer:
+    def test_disabled_records_nothing(self):
+        tracer = Tracer(enabled=False)
+        with tracer.span('decode'):
+            pass
+        tracer.end_frame()
+        assert tracer.chrome_trace()['traceEvents'] == []
+
+    def test_chrome_trace_export(self, tmp_path):
+        tracer = Tracer(enabled=True)
+        with tracer.span('decode', path='a.jpg'):
+            pass
+        with tracer.span('render'):
+            pass
+        tracer.end_frame()
+        assert set(tracer.frame_timings()) == {'decode', 'render'}
+
+        out = tracer.export_chrome_trace(tmp_path / "trace.json")
+        with open(out, encoding='utf-8') as f:
+            events = json.load(f)['traceEvents']
+        spans = [e for e in events if e['ph'] == 'X']
+        assert [e['name'] for e in spans] == ['decode', 'render']
+        assert all(e['dur'] >= 0 for e in spans)
+        assert spans[0]['args'] == {'path': 'a.jpg'}
+
+# 단위 테스트: 로깅 파이프라인
+class TestLogging:
+    @staticmethod
+    def _record(level=logging.DEBUG, lineno=10, **extra):
+        record = logging.LogRecord('test', level, 'main.py', lineno, '포인트 %d', (3,), None)
+        record.__dict__.update(extra)
+        return record
+
+    def test_rate_limit_per_site(self):
+        rate_filter = RateLimitFilter(rate=0.001, burst=2)
+        passed = [rate_filter.filter(self._record()) for _ in range(5)]
+        assert passed == [True, True, False, False, False]
+        # 다른 호출 위치와 WARNING 이상은 제한되지 않음
+        assert rate_filter.filter(self._record(lineno=20))
+        assert rate_filter.filter(self._record(level=logging.WARNING))
+
+    def test_json_formatter_structured_fields(self):
+        entry = json.loads(JsonFormatter().format(self._record(frame=7)))
+        assert entry['message'] == '포인트 3'
+        assert entry['frame'] == 7
+        assert entry['level'] == 'DEBUG'
+
+# 단위 테스트: DecodeService
+class TestDecodeService:
+    def test_worker_decodes_into_shared_slab(self, tmp_path):
+        image = np.random.randint(0, 255, (64, 96, 3), dtype=np.uint8)
+        path = tmp_path / "frame_0.png"
+        cv2.imwrite(str(path), image)
+
+        service = DecodeService(workers=1, slab_bytes=image.nbytes)
+        try:
+            decoded = service.decode(path)
+            # 워커가 RGB 순서로 디코딩해 공유 메모리에 기록한 결과를 복사 없이 사용
+            assert np.array_equal(decoded, cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            assert not decoded.flags.owndata
+            slab = service._leases[id(decoded)].slab
+
+            # 반환된 슬랩은 다음 디코딩에 재사용됨
+            service.release(decoded)
+            del decoded
+            again = service.decode(path)
+            assert service._leases[id(again)].slab is slab
+            service.release(again)
+            del again
+
+            with pytest.raises(ValueError):
+                service.decode(tmp_path / "missing.png", data=b'not an image')
+        finally:
+            service.shutdown()
+
+    def test_recovers_from_dead_workers_and_caps_slabs(self, tmp_path):
+        image = np.random.randint(0, 255, (32, 48, 3), dtype=np.uint8)
+        path = tmp_path / "frame_0.png"
+        cv2.imwrite(str(path), image)
+        expected = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+        service = DecodeService(workers=1, slab_bytes=image.nbytes, cached_frames=1)
+        try:
+            # 슬랩은 캐시 크기 + 워커 수까지만 생성되고 이후는 일반 전송
+            held = [service.decode(path) for _ in range(3)]
+            assert len(service._slabs) == 2
+            assert id(held[2]) not in service._leases and np.array_equal(held[2], expected)
+
+            # 워커가 죽어도 요청은 실패하지 않고 풀이 다시 생성됨
+            for process in list(service.start()._executor._processes.values()):
+                process.kill()
+            assert np.array_equal(service.decode(path), expected)
+            assert np.array_equal(service.decode(path), expected)
+        finally:
+            service.shutdown()
+
+    def test_evicted_frame_in_use_is_not_overwritten(self, tmp_path):
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"frame_{i}.png"
+            cv2.imwrite(str(path), np.full((32, 48, 3), 50 * (i + 1), dtype=np.uint8))
+            paths.append(path)
+
+        service = DecodeService(workers=1, slab_bytes=32 * 48 * 3, cached_frames=1)
+        cache = ImageCache(on_evict=service.release)
+        cache.max_size = 1
+        try:
+            first = service.decode(paths[0])
+            cache.put("0", first)
+            assert service.retain(first)   # 화면에 표시 중
+            expected = first.copy()
+            slab = service._leases[id(first)].slab
+
+            # 캐시에서 빠져도 사용 중인 슬랩은 다음 디코딩에 쓰이지 않음
+            cache.put("0", service.decode(paths[1]))
+            cache.put("1", service.decode(paths[2]))
+            cache.put("2", service.decode(paths[2]))
+            assert np.array_equal(first, expected)
+            assert slab not in service._free
+
+            # 마지막 사용자가 놓으면 재사용
+            service.release(first)
+            assert slab in service._free
+            cache.clear()
+        finally:
+            service.shutdown()
+
+    def test_lease_group_holds_frames_until_closed(self, tmp_path):
+        path = tmp_path / "frame_0.png"
+        cv2.imwrite(str(path), np.full((32, 48, 3), 90, dtype=np.uint8))
+        service = DecodeService(workers=1, slab_bytes=32 * 48 * 3)
+        try:
+            lease = LeaseGroup(service)
+            future = lease.hold(service.submit(path))   # 아직 디코딩 중인 요청
+            image = future.result()
+            slab = service._leases[id(image)].slab
+            service.release(image)   # 캐시에서 빠짐
+            assert slab not in service._free
+            lease.close()
+            assert slab in service._free
+        finally:
+            service.shutdown()
+
+    def test_cache_eviction_releases_slab(self, sample_image):
+        released = []
+        cache = ImageCache(on_evict=released.append)
+        cache.max_size = 2
+        for i in range(3):
+            cache.put(f"{i}.jpg", sample_image)
+        assert len(released) == 1
+        cache.clear()
+        assert len(released) == 3
+
+# 단위 테스트: 썸네일 캐시 / 필름스트립
+class TestFilmstrip:
+    @pytest.fixture
+    def frames(self, tmp_path):
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"seq_{i}.jpg"
+            cv2.imwrite(str(path), np.full((1296, 2304, 3), 40 * i, dtype=np.uint8))
+            paths.append(path)
+        return paths
+
+    def test_thumbnail_cache_persists_by_mtime(self, tmp_path, frames):
+        cache = ThumbnailCache(tmp_path / "thumbs")
+        assert cache.get(frames[0]) is None
+
+        thumb = cache.load_or_create(frames[0])
+        assert thumb.shape == (81, 144, 3)
+        # 새 인스턴스(재시작)에서도 디스크 캐시 사용
+        assert ThumbnailCache(tmp_path / "thumbs").get(frames[0]) is not None
+
+        # 파일이 바뀌면 캐시 키도 바뀜
+        os.utime(frames[0], ns=(0, 0))
+        assert cache.get(frames[0]) is None
+
+    def test_click_selects_frame(self, qtbot, tmp_path, frames):
+        strip = FilmstripWidget(cache=ThumbnailCache(tmp_path / "thumbs"))
+        qtbot.addWidget(strip)
+        strip.set_frames(frames, current=1)
+        assert strip.wait_for_thumbnails(5000)
+        assert strip.currentRow() == 1
+
+        with qtbot.waitSignal(strip.frame_selected) as blocker:
+            strip.itemClicked.emit(strip.item(2))
+        assert blocker.args == [2]
+
+# 단위 테스트: 디스크 프레임 캐시
+class TestFrameDiskCache:
+    def test_persists_across_sessions(self, tmp_path, sample_image):
+        source = tmp_path / "seq_0.jpg"
+        source.write_bytes(b'jpeg')
+        frame = sample_image.copy()
+        frame[:, :1152] = 255
+
+        cache = FrameDiskCache(tmp_path / "frames", budget_bytes=8 * 1152 * 648 * 3)
+        cache.put(source, frame)
+        cache.close()
+
+        # 재시작 후에도 디스플레이 해상도 프레임을 메모리 맵 뷰로 반환
+        cached = FrameDiskCache(tmp_path / "frames", budget_bytes=8 * 1152 * 648 * 3).get(source)
+        assert cached.shape == (648, 1152, 3)
+        assert not cached.flags.owndata and not cached.flags.writeable
+        assert cached[:, :500].min() == 255 and cached[:, 700:].max() == 0
+
+    def test_lru_eviction_within_budget(self, tmp_path, sample_image):
+        sources = []
+        for i in range(3):
+            sources.append(tmp_path / f"seq_{i}.jpg")
+            sources[-1].write_bytes(b'jpeg%d' % i)
+
+        cache = FrameDiskCache(tmp_path / "frames", budget_bytes=2 * 1152 * 648 * 3)
+        cache.put(sources[0], sample_image)
+        cache.put(sources[1], sample_image)
+        cache.get(sources[0])  # 0번을 최근 사용으로
+        cache.put(sources[2], sample_image)
+
+        assert cache.get(sources[1]) is None
+        assert cache.get(sources[0]) is not None and cache.get(sources[2]) is not None
+        assert (tmp_path / "frames" / "frames.bin").stat().st_size == 2 * 1152 * 648 * 3
+
+    def test_stale_index_never_returns_other_frame(self, tmp_path, sample_image):
+        sources = []
+        for i in range(2):
+            sources.append(tmp_path / f"seq_{i}.jpg")
+            sources[-1].write_bytes(b'jpeg%d' % i)
+        index_path = tmp_path / "frames" / "index.json"
+
+        cache = FrameDiskCache(tmp_path / "frames", budget_bytes=1152 * 648 * 3)
+        # 같은 캐시 폴더는 한 인스턴스만 사용
+        assert not FrameDiskCache(tmp_path / "frames", budget_bytes=1152 * 648 * 3).enabled
+        cache.put(sources[0], sample_image)
+        cache.flush()
+        stale_index = index_path.read_bytes()
+        cache.put(sources[1], np.full_like(sample_image, 255))  # 0번 슬롯 재사용
+        cache.close()
+
+        # 슬롯 재사용 후 인덱스가 저장되지 못한 채 종료된 상황
+        index_path.write_bytes(stale_index)
+        reopened = FrameDiskCache(tmp_path / "frames", budget_bytes=1152 * 648 * 3)
+        assert reopened.enabled
+        assert reopened.get(sources[0]) is None
+        reopened.close()
+
+    def test_disabled_with_zero_budget(self, tmp_path, sample_image):
+        cache = FrameDiskCache(tmp_path / "frames", budget_bytes=0)
+        cache.put(tmp_path, sample_image)
+        assert not cache.enabled and cache.get(tmp_path) is None
+
+# 단위 테스트: 파일 목록 검색 인덱스
+class TestFileIndex:
+    def test_substring_glob_and_status(self):
+        names = [f"seq{i // 10}_clip_{i % 10}.json" for i in range(30)]
+        index = FileIndex(names, [EDITED if i % 3 == 0 else UNEDITED for i in range(30)])
+
+        assert index.search("SEQ1_").sum() == 10  # 대소문자 무시
+        # 글자를 덧붙인 검색어는 직전 결과 안에서 다시 확인
+        assert np.flatnonzero(index.search("seq1_clip_5")).tolist() == [15]
+        assert np.flatnonzero(index.search("*_clip_[12].json")).tolist() == [1, 2, 11, 12, 21, 22]
+        assert index.search("clip_?").sum() == 0  # 패턴은 전체 이름과 일치해야 함
+
+        unedited = index.search("seq2", statuses=[UNEDITED])
+        assert np.flatnonzero(unedited).tolist() == [20, 22, 23, 25, 26, 28, 29]
+        index.set_status("seq2_clip_2.json", EDITED)
+        assert not index.search("seq2", statuses=[UNEDITED])[22]
+
+# 단위 테스트: 시퀀스별 진행 현황
+class TestProgressDashboard:
+    @pytest.fixture
+    def dataset(self, tmp_path):
+        label_root = tmp_path / "2.라벨링데이터"
+        for name, total, edited in [("seqA", 4, 1), ("seqB", 2, 2), ("seqC", 3, 0)]:
+            (label_root / name / "edited").mkdir(parents=True)
+            for i in range(total):
+                (label_root / name / f"clip_{i}.json").write_text('{}')
+            for i in range(edited):
+                (label_root / name / "edited" / f"clip_{i}.json").write_text('{}')
+        # 원본이 없는 edited 파일은 집계하지 않음
+        (label_root / "seqC" / "edited" / "orphan.json").write_text('{}')
+        return tmp_path
+
+    def test_parallel_scan_and_csv(self, dataset, tmp_path):
+        results = {r.name: r for r in scan_progress(dataset, workers=3)}
+        assert {n: (r.total, r.edited) for n, r in results.items()} == {
+            "seqA": (4, 1), "seqB": (2, 2), "seqC": (3, 0)
+        }
+        assert results["seqA"].percent == 25.0
+
+        path = write_progress_csv(tmp_path / "progress.csv", results.values())
+        lines = path.read_text(encoding='utf-8-sig').splitlines()
+        assert lines[0] == "시퀀스,전체,수정됨,진행률(%)"
+        assert lines[1] == "seqA,4,1,25.0"
+        assert lines[-1] == "합계,9,3,33.3"
+
+    def test_dashboard_fills_progressively_and_sorts(self, qtbot, dataset):
+        dashboard = ProgressDashboard(dataset, workers=2)
+        qtbot.addWidget(dashboard)
+        dashboard.wait_for_scan()
+        qtbot.waitUntil(lambda: dashboard.table.rowCount() == 3)
+        assert dashboard.summary_label.text() == "전체 9개 중 3개 수정 (33.3%)"
+
+        # 진행률은 숫자 기준으로 정렬
+        dashboard.table.sortItems(3, Qt.DescendingOrder)
+        order = [dashboard.table.item(r, 0).text() for r in range(3)]
+        assert order == ["seqB", "seqA", "seqC"]
+
+        with qtbot.waitSignal(dashboard.sequence_activated) as blocker:
+            dashboard._on_double_click(1, 2)
+        assert blocker.args == ["seqA"]
+
+    def test_refresh_drops_results_of_previous_scan(self, qtbot, dataset):
+        """새로 고침 전에 실행 중이던 스캔 결과는 표에 추가하지 않음"""
+        gate, refreshed = threading.Event(), threading.Event()
+
+        def slow_scan(folder):
+            stale = not refreshed.is_set()
+            if stale:
+                gate.wait(5)
+            return SequenceProgress(Path(folder).name, 99 if stale else 1, 0)
+
+        with patch('widgets.scan_sequence', side_effect=slow_scan):
+            dashboard = ProgressDashboard(dataset, workers=2)
+            qtbot.addWidget(dashboard)
+            old_executor, old_token = dashboard._executor, dashboard._token
+            refreshed.set()
+            dashboard.start_scan()
+            assert old_token.cancelled
+            gate.set()
+            old_executor.shutdown(wait=True)
+            dashboard.wait_for_scan()
+            qtbot.waitUntil(lambda: dashboard.table.rowCount() == 3)
+            qtbot.wait(50)
+        assert dashboard.table.rowCount() == 3
+        assert {r.total for r in dashboard.results.values()} == {1}
+
+# 단위 테스트: 원본/수정본 비교
+class TestAnnotationDiff:
+    @pytest.fixture
+    def dataset(self, tmp_path):
+        def write(path, frames, annotator=None):
+            data = {"segmentation": [{"keyframe": k, "keypoints": p} for k, p in frames]}
+            if annotator:
+                data["annotator"] = annotator
+            path.write_text(json.dumps(data))
+
+        base = [[100 + i, 200] for i in range(17)]
+        for seq, annotator, shift in [("seqA", "kim", 3), ("seqB", "lee", 10)]:
+            folder = tmp_path / "2.라벨링데이터" / seq
+            (folder / "edited").mkdir(parents=True)
+            write(folder / "clip.json", [(0, base), (4, base)])
+            moved = [[x + shift, y] for x, y in base]
+            moved[16] = [0, 0]           # 삭제
+            edited_first = [list(p) for p in base]
+            edited_first[0] = [0, 0]     # 삭제
+            write(folder / "edited" / "clip.json", [(0, edited_first), (4, moved)], annotator)
+            write(folder / "unedited.json", [(0, base)])
+        return tmp_path
+
+    def test_displacement_and_annotator_aggregates(self, dataset):
+        diffs = sorted(diff_dataset(dataset, workers=0), key=lambda d: d.sequence)
+        assert [(d.sequence, d.name, d.annotator) for d in diffs] == [
+            ("seqA", "clip.json", "kim"), ("seqB", "clip.json", "lee")
+        ]
+        a = diffs[0]
+        assert a.keyframes.tolist() == [0, 4]
+        assert np.isnan(a.displacement[0, 0]) and a.removed[0, 0]
+        assert np.allclose(a.displacement[1, :16], 3.0) and a.removed[1, 16]
+
+        summary = summarize(diffs)
+        assert summary['annotators']['kim']['mean_px'] == round(3 * 16 / 32, 2)
+        assert summary['annotators']['lee']['max_px'] == 10.0
+        assert summary['total']['removed'] == 4
+        assert summary['keypoint_mean_px'][16] == 0.0
+
+        top = largest_corrections(diffs)
+        assert [(c.sequence, c.keyframe, c.max_px) for c in top[:2]] == [("seqB", 4, 10.0), ("seqA", 4, 3.0)]
+        assert len(build_report(diffs, limit=1)['largest_corrections']) == 1
+
+    def test_load_segments_normalizes_and_skips_bad_keyframes(self, tmp_path):
+        path = tmp_path / "clip.json"
+        path.write_text(json.dumps({"segmentation": [
+            {"keyframe": "3", "keypoints": [[1, 2]] * 17},
+            {"keyframe": 3.0, "keypoints": [[3, 4]] * 17},
+            {"keyframe": None, "keypoints": [[5, 6]] * 17},
+            {"keyframe": "abc", "keypoints": [[7, 8]] * 17},
+            {"keypoints": [[9, 9]] * 17},
+        ]}))
+        segments, annotator = load_segments(path)
+        assert sorted(segments) == [(3, 0), (3, 1)]
+        assert segments[(3, 1)][0].tolist() == [3, 4]
+        assert annotator == "unknown"
+
+    def test_process_pool_matches_inline(self, dataset):
+        inline = {d.sequence: d for d in diff_dataset(dataset, workers=0)}
+        pooled = {d.sequence: d for d in diff_dataset(dataset, workers=2)}
+        assert inline.keys() == pooled.keys()
+        for key in inline:
+            assert np.array_equal(inline[key].displacement, pooled[key].displacement, equal_nan=True)
+
+    def test_dialog_lists_largest_corrections(self, qtbot, dataset):
+        dialog = CorrectionsDialog(dataset, workers=0)
+        qtbot.addWidget(dialog)
+        dialog.wait_for_diff()
+        qtbot.waitUntil(lambda: dialog.table.rowCount() == 4)
+        assert dialog.table.item(0, 0).text() == "seqB"
+        with qtbot.waitSignal(dialog.frame_activated) as blocker:
+            dialog._on_double_click(0, 0)
+        assert blocker.args == ["seqB", "clip.json", 4]
+
+# 단위 테스트: 원본 영상 프레임 소스
+def write_video(path, count=40, size=(64, 48), gop=12):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), 10, size)
+    writer.set(cv2.VIDEOWRITER_PROP_QUALITY, 100)
+    for i in range(count):
+        frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        cv2.putText(frame, str(i), (4, 36), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        frame[:, :, 0] = i * 5
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+class TestVideoFrameSource:
+    @pytest.fixture
+    def video(self, tmp_path):
+        path = write_video(tmp_path / "clip.mp4")
+        cap = cv2.VideoCapture(str(path))
+        frames = []
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        cap.release()
+        return path, frames
+
+    def test_random_access_matches_sequential_decode(self, tmp_path, video):
+        path, frames = video
+        keyframes, count = scan_keyframes(path)
+        assert count == len(frames) == 40
+        assert keyframes[0] == 0 and len(keyframes) > 1
+
+        source = VideoFrameSource(path, index_dir=tmp_path / "index")
+        try:
+            for n in [30, 5, 39, 0, 17, 16, 18]:
+                assert np.array_equal(source.read(n), frames[n]), n
+            # 최근 프레임은 디코딩 없이 반환
+            assert source.read(17) is source.read(17)
+            assert np.array_equal(source.submit(22).result(), frames[22])
+        finally:
+            source.close()
+
+        # 색인은 디스크에서 재사용
+        with patch('frame_source.scan_keyframes') as scan:
+            reopened = VideoFrameSource(path, index_dir=tmp_path / "index")
+            reopened.close()
+        scan.assert_not_called()
+        assert np.array_equal(reopened.keyframes, keyframes)
+
+    def test_sequential_stepping_decodes_forward(self, tmp_path, video):
+        path, frames = video
+        source = VideoFrameSource(path, index_dir=tmp_path / "index")
+        try:
+            source.read(3)
+            source._cap = MagicMock(wraps=source._cap)
+            for n in range(4, 10):
+                assert np.array_equal(source.read(n), frames[n])
+            source._cap.set.assert_not_called()
+        finally:
+            source.close()
+
+    def test_close_does_not_wait_for_decode(self, tmp_path, video):
+        import time
+        path, _ = video
+        source = VideoFrameSource(path, index_dir=tmp_path / "index")
+        source.read(0)
+        started, resume = threading.Event(), threading.Event()
+        read = source.read
+
+        def slow_read(n):
+            started.set()
+            resume.wait(5)
+            return read(n)
+
+        with patch.object(source, 'read', side_effect=slow_read):
+            running = source.submit(10)
+            queued = source.submit(20)
+            assert started.wait(5)
+            t0 = time.perf_counter()
+            source.close()
+            assert time.perf_counter() - t0 < 0.5
+            assert queued.cancelled() and source._cap is not None
+            resume.set()
+            assert running.result(5) is not None
+        source._executor.shutdown(wait=True)
+        assert source._cap is None and not source._cache
+
+# 단위 테스트: 아카이브 데이터셋
+def write_dataset(base, sequences=("seqA",), frames=3):
+    for seq in sequences:
+        image_dir = base / "1.추출 이미지 데이터" / seq
+        json_dir = base / "2.라벨링데이터" / seq
+        image_dir.mkdir(parents=True)
+        json_dir.mkdir(parents=True)
+        for i in range(frames):
+            image = np.full((36, 64, 3), i * 40, dtype=np.uint8)
+            cv2.imwrite(str(image_dir / f"clip_{i}.jpg"), image)
+        (json_dir / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": 1, "keypoints": [[20, 10] for _ in range(17)]}
+        ]}))
+    return base
+
+
+def zip_dataset(base, archive, wrap="dataset"):
+    import zipfile
+    with zipfile.ZipFile(archive, 'w') as zf:
+        for path in sorted(base.rglob("*")):
+            if path.is_file():
+                # JPEG은 무압축, JSON은 deflate로 저장
+                method = zipfile.ZIP_STORED if path.suffix == '.jpg' else zipfile.ZIP_DEFLATED
+                zf.write(path, f"{wrap}/{path.relative_to(base).as_posix()}", compress_type=method)
+    return archive
+
+
+@pytest.fixture
+def labeled_dataset(tmp_path):
+    """일괄 처리 도구 테스트용 데이터셋 (seqA~seqC, 키프레임 1에 포인트가 있는 clip.json)"""
+    return write_dataset(tmp_path / "data", sequences=("seqA", "seqB", "seqC"))
+
+
+class TestArchiveStorage:
+    @pytest.fixture
+    def dataset(self, tmp_path):
+        return write_dataset(tmp_path / "src")
+
+    @pytest.mark.parametrize("kind", ["zip", "tar"])
+    def test_reads_members_without_extracting(self, tmp_path, dataset, kind):
+        if kind == "zip":
+            archive = zip_dataset(dataset, tmp_path / "ds.zip")
+        else:
+            import tarfile
+            archive = tmp_path / "ds.tar"
+            with tarfile.open(archive, 'w') as tar:
+                tar.add(dataset, arcname=".")
+        root = storage.open_dataset(archive)
+        try:
+            image_dir = root / "1.추출 이미지 데이터" / "seqA"
+            assert storage.subdirs(root / "1.추출 이미지 데이터") == ["seqA"]
+            assert [p.name for p in storage.glob(image_dir, "clip_*.jpg")] == [
+                "clip_0.jpg", "clip_1.jpg", "clip_2.jpg"]
+
+            source = dataset / "1.추출 이미지 데이터" / "seqA" / "clip_2.jpg"
+            data = storage.read_array(image_dir / "clip_2.jpg")
+            assert data.tobytes() == source.read_bytes()
+            assert storage.read_range(image_dir / "clip_2.jpg", 2, 4) == source.read_bytes()[2:6]
+            assert probe_image_size(image_dir / "clip_2.jpg") == (64, 36)
+            assert storage.cache_key(image_dir / "clip_1.jpg") != storage.cache_key(image_dir / "clip_2.jpg")
+
+            # 쓰기는 옆 폴더로, 이후 조회는 옆 폴더 우선
+            edited = root / "2.라벨링데이터" / "seqA" / "edited" / "clip.json"
+            assert not storage.exists(edited)
+            storage.write_bytes(edited, b'{"segmentation": []}')
+            assert (tmp_path / "ds_edited" / "2.라벨링데이터" / "seqA" / "edited" / "clip.json").exists()
+            assert storage.exists(edited)
+            assert json.loads(storage.read_bytes(edited)) == {"segmentation": []}
+        finally:
+            storage.unmount(archive)
+        assert storage.backend_for(archive / "x") is storage.LOCAL
+
+    def test_process_pool_only_for_local_datasets(self, tmp_path, dataset):
+        assert storage.process_pool(dataset, 0, 4) is None
+        assert storage.process_pool(dataset, 2, 1) is None
+        executor = storage.process_pool(dataset, 2, 4)
+        with executor:
+            assert executor._max_workers == 2
+        archive = zip_dataset(dataset, tmp_path / "ds.zip")
+        root = storage.open_dataset(archive)
+        try:
+            # 아카이브는 워커 프로세스에서 열 수 없으므로 현재 프로세스에서 처리
+            assert storage.process_pool(root, 2, 4) is None
+        finally:
+            storage.unmount(archive)
+
+    def test_rejects_compressed_tar(self, tmp_path, dataset):
+        import tarfile
+        archive = tmp_path / "ds.tar"
+        with tarfile.open(archive, 'w:gz') as tar:
+            tar.add(dataset, arcname=".")
+        with pytest.raises(ValueError):
+            storage.open_dataset(archive)
+
+
+# 단위 테스트: HTTP 저장소
+@pytest.fixture
+def dataset_server(tmp_path):
+    import threading
+    write_dataset(tmp_path / "served" / "ds")
+    server = make_server(tmp_path / "served", port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/ds"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpStorage:
+    def test_lists_reads_and_writes_over_pooled_connections(self, tmp_path, dataset_server):
+        root = storage.open_dataset(dataset_server)
+        backend = storage.backend_for(root)
+        try:
+            assert isinstance(backend, storage.HttpStorage)
+            image_dir = root / "1.추출 이미지 데이터" / "seqA"
+            assert storage.subdirs(root / "1.추출 이미지 데이터") == ["seqA"]
+            images = storage.glob(image_dir, "clip_*.jpg")
+            assert [p.name for p in images] == ["clip_0.jpg", "clip_1.jpg", "clip_2.jpg"]
+
+            # 미리 받은 파일은 추가 요청 없이 읽고, 연결은 재사용
+            storage.prefetch(images)
+            source = tmp_path / "served" / "ds" / "1.추출 이미지 데이터" / "seqA" / "clip_2.jpg"
+            for path in images:
+                storage.read_async(path).result(timeout=5)
+            assert storage.read_array(images[2]).tobytes() == source.read_bytes()
+            assert storage.read_range(images[2], 2, 4) == source.read_bytes()[2:6]
+            assert probe_image_size(images[2]) == (64, 36)
+            assert backend._pool.connections_created <= len(images)
+
+            edited = root / "2.라벨링데이터" / "seqA" / "edited" / "clip.json"
+            assert not storage.exists(edited)
+            storage.write_bytes(edited, b'{"segmentation": []}')
+            assert storage.exists(edited)
+            assert json.loads(storage.read_bytes(edited)) == {"segmentation": []}
+            assert (tmp_path / "served" / "ds" / "2.라벨링데이터" / "seqA" / "edited" / "clip.json").exists()
+
+            with pytest.raises(FileNotFoundError):
+                storage.read_array(image_dir / "clip_9.jpg")
+        finally:
+            storage.unmount(root)
+        assert storage.backend_for(root / "x") is storage.LOCAL
+
+    def test_range_read_waits_for_prefetch(self, dataset_server):
+        """받는 중인 파일의 앞부분을 읽으면 Range 요청을 따로 보내지 않고 도착을 기다림"""
+        import time
+        backend = storage.HttpStorage(dataset_server)
+        request = backend._request
+        sent = []
+
+        def slow_request(method, name, body=None, headers=None, query=''):
+            sent.append(headers)
+            if method == 'GET' and name.endswith('.jpg'):
+                time.sleep(0.2)
+            return request(method, name, body, headers, query)
+
+        try:
+            path = backend.root / "1.추출 이미지 데이터" / "seqA" / "clip_1.jpg"
+            with patch.object(backend, '_request', side_effect=slow_request):
+                backend.prefetch([path])
+                head = backend.read_range(path, 0, 4)
+            assert head == backend.read_array(path)[:4].tobytes()
+            assert sent == [None]  # 전체 받기 한 번뿐
+        finally:
+            backend.close()
+
+    def test_cache_is_bounded(self, dataset_server):
+        backend = storage.HttpStorage(dataset_server, cache_bytes=1)
+        try:
+            images = backend.glob(backend.root / "1.추출 이미지 데이터" / "seqA", "*.jpg")
+            for path in images:
+                backend.read_array(path)
+            assert len(backend._cache) == 1
+        finally:
+            backend.close()
+
+# 단위 테스트: 키프레임 보간
+class TestInterpolation:
+    def test_linear_fills_between_keyframes(self):
+        start = [[10, 20]] + [[0, 0]] * 15 + [[50, 50]]
+        end = [[30, 60]] + [[0, 0]] * 15 + [[0, 0]]
+        result = interpolate_keyframes({2: start, 6: end}, range(0, 9), LINEAR)
+        assert result.frames.tolist() == list(range(9))
+        # 키프레임 자체와 범위 밖 프레임은 채우지 않음
+        assert not result.interpolated[[0, 1, 2, 6, 7, 8]].any()
+        np.testing.assert_allclose(result.points[3, 0], [15, 30])
+        np.testing.assert_allclose(result.points[5, 0], [25, 50])
+        # 한쪽 키프레임에만 표시된 포인트는 채우지 않음
+        assert result.interpolated[3].tolist() == [True] + [False] * 16
+        keypoints, proposed = result.proposal(4)
+        assert keypoints[0] == [20, 40] and proposed[0] and not proposed[16]
+        assert result.proposal(2) is None
+
+    def test_spline_follows_curved_motion(self):
+        # y = x^2 궤적을 따르는 점: 3차 Hermite는 선형보다 가까움
+        keyframes = {f: [[f * 10 + 1, f * f + 1]] * 17 for f in (0, 4, 8, 12)}
+        linear = interpolate_keyframes(keyframes, range(13), LINEAR)
+        spline = interpolate_keyframes(keyframes, range(13), SPLINE)
+        truth = np.array([[f * 10 + 1, f * f + 1] for f in range(13)], dtype=float)
+        linear_error = np.abs(linear.points[:, 0] - truth)[linear.interpolated[:, 0]].max()
+        spline_error = np.abs(spline.points[:, 0] - truth)[spline.interpolated[:, 0]].max()
+        assert spline_error < linear_error
+        np.testing.assert_allclose(spline.points[6, 0], truth[6], atol=1e-6)
+
+    def test_needs_two_keyframes(self):
+        result = interpolate_keyframes({3: [[5, 5]] * 17}, range(10))
+        assert not result.interpolated.any()
+        with pytest.raises(ValueError):
+            interpolate_keyframes({}, range(3), 'cubic')
+
+# 단위 테스트: 광학 흐름 추적
+def textured_frames(count, shift=(3, 2), size=(160, 120)):
+    """프레임마다 (dx, dy)만큼 이동하는 무늬 이미지 목록 (RGB)"""
+    rng = np.random.default_rng(0)
+    texture = cv2.GaussianBlur(rng.integers(0, 255, (size[1] * 2, size[0] * 2), dtype=np.uint8), (5, 5), 0)
+    frames = []
+    for i in range(count):
+        x, y = 40 - shift[0] * i, 40 - shift[1] * i
+        gray = texture[y:y + size[1], x:x + size[0]]
+        frames.append(cv2.cvtColor(np.ascontiguousarray(gray), cv2.COLOR_GRAY2RGB))
+    return frames
+
+
+class TestKeypointTracker:
+    def test_tracks_points_and_reports_confidence(self):
+        frames = textured_frames(4)
+        tracker = KeypointTracker()
+        try:
+            keypoints = [[0, 0]] * 17
+            keypoints[0] = [80, 60]
+            keypoints[5] = [40, 50]
+            targets = [(i, f"f{i}", frames[i]) for i in range(1, 4)]
+            proposals = tracker.submit(("f0", frames[0]), keypoints, targets).result(timeout=10)
+            assert [p.frame for p in proposals] == [1, 2, 3]
+            assert proposals[2].keypoints[0] == [89, 66]
+            assert proposals[2].keypoints[5] == [49, 56]
+            assert proposals[2].confidence[0] >= MIN_CONFIDENCE
+            # 표시하지 않은 포인트는 추적하지 않음
+            assert proposals[0].keypoints[1] == [0, 0] and proposals[0].confidence[1] == 0
+            assert proposals[0].proposed[0] and not proposals[0].proposed[1]
+
+            # 저장 좌표계가 배열의 2배인 경우에도 같은 위치 (피라미드는 재사용)
+            doubled = [[2 * x, 2 * y] for x, y in keypoints]
+            again = tracker.track(("f0", None), doubled, [(1, "f1", None)], image_size=(320, 240))
+            assert again[0].keypoints[0] == [166, 124]
+        finally:
+            tracker.shutdown()
+
+# 단위 테스트: 자동 라벨링
+class TestPrelabel:
+    @pytest.fixture
+    def dataset(self, labeled_dataset):
+        base = labeled_dataset
+        # seqA: 키프레임 1은 사람이 찍은 포인트, 키프레임 2는 비어 있음
+        (base / "2.라벨링데이터" / "seqA" / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": 1, "keypoints": [[20, 10] for _ in range(17)]},
+            {"keyframe": 2, "keypoints": []},
+        ]}))
+        # seqB: JSON 없음
+        (base / "2.라벨링데이터" / "seqB" / "clip.json").unlink()
+        return base
+
+    # 워커 프로세스마다 초기화 함수로 예측기를 만드는 경로와 현재 프로세스 경로를 모두 확인
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_fills_empty_keyframes_and_resumes(self, dataset, workers):
+        results = prelabel_dataset(dataset, 'stub', workers=workers, batch_size=2)
+        assert sorted((Path(r.json_path).parent.name, r.frames) for r in results) == [
+            ("seqA", 1), ("seqB", 3), ("seqC", 0)]
+
+        # 결과는 edited 폴더에만 저장 (원본은 그대로)
+        label_root = dataset / "2.라벨링데이터"
+        assert "prelabel" not in json.loads((label_root / "seqA" / "clip.json").read_text(encoding='utf-8'))
+        seq_a = json.loads((label_root / "seqA" / "edited" / "clip.json").read_text(encoding='utf-8'))
+        assert seq_a["segmentation"][0]["keypoints"][0] == [20, 10]  # 사람이 찍은 포인트 유지
+        predicted = seq_a["segmentation"][1]["keypoints"]
+        assert predicted[0] == [32, 5] and predicted[1] == [0, 0]  # 64x36 기준, 눈은 표시 안 함
+        assert seq_a["prelabel"] == {"model": "stub"}
+
+        seq_b = json.loads((label_root / "seqB" / "edited" / "clip.json").read_text(encoding='utf-8'))
+        assert [s["keyframe"] for s in seq_b["segmentation"]] == [0, 1, 2]
+        original_b = json.loads((label_root / "seqB" / "clip.json").read_text(encoding='utf-8'))
+        assert all(s["keypoints"] == [] for s in original_b["segmentation"])
+
+        # 진행 기록이 있으면 다시 실행해도 건너뜀
+        assert len((dataset / PROGRESS_FILE).read_text().splitlines()) == 3
+        assert prelabel_dataset(dataset, 'stub', workers=workers) == []
+        again = prelabel_dataset(dataset, 'stub', workers=0, resume=False)
+        assert [r.frames for r in again] == [0, 0, 0]
+
+    def test_reads_edited_copy_first(self, dataset):
+        """수정본에서 사람이 채운 키프레임은 원본에서 비어 있어도 예측하지 않음"""
+        folder = dataset / "2.라벨링데이터" / "seqA"
+        (folder / "edited").mkdir()
+        (folder / "edited" / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": 1, "keypoints": [[20, 10] for _ in range(17)]},
+            {"keyframe": "2", "keypoints": [[40, 20] for _ in range(17)]},
+            {"keyframe": 0, "keypoints": []},
+        ]}))
+        results = prelabel_dataset(dataset, 'stub', workers=0)
+        assert sorted((Path(r.json_path).parent.name, r.frames) for r in results) == [
+            ("seqA", 1), ("seqB", 3), ("seqC", 0)]
+        saved = json.loads((folder / "edited" / "clip.json").read_text(encoding='utf-8'))
+        assert [s["keypoints"][0] for s in saved["segmentation"]] == [[20, 10], [40, 20], [32, 5]]
+
+    def test_predictor_must_implement_predict(self):
+        class Incomplete(PosePredictor):
+            name = 'incomplete'
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_decode_heatmaps(self):
+        heatmaps = np.zeros((2, 17, 8, 6), dtype=np.float32)
+        heatmaps[0, 0, 2, 3] = 0.9
+        heatmaps[0, 0, 2, 4] = 0.5  # 오른쪽 이웃이 더 큼 -> +1/4
+        heatmaps[1, 5, 7, 0] = 0.4
+        points = decode_heatmaps(heatmaps, [(60, 80), (6, 8)])
+        np.testing.assert_allclose(points[0, 0], [(3.25 + 0.5) * 10 - 0.5, (2 + 0.5) * 10 - 0.5, 0.9], rtol=1e-6)
+        np.testing.assert_allclose(points[1, 5], [0, 7, 0.4], rtol=1e-6)
+
+    def test_unknown_predictor(self):
+        with pytest.raises(ValueError):
+            create_predictor('nope')
+        assert create_predictor('prelabel:StubPredictor').name == 'stub'
+
+# 단위 테스트: 학습용 샤드 내보내기
+class TestShardExport:
+    @pytest.fixture
+    def dataset(self, labeled_dataset):
+        base = labeled_dataset
+        # seqA는 수정본 우선, 키프레임 2의 포인트 하나는 표시 안 함
+        edited = base / "2.라벨링데이터" / "seqA" / "edited"
+        edited.mkdir()
+        points = [[30, 12] for _ in range(17)]
+        points[3] = [0, 0]
+        (edited / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": 2, "keypoints": points}, {"keyframe": 0, "keypoints": []},
+        ]}))
+        return base
+
+    def test_jpeg_shards_random_access(self, tmp_path, dataset):
+        samples = collect_samples(dataset)
+        assert [s.key for s in samples] == ["seqA/clip/2", "seqB/clip/1", "seqC/clip/1"]
+
+        manifest = export_shards(dataset, tmp_path / "out", shard_size=2, workers=2)
+        reader = ShardReader(manifest)
+        try:
+            assert len(reader) == 3 and len(reader.manifest['shards']) == 2
+            image, keypoints = reader[0]
+            source = dataset / "1.추출 이미지 데이터" / "seqA" / "clip_2.jpg"
+            assert image.tobytes() == source.read_bytes()
+            assert keypoints.shape == (17, 3)
+            assert keypoints[0].tolist() == [30, 12, 2] and keypoints[3].tolist() == [0, 0, 0]
+            image, keypoints = reader[2]  # 두 번째 샤드
+            assert cv2.imdecode(image, cv2.IMREAD_COLOR).shape == (36, 64, 3)
+            assert keypoints[0].tolist() == [20, 10, 2]
+            assert reader._index[1][0, 2:].tolist() == [64, 36]
+            with pytest.raises(IndexError):
+                reader[3]
+        finally:
+            reader.close()
+
+    def test_invalid_keyframes_are_skipped(self, dataset, caplog):
+        (dataset / "2.라벨링데이터" / "seqB" / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": "2", "keypoints": [[20, 10] for _ in range(17)]},
+            {"keyframe": "x", "keypoints": [[20, 10] for _ in range(17)]},
+            {"keyframe": None, "keypoints": [[20, 10] for _ in range(17)]},
+        ]}))
+        with caplog.at_level(logging.WARNING):
+            samples = collect_samples(dataset)
+        assert [s.key for s in samples] == ["seqA/clip/2", "seqB/clip/2", "seqC/clip/1"]
+        assert sum("키프레임 번호가 잘못된" in r.getMessage() for r in caplog.records) == 2
+
+    def test_raw_shards_are_downscaled(self, tmp_path, dataset):
+        manifest = export_shards(dataset, tmp_path / "out", mode='raw', raw_size=(32, 18), workers=0)
+        reader = ShardReader(tmp_path / "out")
+        try:
+            image, keypoints = reader[1]
+            assert image.shape == (18, 32, 3)
+            assert abs(int(image.mean()) - 40) <= 2  # clip_1은 값 40으로 채운 이미지
+            assert keypoints[0].tolist() == [10, 5, 2]
+        finally:
+            reader.close()
+
+# 단위 테스트: 세션 저장과 시작 시간
+class TestSession:
+    def test_round_trip_and_invalid_files(self, tmp_path):
+        path = tmp_path / "conf" / "session.json"
+        assert load_session(path) is None
+        session = Session("/data/ds.zip", "seqA", "clip.json", 3, "Z2Vv", "c3Q=")
+        save_session(session, path)
+        assert load_session(path) == session
+        assert not (tmp_path / "conf" / "session.json.tmp").exists()
+
+        path.write_text("{not json")
+        assert load_session(path) is None
+        path.write_text(json.dumps({"version": 99, "dataset": "/data"}))
+        assert load_session(path) is None
+
+    def test_main_defers_heavy_imports(self):
+        """main 임포트 시 필요할 때만 쓰는 모듈은 로드하지 않음"""
+        deferred = ['psutil', 'http.client', 'annotation_diff', 'propagation']
+        code = f"import sys, main; print([m for m in {deferred!r} if m in sys.modules])"
+        env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                             cwd=Path(__file__).parent, env=env, timeout=60)
+        assert out.returncode == 0, out.stderr
+        assert out.stdout.strip() == "[]"
+
+
+# 단위 테스트: 키포인트 궤적 타임라인
+def smooth_keyframes(frames, jitter=None):
+    """프레임마다 1px씩 움직이는 키프레임 (jitter 프레임만 튀게 함)"""
+    keyframes = {f: [[10 + f, 20 + f] for _ in range(17)] for f in frames}
+    if jitter is not None:
+        keyframes[jitter][7] = [10 + jitter + 20, 20 + jitter]
+    return keyframes
+
+
+class TestTrajectory:
+    def test_scores_mark_spikes_and_missing_points(self):
+        track = TrackArray.from_keyframes(range(10), smooth_keyframes(range(10), jitter=4))
+        assert track.spikes().tolist() == [4]
+        assert track.scores[4] == pytest.approx(20)
+        # 튐 프레임의 이웃은 중간점이 함께 밀려 절반만 벗어남
+        assert track.scores[3] == pytest.approx(10) and track.scores[3] < SPIKE_THRESHOLD_PX
+
+        # 앞뒤에는 있는 포인트가 빠진 프레임
+        keyframes = smooth_keyframes(range(10))
+        keyframes[6][0] = [0, 0]
+        track = TrackArray.from_keyframes(range(10), keyframes)
+        assert track.scores[6] == np.inf and track.spikes().tolist() == [6]
+
+    def test_incremental_update_matches_full_recompute(self):
+        rng = np.random.default_rng(0)
+        track = TrackArray.from_keyframes(range(30), smooth_keyframes(range(0, 30, 2)))
+        for _ in range(50):
+            frame, point = int(rng.integers(30)), int(rng.integers(17))
+            xy = [0, 0] if rng.random() < 0.2 else rng.integers(1, 500, 2).tolist()
+            assert track.set_point(frame, point, xy) == frame
+            full = TrackArray(track.frames, track.points)
+            np.testing.assert_array_equal(track.scores, full.scores)
+        assert track.set_point(99, 0, [1, 1]) == -1
+
+    def test_timeline_redraws_only_changed_columns(self, qtbot):
+        timeline = TrajectoryTimeline()
+        qtbot.addWidget(timeline)
+        timeline.resize(600, timeline.height())
+        timeline.set_tracks(TrackArray.from_keyframes(range(100), smooth_keyframes(range(100))), (200, 200))
+        assert timeline.last_redraw == (0, 599)
+        before = timeline.canvas.copy()
+
+        timeline.set_point(50, 7, [150, 20])
+        c0, c1 = timeline.last_redraw
+        assert c0 <= timeline._columns([50])[0] <= c1 and c1 - c0 < 20
+        changed = np.flatnonzero(np.any(timeline.canvas != before, axis=(0, 2)))
+        assert len(changed) and c0 <= changed.min() and changed.max() <= c1
+
+        # 튐 표시 근처를 클릭하면 그 프레임으로 이동
+        x = int(timeline._columns([50])[0])
+        with qtbot.waitSignal(timeline.frame_selected) as blocker:
+            qtbot.mouseClick(timeline, Qt.LeftButton, pos=QPoint(x + 3, 10))
+        assert blocker.args == [50]
+        assert timeline.frame_at(10) == 1
+
+
+# 단위 테스트: 입출력 작업 스케줄러
+class TestTaskScheduler:
+    def test_runs_by_priority_and_keeps_a_thread_for_frames(self, qtbot):
+        import threading
+        scheduler = TaskScheduler(threads=2)
+        started, frame_gate, scan_gate = [], threading.Event(), threading.Event()
+
+        def job(name, gate=None):
+            started.append(name)
+            if gate is not None:
+                assert gate.wait(5)
+            return name
+
+        scheduler.submit(job, 'frame0', frame_gate, priority=PRIORITY_FRAME)
+        scheduler.submit(job, 'scan0', scan_gate, priority=PRIORITY_SCAN)
+        qtbot.waitUntil(lambda: len(started) == 2)
+        # 두 스레드가 모두 사용 중이면 우선순위 순서로 대기
+        for name, priority in [('scan1', PRIORITY_SCAN), ('prefetch', PRIORITY_PREFETCH),
+                               ('save', PRIORITY_SAVE), ('frame1', PRIORITY_FRAME)]:
+            scheduler.submit(job, name, priority=priority)
+        frame_gate.set()
+        # 스캔이 끝나지 않아도 프레임과 저장은 남은 스레드에서 실행되고, 배경 작업은 대기
+        qtbot.waitUntil(lambda: started[2:] == ['frame1', 'save'])
+        assert scheduler.pending() == 3
+        scan_gate.set()
+        scheduler.wait_for_done()
+        assert started[2:] == ['frame1', 'save', 'prefetch', 'scan1']
+
+    def test_cancelled_tasks_are_not_run_or_delivered(self, qtbot):
+        import threading
+        scheduler = TaskScheduler(threads=2)
+        gate, token, delivered = threading.Event(), CancelToken(), []
+        # 배경 작업 슬롯(스레드 - 1개)을 막아 두고 같은 토큰의 작업 두 개를 대기시킴
+        scheduler.submit(gate.wait, 5, priority=PRIORITY_SCAN)
+        queued = [scheduler.submit(delivered.append, i, priority=PRIORITY_SCAN, token=token,
+                                   on_done=lambda f: delivered.append('done')) for i in range(2)]
+        token.cancel()
+        gate.set()
+        scheduler.wait_for_done()
+        qtbot.wait(50)
+        assert delivered == [] and all(f.cancelled() for f in queued)
+
+        # 결과는 GUI 스레드에서 전달
+        main_thread = threading.current_thread()
+        with qtbot.waitSignal(scheduler._finished):
+            future = scheduler.submit(lambda: 42, priority=PRIORITY_FRAME,
+                                      on_done=lambda f: delivered.append((f.result(), threading.current_thread())))
+        qtbot.waitUntil(lambda: len(delivered) == 1)
+        assert delivered == [(42, main_thread)] and future.result() == 42
+
+    def test_inline_mode_runs_immediately(self):
+        scheduler = TaskScheduler(threads=0)
+        results = []
+        future = scheduler.submit(lambda: 1 / 0, on_done=results.append)
+        assert results == [future] and isinstance(future.exception(), ZeroDivisionError)
+
+
+# 단위 테스트: 되돌리기 기록
+class TestEditHistory:
+    def test_drag_merges_into_one_compact_edit(self):
+        history = EditHistory()
+        # 드래그 중 마우스 이벤트마다 17개 포인트가 모두 바뀜
+        for step in range(1, 50):
+            for point in range(17):
+                history.record(3, 0, point, [10 + step - 1, 20], [10 + step, 20])
+        edit = history.commit()
+        assert len(history) == 1 and edit.changes.shape == (17, 5)
+        assert history.nbytes == 17 * 5 * 4 + EDIT_OVERHEAD_BYTES
+        assert edit.points(undo=True)[0] == (0, [10, 20]) and edit.points()[0] == (0, [59, 20])
+
+        # 제자리로 돌아온 포인트는 기록하지 않음
+        history.record(3, 0, 5, [59, 20], [70, 20])
+        history.record(3, 0, 5, [70, 20], [59, 20])
+        assert history.commit() is None and len(history) == 1
+
+    def test_undo_redo_and_saved_state(self):
+        history = EditHistory()
+        history.record(1, 0, 0, [0, 0], [5, 5])
+        history.record(2, 0, 0, [0, 0], [6, 6])  # 다른 프레임이면 앞 편집을 확정
+        history.mark_saved()
+        assert len(history) == 2 and history.is_saved
+
+        assert history.undo().frame == 2 and not history.is_saved
+        assert history.redo().frame == 2 and history.is_saved
+        history.undo()
+        # 되돌린 뒤 새로 편집하면 다시 실행 기록과 저장 상태로 돌아갈 길이 사라짐
+        history.record(1, 1, 4, [0, 0], [1, 1])
+        history.commit()
+        assert not history.can_redo and history.redo() is None
+        history.undo()
+        assert not history.is_saved
+
+    def test_history_is_capped_by_bytes(self):
+        edit_bytes = 17 * 5 * 4 + EDIT_OVERHEAD_BYTES
+        history = EditHistory(max_bytes=edit_bytes * 10)
+        for frame in range(100):
+            for point in range(17):
+                history.record(frame, 0, point, [0, 0], [frame + 1, 1])
+        history.commit()
+        assert len(history) == 10 and history.nbytes == edit_bytes * 10
+        frames = [history.undo().frame for _ in range(10)]
+        assert frames == list(range(99, 89, -1)) and history.undo() is None
+
+
+# 단위 테스트: 라벨 JSON 형식 검사
+class TestLabelValidation:
+    @pytest.fixture
+    def dataset(self, labeled_dataset):
+        base = labeled_dataset
+        # seqB: 고칠 수 있는 문제 (실수 좌표, 문자열 키프레임, 부족한 포인트, [x, y, v])
+        points = [[20.7, 10.2]] + [[20, 10, 2]] * 15
+        (base / "2.라벨링데이터" / "seqB" / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": "1", "keypoints": points}, {"keyframe": 2, "keypoints": []},
+        ]}))
+        # seqC: 수정본에 segmentation이 없음 (직접 수정 필요)
+        edited = base / "2.라벨링데이터" / "seqC" / "edited"
+        edited.mkdir()
+        (edited / "clip.json").write_text(json.dumps({"annotator": "kim"}))
+        return base
+
+    def test_normalize_reports_locations(self):
+        data = {"segmentation": [
+            {"keyframe": 0.0, "keypoints": [[1.5, 2]] * 17},
+            {"keyframe": "x", "keypoints": [[1, 2]] * 18},
+            {"keyframe": 3, "keypoints": [[1, None]] + [[1, 2]] * 16},
+        ]}
+        normalized, problems = normalize_label(data)
+        assert normalized is None
+        locations = {(p.location, p.fixable) for p in problems}
+        assert ("segmentation[0].keyframe", True) in locations
+        assert ("segmentation[0].keypoints[16]", True) in locations
+        assert ("segmentation[1].keyframe", False) in locations
+        assert ("segmentation[1].keypoints", False) in locations
+        assert ("segmentation[2].keypoints[0]", False) in locations
+
+        normalized, problems = normalize_label({"segmentation": data["segmentation"][:1], "annotator": "kim"})
+        assert len(problems) == 18 and all(p.fixable for p in problems)
+        assert normalized == {"segmentation": [{"keyframe": 0, "keypoints": [[1, 2]] * 17}],
+                              "annotator": "kim"}
+        assert normalize_label({"segmentation": [{"keyframe": 1, "keypoints": []}]})[1] == []
+
+    def test_keyframes_follow_loader_rules(self):
+        data = {"segmentation": [{"keyframe": k, "keypoints": []} for k in ["+3", " 4 ", 5.0, True, 2.5]]}
+        normalized, problems = normalize_label(data)
+        assert normalized is None
+        assert [(p.segment, p.fixable) for p in problems] == [(0, True), (1, True), (2, True), (3, False), (4, False)]
+        normalized, _ = normalize_label({"segmentation": data["segmentation"][:3]})
+        assert [s["keyframe"] for s in normalized["segmentation"]] == [3, 4, 5]
+
+    def test_validates_and_fixes_dataset(self, dataset):
+        reports = {r.sequence: r for r in validate_dataset(dataset, fix=True, workers=2)}
+        assert reports["seqA"].ok and reports["seqA"].written is None
+        assert reports["seqB"].fixable and reports["seqB"].written
+        assert not reports["seqC"].fixable and reports["seqC"].written is None
+        assert [p.location for p in reports["seqC"].problems] == ["segmentation"]
+        assert reports["seqC"].path.endswith(str(Path("edited") / "clip.json"))
+
+        fixed = json.loads((dataset / "2.라벨링데이터" / "seqB" / "edited" / "clip.json").read_text())
+        segment = fixed["segmentation"][0]
+        assert segment["keyframe"] == 1 and len(segment["keypoints"]) == 17
+        assert segment["keypoints"][:2] == [[20, 10], [20, 10]] and segment["keypoints"][16] == [0, 0]
+        assert fixed["segmentation"][1] == {"keyframe": 2, "keypoints": []}
+        assert not (dataset / "2.라벨링데이터" / "seqA" / "edited").exists()
+
+        # 정규화한 수정본을 다시 검사하면 seqC만 남음
+        report = build_check_report(validate_dataset(dataset, workers=0))
+        assert report["files"] == 3 and report["failed"] == 1
+        assert report["problems"][0]["sequence"] == "seqC"
+
+
+# 단위 테스트: 사람별 이미지 잘라 내보내기
+class TestCropExport:
+    @pytest.fixture
+    def dataset(self, labeled_dataset):
+        base = labeled_dataset
+        # seqA 수정본: 키프레임 2에 두 사람 (두 번째 사람의 포인트 하나는 표시 안 함)
+        edited = base / "2.라벨링데이터" / "seqA" / "edited"
+        edited.mkdir()
+        first = [[10 + i, 8 + i] for i in range(17)]
+        second = [[55 + i % 8, 1 + i] for i in range(17)]  # 오른쪽 위 모서리
+        second[3] = [0, 0]
+        (edited / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": 2, "keypoints": first}, {"keyframe": 2, "keypoints": second},
+            {"keyframe": 0, "keypoints": []},
+        ]}))
+        return base
+
+    def test_string_keyframes_are_grouped_and_invalid_skipped(self, dataset):
+        (dataset / "2.라벨링데이터" / "seqB" / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": 1, "keypoints": [[20, 10] for _ in range(17)]},
+            {"keyframe": "1", "keypoints": [[30, 10] for _ in range(17)]},
+            {"keyframe": [1], "keypoints": [[40, 10] for _ in range(17)]},
+        ]}))
+        sources = collect_sources(dataset)
+        assert [(s.sequence, s.keyframe, len(s.people)) for s in sources] == [
+            ("seqA", 2, 2), ("seqB", 1, 2), ("seqC", 1, 1)]
+
+    def test_boxes_use_visible_points_only(self):
+        people = np.zeros((3, 17, 2))
+        people[0, :, 0] = np.arange(17) * 10 + 100
+        people[0, :, 1] = 200
+        people[0, 5] = 0                    # (0, 0)은 박스 계산에서 제외
+        people[1, 0] = (50, 50)             # 표시된 포인트가 하나뿐
+        boxes, valid = person_boxes(people, (1000, 1000), padding=0.1, aspect=0.5)
+        assert valid.tolist() == [True, False, False]
+        x0, y0, x1, y1 = boxes[0]
+        assert (x0 + x1) / 2 == pytest.approx(180) and x1 - x0 == pytest.approx(192)
+        assert (y0 + y1) / 2 == pytest.approx(200) and y1 - y0 == pytest.approx(384)
+
+    # 워커에서 순서 없이 끝난 묶음도 작업 순서대로 모으는지 두 경로 모두 확인
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_exports_crops_with_remapped_keypoints(self, tmp_path, dataset, workers):
+        sources = collect_sources(dataset)
+        assert [(s.sequence, s.keyframe, len(s.people)) for s in sources] == [
+            ("seqA", 2, 2), ("seqB", 1, 1), ("seqC", 1, 1)]
+
+        manifest = export_crops(dataset, tmp_path / "out", padding=0.1, workers=workers, chunk_images=1)
+        crops = json.loads(manifest.read_text())['crops']
+        assert [(c['sequence'], c['person']) for c in crops] == [
+            ("seqA", 0), ("seqA", 1), ("seqB", 0), ("seqC", 0)]
+        for crop, source in zip(crops, [sources[0].people[0], sources[0].people[1], sources[1].people[0]]):
+            image = cv2.imread(str(tmp_path / "out" / crop['file']))
+            assert [image.shape[1], image.shape[0]] == crop['size']
+            keypoints = np.array(crop['keypoints'])
+            shown = keypoints[:, 2] == 2
+            assert np.allclose(keypoints[shown, :2] + crop['box'][:2], np.array(source)[shown])
+            assert (keypoints[:, :2] >= 0).all() and (keypoints[:, 0] < image.shape[1]).all()
+        assert crops[1]['keypoints'][3] == [0, 0, 0]
+        # 박스가 이미지 밖으로 나가면 이미지 안으로 자름 (64x36)
+        assert crops[1]['box'][2] == 64 and crops[1]['box'][1] == 0
+        assert abs(int(cv2.imread(str(tmp_path / "out" / crops[2]['file'])).mean()) - 40) <= 2
+
+    def test_fixed_output_size(self, tmp_path, dataset):
+        manifest = export_crops(dataset, tmp_path / "out", aspect=0.75, out_size=(48, 64), workers=0)
+        crops = json.loads(manifest.read_text())['crops']
+        image = cv2.imread(str(tmp_path / "out" / crops[0]['file']))
+        assert image.shape == (64, 48, 3) and crops[0]['size'] == [48, 64]
+        x0, y0, x1, y1 = crops[0]['box']
+        assert (x1 - x0) / (y1 - y0) == pytest.approx(0.75, rel=1e-3)
+        first = np.array(crops[0]['keypoints'])[:, :2]
+        expected = (np.array([[10 + i, 8 + i] for i in range(17)]) - (x0, y0)) * (48 / (x1 - x0))
+        assert np.allclose(first, expected, atol=0.05)  # 기록은 소수 둘째 자리까지
+
+
 # 통합 테스트
 class TestKeypointLabeler:
     @patch.object(QFileDialog, 'getExistingDirectory')
@@ -139,6 +1540,602 @@ class TestKeypointLabeler:
         app.load_json(test_json)
         assert app.current_json == test_json
 
+    def test_held_arrow_decodes_only_landing_frame(self, app, qtbot, tmp_path):
+        """방향키를 누르고 있는 동안에는 디코딩하지 않고 도착한 프레임만 디코딩"""
+        image_dir = tmp_path / "data" / "1.추출 이미지 데이터" / "seq"
+        json_dir = tmp_path / "data" / "2.라벨링데이터" / "seq"
+        image_dir.mkdir(parents=True)
+        json_dir.mkdir(parents=True)
+        for i in range(5):
+            cv2.imwrite(str(image_dir / f"clip_{i}.jpg"), np.zeros((36, 64, 3), dtype=np.uint8))
+        test_json = json_dir / "clip.json"
+        test_json.write_text(json.dumps({"segmentation": [
+            {"keyframe": 0, "keypoints": [[100, 100] for _ in range(17)]}
+        ]}))
+
+        app.base_path = tmp_path / "data"
+        app.load_json(test_json)
+
+        with patch.object(app.decode_service, 'submit', wraps=app.decode_service.submit) as submit:
+            app.step_image(1)  # 첫 입력은 바로 디코딩
+            for _ in range(3):
+                app.step_image(1, auto_repeat=True)
+            assert app.current_image_idx == 4
+            assert app.pending_nav_path == image_dir / "clip_4.jpg"
+            assert [c.args[0].name for c in submit.call_args_list] == ["clip_1.jpg"]
+
+            app.flush_navigation()  # 키를 뗌
+            assert [c.args[0].name for c in submit.call_args_list] == ["clip_1.jpg", "clip_4.jpg"]
+
+        assert app.pending_nav_path is None
+        assert app.displayed_image_path == image_dir / "clip_4.jpg"
+        assert app.editor_widget.current_image.shape == (36, 64, 3)
+
+        # 자동 반복 중에는 JSON 경계를 넘지 않음
+        app.step_image(1, auto_repeat=True)
+        assert app.current_json == test_json and app.current_image_idx == 4
+
+    def test_filter_bar_limits_navigation(self, app, qtbot, tmp_path):
+        """검색/상태 필터에 걸린 파일만 표시되고 ↑/↓ 이동도 그 순서를 따름"""
+        (tmp_path / "data" / "1.추출 이미지 데이터" / "seq").mkdir(parents=True)
+        json_dir = tmp_path / "data" / "2.라벨링데이터" / "seq"
+        (json_dir / "edited").mkdir(parents=True)
+        for i in range(6):
+            (json_dir / f"clip_{i}.json").write_text('{"segmentation": []}')
+        (json_dir / "edited" / "clip_2.json").write_text('{"segmentation": []}')
+
+        app.base_path = tmp_path / "data"
+        app.folder_combo.addItem("seq")  # 목록 로드
+        assert app.file_list.rowCount() == 6
+
+        app.status_filter.setCurrentIndex(app.status_filter.findText("수정 사항 없음"))
+        qtbot.keyClicks(app.search_edit, "clip_[0-3]*")
+        hidden = [app.file_list.isRowHidden(r) for r in range(6)]
+        assert hidden == [False, False, True, False, True, True]
+        assert app.filter_count_label.text() == "3 / 6"
+
+        app.current_json = json_dir / "clip_1.json"
+        assert app.get_next_json() == json_dir / "clip_3.json"
+        app.current_json = json_dir / "clip_3.json"
+        assert app.get_next_json() is None
+        assert app.get_prev_json() == json_dir / "clip_1.json"
+
+    def test_open_frame_jumps_to_keyframe(self, app, qtbot, tmp_path):
+        """수정 비교 목록에서 선택한 프레임으로 이동"""
+        image_dir = tmp_path / "data" / "1.추출 이미지 데이터" / "seq"
+        json_dir = tmp_path / "data" / "2.라벨링데이터" / "seq"
+        image_dir.mkdir(parents=True)
+        json_dir.mkdir(parents=True)
+        for i in range(5):
+            cv2.imwrite(str(image_dir / f"clip_{i}.jpg"), np.zeros((36, 64, 3), dtype=np.uint8))
+        (json_dir / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": 0, "keypoints": [[100, 100] for _ in range(17)]}
+        ]}))
+
+        app.base_path = tmp_path / "data"
+        app.folder_combo.addItem("seq")
+        app.open_frame("seq", "clip.json", 3)
+        assert app.current_json == json_dir / "clip.json"
+        assert app.current_image_idx == 3
+        assert app.displayed_image_path == image_dir / "clip_3.jpg"
+
+    def test_loads_frames_from_source_video(self, app, qtbot, tmp_path):
+        """추출 이미지가 없으면 원본 영상에서 프레임을 읽음"""
+        image_dir = tmp_path / "data" / "1.추출 이미지 데이터" / "seq"
+        json_dir = tmp_path / "data" / "2.라벨링데이터" / "seq"
+        image_dir.mkdir(parents=True)
+        json_dir.mkdir(parents=True)
+        write_video(image_dir / "clip.mp4", count=20)
+        (json_dir / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": 7, "keypoints": [[10, 10] for _ in range(17)]}
+        ]}))
+
+        app.base_path = tmp_path / "data"
+        app.load_json(json_dir / "clip.json")
+        assert len(app.current_images) == 20
+        assert app.filmstrip.count() == 20
+        qtbot.waitUntil(lambda: app.displayed_image_path == image_dir / "clip_0.jpg")
+
+        app.jump_to_image(7)
+        qtbot.waitUntil(lambda: app.displayed_image_path == image_dir / "clip_7.jpg")
+        assert app.editor_widget.current_image.shape == (48, 64, 3)
+        assert app.editor_widget.keypoints[0] == [10, 10]
+
+        app.close_video()
+        assert app.video_frames is None
+
+    def test_labels_archive_dataset(self, app, qtbot, tmp_path):
+        """zip 아카이브를 풀지 않고 탐색/저장 (수정본은 옆 폴더에 저장)"""
+        archive = zip_dataset(write_dataset(tmp_path / "src"), tmp_path / "ds.zip")
+        app.set_dataset(archive)
+        assert app.folder_combo.currentText() == "seqA"
+        assert app.file_list.rowCount() == 1
+
+        json_file = archive / "2.라벨링데이터" / "seqA" / "clip.json"
+        app.load_json(json_file)
+        assert len(app.current_images) == 3
+        app.jump_to_image(1)
+        qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[1])
+        assert app.editor_widget.current_image.shape == (36, 64, 3)
+        assert app.editor_widget.keypoints[0] == [20, 10]
+
+        app.on_keypoint_update(0, [30, 15])
+        with patch('main.QMessageBox.show'):
+            app.save_current()
+        side = tmp_path / "ds_edited" / "2.라벨링데이터" / "seqA" / "edited" / "clip.json"
+        saved = json.loads(side.read_text(encoding='utf-8'))
+        assert saved["segmentation"][0]["keypoints"][0] == [30, 15]
+        assert app.file_list.item(0, 1).text() == "수정됨"
+        storage.unmount(archive)
+
+    def test_labels_remote_dataset(self, app, qtbot, tmp_path, dataset_server):
+        """HTTP 서버의 데이터셋을 탐색/저장 (수정본은 서버에 PUT)"""
+        app.set_dataset(dataset_server)
+        root = app.base_path
+        assert app.folder_combo.currentText() == "seqA"
+        app.load_json(root / "2.라벨링데이터" / "seqA" / "clip.json")
+        app.jump_to_image(1)
+        qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[1])
+        assert app.editor_widget.keypoints[0] == [20, 10]
+
+        app.on_keypoint_update(0, [30, 15])
+        with patch('main.QMessageBox.show'):
+            app.save_current()
+        saved = tmp_path / "served" / "ds" / "2.라벨링데이터" / "seqA" / "edited" / "clip.json"
+        assert json.loads(saved.read_text(encoding='utf-8'))["segmentation"][0]["keypoints"][0] == [30, 15]
+        assert app.file_list.item(0, 1).text() == "수정됨"
+        storage.unmount(root)
+
+    def test_restores_last_session(self, app, qtbot, tmp_path):
+        """종료 시 작업 위치를 저장하고, 다음 실행에서 백그라운드 스캔 후 같은 프레임을 다시 엶"""
+        base = write_dataset(tmp_path / "data", sequences=("seqA", "seqB"))
+        app.set_dataset(str(base))
+        app.open_sequence("seqB")
+        app.load_json(base / "2.라벨링데이터" / "seqB" / "clip.json")
+        app.jump_to_image(2)
+        app.close()
+        session = load_session()
+        assert (session.dataset, session.sequence, session.json_name, session.frame) == \
+            (str(base), "seqB", "clip.json", 2)
+
+        restored = KeypointLabeler()
+        qtbot.addWidget(restored)
+        with patch.object(restored, 'load_folder_files') as rescan:
+            assert restored.restore_session() is not None
+            qtbot.waitUntil(lambda: restored.current_json is not None, timeout=5000)
+            rescan.assert_not_called()  # 세션 스캔 결과를 재사용 (폴더를 다시 스캔하지 않음)
+        assert restored.base_path == base
+        assert restored.folder_combo.currentText() == "seqB"
+        assert restored.file_list.rowCount() == 1
+        assert restored.current_json == base / "2.라벨링데이터" / "seqB" / "clip.json"
+        assert restored.current_image_idx == 2
+        qtbot.waitUntil(lambda: restored.displayed_image_path == restored.current_images[2])
+
+    def test_interpolated_proposals_are_accepted_and_saved(self, app, qtbot, tmp_path):
+        """키프레임 사이 프레임에 보간 제안을 표시하고, 확정한 프레임만 저장"""
+        image_dir = tmp_path / "data" / "1.추출 이미지 데이터" / "seq"
+        json_dir = tmp_path / "data" / "2.라벨링데이터" / "seq"
+        image_dir.mkdir(parents=True)
+        json_dir.mkdir(parents=True)
+        for i in range(5):
+            cv2.imwrite(str(image_dir / f"clip_{i}.jpg"), np.zeros((36, 64, 3), dtype=np.uint8))
+        (json_dir / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": 0, "keypoints": [[10, 10] for _ in range(17)]},
+            {"keyframe": 4, "keypoints": [[50, 30] for _ in range(17)]},
+        ]}))
+
+        app.base_path = tmp_path / "data"
+        app.load_json(json_dir / "clip.json")
+        app.jump_to_image(1)
+        qtbot.waitUntil(lambda: app.displayed_image_path == image_dir / "clip_1.jpg")
+        assert app.editor_widget.keypoints[0] == [20, 15]
+        assert all(app.editor_widget.proposed)
+        assert 1 not in app.keypoints_data
+
+        app.accept_proposals()
+        assert app.keypoints_data[1][0] == [20, 15]
+        assert not any(app.editor_widget.proposed)
+
+        # 제안 포인트 하나를 수정하면 프레임 전체가 확정
+        app.jump_to_image(2)
+        qtbot.waitUntil(lambda: app.displayed_image_path == image_dir / "clip_2.jpg")
+        app.editor_widget.keypoints[5] = [33, 22]
+        app.on_keypoint_update(5, [33, 22])
+        assert app.keypoints_data[2][5] == [33, 22]
+        assert app.keypoints_data[2][0] == [30, 20]
+
+        with patch('main.QMessageBox.show'):
+            app.save_current()
+        saved = json.loads((json_dir / "edited" / "clip.json").read_text(encoding='utf-8'))
+        frames = {s["keyframe"]: s["keypoints"] for s in saved["segmentation"]}
+        assert sorted(frames) == [0, 1, 2, 4]
+        assert frames[1][0] == [20, 15]
+
+    def test_editing_other_person_keeps_first_person_unlabeled(self, app, qtbot, tmp_path):
+        """라벨링되지 않은 프레임에서 다른 사람을 편집해도 첫 번째 사람의 제안은 확정되지 않음"""
+        base = write_dataset(tmp_path / "data", frames=5)
+        json_dir = base / "2.라벨링데이터" / "seqA"
+        (json_dir / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": 0, "keypoints": [[10, 10] for _ in range(17)]},
+            {"keyframe": 4, "keypoints": [[50, 30] for _ in range(17)]},
+        ]}))
+        app.base_path = base
+        app.load_json(json_dir / "clip.json")
+        app.jump_to_image(2)
+        qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[2])
+        assert all(app.editor_widget.proposed)
+
+        app.add_person()
+        app.add_person()
+        assert app.editor_widget.active_person == 2
+        app.editor_widget.keypoints[6] = [40, 20]
+        app.on_keypoint_update(6, [40, 20])
+        assert 2 not in app.keypoints_data
+        assert app.other_persons[2][1][6] == [40, 20]
+        assert all(app.editor_widget.proposed)
+
+        with patch('main.QMessageBox.show'):
+            app.save_current()
+        saved = json.loads((json_dir / "edited" / "clip.json").read_text(encoding='utf-8'))
+        frame_2 = [s["keypoints"] for s in saved["segmentation"] if s["keyframe"] == 2]
+        assert len(frame_2) == 1 and frame_2[0][6] == [40, 20]
+        assert sum(1 for x, y in frame_2[0] if x or y) == 1
+
+    def test_string_and_null_keyframes_are_normalized(self, app, qtbot, tmp_path):
+        """문자열 키프레임은 정수로 읽어 보간에 쓰고, null 키프레임은 건너뛰며, 저장 시 원래 세그먼트를 갱신"""
+        base = write_dataset(tmp_path / "data", frames=5)
+        json_dir = base / "2.라벨링데이터" / "seqA"
+        (json_dir / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": "0", "keypoints": [[10, 10] for _ in range(17)]},
+            {"keyframe": None, "keypoints": [[99, 99] for _ in range(17)]},
+            {"keyframe": 4, "keypoints": [[50, 30] for _ in range(17)]},
+        ]}))
+
+        app.base_path = base
+        app.load_json(json_dir / "clip.json")
+        assert sorted(app.keypoints_data) == [0, 4]
+        app.jump_to_image(1)
+        qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[1])
+        assert app.editor_widget.keypoints[0] == [20, 15] and all(app.editor_widget.proposed)
+
+        app.jump_to_image(0)
+        qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[0])
+        app.editor_widget.keypoints[0] = [12, 12]
+        app.on_keypoint_update(0, [12, 12])
+        with patch('main.QMessageBox.show'):
+            app.save_current()
+        saved = json.loads((json_dir / "edited" / "clip.json").read_text(encoding='utf-8'))
+        assert len(saved["segmentation"]) == 3
+        assert saved["segmentation"][0]["keypoints"][0] == [12, 12]
+
+    def test_edited_frame_propagates_to_next_frames(self, app, qtbot, tmp_path):
+        """편집한 프레임에서 다음으로 넘어가면 이어지는 프레임에 추적 제안 표시"""
+        image_dir = tmp_path / "data" / "1.추출 이미지 데이터" / "seq"
+        json_dir = tmp_path / "data" / "2.라벨링데이터" / "seq"
+        image_dir.mkdir(parents=True)
+        json_dir.mkdir(parents=True)
+        for i, frame in enumerate(textured_frames(4)):
+            # 이동량이 정확하도록 무손실 PNG로 저장 (디코딩은 내용 기준이므로 확장자만 .jpg)
+            cv2.imwrite(str(image_dir / f"clip_{i}.png"), frame)
+            (image_dir / f"clip_{i}.png").rename(image_dir / f"clip_{i}.jpg")
+        (json_dir / "clip.json").write_text(json.dumps({"segmentation": [
+            {"keyframe": 0, "keypoints": [[0, 0] for _ in range(17)]}
+        ]}))
+
+        app.base_path = tmp_path / "data"
+        app.load_json(json_dir / "clip.json")
+        qtbot.waitUntil(lambda: app.displayed_image_path == image_dir / "clip_0.jpg")
+        app.editor_widget.keypoints[0] = [80, 60]
+        app.on_keypoint_update(0, [80, 60])
+
+        app.step_image(1)
+        qtbot.waitUntil(lambda: 3 in app.flow_proposals, timeout=5000)
+        qtbot.waitUntil(lambda: app.displayed_image_path == image_dir / "clip_1.jpg")
+        assert app.editor_widget.keypoints[0] == [83, 62]
+        assert app.editor_widget.proposed[0]
+
+        app.accept_proposals()
+        assert app.keypoints_data[1][0] == [83, 62]
+        assert 1 not in app.flow_proposals
+        with patch('main.QMessageBox.show'):
+            app.save_current()
+
+    def test_tracking_shares_in_flight_decode_with_navigation(self, app, qtbot, tmp_path):
+        """추적과 이동이 같은 프레임을 요청하면 디코딩은 한 번만 하고, 이동을 취소해도 추적은 계속됨"""
+        base = write_dataset(tmp_path / "data", frames=3)
+        json_file = base / "2.라벨링데이터" / "seqA" / "clip.json"
+        app.base_path = base
+        app.load_json(json_file, keyframe=1)
+        qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[1])
+
+        requests = []
+
+        def submit(path, data=None):
+            requests.append(path)
+            return DecodeFuture()
+
+        with patch.object(app.decode_service, 'submit', side_effect=submit):
+            tracking = app.propagate_from(1)
+            app.step_image(1)
+            assert len(requests) == 1 and app.nav_future is app._decoding[app.current_images[2]]
+            app.cancel_navigation()
+            pending = app._decoding[app.current_images[2]]
+            assert not pending.cancelled()
+            pending.set_result(decode_file(app.current_images[2]))
+        qtbot.waitUntil(tracking.done, timeout=5000)
+        qtbot.waitUntil(lambda: not app._tracking_leases, timeout=5000)
+        assert not app._decoding and tracking.exception() is None
+        with patch('main.QMessageBox.show'):
+            app.save_current()
+
+    def test_labels_multiple_people_per_keyframe(self, app, qtbot, tmp_path):
+        """같은 키프레임의 세그먼트를 사람별로 표시하고, 클릭한 사람의 포인트를 수정/추가해 저장"""
+        base = write_dataset(tmp_path / "data")
+        json_file = base / "2.라벨링데이터" / "seqA" / "clip.json"
+        second = [[0, 0] for _ in range(17)]
+        second[0] = [50, 25]
+        json_file.write_text(json.dumps({"segmentation": [
+            {"keyframe": 1, "keypoints": [[20, 10] for _ in range(17)]},
+            {"keyframe": 1, "keypoints": second},
+        ]}))
+
+        app.base_path = base
+        app.load_json(json_file)
+        app.jump_to_image(1)
+        qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[1])
+        editor = app.editor_widget
+        assert len(editor.persons) == 2 and app.person_label.text() == "사람 1 / 2"
+
+        # 두 번째 사람의 점을 끌어서 이동
+        target = QPoint(*np.rint(editor.view.map_to_view([50, 25])[0]).astype(int).tolist())
+        target = editor.image_container.mapTo(editor, target)
+        qtbot.mousePress(editor, Qt.LeftButton, pos=target)
+        assert editor.active_person == 1 and app.person_label.text() == "사람 2 / 2"
+        # QTest.mouseMove는 버튼을 누른 채 이동하는 이벤트를 보내지 않으므로 직접 전달
+        editor.mouseMoveEvent(QMouseEvent(QEvent.MouseMove, target + QPoint(60, 0),
+                                          Qt.NoButton, Qt.LeftButton, Qt.NoModifier))
+        qtbot.mouseRelease(editor, Qt.LeftButton, pos=target + QPoint(60, 0))
+        moved = app.other_persons[1][0][0]
+        assert moved[0] > 50 and app.keypoints_data[1][0] == [20, 10]
+
+        # 세 번째 사람 추가
+        app.add_person()
+        assert editor.active_person == 2
+        editor.keypoints[3] = [5, 5]
+        app.on_keypoint_update(3, [5, 5])
+        with patch('main.QMessageBox.show'):
+            app.save_current()
+
+        saved = json.loads((json_file.parent / "edited" / "clip.json").read_text(encoding='utf-8'))
+        persons = [s["keypoints"] for s in saved["segmentation"] if s["keyframe"] == 1]
+        assert len(persons) == 3
+        assert persons[0][0] == [20, 10] and persons[1][0] == moved and persons[2][3] == [5, 5]
+
+        # 다시 불러와도 같은 사람 순서
+        app.load_json(json_file)
+        assert app.other_persons[1][1][3] == [5, 5]
+
+    def test_timeline_jumps_to_jittered_frame(self, app, qtbot, tmp_path):
+        """타임라인의 튐 표시를 클릭하면 해당 프레임으로 이동하고, 수정하면 표시가 사라짐"""
+        base = write_dataset(tmp_path / "data", frames=6)
+        json_file = base / "2.라벨링데이터" / "seqA" / "clip.json"
+        keyframes = smooth_keyframes(range(6), jitter=3)
+        json_file.write_text(json.dumps({"segmentation": [
+            {"keyframe": f, "keypoints": points} for f, points in keyframes.items()
+        ]}))
+
+        app.base_path = base
+        app.load_json(json_file)
+        timeline = app.timeline
+        assert timeline.tracks.spikes().tolist() == [3]
+        x = int(timeline._columns([3])[0])
+        qtbot.mouseClick(timeline, Qt.LeftButton, pos=QPoint(x + 2, 10))
+        qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[3])
+        assert timeline.current == 3
+
+        app.editor_widget.keypoints[7] = [13, 23]
+        app.on_keypoint_update(7, [13, 23])
+        assert timeline.tracks.spikes().tolist() == []
+        with patch('main.QMessageBox.show'):
+            app.save_current()
+
+    def test_file_io_does_not_block_event_loop(self, qtbot, tmp_path, monkeypatch):
+        """느린 저장소에서도 데이터셋 열기, JSON 읽기, 저장 요청은 바로 반환되고 결과는 나중에 반영"""
+        import time
+        monkeypatch.setenv(DECODE_WORKERS_ENV, '0')
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+        monkeypatch.setenv(SESSION_ENV, str(tmp_path / "session.json"))
+        monkeypatch.setenv(IO_THREADS_ENV, '3')
+        base = write_dataset(tmp_path / "data")
+        read_bytes, read_range = storage.read_bytes, storage.read_range
+        gui_thread = threading.current_thread()
+        probed_on_gui = []
+
+        def slow_read(path):
+            time.sleep(0.3)
+            return read_bytes(path)
+
+        def slow_range(path, offset, length):
+            time.sleep(0.3)
+            return read_range(path, offset, length)
+
+        def probe(path):
+            # 원격 데이터셋의 헤더 확인은 Range 요청이므로 GUI 스레드에서 하면 안 됨
+            if threading.current_thread() is gui_thread:
+                probed_on_gui.append(path)
+            time.sleep(0.3)
+            return probe_image_size(path)
+
+        app = KeypointLabeler()
+        qtbot.addWidget(app)
+        with patch('storage.read_bytes', side_effect=slow_read), \
+                patch('storage.read_range', side_effect=slow_range), \
+                patch('main.probe_image_size', side_effect=probe):
+            app.set_dataset(str(base))
+            qtbot.waitUntil(lambda: app.file_list.rowCount() == 1, timeout=5000)
+
+            json_file = base / "2.라벨링데이터" / "seqA" / "clip.json"
+            started = time.perf_counter()
+            app.load_json(json_file, keyframe=1)
+            assert time.perf_counter() - started < 0.2 and app.current_json is None
+            qtbot.waitUntil(lambda: len(app.current_images) == 3
+                            and app.displayed_image_path == app.current_images[1], timeout=5000)
+
+            # 다음 프레임으로 이동해도 이미지 크기 확인을 기다리지 않음
+            started = time.perf_counter()
+            app.jump_to_image(2)
+            assert time.perf_counter() - started < 0.2
+            qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[2], timeout=5000)
+            assert app.editor_widget.view.image_size == (64, 36)
+            app.jump_to_image(1)
+            qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[1], timeout=5000)
+            assert not probed_on_gui
+
+            app.editor_widget.keypoints[0] = [30, 12]
+            app.on_keypoint_update(0, [30, 12])
+            started = time.perf_counter()
+            with patch('main.QMessageBox.show'):
+                future = app.save_current()
+                assert time.perf_counter() - started < 0.2 and not app.modified
+                assert app.file_list.item(0, 1).text() == "수정됨"
+                qtbot.waitUntil(future.done, timeout=5000)
+                qtbot.wait(50)  # 완료 알림 전달
+        saved = json.loads((json_file.parent / "edited" / "clip.json").read_text(encoding='utf-8'))
+        assert saved["segmentation"][0]["keypoints"][0] == [30, 12]
+        app.close()
+
+    def test_frame_cache_and_preview_run_on_io_threads(self, qtbot, tmp_path, monkeypatch):
+        """디스크 프레임 캐시 저장과 미리보기 읽기는 작업 스레드에서 하고, 그동안 빈 화면 표시"""
+        monkeypatch.setenv(DECODE_WORKERS_ENV, '0')
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+        monkeypatch.setenv(SESSION_ENV, str(tmp_path / "session.json"))
+        monkeypatch.setenv(IO_THREADS_ENV, '2')
+        base = write_dataset(tmp_path / "data")
+        app = KeypointLabeler()
+        qtbot.addWidget(app)
+        gui_thread = threading.current_thread()
+        calls = []
+
+        def record(name, fn):
+            def wrapper(*args):
+                calls.append((name, threading.current_thread() is gui_thread))
+                return fn(*args)
+            return wrapper
+
+        app.frame_cache.put = record('put', app.frame_cache.put)
+        app.base_path = base
+        app.load_json(base / "2.라벨링데이터" / "seqA" / "clip.json", keyframe=1)
+        qtbot.waitUntil(lambda: len(app.current_images) == 3
+                        and app.displayed_image_path == app.current_images[1], timeout=5000)
+        app.jump_to_image(0)
+        qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[0], timeout=5000)
+        qtbot.waitUntil(lambda: app.frame_cache.get(app.current_images[1]) is not None, timeout=5000)
+        assert ('put', False) in calls and ('put', True) not in calls
+
+        # 원본이 캐시에 없으면 빈 화면 뒤에 디스크 캐시 미리보기가 도착
+        app.image_cache.clear()
+        app.frame_cache.get = record('get', app.frame_cache.get)
+        app.step_image(1, auto_repeat=True)
+        assert app.displayed_image_path is None
+        qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[1], timeout=5000)
+        assert app.editor_widget.current_image.flags.writeable
+        assert ('get', False) in calls and ('get', True) not in calls
+        app.close()
+
+    def test_reload_during_save_does_not_block_io_threads(self, qtbot, tmp_path, monkeypatch):
+        """저장 중인 JSON을 다시 열면 저장이 끝난 뒤 읽으며, 기다리는 동안 작업 스레드를 점유하지 않음"""
+        import threading
+        monkeypatch.setenv(DECODE_WORKERS_ENV, '0')
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+        monkeypatch.setenv(SESSION_ENV, str(tmp_path / "session.json"))
+        monkeypatch.setenv(IO_THREADS_ENV, '2')
+        base = write_dataset(tmp_path / "data")
+        json_file = base / "2.라벨링데이터" / "seqA" / "clip.json"
+        app = KeypointLabeler()
+        qtbot.addWidget(app)
+        app.base_path = base
+        app.load_json(json_file, keyframe=1)
+        qtbot.waitUntil(lambda: len(app.current_images) == 3
+                        and app.displayed_image_path == app.current_images[1], timeout=5000)
+
+        release = threading.Event()
+        write_json = KeypointLabeler._write_json
+
+        def slow_write(json_file, persons):
+            release.wait(5)
+            return write_json(json_file, persons)
+
+        app.editor_widget.keypoints[0] = [30, 12]
+        app.on_keypoint_update(0, [30, 12])
+        with patch.object(KeypointLabeler, '_write_json', side_effect=slow_write), \
+                patch('main.QMessageBox.show'):
+            app.save_current()
+            assert app.load_json(json_file, keyframe=1) is None
+            # 저장 하나만 실행 중이고 읽기는 아직 요청하지 않음
+            assert app.tasks.pending() == 1
+            release.set()
+            qtbot.waitUntil(lambda: not app._pending_saves and app._deferred_load is None, timeout=5000)
+            qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[1], timeout=5000)
+        assert app.keypoints_data[1][0] == [30, 12]
+        app.close()
+
+    def test_undo_restores_ctrl_drag_in_one_step(self, app, qtbot, tmp_path):
+        """Ctrl 드래그로 옮긴 전체 포인트는 되돌리기 한 번에 복구되고, 저장 상태와 수정 표시가 연동됨"""
+        base = write_dataset(tmp_path / "data", frames=3)
+        json_file = base / "2.라벨링데이터" / "seqA" / "clip.json"
+        app.base_path = base
+        app.load_json(json_file, keyframe=1)
+        qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[1])
+        editor = app.editor_widget
+
+        editor.is_multi_select = True
+        start = editor.image_container.mapTo(editor, QPoint(5, 5))
+        qtbot.mousePress(editor, Qt.LeftButton, pos=start)
+        for dx in (20, 40, 80):
+            editor.mouseMoveEvent(QMouseEvent(QEvent.MouseMove, start + QPoint(dx, 0),
+                                              Qt.NoButton, Qt.LeftButton, Qt.NoModifier))
+        qtbot.mouseRelease(editor, Qt.LeftButton, pos=start + QPoint(80, 0))
+        editor.is_multi_select = False
+        moved = app.keypoints_data[1][0]
+        assert moved[0] > 20 and all(p == moved for p in app.keypoints_data[1])
+        assert len(app.history) == 1
+
+        with patch('main.QMessageBox.show'):
+            app.save_current()
+        QTest.keyClick(app, Qt.Key_Z, Qt.ControlModifier)
+        assert all(p == [20, 10] for p in app.keypoints_data[1])
+        assert editor.keypoints[0] == [20, 10] and app.modified
+        QTest.keyClick(app, Qt.Key_Z, Qt.ControlModifier | Qt.ShiftModifier)
+        assert app.keypoints_data[1][0] == moved and not app.modified
+
+        # 빈 프레임에 찍은 포인트를 되돌리면 키프레임 자체가 사라짐
+        app.jump_to_image(2)
+        qtbot.waitUntil(lambda: app.displayed_image_path == app.current_images[2])
+        editor.keypoints[0] = [7, 7]
+        app.on_keypoint_update(0, [7, 7])
+        editor.edit_finished.emit()
+        assert 2 in app.keypoints_data
+        app.undo()
+        assert 2 not in app.keypoints_data and not app.modified
+        app.undo()
+        assert app.current_image_idx == 1 and all(p == [20, 10] for p in app.keypoints_data[1])
+        with patch('main.QMessageBox.show'):
+            app.save_current()
+
+    @patch('PyQt5.QtWidgets.QMessageBox.critical')
+    def test_malformed_json_reports_location(self, mock_critical, app, qtbot, tmp_path):
+        """형식이 잘못된 JSON은 문제 위치와 함께 오류를 표시"""
+        base = write_dataset(tmp_path / "data")
+        json_file = base / "2.라벨링데이터" / "seqA" / "clip.json"
+        json_file.write_text(json.dumps({"segmentation": [
+            {"keyframe": 1, "keypoints": [[20, 10]] * 16 + [["a", 3]]}
+        ]}))
+        app.base_path = base
+        app.load_json(json_file)
+        mock_critical.assert_called_once()
+        assert "segmentation[0].keypoints[16]" in mock_critical.call_args[0][2]
+        assert app.current_json is None
+
     @patch('PyQt5.QtWidgets.QMessageBox.critical')
     def test_error_handling(self, mock_critical, app, qtbot):
         """에러 처리 테스트"""
@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import threading
+import logging
+from collections import deque
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 KEYPOINT_TRACE에 경로를 지정하면 시작 시 추적이 켜지고 종료 시 해당 경로로 내보냄
+TRACE_ENV = "KEYPOINT_TRACE"
+MAX_TRACE_EVENTS = 200_000
+
+
+class _NullSpan:
+    """추적 비활성 시 사용하는 빈 스팬 (할당 없이 재사용)"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'args', 'start')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer._record(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+
+class Tracer:
+    """핫패스 계측용 경량 트레이서 (Chrome trace-event 형식으로 내보내기 지원)"""
+
+    def __init__(self, enabled=False, max_events=MAX_TRACE_EVENTS):
+        self.enabled = enabled
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._frame = {}        # 현재 프레임에서 누적 중인 스팬별 시간(ns)
+        self._last_frame = {}   # 직전 프레임의 스팬별 시간(ns)
+
+    def span(self, name, **args):
+        """계측 스팬 생성. 비활성 상태에서는 공유 빈 스팬을 반환"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def _record(self, name, start, end, args):
+        with self._lock:
+            self._events.append((name, start, end, threading.get_ident(), args))
+            self._frame[name] = self._frame.get(name, 0) + (end - start)
+
+    def end_frame(self):
+        """프레임 경계 표시. HUD에는 직전 프레임의 누적 시간이 표시됨"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._last_frame = self._frame
+            self._frame = {}
+            now = time.perf_counter_ns()
+            self._events.append(('frame', now, None, threading.get_ident(), None))
+
+    def frame_timings(self):
+        """직전 프레임의 스팬별 소요 시간(ms) 반환"""
+        with self._lock:
+            return {name: ns / 1e6 for name, ns in self._last_frame.items()}
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self._frame = {}
+            self._last_frame = {}
+
+    def chrome_trace(self):
+        """Chrome trace-event 형식의 딕셔너리 반환 (chrome://tracing, Perfetto)"""
+        with self._lock:
+            events = list(self._events)
+
+        trace_events = []
+        for name, start, end, tid, args in events:
+            ts = (start - self._origin) / 1000.0
+            if end is None:
+                trace_events.append({
+                    'name': name, 'cat': 'frame', 'ph': 'i', 's': 'p',
+                    'ts': ts, 'pid': self._pid, 'tid': tid
+                })
+                continue
+            event = {
+                'name': name, 'cat': 'keypoint', 'ph': 'X',
+                'ts': ts, 'dur': (end - start) / 1000.0,
+                'pid': self._pid, 'tid': tid
+            }
+            if args:
+                event['args'] = {k: str(v) for k, v in args.items()}
+            trace_events.append(event)
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        """기록된 스팬을 Chrome trace JSON 파일로 저장"""
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+        logger.info(f"추적 결과 저장: {path}")
+        return path
+
+
+tracer = Tracer(enabled=bool(os.environ.get(TRACE_ENV)))
+
+
+def span(name, **args):
+    """전역 트레이서의 스팬 생성 (with span('decode'): ...)"""
+    if not tracer.enabled:
+        return _NULL_SPAN
+    return _Span(tracer, name, args)
@@ -0,0 +1,105 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUM_KEYPOINTS = 17
+# 앞뒤 프레임의 중간점에서 이 거리(px) 이상 벗어난 포인트는 튐으로 표시
+SPIKE_THRESHOLD_PX = 15.0
+
+
+class TrackArray:
+    """
+    JSON 한 개의 프레임별 키포인트 궤적 (F, 17, 2) 배열.
+
+    표시하지 않는 포인트((0, 0))와 라벨이 없는 프레임은 NaN으로 보관합니다.
+    프레임별 튐 점수(앞뒤 프레임 중간점과의 최대 거리, 앞뒤에 있는 포인트가 빠졌으면
+    inf)를 함께 유지하며, 포인트가 바뀌면 그 프레임과 이웃 프레임의 점수만 다시
+    계산합니다.
+    """
+
+    def __init__(self, frames, points=None):
+        self.frames = np.asarray(frames, dtype=np.int64)
+        if points is None:
+            points = np.full((len(self.frames), NUM_KEYPOINTS, 2), np.nan)
+        self.points = np.asarray(points, dtype=np.float64)
+        self.scores = np.zeros(len(self.frames))
+        self._update_scores(0, len(self.frames))
+
+    @classmethod
+    def from_keyframes(cls, frames, keyframes):
+        """
+        :param frames: 프레임 번호 목록 (표시 순서)
+        :param keyframes: {프레임 번호: 17개 [x, y]} (라벨링된 프레임)
+        """
+        track = cls(frames)
+        for i, frame in enumerate(track.frames.tolist()):
+            keypoints = keyframes.get(frame)
+            if keypoints:
+                track.points[i] = _to_track(keypoints)
+        track._update_scores(0, len(track.frames))
+        return track
+
+    def __len__(self):
+        return len(self.frames)
+
+    def index(self, frame):
+        """프레임 번호의 행 번호 (없으면 -1)"""
+        i = int(np.searchsorted(self.frames, frame))
+        if i < len(self.frames) and self.frames[i] == frame:
+            return i
+        # 프레임 번호가 정렬되어 있지 않은 경우
+        hits = np.flatnonzero(self.frames == frame)
+        return int(hits[0]) if len(hits) else -1
+
+    def set_point(self, frame, point_id, xy):
+        """포인트 하나 변경. 바뀐 행 번호 반환 (프레임이 없으면 -1)"""
+        i = self.index(frame)
+        if i < 0:
+            return -1
+        x, y = xy
+        self.points[i, point_id] = (x, y) if (x or y) else (np.nan, np.nan)
+        self._update_scores(i - 1, i + 2)
+        return i
+
+    def set_frame(self, frame, keypoints):
+        """프레임의 17개 포인트 전체 변경. 바뀐 행 번호 반환 (프레임이 없으면 -1)"""
+        i = self.index(frame)
+        if i < 0:
+            return -1
+        self.points[i] = _to_track(keypoints)
+        self._update_scores(i - 1, i + 2)
+        return i
+
+    def _update_scores(self, start, stop):
+        """[start, stop) 행의 튐 점수 다시 계산 (양 끝 행은 이웃이 없어 0)"""
+        start, stop = max(start, 1), min(stop, len(self.frames) - 1)
+        if stop <= start:
+            if len(self.frames) <= 2:
+                self.scores[:] = 0
+            return
+        prev = self.points[start - 1:stop - 1]
+        cur = self.points[start:stop]
+        nxt = self.points[start + 1:stop + 1]
+        deviation = np.linalg.norm(cur - (prev + nxt) / 2, axis=2)      # (n, 17)
+        neighbors = ~np.isnan(prev[..., 0]) & ~np.isnan(nxt[..., 0])
+        missing = neighbors & np.isnan(cur[..., 0])
+        deviation = np.where(neighbors & ~missing, deviation, 0.0)
+        deviation = np.nan_to_num(deviation)
+        scores = deviation.max(axis=1)
+        scores[missing.any(axis=1)] = np.inf
+        self.scores[start:stop] = scores
+
+    def spikes(self, threshold=SPIKE_THRESHOLD_PX):
+        """튐 점수가 threshold 이상인 행 번호"""
+        return np.flatnonzero(self.scores >= threshold)
+
+
+def _to_track(keypoints):
+    """17개 [x, y] -> (17, 2) 배열 ((0, 0)은 NaN)"""
+    points = np.full((NUM_KEYPOINTS, 2), np.nan)
+    rows = np.asarray([p[:2] for p in keypoints[:NUM_KEYPOINTS]], dtype=np.float64).reshape(-1, 2)
+    shown = np.any(rows != 0, axis=1)
+    points[:len(rows)][shown] = rows[shown]
+    return points
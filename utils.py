@@ -1,16 +1,28 @@
 from collections import OrderedDict
 from pathlib import Path
+import os
+import threading
 import cv2
 import numpy as np
 import logging
 import json
-import psutil
 
-logging.basicConfig(level=logging.INFO)
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import storage
+from dataset_progress import list_sequences, EDITED_DIR
+from tracing import span
+from geometry import Affine
+
 logger = logging.getLogger(__name__)
 
 # 키포인트/이미지 관련 상수
 DEFAULT_DISPLAY_SIZE = (1152, 648)
+# 기본 카메라 해상도 (이미지 크기를 알기 전의 초기값과 메모리 추정에만 사용)
 ORIGINAL_SIZE = (2304, 1296)
 
 COLORS = {
@@ -33,74 +45,113 @@ CONNECTIONS = [
 
 SELECTED_POINT = 8
 NORMAL_POINT = 7
+NUM_KEYPOINTS = 17
+
+# JSON 인덱스 -> 화면 표시 번호 (눈과 귀는 표시하지 않음)
+DISPLAY_NUMBERS = {0: 1, **{idx: idx - 3 for idx in range(5, NUM_KEYPOINTS)}}
+# 일괄 렌더링용 연결선 양 끝 인덱스와 점 색상 (get_point_color와 같은 규칙)
+_LINE_START = np.array([a - 1 for a, _ in CONNECTIONS])
+_LINE_END = np.array([b - 1 for _, b in CONNECTIONS])
+_SHOWN_POINTS = np.array([not 1 <= idx <= 4 for idx in range(NUM_KEYPOINTS)])
 
 # KeypointRenderer 최적화
 class KeypointRenderer:
     @staticmethod
-    def render_skeleton(image, keypoints, selected_point=None):
+    def render_skeleton(image, keypoints, selected_point=None, image_size=None):
+        """
+        image 복사본 위에 스켈레톤을 그립니다.
+        :param image_size: 키포인트 좌표계의 (너비, 높이). 생략하면 image 자체 크기
+        """
+        with span('render'):
+            return KeypointRenderer._render_skeleton(image, keypoints, selected_point, image_size)
+
+    @staticmethod
+    def _render_skeleton(image, keypoints, selected_point=None, image_size=None):
         rendered = image.copy()
         h, w = rendered.shape[:2]
-        scale_x = w / ORIGINAL_SIZE[0]
-        scale_y = h / ORIGINAL_SIZE[1]
-        
-        # 좌표 변환을 미리 계산
-        scaled_keypoints = [
-            (int(kp[0] * scale_x), int(kp[1] * scale_y))
-            for kp in keypoints
-        ]
-        
-        # 연결선 일괄 처리
-        for start_idx, end_idx in CONNECTIONS:
-            start_point = scaled_keypoints[start_idx-1]
-            end_point = scaled_keypoints[end_idx-1]
-            
-            if all(p != (0, 0) for p in (start_point, end_point)):
-                cv2.line(rendered, start_point, end_point, COLORS['blue'], 2)
-        
-        # valid_indices와 화면 표시 번호 매핑 생성
-        display_mapping = {
-            0: 1,   # 코는 1번
-            5: 2,   # JSON의 5번은 화면의 2번
-            6: 3,   # JSON의 6번은 화면의 3번
-            7: 4,   # JSON의 7번은 화면의 4번
-            8: 5,   # JSON의 8번은 화면의 5번
-            9: 6,   # JSON의 9번은 화면의 6번
-            10: 7,  # JSON의 10번은 화면의 7번
-            11: 8,  # JSON의 11번은 화면의 8번
-            12: 9,  # JSON의 12번은 화면의 9번
-            13: 10, # JSON의 13번은 화면의 10번
-            14: 11, # JSON의 14번은 화면의 11번
-            15: 12, # JSON의 15번은 화면의 12번
-            16: 13  # JSON의 16번은 화면의 13번
-        }
-        
-        # 키포인트 렌더링
-        for idx, (x, y) in enumerate(scaled_keypoints):
-            if (x, y) == (0, 0):
-                continue
-                
-            actual_idx = idx + 1
-            
-            # 눈과 귀(인덱스 1-4)는 화면에 표시하지 않음
-            if 2 <= actual_idx <= 5:
-                continue
-                
-            color = KeypointRenderer.get_point_color(idx)
-            
-            # 선택된 키포인트를 화면에 표시
-            if selected_point == actual_idx:
-                cv2.circle(rendered, (x, y), SELECTED_POINT, COLORS['white'], -1)
-                
-            cv2.circle(rendered, (x, y), NORMAL_POINT, color, -1)
-            
-            # display_mapping을 사용하여 화면에 표시할 번호 결정
-            if idx in display_mapping:
-                display_num = display_mapping[idx]
-                cv2.putText(rendered, str(display_num), (x + 5, y + 5),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, COLORS['white'], 1)
-                
+
+        # 저장 좌표 -> 배열 좌표 변환을 전체 키포인트에 한 번에 적용
+        points = np.asarray(keypoints, dtype=np.float64).reshape(-1, 2)
+        visible = np.any(points != 0, axis=1)
+        mapped = Affine.between(image_size or (w, h), (w, h)).apply(points)
+        KeypointRenderer._draw(rendered, mapped.astype(int)[None], visible[None], 0, selected_point)
         return rendered
-    
+
+    @staticmethod
+    def draw_skeleton(canvas, view_points, visible, selected_point=None, proposed=None):
+        """
+        화면 좌표로 변환된 키포인트를 canvas 위에 직접 그립니다.
+        :param view_points: [(x, y), ...] 화면 좌표 (정수)
+        :param visible: 키포인트별 표시 여부 (원본 좌표가 (0, 0)이면 False)
+        :param proposed: 키포인트별 제안(보간 등) 여부. 제안된 포인트는 속이 빈 원으로 표시
+        """
+        return KeypointRenderer.draw_people(canvas, np.asarray(view_points)[None],
+                                            np.asarray(visible)[None], 0, selected_point, proposed)
+
+    @staticmethod
+    def draw_people(canvas, view_points, visible, active=0, selected_point=None, proposed=None):
+        """
+        여러 사람의 키포인트를 한 번에 그립니다.
+        :param view_points: (P, 17, 2) 화면 좌표 (정수)
+        :param visible: (P, 17) 표시 여부
+        :param active: 편집 중인 사람 번호. 번호, 선택 강조와 제안 표시는 이 사람에게만 적용
+        :param proposed: 편집 중인 사람의 키포인트별 제안 여부
+        """
+        with span('render'):
+            KeypointRenderer._draw(canvas, view_points, visible, active, selected_point, proposed)
+        return canvas
+
+    @staticmethod
+    def _draw(rendered, view_points, visible, active=0, selected_point=None, proposed=None):
+        """
+        연결선과 점을 색상별로 모아 cv2.polylines 한 번씩으로 그립니다.
+        점은 길이 0인 굵은 선분으로 그리며 (cv2.circle로 채운 원과 같은 픽셀), 사람 수가
+        많아도 그리기 호출 수는 색상 수만큼만 늘어납니다.
+        """
+        points = np.asarray(view_points, dtype=np.int32).reshape(-1, NUM_KEYPOINTS, 2)
+        visible = np.asarray(visible, dtype=bool).reshape(-1, NUM_KEYPOINTS)
+        if not len(points):
+            return
+        is_active = np.arange(len(points)) == active
+
+        # 연결선 (편집 중인 사람은 파란색, 나머지는 회색)
+        drawn = visible[:, _LINE_START] & visible[:, _LINE_END]
+        segments = np.stack([points[:, _LINE_START], points[:, _LINE_END]], axis=2)
+        for mask, color in ((~is_active, COLORS['grey']), (is_active, COLORS['blue'])):
+            lines = segments[mask][drawn[mask]]
+            if len(lines):
+                cv2.polylines(rendered, list(lines), False, color, 2)
+
+        # 선택된 키포인트 강조 (점 아래에 표시)
+        if active is not None and 0 <= active < len(points) and selected_point:
+            idx = selected_point - 1
+            if 0 <= idx < NUM_KEYPOINTS and visible[active, idx]:
+                cv2.circle(rendered, tuple(points[active, idx].tolist()), SELECTED_POINT,
+                           COLORS['white'], -1)
+
+        # 눈과 귀(인덱스 1-4)는 화면에 표시하지 않음
+        shown = visible & _SHOWN_POINTS
+        hollow = np.zeros_like(shown)
+        if proposed is not None and is_active.any():
+            hollow[is_active] = np.asarray(proposed, dtype=bool)[:NUM_KEYPOINTS]
+        for color_index, color in enumerate(_POINT_PALETTE):
+            same_color = _POINT_COLOR_INDEX == color_index
+            dots = points[shown & ~hollow & same_color]
+            if len(dots):
+                cv2.polylines(rendered, list(np.stack([dots, dots], axis=1)), False, color,
+                              2 * NORMAL_POINT)
+            # 확정되지 않은 제안 포인트
+            for x, y in points[shown & hollow & same_color].tolist():
+                cv2.circle(rendered, (x, y), NORMAL_POINT, color, 2)
+
+        # 화면 표시 번호 (편집 중인 사람만)
+        if is_active.any():
+            for idx in np.flatnonzero(shown[active]).tolist():
+                if idx in DISPLAY_NUMBERS:
+                    x, y = points[active, idx].tolist()
+                    cv2.putText(rendered, str(DISPLAY_NUMBERS[idx]), (x + 5, y + 5),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, COLORS['white'], 1)
+
     @staticmethod
     def get_point_color(index):
         """
@@ -118,35 +169,524 @@ class KeypointRenderer:
         else:
             return COLORS['grey']  # grey (기본값)
 
+_POINT_PALETTE = [COLORS['yellow'], COLORS['red'], COLORS['green'], COLORS['grey']]
+_POINT_COLOR_INDEX = np.array([_POINT_PALETTE.index(KeypointRenderer.get_point_color(idx))
+                               for idx in range(NUM_KEYPOINTS)])
+
 # ImageCache 클래스 최적화
 class ImageCache:
-    def __init__(self):
+    def __init__(self, on_evict=None):
         self.cache = OrderedDict()
         self.max_size = self._calculate_max_cache_size()
+        # 항목이 캐시에서 빠질 때 호출 (공유 메모리 슬랩 반환 등)
+        self.on_evict = on_evict
         
     def _calculate_max_cache_size(self):
         """시스템 메모리 기반으로 최적의 캐시 크기 계산"""
+        import psutil  # 모듈 임포트 비용이 커서 필요할 때 로드
         available_memory = psutil.virtual_memory().available
         image_size = ORIGINAL_SIZE[0] * ORIGINAL_SIZE[1] * 3  # RGB
         max_images = int(available_memory * 0.25 / image_size)
         return min(30, max_images)
         
     def put(self, path, image):
+        old = self.cache.pop(path, None)
+        if old is not None and old is not image:
+            self._evicted(old)
         if len(self.cache) >= self.max_size:
             # LRU 방식으로 오래된 항목 제거
-            self.cache.popitem(last=False)
+            _, evicted = self.cache.popitem(last=False)
+            self._evicted(evicted)
         self.cache[path] = image
+
+    def _evicted(self, image):
+        if self.on_evict is not None:
+            self.on_evict(image)
         
     def get(self, path):
-        if path in self.cache:
-            # 캐시 히트 시 항목을 최신 위치로 이동
-            value = self.cache.pop(path)
-            self.cache[path] = value
-            return value
-        return None
+        with span('cache.lookup'):
+            if path in self.cache:
+                # 캐시 히트 시 항목을 최신 위치로 이동
+                value = self.cache.pop(path)
+                self.cache[path] = value
+                return value
+            return None
 
     def clear(self):
+        images = list(self.cache.values())
         self.cache.clear()
+        for image in images:
+            self._evicted(image)
+
+# 줌/팬 관련 상수
+TILE_SIZE = 256
+MAX_ZOOM = 16.0  # 화면 맞춤 대비 최대 확대 배율
+
+
+class ViewTransform:
+    """
+    원본 이미지 좌표와 화면 좌표 사이의 변환 (균일 스케일 + 이동).
+    view = image * scale + offset
+    """
+
+    def __init__(self, image_size=ORIGINAL_SIZE, view_size=DEFAULT_DISPLAY_SIZE):
+        self.view_size = view_size
+        self.set_image_size(image_size)
+
+    def set_image_size(self, image_size):
+        """이미지 크기 변경 시 화면 맞춤 배율을 다시 계산하고 전체 보기로 초기화"""
+        self.image_size = tuple(image_size)
+        self.fit_scale = min(self.view_size[0] / self.image_size[0],
+                             self.view_size[1] / self.image_size[1])
+        self.reset()
+
+    def reset(self):
+        """전체 보기 (화면 맞춤)"""
+        self.scale = self.fit_scale
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self._clamp()
+
+    @property
+    def zoom(self):
+        """화면 맞춤 대비 확대 배율"""
+        return self.scale / self.fit_scale
+
+    @property
+    def affine(self):
+        """이미지 좌표 -> 화면 좌표 아핀 변환"""
+        return Affine([[self.scale, 0, self.offset_x],
+                       [0, self.scale, self.offset_y],
+                       [0, 0, 1]])
+
+    def map_to_view(self, points):
+        """이미지 좌표 배열 (N, 2) -> 화면 좌표 배열 (N, 2)"""
+        return self.affine.apply(points)
+
+    def map_to_image(self, points):
+        """화면 좌표 배열 (N, 2) -> 이미지 좌표 배열 (N, 2)"""
+        return self.affine.inverse().apply(points)
+
+    def zoom_at(self, factor, view_x, view_y):
+        """화면 좌표 (view_x, view_y) 아래의 이미지 지점을 고정한 채 확대/축소"""
+        image_x, image_y = self.map_to_image((view_x, view_y))[0]
+        self.scale = min(max(self.scale * factor, self.fit_scale),
+                         self.fit_scale * MAX_ZOOM)
+        self.offset_x = view_x - image_x * self.scale
+        self.offset_y = view_y - image_y * self.scale
+        self._clamp()
+
+    def pan(self, dx, dy):
+        """화면 픽셀 단위 이동"""
+        self.offset_x += dx
+        self.offset_y += dy
+        self._clamp()
+
+    def _clamp(self):
+        # 이미지가 화면보다 작으면 가운데 정렬, 크면 화면 밖 여백이 생기지 않도록 제한
+        for axis in (0, 1):
+            content = self.image_size[axis] * self.scale
+            view = self.view_size[axis]
+            if content <= view:
+                offset = (view - content) / 2
+            else:
+                current = self.offset_x if axis == 0 else self.offset_y
+                offset = min(0.0, max(view - content, current))
+            if axis == 0:
+                self.offset_x = offset
+            else:
+                self.offset_y = offset
+
+
+class ImagePyramid:
+    """
+    이미지의 밉맵 피라미드. 화면에 보이는 타일만 필요한 해상도 단계에서 잘라 그립니다.
+    레벨은 처음 필요할 때 cv2.pyrDown으로 생성됩니다.
+    """
+
+    def __init__(self, image, image_size=None):
+        h, w = image.shape[:2]
+        # 키포인트 좌표계 기준 크기 (배열 해상도와 다를 수 있음)
+        self.image_size = tuple(image_size) if image_size else (w, h)
+        self.levels = [image]
+
+    def level(self, k):
+        while len(self.levels) <= k:
+            self.levels.append(cv2.pyrDown(self.levels[-1]))
+        return self.levels[k]
+
+    def level_for_scale(self, scale):
+        """확대 배율을 만족하는 가장 작은 레벨 선택 (축소는 최대 2배 이내)"""
+        k = 0
+        while True:
+            h, w = self.level(k).shape[:2]
+            next_w, next_h = (w + 1) // 2, (h + 1) // 2
+            if next_w / self.image_size[0] < scale or max(next_w, next_h) < TILE_SIZE:
+                return k
+            k += 1
+
+    def render(self, view):
+        """ViewTransform 기준으로 화면 크기의 RGB 캔버스 생성"""
+        vw, vh = view.view_size
+        canvas = np.zeros((vh, vw, 3), dtype=np.uint8)
+
+        k = self.level_for_scale(view.scale)
+        level = self.level(k)
+        lh, lw = level.shape[:2]
+        # 레벨 픽셀 -> 화면 픽셀 배율
+        fx = view.scale * self.image_size[0] / lw
+        fy = view.scale * self.image_size[1] / lh
+        ox, oy = view.offset_x, view.offset_y
+
+        # 화면에 보이는 레벨 영역
+        x0 = max(0, int(np.floor(-ox / fx)))
+        x1 = min(lw, int(np.ceil((vw - ox) / fx)))
+        y0 = max(0, int(np.floor(-oy / fy)))
+        y1 = min(lh, int(np.ceil((vh - oy) / fy)))
+        if x0 >= x1 or y0 >= y1:
+            return canvas
+
+        if fx >= 2:
+            interpolation = cv2.INTER_NEAREST  # 확대 시 실제 픽셀 경계를 그대로 표시
+        elif fx >= 1:
+            interpolation = cv2.INTER_LINEAR
+        else:
+            interpolation = cv2.INTER_AREA
+
+        for ty in range(y0 // TILE_SIZE, (y1 - 1) // TILE_SIZE + 1):
+            # 타일 중 화면에 보이는 부분만 사용 (인접 타일과 경계 좌표 공유)
+            sy0 = max(ty * TILE_SIZE, y0)
+            sy1 = min((ty + 1) * TILE_SIZE, y1)
+            dy0 = int(round(sy0 * fy + oy))
+            dy1 = int(round(sy1 * fy + oy))
+            for tx in range(x0 // TILE_SIZE, (x1 - 1) // TILE_SIZE + 1):
+                sx0 = max(tx * TILE_SIZE, x0)
+                sx1 = min((tx + 1) * TILE_SIZE, x1)
+                dx0 = int(round(sx0 * fx + ox))
+                dx1 = int(round(sx1 * fx + ox))
+                if dx1 <= dx0 or dy1 <= dy0:
+                    continue
+
+                tile = cv2.resize(level[sy0:sy1, sx0:sx1], (dx1 - dx0, dy1 - dy0),
+                                  interpolation=interpolation)
+
+                # 캔버스 범위로 자르기
+                cx0, cy0 = max(dx0, 0), max(dy0, 0)
+                cx1, cy1 = min(dx1, vw), min(dy1, vh)
+                if cx1 > cx0 and cy1 > cy0:
+                    canvas[cy0:cy1, cx0:cx1] = tile[cy0 - dy0:cy1 - dy0, cx0 - dx0:cx1 - dx0]
+        return canvas
+
+
+# 디스크 캐시 관련 상수
+CACHE_DIR_ENV = "KEYPOINT_CACHE_DIR"
+THUMBNAIL_WIDTH = 144
+
+
+def default_cache_dir() -> Path:
+    """디스크 캐시 기본 위치 (KEYPOINT_CACHE_DIR 환경 변수로 변경 가능)"""
+    return Path(os.environ.get(CACHE_DIR_ENV) or Path.home() / ".cache" / "keypoint_labeler")
+
+
+def file_cache_key(path) -> str:
+    """경로 + 수정 시각 + 크기 기반 캐시 키 (파일이 바뀌면 키도 바뀜, 아카이브 멤버도 지원)"""
+    return storage.cache_key(path)
+
+
+class ThumbnailCache:
+    """경로 + 수정 시각으로 구분되는 디스크 썸네일 캐시 (작은 JPEG로 저장)"""
+
+    def __init__(self, cache_dir=None, width=THUMBNAIL_WIDTH):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / "thumbnails"
+        self.width = width
+
+    def _entry_path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.jpg"
+
+    def get(self, path):
+        """캐시된 썸네일(RGB) 반환, 없으면 None"""
+        try:
+            entry = self._entry_path(file_cache_key(path))
+            if entry.exists():
+                thumb = cv2.imdecode(np.fromfile(entry.as_posix(), np.uint8), cv2.IMREAD_COLOR)
+                if thumb is not None:
+                    return cv2.cvtColor(thumb, cv2.COLOR_BGR2RGB)
+        except OSError:
+            pass
+        return None
+
+    def load_or_create(self, path):
+        """캐시된 썸네일 반환, 없으면 1/8 축소 디코딩으로 생성 후 저장"""
+        thumb = self.get(path)
+        if thumb is not None:
+            return thumb
+
+        # JPEG 축소 디코딩 (DCT 단계에서 1/8 크기로 디코딩되어 전체 디코딩보다 훨씬 빠름)
+        image = cv2.imdecode(storage.read_array(path), cv2.IMREAD_REDUCED_COLOR_8)
+        if image is None:
+            return None
+        h, w = image.shape[:2]
+        if w > self.width:
+            image = cv2.resize(image, (self.width, max(1, h * self.width // w)),
+                               interpolation=cv2.INTER_AREA)
+
+        try:
+            entry = self._entry_path(file_cache_key(path))
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            ok, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+            if ok:
+                # 다른 스레드가 읽는 중 불완전한 파일이 보이지 않도록 임시 파일 후 교체
+                tmp = entry.with_suffix(f".{threading.get_ident()}.tmp")
+                encoded.tofile(tmp.as_posix())
+                os.replace(tmp, entry)
+        except OSError as e:
+            logger.warning(f"썸네일 캐시 저장 실패: {e}")
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+FRAME_CACHE_ENV = "KEYPOINT_FRAME_CACHE_MB"
+DEFAULT_FRAME_CACHE_MB = 1024
+
+
+def try_lock_file(file) -> bool:
+    """열린 파일에 배타적 잠금 시도 (다른 프로세스가 잡고 있으면 False)"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+class FrameDiskCache:
+    """
+    디스플레이 해상도 RGB 프레임을 세션 간에 보관하는 디스크 캐시.
+
+    하나의 메모리 맵 파일을 고정 크기 슬롯으로 나누어 사용하며, 조회 결과는
+    슬롯을 가리키는 읽기 전용 뷰(페이지 캐시 기반)라 디코딩이나 복사가 없습니다.
+    용량(디스크 예산)을 넘으면 가장 오래 사용하지 않은 슬롯을 재사용합니다.
+
+    슬롯마다 저장된 프레임의 키를 별도 헤더 파일에 기록하고 조회 시 확인하므로,
+    비정상 종료로 인덱스가 오래된 상태여도 다른 프레임을 반환하지 않습니다.
+    캐시 폴더는 잠금 파일로 한 프로세스만 사용하며, 이미 사용 중이면 비활성화됩니다.
+    """
+    DATA_NAME = "frames.bin"
+    KEYS_NAME = "keys.bin"
+    INDEX_NAME = "index.json"
+    LOCK_NAME = "lock"
+    KEY_BYTES = 20  # sha1 다이제스트
+    FLUSH_INTERVAL = 16  # 이 횟수만큼 추가될 때마다 인덱스 저장
+
+    def __init__(self, cache_dir=None, budget_bytes=None, frame_size=DEFAULT_DISPLAY_SIZE):
+        if budget_bytes is None:
+            budget_bytes = int(float(os.environ.get(FRAME_CACHE_ENV, DEFAULT_FRAME_CACHE_MB)) * 1024 * 1024)
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / "frames"
+        self.frame_size = tuple(frame_size)
+        self.slot_bytes = self.frame_size[0] * self.frame_size[1] * 3
+        self.capacity = max(0, budget_bytes // self.slot_bytes)
+        self.entries = OrderedDict()  # 키 -> (슬롯, 너비, 높이), LRU 순서
+        self._free = []
+        self._frames = None
+        self._keys = None
+        self._lock_file = None
+        self._pending = 0
+        # 조회(GUI 스레드)와 저장(작업 스레드)이 동시에 색인을 바꾸지 않도록 보호
+        self._lock = threading.RLock()
+        if self.enabled:
+            try:
+                self._open()
+            except OSError as e:
+                logger.warning(f"프레임 캐시를 열 수 없습니다: {e}")
+                self.capacity = 0
+
+    @property
+    def enabled(self):
+        return self.capacity > 0
+
+    def _open(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # 같은 캐시 폴더를 다른 인스턴스가 사용 중이면 이번 세션은 캐시 없이 동작
+        self._lock_file = open(self.cache_dir / self.LOCK_NAME, 'a+b')
+        if not try_lock_file(self._lock_file):
+            self._lock_file.close()
+            self._lock_file = None
+            logger.info(f"프레임 캐시가 다른 프로세스에서 사용 중입니다: {self.cache_dir}")
+            self.capacity = 0
+            return
+
+        data_path = self.cache_dir / self.DATA_NAME
+        keys_path = self.cache_dir / self.KEYS_NAME
+        index_path = self.cache_dir / self.INDEX_NAME
+
+        # 슬롯 구성이 같을 때만 이전 세션의 인덱스 사용
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('slot_bytes') == self.slot_bytes and index.get('capacity') == self.capacity:
+                for key, slot, w, h in index.get('entries', []):
+                    self.entries[key] = (slot, w, h)
+        except (OSError, ValueError):
+            pass
+
+        # 예산 크기의 희소 파일 (실제 디스크 사용량은 기록된 슬롯만큼)
+        for path, slot_size in ((data_path, self.slot_bytes), (keys_path, self.KEY_BYTES)):
+            size = self.capacity * slot_size
+            with open(path, 'ab') as f:
+                if f.tell() != size:
+                    f.truncate(size)
+        self._frames = np.memmap(data_path, dtype=np.uint8, mode='r+',
+                                 shape=(self.capacity, self.slot_bytes))
+        self._keys = np.memmap(keys_path, dtype=np.uint8, mode='r+',
+                               shape=(self.capacity, self.KEY_BYTES))
+        used = {slot for slot, _, _ in self.entries.values()}
+        self._free = [slot for slot in range(self.capacity - 1, -1, -1) if slot not in used]
+
+    def get(self, path):
+        """캐시된 프레임의 읽기 전용 뷰 반환, 없으면 None"""
+        if not self.enabled:
+            return None
+        try:
+            key = file_cache_key(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or self._frames is None:
+                return None
+            slot, w, h = entry
+            if self._keys[slot].tobytes() != bytes.fromhex(key):
+                # 인덱스 저장 전에 슬롯이 재사용된 경우 (비정상 종료)
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            frame = self._frames[slot, :w * h * 3].reshape(h, w, 3)
+        frame.flags.writeable = False
+        return frame
+
+    def put(self, path, image):
+        """프레임을 디스플레이 해상도로 줄여 저장"""
+        if not self.enabled:
+            return
+        try:
+            key = file_cache_key(path)
+        except OSError:
+            return
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return
+
+        h, w = image.shape[:2]
+        scale = min(1.0, self.frame_size[0] / w, self.frame_size[1] / h)
+        if scale < 1.0:
+            w, h = max(1, int(w * scale)), max(1, int(h * scale))
+            image = cv2.resize(image, (w, h), interpolation=cv2.INTER_AREA)
+
+        with self._lock:
+            if self._frames is None or key in self.entries:
+                return  # 닫혔거나 다른 스레드가 먼저 저장
+            if self._free:
+                slot = self._free.pop()
+            else:
+                # LRU 항목의 슬롯 재사용
+                _, (slot, _, _) = self.entries.popitem(last=False)
+            # 헤더를 지운 뒤 픽셀을 쓰고 마지막에 키 기록 (중간에 종료되면 빈 슬롯으로 취급)
+            self._keys[slot] = 0
+            self._frames[slot, :w * h * 3] = np.ascontiguousarray(image).reshape(-1)
+            self._keys[slot] = np.frombuffer(bytes.fromhex(key), np.uint8)
+            self.entries[key] = (slot, w, h)
+
+            self._pending += 1
+            if self._pending >= self.FLUSH_INTERVAL:
+                self.flush()
+
+    def flush(self):
+        """인덱스를 디스크에 저장"""
+        if not self.enabled:
+            return
+        with self._lock:
+            index = {
+                'slot_bytes': self.slot_bytes,
+                'capacity': self.capacity,
+                'entries': [[key, slot, w, h] for key, (slot, w, h) in self.entries.items()],
+            }
+        index_path = self.cache_dir / self.INDEX_NAME
+        tmp = index_path.with_suffix('.tmp')
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.replace(tmp, index_path)
+            self._pending = 0
+        except OSError as e:
+            logger.warning(f"프레임 캐시 인덱스 저장 실패: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._frames is not None:
+                self._frames.flush()
+                self._keys.flush()
+                self.flush()
+                self._frames = self._keys = None
+                self.capacity = 0
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+def keyframe_number(value):
+    """JSON의 keyframe 값(3, "3", 3.0)을 정수로 변환. 정수로 읽을 수 없으면 None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return None
+    return None
+
+def edited_json_path(json_path) -> Path:
+    """원본 JSON 경로 -> 읽을 경로 (편집 도구와 같이 edited 폴더의 수정본을 우선)"""
+    json_path = Path(json_path)
+    edited = json_path.parent / EDITED_DIR / json_path.name
+    return edited if storage.exists(edited) else json_path
+
+def iter_label_files(base_path):
+    """
+    데이터셋의 모든 라벨 JSON을 (시퀀스 폴더, 원본 경로, 데이터)로 순회.
+    edited 수정본을 우선 읽으며, 읽을 수 없는 파일은 경고 후 건너뜁니다.
+    """
+    for folder in list_sequences(base_path):
+        for json_path in storage.glob(folder, "*.json"):
+            load_path = edited_json_path(json_path)
+            try:
+                data = json.loads(storage.read_bytes(load_path))
+            except Exception as e:
+                logger.warning(f"JSON 읽기 실패: {load_path}: {e}")
+                continue
+            yield folder, json_path, data
+
+def labeled_segments(data, source=''):
+    """
+    키포인트가 있는 세그먼트의 (키프레임 번호, 키포인트) 순회.
+    키프레임을 정수로 읽을 수 없는 세그먼트는 경고 후 건너뜁니다.
+    """
+    segments = data.get('segmentation') if isinstance(data, dict) else None
+    for i, segment in enumerate(segments if isinstance(segments, list) else []):
+        if not isinstance(segment, dict) or not segment.get('keypoints'):
+            continue
+        keyframe = keyframe_number(segment.get('keyframe'))
+        if keyframe is None:
+            logger.warning(f"키프레임 번호가 잘못된 세그먼트 건너뜀: {source} "
+                           f"segmentation[{i}].keyframe={segment.get('keyframe')!r}")
+            continue
+        yield keyframe, segment['keypoints']
 
 def get_json_path(image_path: Path, check_edited: bool = True) -> Path:
     """이미지 파일에 대응하는 JSON 파일 경로 반환"""
@@ -160,18 +700,16 @@ def get_json_path(image_path: Path, check_edited: bool = True) -> Path:
             
     return json_folder / f"{image_path.stem}.json"
 
-def scale_keypoints_to_image(keypoints, image_width, image_height, original_width=2304, original_height=1296):
+def scale_keypoints_to_image(keypoints, image_width, image_height,
+                             original_width=ORIGINAL_SIZE[0], original_height=ORIGINAL_SIZE[1]):
     """
     키포인트 좌표를 실제 이미지 크기에 맞게 스케일링합니다.
     :param keypoints: 원본 키포인트 좌표 리스트.
     :param image_width: 실제 이미지의 너비.
     :param image_height: 실제 이미지의 높이.
+    :param original_width, original_height: 키포인트 좌표계의 크기 (이미지 헤더에서 읽은 원본 크기)
     :return: 스케일링된 키포인트 리스트.
     """
-    scaled_keypoints = []
-    for x, y in keypoints:
-        scaled_x = int(x / original_width * image_width)
-        scaled_y = int(y / original_height * image_height)
-        scaled_keypoints.append([scaled_x, scaled_y])
-    return scaled_keypoints
+    affine = Affine.between((original_width, original_height), (image_width, image_height))
+    return affine.apply(keypoints).astype(int).tolist()
 
@@ -1,19 +1,41 @@
 from PyQt5.QtWidgets import (QWidget, QLabel, QVBoxLayout, QHBoxLayout, 
-   QPushButton, QDialog, QRadioButton, QButtonGroup, QMessageBox)
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QImage, QPixmap
+   QPushButton, QDialog, QRadioButton, QButtonGroup, QMessageBox,
+   QListWidget, QListWidgetItem, QListView, QAbstractItemView,
+   QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog)
+from PyQt5.QtCore import Qt, pyqtSignal, QObject, QRunnable, QThreadPool, QSize
+from PyQt5.QtGui import QImage, QPixmap, QFont, QIcon, QPainter, QColor
 import cv2
 import numpy as np
-from utils import KeypointRenderer, DEFAULT_DISPLAY_SIZE, ORIGINAL_SIZE
+from utils import (KeypointRenderer, ViewTransform, ImagePyramid, ThumbnailCache,
+                   DEFAULT_DISPLAY_SIZE, ORIGINAL_SIZE, THUMBNAIL_WIDTH, DISPLAY_NUMBERS, COLORS)
+from geometry import PointGrid
+from trajectory import TrackArray
+from tracing import tracer, span
+from scheduler import CancelToken
+from dataset_progress import (list_sequences, scan_sequence, write_progress_csv,
+                              SequenceProgress, CSV_HEADER, DEFAULT_SCAN_WORKERS)
 
 import logging
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, CancelledError
 
-# 로거 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# 로거 설정 (핸들러 구성은 logging_setup.setup_logging에서 수행)
 logger = logging.getLogger(__name__)
 
+# 키포인트 선택 반경 (화면 px)
+HIT_RADIUS = 10
+# 궤적 타임라인 높이, 띠 안쪽 여백, 튐 표시에 맞춰 이동하는 클릭 거리 (px)
+TIMELINE_HEIGHT = 120
+TIMELINE_MARGIN = 4
+TIMELINE_SNAP_PX = 4
+TIMELINE_AXIS_COLOR = (60, 60, 60)
+# 타임라인에 그리는 포인트 (화면에 표시하지 않는 눈/귀 제외)
+_TIMELINE_POINTS = np.array([not 1 <= idx <= 4 for idx in range(17)])
+
 class KeypointEditorWidget(QWidget):
-    keypoint_updated = pyqtSignal(int, list)  # 키포인트 ID, [x, y]
+    keypoint_updated = pyqtSignal(int, list)  # 키포인트 ID, [x, y] (편집 중인 사람 기준)
+    person_selected = pyqtSignal(int)         # 편집 중인 사람이 바뀜 (사람 번호)
+    edit_finished = pyqtSignal()              # 드래그 한 번 등 편집 동작이 끝남 (되돌리기 단위)
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -26,15 +48,159 @@ class KeypointEditorWidget(QWidget):
         
     def _init_variables(self):
         """상태 변수 초기화"""
+        self.view = ViewTransform(ORIGINAL_SIZE, DEFAULT_DISPLAY_SIZE)
+        self.pyramid = None
+        # 표시 중인 이미지의 사용 표시 (공유 메모리 슬랩이 표시 중에 재사용되지 않도록)
+        self.retain_image = None
+        self.release_image = None
+        self._current_image = None
         self.current_image = None
-        self.keypoints = [[0,0] for _ in range(17)]
+        # 프레임의 사람별 키포인트. keypoints는 편집 중인 사람(active_person)의 목록
+        self.persons = [[[0, 0] for _ in range(17)]]
+        self.active_person = 0
+        self.proposed = [False] * 17  # 확정 전 제안(보간) 포인트 (첫 번째 사람)
         self.selected_point = None
         self.dragging = False
-        self.scale_factor = DEFAULT_DISPLAY_SIZE[0] / ORIGINAL_SIZE[0]
+        # 선택용 격자 캐시: (키포인트 배열, 변환/반경 키, PointGrid)
+        self._grid_cache = None
         
         # 다중 선택 모드 관련 변수 추가
         self.is_multi_select = False
         self.start_points = None
+
+        # 화면 이동(팬) 상태
+        self.panning = False
+        self.last_pan_pos = None
+
+    @property
+    def keypoints(self):
+        """편집 중인 사람의 17개 [x, y] (사람이 없으면 빈 목록)"""
+        if not self.persons:
+            return []
+        return self.persons[self.active_person]
+
+    @keypoints.setter
+    def keypoints(self, keypoints):
+        # 한 사람만 있는 프레임으로 설정
+        self.set_persons([keypoints] if keypoints else [])
+
+    def set_persons(self, persons, active=0):
+        """프레임의 사람별 키포인트 목록 설정"""
+        self.persons = list(persons)
+        self.active_person = min(max(active, 0), max(len(self.persons) - 1, 0))
+        self.selected_point = None
+        self._grid_cache = None
+
+    def select_person(self, index):
+        """편집할 사람 변경"""
+        if 0 <= index < len(self.persons) and index != self.active_person:
+            self.active_person = index
+            self.selected_point = None
+            self.person_selected.emit(index)
+            self.update_view()
+
+    def add_person(self):
+        """키포인트가 없는 사람을 추가하고 편집 대상으로 선택"""
+        self.persons.append([[0, 0] for _ in range(17)])
+        self.select_person(len(self.persons) - 1)
+        return self.active_person
+
+    @property
+    def current_image(self):
+        return self._current_image
+
+    @current_image.setter
+    def current_image(self, image):
+        self.set_image(image)
+
+    def set_image(self, image, image_size=None):
+        """
+        표시할 이미지 설정.
+        :param image_size: 키포인트 좌표계(원본 이미지)의 (너비, 높이).
+            미리보기처럼 축소된 배열을 표시할 때 지정하며, 생략하면 배열 크기를 사용
+        """
+        # 이미지가 바뀌면 피라미드를 새로 구성 (레벨은 필요할 때 생성)
+        previous = self._current_image
+        if image is not previous:
+            if image is not None and self.retain_image is not None:
+                self.retain_image(image)
+            if previous is not None and self.release_image is not None:
+                self.release_image(previous)
+        self._current_image = image
+        self._grid_cache = None
+        if image is None:
+            self.pyramid = None
+            return
+        if image_size is None:
+            image_size = (image.shape[1], image.shape[0])
+        self.pyramid = ImagePyramid(image, image_size)
+        # 해상도가 다른 이미지로 바뀌면 화면 맞춤을 다시 계산
+        if tuple(image_size) != self.view.image_size:
+            self.view.set_image_size(image_size)
+
+    @property
+    def scale_factor(self):
+        """원본 좌표 -> 화면 좌표 배율 (현재 줌 반영)"""
+        return self.view.scale
+
+    def _view_pos(self, event):
+        """마우스 이벤트 위치를 이미지 표시 영역 기준 화면 좌표로 변환"""
+        pos = self.image_container.mapFrom(self, event.pos())
+        return pos.x(), pos.y()
+
+    def _image_pos(self, event):
+        """마우스 이벤트 위치를 원본 이미지 좌표로 변환"""
+        x, y = self.view.map_to_image(self._view_pos(event))[0]
+        return x, y
+
+    def _person_array(self):
+        """모든 사람의 키포인트 (P, 17, 2)"""
+        if not self.persons:
+            return np.zeros((0, 17, 2))
+        return np.asarray(self.persons, dtype=np.float64).reshape(len(self.persons), -1, 2)
+
+    def _hit_grid(self, points, radius):
+        """
+        화면 좌표 기준 선택용 격자. 프레임, 화면 변환, 키포인트 편집 중 하나가 바뀔 때만
+        새로 만들고 그 외의 클릭에서는 캐시를 재사용합니다.
+        """
+        key = (self.view.scale, self.view.offset_x, self.view.offset_y, radius)
+        cache = self._grid_cache
+        if cache is not None and cache[1] == key and np.array_equal(cache[0], points):
+            return cache[2]
+        flat = points.reshape(-1, 2)
+        grid = PointGrid(self.view.map_to_view(flat), radius, np.any(flat != 0, axis=1))
+        self._grid_cache = (points, key, grid)
+        return grid
+
+    def _hit_person(self, view_x, view_y, radius=HIT_RADIUS):
+        """
+        모든 사람의 키포인트 중 화면 기준 선택 반경 안의 가장 가까운 점의 (사람, 인덱스).
+        반경 안에 편집 중인 사람의 점이 있으면 그 점을 우선합니다. 없으면 None
+        """
+        points = self._person_array()
+        if not points.size:
+            return None
+        active = np.any(points != 0, axis=2)
+        if not active.any():
+            return None
+        with span('hit_test', points=int(active.sum())):
+            hits = self._hit_grid(points, radius).query(view_x, view_y)
+        if not hits:
+            return None
+        count = points.shape[1]
+        own = [i for i in hits if i // count == self.active_person]
+        hit = own[0] if own else hits[0]
+        return hit // count, hit % count
+
+    def _hit_test(self, view_x, view_y, radius=HIT_RADIUS):
+        """화면 좌표 기준 선택 반경 안의 가장 가까운 키포인트 인덱스 (다른 사람이면 편집 대상 변경)"""
+        hit = self._hit_person(view_x, view_y, radius)
+        if hit is None:
+            return None
+        person, index = hit
+        self.select_person(person)
+        return index
         
     def _setup_ui(self):
         """UI 컴포넌트 초기화 및 레이아웃 구성"""
@@ -68,6 +234,10 @@ class KeypointEditorWidget(QWidget):
         self.image_label.setAlignment(Qt.AlignCenter)
         self.image_label.setMouseTracking(True)
         image_layout.addWidget(self.image_label)
+
+        # 프레임별 계측 시간 오버레이 (기본 숨김)
+        self.trace_hud = TraceHud(self.image_container)
+        self.trace_hud.move(8, 8)
         
         # 이미지 래퍼
         image_wrapper = QWidget()
@@ -102,7 +272,8 @@ class KeypointEditorWidget(QWidget):
         shortcut_text = (
             "단축키 안내  -  ◀/▶: 이전/다음 이미지  |  "
             "↑/↓: 이전/다음 JSON  |  S: 수동 저장  |  "
-            "Ctrl + 드래그: 전체 키포인트 이동"
+            "Ctrl + 드래그: 전체 키포인트 이동  |  "
+            "휠: 확대/축소  |  우클릭 드래그: 화면 이동  |  Home: 전체 보기"
         )
         shortcut_label = QLabel(shortcut_text)
         shortcut_label.setStyleSheet("background-color: white; padding: 5px;")
@@ -115,9 +286,15 @@ class KeypointEditorWidget(QWidget):
         if self.current_image is None or len(self.keypoints) == 0:
             return
 
+        # 가운데/오른쪽 버튼 드래그는 화면 이동
+        if event.button() in (Qt.MiddleButton, Qt.RightButton):
+            self.panning = True
+            self.last_pan_pos = self._view_pos(event)
+            self.setCursor(Qt.ClosedHandCursor)
+            return
+
         # 마우스 좌표를 원본 이미지 좌표로 변환
-        current_x = event.pos().x() / self.scale_factor
-        current_y = event.pos().y() / self.scale_factor
+        current_x, current_y = self._image_pos(event)
 
         if self.is_multi_select and event.button() == Qt.LeftButton:
             # 모든 유효한 키포인트의 현재 위치 저장
@@ -127,45 +304,42 @@ class KeypointEditorWidget(QWidget):
                 if point[0] != 0 or point[1] != 0:  # 활성화된 점만 저장
                     self.start_points.append((i, point[0], point[1]))
             self.dragging = True
-            logger.info(f"다중 선택 모드 시작 - 초기 마우스 위치: {self.initial_mouse_pos}")
-            logger.info(f"저장된 시작점들: {self.start_points}")
+            logger.debug("다중 선택 모드 시작",
+                         extra={'mouse': self.initial_mouse_pos, 'points': len(self.start_points)})
             return
 
-        # 단일 포인트 선택 로직
-        for i, point in enumerate(self.keypoints):
-            if point[0] == 0 and point[1] == 0:
-                continue
-
-            scaled_x = point[0] * self.scale_factor
-            scaled_y = point[1] * self.scale_factor
-            dx = scaled_x - event.pos().x()
-            dy = scaled_y - event.pos().y()
-
-            if (dx*dx + dy*dy) <= 100:  # 선택 반경
-                self.selected_point = i
-                self.dragging = True
-                self.update_view()
-                return
+        # 단일 포인트 선택 로직 (화면 기준 반경 10px)
+        hit = self._hit_test(*self._view_pos(event))
+        if hit is not None:
+            self.selected_point = hit
+            self.dragging = True
+            self.update_view()
+            return
 
         self.selected_point = None
         self.dragging = False
         self.update_view()
 
     def mouseMoveEvent(self, event):
+        if self.panning:
+            view_x, view_y = self._view_pos(event)
+            self.view.pan(view_x - self.last_pan_pos[0], view_y - self.last_pan_pos[1])
+            self.last_pan_pos = (view_x, view_y)
+            self.update_view()
+            return
+
         if not self.dragging:
             return
 
         # UI 좌표를 원본 이미지 좌표로 변환
-        current_x = event.pos().x() / self.scale_factor
-        current_y = event.pos().y() / self.scale_factor
+        current_x, current_y = self._image_pos(event)
 
         if self.is_multi_select and self.start_points:
             # 마우스 이동 거리 계산
             dx = current_x - self.initial_mouse_pos[0]
             dy = current_y - self.initial_mouse_pos[1]
             
-            logger.info(f"다중 선택 이동 중 - 현재 위치: ({current_x}, {current_y})")
-            logger.info(f"이동 거리: dx={dx}, dy={dy}")
+            logger.debug("다중 선택 이동: dx=%.1f, dy=%.1f", dx, dy)
             
             # 모든 저장된 점 이동
             for idx, start_x, start_y in self.start_points:
@@ -173,7 +347,6 @@ class KeypointEditorWidget(QWidget):
                 new_y = int(start_y + dy)
                 self.keypoints[idx] = [new_x, new_y]
                 self.keypoint_updated.emit(idx, [new_x, new_y])
-                logger.info(f"키포인트 {idx} 이동: ({start_x}, {start_y}) -> ({new_x}, {new_y})")
             
             self.update_view()
         elif self.selected_point is not None:
@@ -182,11 +355,40 @@ class KeypointEditorWidget(QWidget):
             self.keypoint_updated.emit(self.selected_point, [current_x, current_y])
             self.update_view()
 
+    def wheelEvent(self, event):
+        """마우스 휠로 커서 위치 기준 확대/축소"""
+        if self.current_image is None:
+            return
+        steps = event.angleDelta().y() / 120
+        if steps:
+            pos = self.image_container.mapFrom(self, event.pos())
+            self.view.zoom_at(1.25 ** steps, pos.x(), pos.y())
+            self.update_view()
+        event.accept()
+
+    def show_placeholder(self, name):
+        """디코딩을 기다리는 동안 표시할 빈 화면 (편집 불가)"""
+        self.current_image = None
+        self.keypoints = []
+        self.proposed = [False] * 17
+        self.selected_point = None
+        self.image_label.clear()
+        self.image_label.setText("불러오는 중...")
+        self.filename_label.setText(name)
+
+    def reset_view(self):
+        """전체 보기로 복귀"""
+        self.view.reset()
+        self.update_view()
+
     def keyPressEvent(self, event):
-        if event.key() == Qt.Key_Control:
+        if event.key() == Qt.Key_Home:
+            self.reset_view()
+            event.accept()
+        elif event.key() == Qt.Key_Control:
             self.is_multi_select = True
             self.setCursor(Qt.CrossCursor)
-            logger.info("다중 선택 모드 활성화")
+            logger.debug("다중 선택 모드 활성화")
             event.accept()  # Ctrl 키는 여기서 처리
         else:
             # 다른 키는 부모로 전달
@@ -198,7 +400,7 @@ class KeypointEditorWidget(QWidget):
             self.is_multi_select = False
             self.setCursor(Qt.ArrowCursor)
             self.start_points = None
-            logger.info("다중 선택 모드 비활성화")
+            logger.debug("다중 선택 모드 비활성화")
             event.accept()  # Ctrl 키는 여기서 처리
         else:
             # 다른 키는 부모로 전달
@@ -207,6 +409,13 @@ class KeypointEditorWidget(QWidget):
 
     def mouseReleaseEvent(self, event):
         """마우스 릴리즈 이벤트 처리"""
+        if self.panning:
+            self.panning = False
+            self.last_pan_pos = None
+            self.setCursor(Qt.CrossCursor if self.is_multi_select else Qt.ArrowCursor)
+            return
+        if self.dragging:
+            self.edit_finished.emit()
         self.dragging = False
         self.selected_point = None
         self.start_points = None
@@ -216,46 +425,24 @@ class KeypointEditorWidget(QWidget):
         if self.current_image is None:
             return
 
-        x = event.pos().x() / self.scale_factor
-        y = event.pos().y() / self.scale_factor
-
-        # 실제 인덱스와 표시 번호 매핑
-        display_mapping = {
-            0: 1,   # 코는 1번 유지
-            5: 2,   # JSON의 5번은 화면의 2번
-            6: 3,   # JSON의 6번은 화면의 3번
-            7: 4,
-            8: 5,
-            9: 6,
-            10: 7,
-            11: 8,
-            12: 9,
-            13: 10,
-            14: 11,
-            15: 12,
-            16: 13
-        }
-
-        # 기존 키포인트 삭제 처리
-        for i, point in enumerate(self.keypoints):
-            if point[0] == 0 and point[1] == 0:  # 비활성화된 점은 무시
-                continue
-
-            dx = point[0] - x
-            dy = point[1] - y
-            if (dx * dx + dy * dy) <= 100:  # 선택 반경 내에 있는 경우
-                # 표시 번호로 변환하여 보여주기
-                display_num = display_mapping.get(i, i + 1)
-                reply = QMessageBox.question(
-                    self, '키포인트 삭제',
-                    f'{display_num}번 키포인트를 삭제하시겠습니까?',
-                    QMessageBox.Yes | QMessageBox.No
-                )
-                if reply == QMessageBox.Yes:
-                    self.keypoints[i] = [0, 0]
-                    self.keypoint_updated.emit(i, [0, 0])
-                    self.update_view()
-                return
+        x, y = self._image_pos(event)
+
+        # 기존 키포인트 삭제 처리 (선택 반경 내에 있는 경우)
+        i = self._hit_test(*self._view_pos(event))
+        if i is not None:
+            # 표시 번호로 변환하여 보여주기
+            display_num = DISPLAY_NUMBERS.get(i, i + 1)
+            reply = QMessageBox.question(
+                self, '키포인트 삭제',
+                f'{display_num}번 키포인트를 삭제하시겠습니까?',
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if reply == QMessageBox.Yes:
+                self.keypoints[i] = [0, 0]
+                self.keypoint_updated.emit(i, [0, 0])
+                self.edit_finished.emit()
+                self.update_view()
+            return
 
         # 새 키포인트 추가 다이얼로그
         dialog = KeypointDialog(self.keypoints, self)
@@ -264,26 +451,610 @@ class KeypointEditorWidget(QWidget):
             if point_id is not None:
                 self.keypoints[point_id] = [x, y]
                 self.keypoint_updated.emit(point_id, [x, y])
+                self.edit_finished.emit()
                 self.update_view()
 
     def update_view(self):
         if self.current_image is None:
             return
 
-        # 키포인트 렌더링
-        rendered = KeypointRenderer.render_skeleton(
-            self.current_image,
-            self.keypoints,
-            self.selected_point  # 선택된 키포인트 강조
+        # 보이는 타일만 현재 줌에 맞는 피라미드 레벨에서 잘라 화면 크기 캔버스 구성
+        with span('resize'):
+            canvas = self.pyramid.render(self.view)
+
+        # 모든 사람의 키포인트를 한 번에 화면 좌표로 변환해 캔버스에 직접 렌더링
+        points = self._person_array()
+        visible = np.any(points != 0, axis=2)
+        view_points = np.rint(self.view.map_to_view(points.reshape(-1, 2))).astype(int)
+        # 제안(보간/추적) 포인트는 첫 번째 사람에만 있음
+        proposed = self.proposed if self.active_person == 0 and any(self.proposed) else None
+        KeypointRenderer.draw_people(
+            canvas,
+            view_points.reshape(points.shape),
+            visible,
+            self.active_person,
+            self.selected_point,  # 선택된 키포인트 강조
+            proposed
         )
 
-        # 크기 조정 및 QImage 변환
-        resized = cv2.resize(rendered, (1152, 648))  # UI 크기에 맞게 조정
-        h, w, c = resized.shape
-        bytes_per_line = 3 * w
-        qimg = QImage(resized.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        self.image_label.setPixmap(QPixmap.fromImage(qimg))
-        
+        # QImage 변환
+        with span('qpixmap'):
+            h, w, c = canvas.shape
+            bytes_per_line = 3 * w
+            qimg = QImage(canvas.data, w, h, bytes_per_line, QImage.Format_RGB888)
+            self.image_label.setPixmap(QPixmap.fromImage(qimg))
+
+        tracer.end_frame()
+        if not self.trace_hud.isHidden():
+            self.trace_hud.refresh()
+
+    def toggle_trace_hud(self):
+        """계측 오버레이 표시 전환 (표시 시 추적 활성화)"""
+        visible = self.trace_hud.isHidden()
+        if visible:
+            tracer.enabled = True
+            self.trace_hud.refresh()
+        self.trace_hud.setVisible(visible)
+        self.trace_hud.raise_()
+
+
+class TraceHud(QLabel):
+    """직전 프레임의 스팬별 소요 시간을 표시하는 반투명 오버레이"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFont(QFont("Monospace", 9))
+        self.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 160); color: #00FF00; padding: 4px;"
+        )
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.hide()
+
+    def refresh(self):
+        timings = tracer.frame_timings()
+        lines = [f"{name:<16}{ms:7.2f} ms" for name, ms in
+                 sorted(timings.items(), key=lambda item: -item[1])]
+        lines.append(f"{'total':<16}{sum(timings.values()):7.2f} ms")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+
+class _ThumbnailSignals(QObject):
+    ready = pyqtSignal(int, int, QImage)  # 세대, 프레임 인덱스, 썸네일
+
+
+class _ThumbnailTask(QRunnable):
+    """백그라운드 스레드에서 썸네일을 캐시에서 읽거나 축소 디코딩으로 생성"""
+
+    def __init__(self, strip, generation, index, path):
+        super().__init__()
+        self.strip = strip
+        self.generation = generation
+        self.index = index
+        self.path = path
+        self.cache = strip.cache
+        self.signals = strip._signals
+
+    def run(self):
+        # 프레임 목록이 바뀐 뒤 남은 작업은 건너뜀
+        if self.strip.generation != self.generation:
+            return
+        try:
+            thumb = self.cache.load_or_create(self.path)
+        except Exception as e:
+            logger.warning(f"썸네일 생성 실패: {self.path}: {e}")
+            return
+        if thumb is None:
+            return
+        h, w = thumb.shape[:2]
+        qimg = QImage(thumb.data, w, h, 3 * w, QImage.Format_RGB888).copy()
+        self.signals.ready.emit(self.generation, self.index, qimg)
+
+
+class FilmstripWidget(QListWidget):
+    """현재 JSON에 속한 프레임들의 썸네일 목록 (클릭 시 해당 프레임으로 이동)"""
+    frame_selected = pyqtSignal(int)  # 프레임 인덱스
+
+    def __init__(self, parent=None, cache=None):
+        super().__init__(parent)
+        self.cache = cache or ThumbnailCache()
+        self.generation = 0
+
+        thumb_height = THUMBNAIL_WIDTH * 9 // 16
+        self.setViewMode(QListView.IconMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(False)
+        self.setMovement(QListView.Static)
+        self.setIconSize(QSize(THUMBNAIL_WIDTH, thumb_height))
+        self.setFixedHeight(thumb_height + 48)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setFocusPolicy(Qt.NoFocus)  # 방향키는 메인 창에서 처리
+
+        # 썸네일 생성 전용 스레드 풀 (전역 풀을 점유하지 않도록 분리)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+        self._signals = _ThumbnailSignals()
+        self._signals.ready.connect(self._on_thumbnail)
+        self.itemClicked.connect(lambda item: self.frame_selected.emit(self.row(item)))
+
+    def set_frames(self, paths, current=0, thumbnails=True):
+        """프레임 목록 설정. 현재 프레임에 가까운 것부터 썸네일 생성 (thumbnails=False이면 번호만)"""
+        self.generation += 1
+        self._pool.clear()  # 아직 시작되지 않은 이전 작업 취소
+        self.clear()
+
+        placeholder = QPixmap(self.iconSize())
+        placeholder.fill(Qt.darkGray)
+        for path in paths:
+            item = QListWidgetItem(QIcon(placeholder), Path(path).stem.split('_')[-1])
+            self.addItem(item)
+
+        if not thumbnails:
+            paths = []
+        for index in sorted(range(len(paths)), key=lambda i: abs(i - current)):
+            self._pool.start(_ThumbnailTask(self, self.generation, index, paths[index]))
+        self.set_current(current)
+
+    def set_current(self, index):
+        """현재 프레임 표시 (frame_selected는 발생하지 않음)"""
+        item = self.item(index)
+        if item is not None:
+            self.setCurrentItem(item)
+            self.scrollToItem(item, QAbstractItemView.PositionAtCenter)
+
+    def _on_thumbnail(self, generation, index, qimg):
+        if generation != self.generation:
+            return
+        item = self.item(index)
+        if item is not None:
+            item.setIcon(QIcon(QPixmap.fromImage(qimg)))
+
+    def wait_for_thumbnails(self, msecs=-1):
+        """대기 중인 썸네일 작업 완료 대기 (테스트/종료용)"""
+        return self._pool.waitForDone(msecs)
+
+
+class TrajectoryTimeline(QWidget):
+    """
+    현재 JSON의 키포인트별 x/y 좌표를 프레임 순서로 그린 타임라인.
+
+    위쪽 띠는 x, 아래쪽 띠는 y이며 세로 범위는 원본 이미지 크기로 고정되어 있어,
+    포인트가 바뀌면 해당 프레임의 선분이 지나는 픽셀 열만 지우고 다시 그립니다.
+    튐 점수가 큰 프레임은 아래쪽에 빨간 표시가 붙고, 그 근처를 클릭하면 해당
+    프레임으로 이동합니다.
+    """
+    frame_selected = pyqtSignal(int)  # 프레임 인덱스
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedHeight(TIMELINE_HEIGHT)
+        self.setFocusPolicy(Qt.NoFocus)  # 방향키는 메인 창에서 처리
+        self.tracks = TrackArray([])
+        self.image_size = ORIGINAL_SIZE
+        self.current = -1
+        self.canvas = np.zeros((TIMELINE_HEIGHT, 1, 3), dtype=np.uint8)
+        self.last_redraw = None  # 마지막으로 다시 그린 픽셀 열 범위 (시작, 끝)
+
+    def set_tracks(self, tracks, image_size=None):
+        """궤적 배열 교체 (전체 다시 그리기)"""
+        self.tracks = tracks
+        if image_size:
+            self.image_size = tuple(image_size)
+        self._redraw(0, len(tracks) - 1)
+
+    def set_point(self, frame, point_id, xy):
+        """포인트 하나 변경 (바뀐 프레임 주변 열만 다시 그림)"""
+        i = self.tracks.set_point(frame, point_id, xy)
+        if i >= 0:
+            self._redraw(i, i)
+
+    def set_frame(self, frame, keypoints):
+        """프레임의 포인트 전체 변경 (바뀐 프레임 주변 열만 다시 그림)"""
+        i = self.tracks.set_frame(frame, keypoints)
+        if i >= 0:
+            self._redraw(i, i)
+
+    def set_current(self, index):
+        """현재 프레임 표시 (frame_selected는 발생하지 않음)"""
+        if index != self.current:
+            self.current = index
+            self.update()
+
+    def _columns(self, indices):
+        """행 번호 -> 픽셀 열 (각 프레임 구간의 가운데)"""
+        count = max(len(self.tracks), 1)
+        return ((np.asarray(indices) + 0.5) * self.canvas.shape[1] / count).astype(np.int32)
+
+    def _rows(self, values, band):
+        """좌표 값 -> 띠 안의 픽셀 행 (band 0: x, 1: y)"""
+        half = TIMELINE_HEIGHT // 2
+        scale = (half - 2 * TIMELINE_MARGIN) / max(self.image_size[band], 1)
+        return (band * half + TIMELINE_MARGIN + values * scale).astype(np.int32)
+
+    def _redraw(self, first, last):
+        """
+        [first, last] 행의 변경으로 모양이 바뀌는 픽셀 열만 지우고 다시 그립니다.
+        행 i의 선분은 i-1, i+1과 이어지고 튐 점수도 이웃 행까지 바뀌므로 앞뒤 한 행씩 포함.
+        """
+        width = max(self.width(), 1)
+        if self.canvas.shape[1] != width:
+            self.canvas = np.zeros((TIMELINE_HEIGHT, width, 3), dtype=np.uint8)
+            first, last = 0, len(self.tracks) - 1
+        count = len(self.tracks)
+        if count == 0:
+            self.canvas[:] = 0
+            self.last_redraw = (0, width - 1)
+            self.update()
+            return
+
+        lo, hi = max(first - 1, 0), min(last + 1, count - 1)
+        if (lo, hi) == (0, count - 1):
+            c0, c1 = 0, width - 1
+        else:
+            c0, c1 = self._columns([lo, hi]).tolist()
+        with span('timeline.redraw', columns=c1 - c0 + 1):
+            region = self.canvas[:, c0:c1 + 1]
+            region[:] = 0
+            region[TIMELINE_HEIGHT // 2] = TIMELINE_AXIS_COLOR
+
+            # 열 범위와 겹치는 선분 (i, i+1)만 선택
+            columns = self._columns(np.arange(count))
+            start = max(int(np.searchsorted(columns, c0, side='left')) - 1, 0)
+            stop = min(int(np.searchsorted(columns, c1, side='right')) + 1, count)
+            points = self.tracks.points[start:stop]
+            x = columns[start:stop] - c0
+            for band in (0, 1):
+                rows = self._rows(np.nan_to_num(points[..., band]), band)
+                present = ~np.isnan(points[..., band])
+                drawn = present[:-1] & present[1:]                          # (n-1, 17)
+                for idx in np.flatnonzero(_TIMELINE_POINTS).tolist():
+                    keep = drawn[:, idx]
+                    if not keep.any():
+                        continue
+                    segments = np.stack([
+                        np.stack([x[:-1][keep], rows[:-1, idx][keep]], axis=1),
+                        np.stack([x[1:][keep], rows[1:, idx][keep]], axis=1),
+                    ], axis=1)
+                    cv2.polylines(region, list(segments), False,
+                                  KeypointRenderer.get_point_color(idx), 1)
+                # 다른 프레임과 이어지지 않는 단독 포인트
+                alone = present.copy()
+                alone[:-1] &= ~present[1:]
+                alone[1:] &= ~present[:-1]
+                for i, idx in zip(*np.nonzero(alone & _TIMELINE_POINTS)):
+                    region[np.clip(rows[i, idx], 0, TIMELINE_HEIGHT - 1), np.clip(x[i], 0, region.shape[1] - 1)] = \
+                        KeypointRenderer.get_point_color(int(idx))
+
+            # 튐/누락 프레임 표시
+            spikes = self.tracks.spikes()
+            spikes = spikes[(spikes >= start) & (spikes < stop)]
+            for i in spikes.tolist():
+                sx = int(columns[i]) - c0
+                cv2.line(region, (sx, TIMELINE_HEIGHT - 6), (sx, TIMELINE_HEIGHT - 1), COLORS['red'], 2)
+        self.last_redraw = (c0, c1)
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._redraw(0, len(self.tracks) - 1)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        h, w = self.canvas.shape[:2]
+        painter.drawImage(0, 0, QImage(self.canvas.data, w, h, 3 * w, QImage.Format_RGB888))
+        if 0 <= self.current < len(self.tracks):
+            painter.setPen(QColor(255, 255, 255))
+            x = int(self._columns([self.current])[0])
+            painter.drawLine(x, 0, x, h)
+        painter.end()
+
+    def frame_at(self, x):
+        """클릭 위치의 행 번호. 가까운 튐 표시가 있으면 그 프레임으로 맞춤"""
+        count = len(self.tracks)
+        if count == 0:
+            return -1
+        spikes = self.tracks.spikes()
+        if len(spikes):
+            distance = np.abs(self._columns(spikes) - x)
+            nearest = int(np.argmin(distance))
+            if distance[nearest] <= TIMELINE_SNAP_PX:
+                return int(spikes[nearest])
+        return int(np.clip(x * count // max(self.canvas.shape[1], 1), 0, count - 1))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            index = self.frame_at(event.pos().x())
+            if index >= 0:
+                self.frame_selected.emit(index)
+
+
+class _NumericItem(QTableWidgetItem):
+    """표시 문자열과 별개로 숫자 값으로 정렬되는 표 항목"""
+
+    def __init__(self, value, text=None):
+        super().__init__(text if text is not None else str(value))
+        self.value = value
+        self.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+
+    def __lt__(self, other):
+        if isinstance(other, _NumericItem):
+            return self.value < other.value
+        return super().__lt__(other)
+
+
+class ProgressDashboard(QDialog):
+    """
+    시퀀스별 라벨링 진행 현황.
+
+    모든 시퀀스 폴더를 스레드 풀에서 병렬로 스캔하며, 스캔이 끝난 시퀀스부터
+    표에 추가됩니다. 열 머리글을 눌러 정렬하고, 행을 더블클릭하면 해당
+    시퀀스를 엽니다. 새로 고침하면 이전 스캔의 작업은 취소되고, 이미 실행 중이던
+    작업의 결과는 스캔 세대가 달라 버려집니다.
+    """
+    sequence_scanned = pyqtSignal(int, object)   # 스캔 세대, 스캔 Future (워커 스레드 -> GUI 스레드)
+    sequence_activated = pyqtSignal(str)    # 더블클릭한 시퀀스 이름
+
+    def __init__(self, base_path, parent=None, workers=DEFAULT_SCAN_WORKERS):
+        super().__init__(parent)
+        self.setWindowTitle("진행 현황")
+        self.resize(520, 600)
+        self.base_path = Path(base_path)
+        self.workers = workers
+        self.results = {}
+        self._executor = None
+        self._token = None
+        self._generation = 0
+        self._expected = 0
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, len(CSV_HEADER))
+        self.table.setHorizontalHeaderLabels(CSV_HEADER)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        self.table.cellDoubleClicked.connect(self._on_double_click)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        refresh_btn = QPushButton("새로 고침")
+        refresh_btn.clicked.connect(self.start_scan)
+        button_layout.addWidget(refresh_btn)
+        export_btn = QPushButton("CSV 저장")
+        export_btn.clicked.connect(self.export_csv)
+        button_layout.addWidget(export_btn)
+        layout.addLayout(button_layout)
+
+        self.sequence_scanned.connect(self._on_scanned)
+        self.start_scan()
+
+    def start_scan(self):
+        """모든 시퀀스 폴더 스캔 시작 (이전 스캔의 남은 작업은 취소)"""
+        self.stop_scan()
+        self.results = {}
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+        self.table.setSortingEnabled(True)
+
+        sequences = list_sequences(self.base_path)
+        self._expected = len(sequences)
+        self._update_summary()
+        if not sequences:
+            return
+        self._generation += 1
+        generation = self._generation
+        self._token = token = CancelToken()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        for folder in sequences:
+            future = self._executor.submit(self._scan, folder, token)
+            future.add_done_callback(lambda f: self._emit_scanned(generation, f))
+
+    def stop_scan(self):
+        if self._token is not None:
+            self._token.cancel()
+            self._token = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _scan(folder, token):
+        """워커 스레드: 시작 전에 취소된 스캔이면 폴더를 읽지 않음"""
+        if token.cancelled:
+            raise CancelledError()
+        return scan_sequence(folder)
+
+    def wait_for_scan(self):
+        """진행 중인 스캔 완료 대기 (결과 표시는 이벤트 루프에서 처리)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def _emit_scanned(self, generation, future):
+        try:
+            self.sequence_scanned.emit(generation, future)
+        except RuntimeError:  # 창이 이미 닫혀 삭제된 경우
+            pass
+
+    def _on_scanned(self, generation, future):
+        if generation != self._generation or future.cancelled():
+            return  # 새로 고침 전에 시작한 스캔의 결과
+        try:
+            result = future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            logger.warning(f"시퀀스 스캔 실패: {e}")
+            return
+        self.results[result.name] = result
+
+        # 정렬 중 행이 이동하지 않도록 잠시 정렬을 끄고 추가
+        self.table.setSortingEnabled(False)
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.table.setItem(row, 0, QTableWidgetItem(result.name))
+        self.table.setItem(row, 1, _NumericItem(result.total))
+        self.table.setItem(row, 2, _NumericItem(result.edited))
+        self.table.setItem(row, 3, _NumericItem(result.percent, f"{result.percent:.1f}"))
+        self.table.setSortingEnabled(True)
+        self._update_summary()
+
+    def _update_summary(self):
+        total = sum(r.total for r in self.results.values())
+        edited = sum(r.edited for r in self.results.values())
+        overall = SequenceProgress('', total, edited)
+        text = f"전체 {total}개 중 {edited}개 수정 ({overall.percent:.1f}%)"
+        if len(self.results) < self._expected:
+            text += f" - 스캔 중 {len(self.results)}/{self._expected}"
+        self.summary_label.setText(text)
+
+    def _on_double_click(self, row, column):
+        item = self.table.item(row, 0)
+        if item is not None:
+            self.sequence_activated.emit(item.text())
+
+    def export_csv(self):
+        """현재 집계 결과를 CSV로 저장"""
+        path, _ = QFileDialog.getSaveFileName(self, "진행 현황 저장", "progress.csv", "CSV (*.csv)")
+        if not path:
+            return
+        try:
+            write_progress_csv(path, self.results.values())
+        except Exception as e:
+            logger.error(f"진행 현황 저장 실패: {e}")
+            QMessageBox.critical(self, "오류", f"진행 현황 저장 실패: {e}")
+
+    def closeEvent(self, event):
+        self.stop_scan()
+        super().closeEvent(event)
+
+
+class CorrectionsDialog(QDialog):
+    """
+    원본 대비 수정 폭이 큰 프레임 목록과 편집자별 집계.
+
+    비교는 백그라운드 스레드에서 프로세스 풀로 수행되며, 행을 더블클릭하면
+    해당 프레임으로 이동합니다.
+    """
+    diff_finished = pyqtSignal(object)             # 비교 Future (워커 스레드 -> GUI 스레드)
+    frame_activated = pyqtSignal(str, str, int)    # 시퀀스, JSON 파일명, 키프레임
+    COLUMNS = ['시퀀스', '파일', '프레임', '최대 이동(px)', '평균 이동(px)', '추가', '삭제', '편집자']
+
+    def __init__(self, base_path, parent=None, workers=None):
+        super().__init__(parent)
+        self.setWindowTitle("수정 비교")
+        self.resize(900, 600)
+        # 수정 비교 모듈은 창을 처음 열 때 로드 (프로그램 시작 시간 단축)
+        import annotation_diff
+        self._diff = annotation_diff
+        self.base_path = Path(base_path)
+        self.workers = annotation_diff.DEFAULT_DIFF_WORKERS if workers is None else workers
+        self.diffs = []
+        self.corrections = []
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._future = None
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel("비교 중...")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.cellDoubleClicked.connect(self._on_double_click)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        refresh_btn = QPushButton("다시 비교")
+        refresh_btn.clicked.connect(self.start_diff)
+        button_layout.addWidget(refresh_btn)
+        export_btn = QPushButton("보고서 저장")
+        export_btn.clicked.connect(self.export_report)
+        button_layout.addWidget(export_btn)
+        layout.addLayout(button_layout)
+
+        self.diff_finished.connect(self._on_finished)
+        self.start_diff()
+
+    def start_diff(self):
+        if self._future is not None and not self._future.done():
+            return
+        self.summary_label.setText("비교 중...")
+        self._future = self._executor.submit(self._diff.diff_dataset, self.base_path, self.workers)
+        self._future.add_done_callback(self._emit_finished)
+
+    def wait_for_diff(self):
+        if self._future is not None:
+            self._future.exception()
+
+    def _emit_finished(self, future):
+        try:
+            self.diff_finished.emit(future)
+        except RuntimeError:  # 창이 이미 닫혀 삭제된 경우
+            pass
+
+    def _on_finished(self, future):
+        try:
+            self.diffs = future.result()
+        except Exception as e:
+            logger.error(f"수정 비교 실패: {e}")
+            self.summary_label.setText(f"수정 비교 실패: {e}")
+            return
+
+        summary = self._diff.summarize(self.diffs)
+        total = summary['total']
+        lines = [f"{total['files']}개 파일, {total['frames']}개 프레임: 평균 이동 {total['mean_px']}px, "
+                 f"최대 {total['max_px']}px, 추가 {total['added']}, 삭제 {total['removed']}"]
+        for name, stats in summary['annotators'].items():
+            lines.append(f"{name}: {stats['files']}개 파일, 평균 {stats['mean_px']}px, "
+                         f"추가 {stats['added']}, 삭제 {stats['removed']}")
+        self.summary_label.setText("\n".join(lines))
+
+        self.corrections = self._diff.largest_corrections(self.diffs)
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(self.corrections))
+        for row, c in enumerate(self.corrections):
+            self.table.setItem(row, 0, QTableWidgetItem(c.sequence))
+            item = QTableWidgetItem(c.name)
+            item.setData(Qt.UserRole, row)
+            self.table.setItem(row, 1, item)
+            self.table.setItem(row, 2, _NumericItem(c.keyframe))
+            self.table.setItem(row, 3, _NumericItem(c.max_px))
+            self.table.setItem(row, 4, _NumericItem(c.mean_px))
+            self.table.setItem(row, 5, _NumericItem(c.added))
+            self.table.setItem(row, 6, _NumericItem(c.removed))
+            self.table.setItem(row, 7, QTableWidgetItem(c.annotator))
+        self.table.setSortingEnabled(True)
+
+    def _on_double_click(self, row, column):
+        item = self.table.item(row, 1)
+        if item is not None:
+            c = self.corrections[item.data(Qt.UserRole)]
+            self.frame_activated.emit(c.sequence, c.name, c.keyframe)
+
+    def export_report(self):
+        """요약과 상위 수정 프레임을 JSON 보고서로 저장"""
+        path, _ = QFileDialog.getSaveFileName(self, "보고서 저장", "diff_report.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self._diff.write_report(path, self.diffs)
+        except Exception as e:
+            logger.error(f"보고서 저장 실패: {e}")
+            QMessageBox.critical(self, "오류", f"보고서 저장 실패: {e}")
+
+    def closeEvent(self, event):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        super().closeEvent(event)
+
+
 class KeypointDialog(QDialog):
     def __init__(self, existing_points, parent=None):
         super().__init__(parent)